@@ -110,6 +110,10 @@ async def lifespan(app: FastAPI):
                 pass
             logger.info("Alert monitoring background task stopped")
         
+        # Write result cache hits buffered since the last batch
+        from ..cache.result_cache import flush_result_caches
+        await flush_result_caches()
+        
         # Cleanup Database connections
         from ..database.connection import close_database
         await close_database()
@@ -120,6 +124,10 @@ async def lifespan(app: FastAPI):
         await factory.cleanup()
         logger.info("LLM provider factory cleaned up")
         
+        # Stop keep_alive pings and close the shared Ollama endpoint pools
+        from ..llm.providers.ollama_pool import close_endpoint_pools
+        await close_endpoint_pools()
+        
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
     
@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Request, status
+from pydantic import BaseModel, Field
 
 from ...core.logging import get_logger
 from ...core.config import get_settings
@@ -20,6 +21,7 @@ from ...core.dashboards import (
     get_alert_manager, get_dashboard_generator, run_alert_checks, generate_prometheus_metrics
 )
 from ...database.connection import get_database
+from ...llm.prompts import PromptExperiment, prompt_experiment_manager
 # Rate limiting middleware removed - no longer needed
 
 logger = get_logger(__name__)
@@ -450,6 +452,97 @@ async def resolve_alert(
         )
 
 
+# Prompt Experiment Endpoints
+
+class PromptExperimentRequest(BaseModel):
+    """Definition of a prompt template A/B experiment."""
+    
+    experiment_id: str = Field(..., min_length=1, max_length=100, description="Unique experiment identifier")
+    control_template_id: str = Field(..., description="Template that receives the remaining traffic")
+    variants: Dict[str, float] = Field(
+        ..., description="Alternative template ids mapped to their traffic share in percent"
+    )
+    description: Optional[str] = Field(default=None, description="What the experiment tests")
+
+
+@router.get("/prompt-experiments")
+async def get_prompt_experiments(
+    request: Request,
+):
+    """Compare tokens, latency and confidence per template for all prompt experiments."""
+    try:
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "experiments": prompt_experiment_manager.report()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to build prompt experiment report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build prompt experiment report"
+        )
+
+
+@router.post("/prompt-experiments", status_code=status.HTTP_201_CREATED)
+async def start_prompt_experiment(
+    experiment_request: PromptExperimentRequest,
+    request: Request,
+):
+    """Start routing a share of function translations to alternative prompt templates."""
+    try:
+        experiment = prompt_experiment_manager.start(PromptExperiment(
+            experiment_request.experiment_id,
+            experiment_request.control_template_id,
+            experiment_request.variants,
+            description=experiment_request.description
+        ))
+        
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "experiment": experiment.report()
+        }
+        
+    except (KeyError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e).strip("'")
+        )
+    except Exception as e:
+        logger.error(f"Failed to start prompt experiment {experiment_request.experiment_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start prompt experiment {experiment_request.experiment_id}"
+        )
+
+
+@router.post("/prompt-experiments/{experiment_id}/stop")
+async def stop_prompt_experiment(
+    experiment_id: str,
+    request: Request,
+):
+    """Stop a prompt experiment; its results stay available in the report."""
+    try:
+        experiment = prompt_experiment_manager.stop(experiment_id)
+        
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "experiment": experiment.report()
+        }
+        
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Prompt experiment '{experiment_id}' not found"
+        )
+    except Exception as e:
+        logger.error(f"Failed to stop prompt experiment {experiment_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to stop prompt experiment {experiment_id}"
+        )
+
+
 # Monitoring and Health Endpoints
 
 @router.get("/monitoring/prometheus")
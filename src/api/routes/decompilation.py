@@ -106,14 +106,47 @@ async def process_decompilation_job(job_id: str, file_path: str, analysis_config
                     "llm_endpoint_url": analysis_config.get("llm_endpoint_url"),
                     "llm_api_key": analysis_config.get("llm_api_key"),
                     "translation_detail": analysis_config.get("translation_detail", "standard"),
-                    "analysis_depth": analysis_config.get("analysis_depth", "standard")
+                    "analysis_depth": analysis_config.get("analysis_depth", "standard"),
+                    "max_functions": analysis_config.get("max_functions"),
+                    "important_functions": analysis_config.get("important_functions"),
+                    "tail_mode": analysis_config.get("tail_mode"),
+                    "summary_after_functions": analysis_config.get("summary_after_functions"),
+                    "priority": analysis_config.get("priority", "normal"),
+                    "execution_mode": analysis_config.get("execution_mode"),
+                    "cascade": analysis_config.get("cascade", False),
+                    "local_llm_model": analysis_config.get("local_llm_model"),
+                    "local_llm_endpoint_url": analysis_config.get("local_llm_endpoint_url"),
+                    "structured_output": analysis_config.get("structured_output", False),
+                    "max_job_tokens": analysis_config.get("max_job_tokens"),
+                    "max_job_cost_usd": analysis_config.get("max_job_cost_usd"),
+                    "budget_degrade_at": analysis_config.get("budget_degrade_at"),
+                    "budget_fallback_model": analysis_config.get("budget_fallback_model"),
+                    "hedge_provider": analysis_config.get("hedge_provider"),
+                    "hedge_model": analysis_config.get("hedge_model")
                 }
                 
+                async def report_translation_progress(progress: Dict[str, Any]) -> None:
+                    # Translation occupies the 70-90% band of overall job progress
+                    fraction = progress["completed"] / progress["total"] if progress["total"] else 1.0
+                    budget = progress.get("budget")
+                    budget_note = f", budget {budget['fraction_used']:.0%} used" if budget else ""
+                    await job_queue.update_job_progress(
+                        job_id=job_id,
+                        worker_id="background-worker",
+                        progress_percentage=round(70.0 + 20.0 * fraction, 1),
+                        current_stage=(
+                            f"LLM translation: {progress['important_translated']}/{progress['important_total']} "
+                            f"important functions ({progress['important_coverage']:.0%}), "
+                            f"{progress['completed']}/{progress['total']} total{budget_note}"
+                        )
+                    )
+                
                 # Translate the decompilation result
                 translation_result = await translation_service.translate_decompilation_result(
                     decompilation_result=result,
                     llm_config=llm_config,
-                    context={"job_id": job_id}
+                    context={"job_id": job_id},
+                    progress_callback=report_translation_progress
                 )
                 
                 # Handle tuple return (result, translation_data) or just result
@@ -204,6 +237,22 @@ async def submit_decompilation_job(
     llm_endpoint_url: Optional[str] = Form(default=None),
     llm_api_key: Optional[str] = Form(default=None),
     translation_detail: str = Form(default="standard"),
+    max_functions: Optional[int] = Form(default=None, ge=1),
+    important_functions: Optional[int] = Form(default=None, ge=0),
+    tail_mode: Optional[str] = Form(default=None, pattern="^(brief|skip)$"),
+    summary_after_functions: Optional[int] = Form(default=None, ge=0),
+    priority: str = Form(default="normal", pattern="^(low|normal|high|urgent)$"),
+    execution_mode: Optional[str] = Form(default=None, pattern="^(batch|interactive)$"),
+    cascade: bool = Form(default=False),
+    local_llm_model: Optional[str] = Form(default=None),
+    local_llm_endpoint_url: Optional[str] = Form(default=None),
+    structured_output: bool = Form(default=False),
+    max_job_tokens: Optional[int] = Form(default=None, ge=1),
+    max_job_cost_usd: Optional[float] = Form(default=None, gt=0),
+    budget_degrade_at: Optional[float] = Form(default=None, gt=0, le=1),
+    budget_fallback_model: Optional[str] = Form(default=None),
+    hedge_provider: Optional[str] = Form(default=None),
+    hedge_model: Optional[str] = Form(default=None),
     job_queue: JobQueue = Depends(get_job_queue)
 ):
     """
@@ -217,6 +266,32 @@ async def submit_decompilation_job(
         analysis_depth: Decompilation depth (basic, standard, comprehensive)
         llm_provider: LLM provider for translation (openai, anthropic, gemini)
         translation_detail: Translation detail level (basic, standard, detailed)
+        max_functions: Maximum number of functions to translate (highest ranked first)
+        important_functions: Number of top-ranked functions translated at full detail
+        tail_mode: What happens to functions ranked below important_functions:
+            "brief" (translated in brief mode, the default) or "skip"
+        summary_after_functions: Start the overall summary once this many
+            functions are translated (0 starts it right away)
+        priority: Job priority (low, normal, high, urgent); low-priority jobs are
+            translated through the provider's batch API when available
+        execution_mode: "batch" to use the provider's batch API regardless of
+            priority, or "interactive" to never use it; by default priority decides
+        cascade: Draft every function with a local Ollama model and send only
+            low-confidence drafts to llm_provider
+        local_llm_model: Ollama model for cascade drafts
+        local_llm_endpoint_url: Ollama endpoint for cascade drafts
+        structured_output: Request schema-constrained JSON translations
+            (OpenAI and Anthropic) instead of parsing free text
+        max_job_tokens: Token budget for the job's LLM requests; functions that
+            would exceed it are left untranslated
+        max_job_cost_usd: Estimated cost budget (USD) for the job's LLM requests
+        budget_degrade_at: Fraction of the budget after which the remaining
+            functions are translated briefly (default 0.8)
+        budget_fallback_model: Cheaper model used once most of the budget is spent
+        hedge_provider: Second provider (a configured provider ID) that function
+            requests slower than llm_provider's p95 latency, or failed ones, are
+            also sent to; ignored for budgeted jobs
+        hedge_model: Model for hedge_provider
     
     Returns:
         Job information with tracking ID
@@ -249,6 +324,22 @@ async def submit_decompilation_job(
         "llm_endpoint_url": llm_endpoint_url,
         "llm_api_key": llm_api_key,
         "translation_detail": translation_detail,
+        "max_functions": max_functions,
+        "important_functions": important_functions,
+        "tail_mode": tail_mode,
+        "summary_after_functions": summary_after_functions,
+        "priority": priority,
+        "execution_mode": execution_mode,
+        "cascade": cascade,
+        "local_llm_model": local_llm_model,
+        "local_llm_endpoint_url": local_llm_endpoint_url,
+        "structured_output": structured_output,
+        "max_job_tokens": max_job_tokens,
+        "max_job_cost_usd": max_job_cost_usd,
+        "budget_degrade_at": budget_degrade_at,
+        "budget_fallback_model": budget_fallback_model,
+        "hedge_provider": hedge_provider,
+        "hedge_model": hedge_model,
         "file_path": temp_file_path
     }
     
@@ -257,7 +348,7 @@ async def submit_decompilation_job(
         file_reference=temp_file_path,
         filename=file.filename,
         analysis_config=analysis_config,
-        priority="normal"
+        priority=priority
     )
     
     # Start background processing with asyncio.create_task
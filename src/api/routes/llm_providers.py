@@ -237,6 +237,8 @@ async def get_llm_provider_details(
                 "failed_requests": stats.failed_requests if stats else 0,
                 "success_rate_percent": round(stats.success_rate, 2) if stats else 0,
                 "average_latency_ms": round(stats.average_latency_ms, 2) if stats else 0,
+                "p95_latency_ms": stats.p95_latency_ms if stats else None,
+                "recent_error_rate": round(stats.error_rate_ewma, 3) if stats else 0,
                 "total_tokens_processed": stats.total_tokens if stats else 0,
                 "total_cost_usd": round(stats.total_cost, 2) if stats else 0,
                 "last_used": stats.last_used.isoformat() if stats and stats.last_used else None
@@ -2,24 +2,84 @@
 File-based storage implementation with async operations and expiration management.
 
 Provides the foundational file storage client with JSON serialization, expiration handling,
-and comprehensive logging for all cache components.
+and comprehensive logging for all cache components. Blocking file I/O, serialization and
+file lock waits run on a dedicated thread pool so slow disks never stall the event loop.
+Values are stored through PayloadCodec (binary serialization and compression with a
+self-describing header; plain JSON entries from earlier versions still read). Expiry cleanup
+reads a time-bucketed expiry index instead of walking the storage tree; when several
+processes share the storage, only the process owning the index uses it and the others
+walk.
 """
 
 import asyncio
+import functools
 import json
 import os
 import shutil
 import tempfile
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Optional, Union, Dict, List, AsyncGenerator
+from typing import Any, Callable, Optional, Union, Dict, Iterator, List, AsyncGenerator, Set, Tuple, TypeVar
 import fcntl
 import hashlib
+import time
 
 from ..core.config import Settings, get_settings
 from ..core.exceptions import CacheException, CacheConnectionError, CacheTimeoutError
 from ..core.logging import get_logger
+from .codec import PayloadCodec
+from .expiry_index import ExpiryIndex, iso_to_epoch
+
+
+T = TypeVar("T")
+
+EXPIRY_INDEX_FILE = "expiry_index.json"
+DICTIONARY_DIR = "dictionaries"
+
+
+class FileIOExecutor:
+    """
+    Dedicated thread pool for blocking file operations.
+    
+    At most max_pending operations are queued or running; further callers
+    wait on the event loop (without blocking it) until a slot frees up.
+    """
+    
+    def __init__(self, max_workers: int = 8, max_pending: int = 256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-storage-io")
+        self._slots = asyncio.Semaphore(max_pending)
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run func(*args) on the I/O pool and await its result."""
+        async with self._slots:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+            finally:
+                self._in_flight -= 1
+                self._completed += 1
+    
+    def shutdown(self) -> None:
+        """Stop accepting work; running operations finish in the background."""
+        self._executor.shutdown(wait=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "threads": self.max_workers,
+            "queue_depth": self.max_pending,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "completed": self._completed
+        }
 
 
 class FileStorageClient:
@@ -31,6 +91,9 @@ class FileStorageClient:
     - JSON serialization/deserialization with binary data support
     - TTL-based expiration with background cleanup
     - File locking for thread safety
+    - Blocking I/O on a bounded thread pool, one pool hop per operation
+      (data and metadata are read or written together, multi-key
+      operations run as one batch)
     - Comprehensive error handling and logging
     - Performance metrics tracking
     """
@@ -53,6 +116,42 @@ class FileStorageClient:
         # Create base directory
         self.base_path.mkdir(parents=True, exist_ok=True)
         
+        # Blocking file work runs here instead of on the event loop
+        self._io = FileIOExecutor(
+            max_workers=getattr(self.settings.storage, 'io_threads', 8),
+            max_pending=getattr(self.settings.storage, 'io_queue_depth', 256)
+        )
+        # Shard directories known to exist, so writes skip the mkdir call
+        self._known_dirs: Set[Path] = set()
+        
+        # Serializer and compression for stored values (STORAGE_ENABLE_COMPRESSION)
+        self._codec = PayloadCodec(
+            serializer=getattr(self.settings.storage, 'serializer', 'auto'),
+            compression=getattr(self.settings.storage, 'enable_compression', True),
+            min_compress_bytes=getattr(self.settings.storage, 'compression_min_bytes', 512),
+            dictionary_dir=self.base_path / DICTIONARY_DIR
+        )
+        
+        # Key expiries by time bucket; loaded or rebuilt by the first cleanup run.
+        # One process per storage directory owns it, the others walk storage.
+        self._expiry_index = ExpiryIndex(
+            self.base_path / EXPIRY_INDEX_FILE,
+            bucket_seconds=getattr(self.settings.storage, 'expiry_bucket_seconds', 60),
+            exclusive=True
+        )
+        self._cleanup_batch_size = getattr(self.settings.storage, 'cleanup_batch_size', 500)
+        self._cleanup_lock = asyncio.Lock()  # One cleanup run (and index load) at a time
+        self._cleanup_progress: Dict[str, Any] = {
+            "running": False,
+            "started_at": None,
+            "finished_at": None,
+            "batches": 0,
+            "processed": 0,
+            "removed": 0,
+            "total_removed": 0,
+            "index_rebuilds": 0
+        }
+        
         # Storage state
         self._connected = True  # File storage is always "connected"
         self._last_cleanup = datetime.min
@@ -72,7 +171,8 @@ class FileStorageClient:
             extra={
                 "base_path": str(self.base_path),
                 "default_ttl_hours": self.default_ttl_hours,
-                "max_file_size_mb": self.max_file_size_mb
+                "max_file_size_mb": self.max_file_size_mb,
+                "io_threads": self._io.max_workers
             }
         )
     
@@ -82,9 +182,9 @@ class FileStorageClient:
         
         Args:
             key: Cache key
-            
+        
         Returns:
-            Path: File path for the key
+            Path: File path for the key (its directory may not exist yet)
         """
         # Hash key to create safe filename and avoid long paths
         key_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()
@@ -93,10 +193,7 @@ class FileStorageClient:
         subdir1 = key_hash[:2]
         subdir2 = key_hash[2:4]
         
-        file_dir = self.base_path / subdir1 / subdir2
-        file_dir.mkdir(parents=True, exist_ok=True)
-        
-        return file_dir / f"{key_hash}.json"
+        return self.base_path / subdir1 / subdir2 / f"{key_hash}.json"
     
     def _get_meta_path(self, key: str) -> Path:
         """
@@ -104,13 +201,19 @@ class FileStorageClient:
         
         Args:
             key: Cache key
-            
+        
         Returns:
             Path: Metadata file path for the key
         """
         data_path = self._get_file_path(key)
         return data_path.with_suffix('.meta')
     
+    def _ensure_dir(self, directory: Path) -> None:
+        """Create a shard directory once (I/O thread)."""
+        if directory not in self._known_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(directory)
+    
     async def connect(self) -> None:
         """
         Initialize file storage (no-op for file storage).
@@ -130,6 +233,17 @@ class FileStorageClient:
             except asyncio.CancelledError:
                 pass
         
+        # Persist the expiry index so the next start skips the rebuild walk
+        try:
+            await self._io.run(self._expiry_index.save)
+        except Exception as e:
+            self.logger.warning(
+                "Error saving expiry index",
+                extra={"error": str(e)}
+            )
+        self._expiry_index.close()
+        
+        self._io.shutdown()
         self.logger.info("File storage disconnected")
     
     async def health_check(self) -> bool:
@@ -147,7 +261,7 @@ class FileStorageClient:
             await self.delete(test_key)
             
             return result is not None and result.get("test") is True
-            
+        
         except Exception as e:
             self.logger.warning(
                 "File storage health check failed",
@@ -164,7 +278,7 @@ class FileStorageClient:
                 
                 # Wait for next cleanup
                 await asyncio.sleep(self._cleanup_interval)
-                
+            
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -175,57 +289,150 @@ class FileStorageClient:
                 await asyncio.sleep(60)  # Wait 1 minute on error
     
     async def _cleanup_expired_files(self) -> None:
-        """Remove expired files from storage."""
-        try:
-            current_time = datetime.utcnow()
-            expired_count = 0
+        """Remove expired entries in batches, consuming the expiry index."""
+        async with self._cleanup_lock:
+            progress = self._cleanup_progress
+            progress.update(
+                running=True, started_at=datetime.utcnow().isoformat(), finished_at=None,
+                batches=0, processed=0, removed=0
+            )
+            try:
+                if not self._expiry_index.owner:
+                    # Another process owns the expiry index
+                    removed = await self._io.run(self._cleanup_expired_walk_sync)
+                    progress.update(batches=1, processed=removed, removed=removed)
+                    progress["total_removed"] += removed
+                    return
+                
+                if not self._expiry_index.complete:
+                    await self._io.run(self._load_expiry_index_sync)
+                
+                # One batch per pool call, so other operations interleave with a large cleanup
+                while True:
+                    processed, removed = await self._io.run(
+                        self._cleanup_expired_batch_sync, self._cleanup_batch_size
+                    )
+                    progress["batches"] += 1
+                    progress["processed"] += processed
+                    progress["removed"] += removed
+                    progress["total_removed"] += removed
+                    if processed < self._cleanup_batch_size:
+                        break
+                
+                await self._io.run(self._expiry_index.save)
+                
+                if progress["removed"] > 0:
+                    self.logger.info(
+                        "Cleaned up expired files",
+                        extra={"expired_count": progress["removed"], "batches": progress["batches"]}
+                    )
             
-            # Walk through all storage directories
-            for root, dirs, files in os.walk(self.base_path):
-                for file in files:
-                    if file.endswith('.meta'):
-                        meta_path = Path(root) / file
-                        data_path = meta_path.with_suffix('.json')
-                        
-                        try:
-                            # Read metadata
-                            async with self._file_lock(meta_path):
-                                if meta_path.exists():
-                                    with open(meta_path, 'r') as f:
-                                        metadata = json.load(f)
-                                    
-                                    expires_at = metadata.get('expires_at')
-                                    if expires_at:
-                                        expiry_time = datetime.fromisoformat(expires_at)
-                                        if current_time > expiry_time:
-                                            # Remove expired files
-                                            if data_path.exists():
-                                                data_path.unlink()
-                                            meta_path.unlink()
-                                            expired_count += 1
-                        
-                        except Exception as e:
-                            self.logger.warning(
-                                "Error cleaning up expired file",
-                                extra={"file": str(meta_path), "error": str(e)}
-                            )
+            except Exception as e:
+                self.logger.error(
+                    "Error during cleanup",
+                    extra={"error": str(e)}
+                )
+            finally:
+                progress.update(running=False, finished_at=datetime.utcnow().isoformat())
+    
+    def _cleanup_expired_walk_sync(self) -> int:
+        """Walk storage and remove expired entries, without the expiry index (I/O thread)."""
+        expired_count = 0
+        
+        for root, dirs, files in os.walk(self.base_path):
+            for file in files:
+                if file.endswith('.meta'):
+                    meta_path = Path(root) / file
+                    data_path = meta_path.with_suffix('.json')
+                    try:
+                        with self._file_lock(data_path):
+                            with open(meta_path, 'r') as f:
+                                metadata = json.load(f)
+                            if metadata.get('expires_at') and self._metadata_expired(metadata):
+                                data_path.unlink(missing_ok=True)
+                                meta_path.unlink(missing_ok=True)
+                                expired_count += 1
+                    except FileNotFoundError:
+                        continue
+                    except Exception as e:
+                        self.logger.warning(
+                            "Error cleaning up expired file",
+                            extra={"file": str(meta_path), "error": str(e)}
+                        )
+        
+        return expired_count
+    
+    def _load_expiry_index_sync(self) -> None:
+        """Complete the expiry index from its snapshot, or by one storage walk (I/O thread)."""
+        entries = self._expiry_index.load_snapshot()
+        if entries is not None:
+            self._expiry_index.merge(entries, from_snapshot=True)
+            return
+        
+        entries = {}
+        for root, dirs, files in os.walk(self.base_path):
+            for file in files:
+                if file.endswith('.meta'):
+                    try:
+                        with open(Path(root) / file, 'r') as f:
+                            metadata = json.load(f)
+                        key = metadata.get('key')
+                        if key:
+                            entries[key] = iso_to_epoch(metadata.get('expires_at'))
+                    except Exception:
+                        continue
+        
+        self._expiry_index.merge(entries)
+        self._cleanup_progress["index_rebuilds"] += 1
+        self.logger.info(
+            "Rebuilt expiry index",
+            extra={"entry_count": len(entries)}
+        )
+    
+    def _cleanup_expired_batch_sync(self, limit: int) -> Tuple[int, int]:
+        """
+        Remove up to limit due entries (I/O thread).
+        
+        Returns:
+            Tuple[int, int]: (entries processed, entries removed)
+        """
+        due_keys = self._expiry_index.pop_due(time.time(), limit)
+        removed = 0
+        
+        for key in due_keys:
+            data_path = self._get_file_path(key)
+            meta_path = self._get_meta_path(key)
+            try:
+                with self._file_lock(data_path):
+                    # Metadata is authoritative: the key may have been rewritten or extended
+                    metadata = self._read_metadata(key)
+                    if metadata is None:
+                        continue
+                    
+                    try:
+                        expires_at = iso_to_epoch(metadata.get('expires_at'))
+                    except ValueError:
+                        expires_at = 0.0
+                    if expires_at is None or expires_at > time.time():
+                        self._expiry_index.set(key, expires_at)
+                        continue
+                    
+                    data_path.unlink(missing_ok=True)
+                    meta_path.unlink(missing_ok=True)
+                    removed += 1
             
-            if expired_count > 0:
-                self.logger.info(
-                    "Cleaned up expired files",
-                    extra={"expired_count": expired_count}
+            except Exception as e:
+                self.logger.warning(
+                    "Error cleaning up expired file",
+                    extra={"file": str(meta_path), "error": str(e)}
                 )
         
-        except Exception as e:
-            self.logger.error(
-                "Error during cleanup",
-                extra={"error": str(e)}
-            )
+        return len(due_keys), removed
     
-    @asynccontextmanager
-    async def _file_lock(self, file_path: Path) -> AsyncGenerator[None, None]:
+    @contextmanager
+    def _file_lock(self, file_path: Path) -> Iterator[None]:
         """
-        Context manager for file locking.
+        Context manager for file locking (I/O thread; the wait blocks only that thread).
         
         Args:
             file_path: Path to file to lock
@@ -233,6 +440,7 @@ class FileStorageClient:
         lock_file = None
         try:
             # Create lock file
+            self._ensure_dir(file_path.parent)
             lock_file = open(f"{file_path}.lock", 'w')
             fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
             yield
@@ -265,7 +473,7 @@ class FileStorageClient:
             self._operation_count += 1
             response_time = (datetime.utcnow() - start_time).total_seconds()
             self._total_response_time += response_time
-            
+        
         except OSError as e:
             self._error_count += 1
             self.logger.error(
@@ -273,7 +481,7 @@ class FileStorageClient:
                 extra={"error": str(e)}
             )
             raise CacheConnectionError(f"File system error during {operation_name}: {e}")
-            
+        
         except json.JSONDecodeError as e:
             self._error_count += 1
             self.logger.error(
@@ -281,7 +489,7 @@ class FileStorageClient:
                 extra={"error": str(e)}
             )
             raise CacheException(f"JSON decode error during {operation_name}: {e}")
-            
+        
         except Exception as e:
             self._error_count += 1
             self.logger.error(
@@ -290,54 +498,55 @@ class FileStorageClient:
             )
             raise CacheException(f"Unexpected error during {operation_name}: {e}")
     
-    def _serialize_value(self, value: Any) -> str:
+    def _serialize_value(self, value: Any) -> bytes:
         """
         Serialize a value for file storage.
         
         Args:
             value: Value to serialize
-            
+        
         Returns:
-            str: Serialized value
-        """
-        if isinstance(value, (str, int, float, bool)):
-            return json.dumps(value)
-        elif isinstance(value, (dict, list, tuple)):
-            return json.dumps(value)
-        elif isinstance(value, bytes):
-            # For binary data, encode as base64
-            import base64
-            return json.dumps({"__bytes__": base64.b64encode(value).decode('utf-8')})
-        else:
-            # For other types, try JSON serialization
-            try:
-                return json.dumps(value, default=str)
-            except (TypeError, ValueError):
-                return json.dumps(str(value))
+            bytes: Codec header and (possibly compressed) serialized value
+        """
+        return self._codec.encode(value)
     
-    def _deserialize_value(self, value: str) -> Any:
+    def _deserialize_value(self, value: Union[bytes, str]) -> Any:
         """
         Deserialize a value from file storage.
         
         Args:
-            value: Serialized value from file
-            
+            value: Stored payload (plain JSON text for entries written before the codec)
+        
         Returns:
             Any: Deserialized value
         """
+        return self._codec.decode(value)
+    
+    def _read_metadata(self, key: str) -> Optional[Dict[str, Any]]:
+        """Metadata for a key, or None if missing or unreadable (I/O thread)."""
         try:
-            data = json.loads(value)
-            
-            # Handle special case for binary data
-            if isinstance(data, dict) and "__bytes__" in data:
-                import base64
-                return base64.b64decode(data["__bytes__"])
-            
-            return data
-            
-        except (json.JSONDecodeError, ValueError):
-            # Return as string if not valid JSON
-            return value
+            with open(self._get_meta_path(key), 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _metadata_expired(metadata: Optional[Dict[str, Any]]) -> bool:
+        """Whether metadata marks its entry expired (missing metadata counts as expired)."""
+        if metadata is None:
+            return True
+        
+        expires_at = metadata.get('expires_at')
+        if not expires_at:
+            return False  # No expiration
+        
+        try:
+            return datetime.utcnow() > datetime.fromisoformat(expires_at)
+        except ValueError:
+            return True  # Treat as expired on error
+    
+    def _is_expired_sync(self, key: str) -> bool:
+        return self._metadata_expired(self._read_metadata(key))
     
     async def _is_expired(self, key: str) -> bool:
         """
@@ -345,28 +554,246 @@ class FileStorageClient:
         
         Args:
             key: Cache key
-            
+        
         Returns:
             bool: True if expired or doesn't exist
         """
+        return await self._io.run(self._is_expired_sync, key)
+    
+    # Blocking operation bodies, run on the I/O pool
+    
+    def _get_sync(self, key: str) -> Optional[Any]:
+        data_path = self._get_file_path(key)
+        
+        if not data_path.exists():
+            return None
+        
+        # Check expiration
+        if self._is_expired_sync(key):
+            # Clean up expired files
+            try:
+                data_path.unlink(missing_ok=True)
+                self._get_meta_path(key).unlink(missing_ok=True)
+                self._expiry_index.discard(key)
+            except:
+                pass
+            return None
+        
+        with self._file_lock(data_path):
+            try:
+                with open(data_path, 'rb') as f:
+                    value = f.read()
+                return self._deserialize_value(value)
+            except Exception:
+                return None
+    
+    def _set_sync(self, key: str, value: Any, ttl: Optional[int], nx: bool, xx: bool) -> bool:
+        data_path = self._get_file_path(key)
         meta_path = self._get_meta_path(key)
         
-        if not meta_path.exists():
-            return True
+        # Check nx/xx conditions
+        exists = data_path.exists() and not self._is_expired_sync(key)
         
-        try:
-            with open(meta_path, 'r') as f:
-                metadata = json.load(f)
+        if nx and exists:
+            return False
+        if xx and not exists:
+            return False
+        
+        # Calculate expiration
+        expires_at = None
+        if ttl is not None:
+            expires_at = (datetime.utcnow() + timedelta(seconds=ttl)).isoformat()
+        elif not exists:  # New key gets default TTL
+            expires_at = (datetime.utcnow() + timedelta(hours=self.default_ttl_hours)).isoformat()
+        
+        serialized_value = self._serialize_value(value)
+        
+        # Write data and metadata atomically
+        with self._file_lock(data_path):
+            tmp_data_path = tmp_meta_path = None
+            try:
+                # Write data to temporary file first
+                with tempfile.NamedTemporaryFile(mode='wb', delete=False,
+                                               dir=data_path.parent,
+                                               suffix='.tmp') as tmp_data:
+                    tmp_data.write(serialized_value)
+                    tmp_data_path = tmp_data.name
+                
+                # Write metadata to temporary file
+                metadata = {
+                    'created_at': datetime.utcnow().isoformat(),
+                    'expires_at': expires_at,
+                    'key': key
+                }
+                
+                with tempfile.NamedTemporaryFile(mode='w', delete=False,
+                                               dir=meta_path.parent,
+                                               suffix='.tmp') as tmp_meta:
+                    json.dump(metadata, tmp_meta)
+                    tmp_meta_path = tmp_meta.name
+                
+                # Atomic move
+                shutil.move(tmp_data_path, data_path)
+                shutil.move(tmp_meta_path, meta_path)
+                
+                self._expiry_index.set(key, iso_to_epoch(expires_at))
+                return True
             
-            expires_at = metadata.get('expires_at')
-            if not expires_at:
-                return False  # No expiration
+            except Exception:
+                # Cleanup temporary files on error
+                for tmp_path in (tmp_data_path, tmp_meta_path):
+                    if tmp_path:
+                        try:
+                            os.unlink(tmp_path)
+                        except OSError:
+                            pass
+                raise
+    
+    def _delete_sync(self, keys: Tuple[str, ...]) -> int:
+        deleted_count = 0
+        
+        for key in keys:
+            data_path = self._get_file_path(key)
+            meta_path = self._get_meta_path(key)
+            if not data_path.exists() and not meta_path.exists():
+                continue
             
+            with self._file_lock(data_path):
+                try:
+                    data_deleted = False
+                    meta_deleted = False
+                    
+                    if data_path.exists():
+                        data_path.unlink()
+                        data_deleted = True
+                    
+                    if meta_path.exists():
+                        meta_path.unlink()
+                        meta_deleted = True
+                    
+                    self._expiry_index.discard(key)
+                    if data_deleted or meta_deleted:
+                        deleted_count += 1
+                
+                except Exception as e:
+                    self.logger.warning(
+                        f"Error deleting key {key}",
+                        extra={"error": str(e)}
+                    )
+        
+        return deleted_count
+    
+    def _exists_sync(self, keys: Tuple[str, ...]) -> int:
+        return sum(
+            1 for key in keys
+            if self._get_file_path(key).exists() and not self._is_expired_sync(key)
+        )
+    
+    def _expire_sync(self, key: str, seconds: int) -> bool:
+        data_path = self._get_file_path(key)
+        meta_path = self._get_meta_path(key)
+        
+        if not data_path.exists() or self._is_expired_sync(key):
+            return False
+        
+        with self._file_lock(data_path):
+            try:
+                # Read existing metadata
+                metadata = self._read_metadata(key) or {}
+                
+                # Update expiration
+                metadata['expires_at'] = (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
+                
+                # Write updated metadata
+                with open(meta_path, 'w') as f:
+                    json.dump(metadata, f)
+                
+                self._expiry_index.set(key, iso_to_epoch(metadata['expires_at']))
+                return True
+            
+            except Exception:
+                return False
+    
+    def _ttl_sync(self, key: str) -> int:
+        data_path = self._get_file_path(key)
+        meta_path = self._get_meta_path(key)
+        
+        if not data_path.exists():
+            return -2
+        
+        if not meta_path.exists():
+            return -1  # No expiration set
+        
+        metadata = self._read_metadata(key)
+        if metadata is None:
+            return -2
+        
+        expires_at = metadata.get('expires_at')
+        if not expires_at:
+            return -1  # No expiration
+        
+        try:
             expiry_time = datetime.fromisoformat(expires_at)
-            return datetime.utcnow() > expiry_time
+        except ValueError:
+            return -2
+        current_time = datetime.utcnow()
+        
+        if current_time > expiry_time:
+            return -2  # Already expired
+        
+        return int((expiry_time - current_time).total_seconds())
+    
+    def _keys_sync(self, pattern: str) -> List[str]:
+        # Walks storage rather than reading the expiry index, which misses keys
+        # written by other processes
+        matching_keys = []
+        
+        try:
+            # Walk through all storage directories
+            for root, dirs, files in os.walk(self.base_path):
+                for file in files:
+                    if file.endswith('.meta'):
+                        meta_path = Path(root) / file
+                        
+                        try:
+                            with open(meta_path, 'r') as f:
+                                metadata = json.load(f)
+                            
+                            key = metadata.get('key')
+                            if key and not self._metadata_expired(metadata):
+                                # Simple pattern matching (only * wildcard)
+                                if pattern == "*" or pattern in key:
+                                    matching_keys.append(key)
+                        
+                        except Exception:
+                            continue
+        
+        except Exception as e:
+            self.logger.error(
+                "Error listing keys",
+                extra={"error": str(e)}
+            )
+        
+        return matching_keys
+    
+    def _flushdb_sync(self) -> bool:
+        try:
+            # Remove all files in storage directory
+            if self.base_path.exists():
+                shutil.rmtree(self.base_path)
+                self.base_path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.clear()
+            self._expiry_index.clear()
+            self._codec.save_dictionaries()  # Entries written from now on may reference them
             
-        except Exception:
-            return True  # Treat as expired on error
+            return True
+        
+        except Exception as e:
+            self.logger.error(
+                "Error flushing storage",
+                extra={"error": str(e)}
+            )
+            return False
     
     # Basic cache operations
     
@@ -376,38 +803,17 @@ class FileStorageClient:
         
         Args:
             key: Cache key
-            
+        
         Returns:
             Any: Cached value or None if not found/expired
         """
         async with self._operation_context("get"):
-            data_path = self._get_file_path(key)
-            
-            if not data_path.exists():
-                return None
-            
-            # Check expiration
-            if await self._is_expired(key):
-                # Clean up expired files
-                try:
-                    data_path.unlink(missing_ok=True)
-                    self._get_meta_path(key).unlink(missing_ok=True)
-                except:
-                    pass
-                return None
-            
-            async with self._file_lock(data_path):
-                try:
-                    with open(data_path, 'r') as f:
-                        value = f.read()
-                    return self._deserialize_value(value)
-                except Exception:
-                    return None
+            return await self._io.run(self._get_sync, key)
     
     async def set(
-        self, 
-        key: str, 
-        value: Any, 
+        self,
+        key: str,
+        value: Any,
         ttl: Optional[int] = None,
         nx: bool = False,
         xx: bool = False
@@ -421,71 +827,12 @@ class FileStorageClient:
             ttl: Time to live in seconds
             nx: Only set if key doesn't exist
             xx: Only set if key exists
-            
+        
         Returns:
             bool: True if value was set
         """
         async with self._operation_context("set"):
-            data_path = self._get_file_path(key)
-            meta_path = self._get_meta_path(key)
-            
-            # Check nx/xx conditions
-            exists = data_path.exists() and not await self._is_expired(key)
-            
-            if nx and exists:
-                return False
-            if xx and not exists:
-                return False
-            
-            # Calculate expiration
-            expires_at = None
-            if ttl is not None:
-                expires_at = (datetime.utcnow() + timedelta(seconds=ttl)).isoformat()
-            elif not exists:  # New key gets default TTL
-                expires_at = (datetime.utcnow() + timedelta(hours=self.default_ttl_hours)).isoformat()
-            
-            serialized_value = self._serialize_value(value)
-            
-            # Write data and metadata atomically
-            async with self._file_lock(data_path):
-                try:
-                    # Write data to temporary file first
-                    with tempfile.NamedTemporaryFile(mode='w', delete=False, 
-                                                   dir=data_path.parent, 
-                                                   suffix='.tmp') as tmp_data:
-                        tmp_data.write(serialized_value)
-                        tmp_data_path = tmp_data.name
-                    
-                    # Write metadata to temporary file
-                    metadata = {
-                        'created_at': datetime.utcnow().isoformat(),
-                        'expires_at': expires_at,
-                        'key': key
-                    }
-                    
-                    with tempfile.NamedTemporaryFile(mode='w', delete=False,
-                                                   dir=meta_path.parent,
-                                                   suffix='.tmp') as tmp_meta:
-                        json.dump(metadata, tmp_meta)
-                        tmp_meta_path = tmp_meta.name
-                    
-                    # Atomic move
-                    shutil.move(tmp_data_path, data_path)
-                    shutil.move(tmp_meta_path, meta_path)
-                    
-                    return True
-                
-                except Exception as e:
-                    # Cleanup temporary files on error
-                    try:
-                        os.unlink(tmp_data_path)
-                    except:
-                        pass
-                    try:
-                        os.unlink(tmp_meta_path)
-                    except:
-                        pass
-                    raise
+            return await self._io.run(self._set_sync, key, value, ttl, nx, xx)
     
     async def delete(self, *keys: str) -> int:
         """
@@ -493,7 +840,7 @@ class FileStorageClient:
         
         Args:
             *keys: Keys to delete
-            
+        
         Returns:
             int: Number of keys deleted
         """
@@ -501,35 +848,7 @@ class FileStorageClient:
             return 0
         
         async with self._operation_context("delete"):
-            deleted_count = 0
-            
-            for key in keys:
-                data_path = self._get_file_path(key)
-                meta_path = self._get_meta_path(key)
-                
-                async with self._file_lock(data_path):
-                    try:
-                        data_deleted = False
-                        meta_deleted = False
-                        
-                        if data_path.exists():
-                            data_path.unlink()
-                            data_deleted = True
-                        
-                        if meta_path.exists():
-                            meta_path.unlink()
-                            meta_deleted = True
-                        
-                        if data_deleted or meta_deleted:
-                            deleted_count += 1
-                    
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Error deleting key {key}",
-                            extra={"error": str(e)}
-                        )
-            
-            return deleted_count
+            return await self._io.run(self._delete_sync, keys)
     
     async def exists(self, *keys: str) -> int:
         """
@@ -537,7 +856,7 @@ class FileStorageClient:
         
         Args:
             *keys: Keys to check
-            
+        
         Returns:
             int: Number of keys that exist and are not expired
         """
@@ -545,15 +864,7 @@ class FileStorageClient:
             return 0
         
         async with self._operation_context("exists"):
-            exists_count = 0
-            
-            for key in keys:
-                data_path = self._get_file_path(key)
-                
-                if data_path.exists() and not await self._is_expired(key):
-                    exists_count += 1
-            
-            return exists_count
+            return await self._io.run(self._exists_sync, keys)
     
     async def expire(self, key: str, seconds: int) -> bool:
         """
@@ -562,36 +873,12 @@ class FileStorageClient:
         Args:
             key: Cache key
             seconds: Expiration time in seconds
-            
+        
         Returns:
             bool: True if expiration was set
         """
         async with self._operation_context("expire"):
-            data_path = self._get_file_path(key)
-            meta_path = self._get_meta_path(key)
-            
-            if not data_path.exists() or await self._is_expired(key):
-                return False
-            
-            async with self._file_lock(data_path):
-                try:
-                    # Read existing metadata
-                    metadata = {}
-                    if meta_path.exists():
-                        with open(meta_path, 'r') as f:
-                            metadata = json.load(f)
-                    
-                    # Update expiration
-                    metadata['expires_at'] = (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
-                    
-                    # Write updated metadata
-                    with open(meta_path, 'w') as f:
-                        json.dump(metadata, f)
-                    
-                    return True
-                
-                except Exception:
-                    return False
+            return await self._io.run(self._expire_sync, key, seconds)
     
     async def ttl(self, key: str) -> int:
         """
@@ -599,38 +886,12 @@ class FileStorageClient:
         
         Args:
             key: Cache key
-            
+        
         Returns:
             int: TTL in seconds (-1 if no expiry, -2 if key doesn't exist)
         """
         async with self._operation_context("ttl"):
-            data_path = self._get_file_path(key)
-            meta_path = self._get_meta_path(key)
-            
-            if not data_path.exists():
-                return -2
-            
-            if not meta_path.exists():
-                return -1  # No expiration set
-            
-            try:
-                with open(meta_path, 'r') as f:
-                    metadata = json.load(f)
-                
-                expires_at = metadata.get('expires_at')
-                if not expires_at:
-                    return -1  # No expiration
-                
-                expiry_time = datetime.fromisoformat(expires_at)
-                current_time = datetime.utcnow()
-                
-                if current_time > expiry_time:
-                    return -2  # Already expired
-                
-                return int((expiry_time - current_time).total_seconds())
-            
-            except Exception:
-                return -2
+            return await self._io.run(self._ttl_sync, key)
     
     async def keys(self, pattern: str = "*") -> List[str]:
         """
@@ -638,40 +899,12 @@ class FileStorageClient:
         
         Args:
             pattern: Key pattern (simplified - only * wildcard supported)
-            
+        
         Returns:
             List[str]: Matching keys
         """
         async with self._operation_context("keys"):
-            matching_keys = []
-            
-            try:
-                # Walk through all storage directories
-                for root, dirs, files in os.walk(self.base_path):
-                    for file in files:
-                        if file.endswith('.meta'):
-                            meta_path = Path(root) / file
-                            
-                            try:
-                                with open(meta_path, 'r') as f:
-                                    metadata = json.load(f)
-                                
-                                key = metadata.get('key')
-                                if key and not await self._is_expired(key):
-                                    # Simple pattern matching (only * wildcard)
-                                    if pattern == "*" or pattern in key:
-                                        matching_keys.append(key)
-                            
-                            except Exception:
-                                continue
-            
-            except Exception as e:
-                self.logger.error(
-                    "Error listing keys",
-                    extra={"error": str(e)}
-                )
-            
-            return matching_keys
+            return await self._io.run(self._keys_sync, pattern)
     
     async def flushdb(self) -> bool:
         """
@@ -681,21 +914,8 @@ class FileStorageClient:
             bool: True if successful
         """
         async with self._operation_context("flushdb"):
-            try:
-                # Remove all files in storage directory
-                if self.base_path.exists():
-                    shutil.rmtree(self.base_path)
-                    self.base_path.mkdir(parents=True, exist_ok=True)
-                
-                return True
-            
-            except Exception as e:
-                self.logger.error(
-                    "Error flushing storage",
-                    extra={"error": str(e)}
-                )
-                return False
-    
+            return await self._io.run(self._flushdb_sync)
+
     # Metrics and status
     
     def get_stats(self) -> Dict[str, Any]:
@@ -728,6 +948,13 @@ class FileStorageClient:
             "error_count": self._error_count,
             "average_response_time_seconds": avg_response_time,
             "last_cleanup": self._last_cleanup.isoformat(),
+            "io": self._io.get_stats(),
+            "codec": self._codec.get_stats(),
+            "expiry_index": {
+                **self._expiry_index.get_stats(),
+                "due_count": self._expiry_index.due_count(time.time()),
+                "cleanup": dict(self._cleanup_progress)
+            },
             "storage_stats": {
                 "base_path": str(self.base_path),
                 "total_size_bytes": total_size,
@@ -747,6 +974,23 @@ class FileStorageClient:
 _file_storage_client: Optional[FileStorageClient] = None
 
 
+def create_storage_client(settings: Optional[Settings] = None) -> FileStorageClient:
+    """
+    Create a storage client for the configured backend (STORAGE_BACKEND).
+    
+    Args:
+        settings: Application settings
+        
+    Returns:
+        FileStorageClient: File-per-key client, or the SQLite single-file client
+    """
+    settings = settings or get_settings()
+    if getattr(settings.storage, 'backend', 'files') == 'sqlite':
+        from .sqlite_storage import SQLiteStorageClient
+        return SQLiteStorageClient(settings)
+    return FileStorageClient(settings)
+
+
 async def get_file_storage_client() -> FileStorageClient:
     """
     Get the global file storage client instance.
@@ -757,7 +1001,7 @@ async def get_file_storage_client() -> FileStorageClient:
     global _file_storage_client
     
     if _file_storage_client is None:
-        _file_storage_client = FileStorageClient()
+        _file_storage_client = create_storage_client()
         await _file_storage_client.connect()
     
     return _file_storage_client
@@ -787,7 +1031,7 @@ async def init_file_storage_client(settings: Optional[Settings] = None) -> FileS
     if _file_storage_client:
         await _file_storage_client.disconnect()
     
-    _file_storage_client = FileStorageClient(settings)
+    _file_storage_client = create_storage_client(settings)
     await _file_storage_client.connect()
     
     return _file_storage_client
@@ -0,0 +1,460 @@
+"""
+Payload codec for stored cache and result values.
+
+Encodes values as a small self-describing header followed by the serialized,
+optionally compressed body. The header names the serializer (json, orjson,
+msgpack), the compressor (zlib, zstd, lz4) and the zstd dictionary used, so
+any entry decodes regardless of current settings; entries without the header
+are the original JSON text and still decode. Optional libraries are used when
+installed, with stdlib json and zlib as the fallback.
+"""
+
+import base64
+import fcntl
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..core.logging import get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional at runtime
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional at runtime
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - lz4 is optional at runtime
+    lz4_frame = None
+
+
+logger = get_logger(__name__)
+
+# Header: magic, format version, serializer id, compressor id, zstd dictionary id.
+# JSON text never starts with NUL, so headerless entries are unambiguous.
+MAGIC = b"\x00B2N"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("!4sBBBI")
+
+SERIALIZER_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSOR_IDS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+# Bodies below this size are written with lz4 (when installed) for cheap reads of hot values
+SMALL_VALUE_BYTES = 16 * 1024
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Dictionary training: samples are large bodies (assembly-heavy results)
+DICTIONARY_SIZE = 112 * 1024
+DICTIONARY_SAMPLES = 256
+DICTIONARY_SAMPLE_BYTES = 128 * 1024
+DICTIONARY_SUFFIX = ".zdict"
+DICTIONARY_LOCK_FILE = "train.lock"
+
+
+class CodecError(ValueError):
+    """A stored payload that cannot be decoded here."""
+
+
+def available_serializers() -> List[str]:
+    """Serializers usable in this environment, preferred first."""
+    names = []
+    if msgpack is not None:
+        names.append("msgpack")
+    if orjson is not None:
+        names.append("orjson")
+    names.append("json")
+    return names
+
+
+class PayloadCodec:
+    """
+    Serializer and compressor selection for stored values.
+    
+    Small bodies are stored uncompressed, hot-sized bodies with lz4 and large
+    ones with zstd (using a dictionary trained from earlier large bodies when
+    a dictionary directory is configured), falling back to zlib. Compression
+    is kept only when it shrinks the body. Safe to use from I/O threads.
+    
+    Processes sharing a dictionary directory train the first dictionary once
+    between them, and load dictionaries saved by others when a payload needs
+    one.
+    """
+    
+    def __init__(
+        self,
+        serializer: str = "auto",
+        compression: bool = True,
+        min_compress_bytes: int = 512,
+        dictionary_dir: Optional[Path] = None
+    ):
+        """
+        Initialize the codec.
+        
+        Args:
+            serializer: "auto" (best available), "json", "orjson" or "msgpack"
+            compression: Compress bodies of at least min_compress_bytes
+            min_compress_bytes: Smallest body worth compressing
+            dictionary_dir: Where zstd dictionaries are kept (None disables training)
+        """
+        if serializer == "auto":
+            serializer = available_serializers()[0]
+        elif serializer not in available_serializers():
+            logger.warning(
+                "Serializer not installed, using json",
+                extra={"serializer": serializer}
+            )
+            serializer = "json"
+        
+        self.serializer = serializer
+        self.compression = compression
+        self.min_compress_bytes = min_compress_bytes
+        self.dictionary_dir = Path(dictionary_dir) if dictionary_dir is not None else None
+        
+        self._lock = threading.Lock()
+        self._local = threading.local()  # zstd (de)compressors are not thread-safe
+        self._dictionaries: Dict[int, Any] = {}
+        self._active_dictionary_id = 0
+        self._samples: List[bytes] = []
+        self._stats: Dict[str, int] = {
+            "encoded": 0,
+            "decoded": 0,
+            "legacy_decoded": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0
+        }
+        self._compressor_counts: Dict[str, int] = {name: 0 for name in COMPRESSOR_IDS}
+        
+        if self.dictionary_dir is not None and zstandard is not None:
+            self._load_dictionaries()
+    
+    # Encoding
+    
+    def encode(self, value: Any) -> bytes:
+        """
+        Encode a value with a self-describing header.
+        
+        Args:
+            value: Value to store
+        
+        Returns:
+            bytes: Header and body
+        """
+        serializer, body = self._serialize(value)
+        compressor, dictionary_id, stored = self._compress(body)
+        
+        with self._lock:
+            self._stats["encoded"] += 1
+            self._stats["raw_bytes"] += len(body)
+            self._stats["stored_bytes"] += len(stored)
+            self._compressor_counts[compressor] += 1
+        
+        return HEADER.pack(
+            MAGIC, FORMAT_VERSION, SERIALIZER_IDS[serializer], COMPRESSOR_IDS[compressor], dictionary_id
+        ) + stored
+    
+    def _serialize(self, value: Any) -> Tuple[str, bytes]:
+        # Same value mapping as the original JSON text: top-level bytes are wrapped,
+        # anything else unsupported becomes its str()
+        if isinstance(value, bytes) and self.serializer != "msgpack":
+            value = {"__bytes__": base64.b64encode(value).decode('utf-8')}
+        
+        if self.serializer == "msgpack":
+            try:
+                return "msgpack", msgpack.packb(value, use_bin_type=True, default=str)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        elif self.serializer == "orjson":
+            try:
+                return "orjson", orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+            except (TypeError, orjson.JSONEncodeError):
+                pass
+        
+        try:
+            return "json", json.dumps(value, default=str).encode('utf-8')
+        except (TypeError, ValueError):
+            return "json", json.dumps(str(value)).encode('utf-8')
+    
+    def _compress(self, body: bytes) -> Tuple[str, int, bytes]:
+        if not self.compression or len(body) < self.min_compress_bytes:
+            return "none", 0, body
+        
+        if len(body) < SMALL_VALUE_BYTES and lz4_frame is not None:
+            compressor, dictionary_id, compressed = "lz4", 0, lz4_frame.compress(body)
+        elif zstandard is not None:
+            self._maybe_add_sample(body)
+            dictionary_id = self._active_dictionary_id
+            compressed = self._zstd_compressor(dictionary_id).compress(body)
+            compressor = "zstd"
+        else:
+            compressor, dictionary_id, compressed = "zlib", 0, zlib.compress(body, ZLIB_LEVEL)
+        
+        if len(compressed) >= len(body):
+            return "none", 0, body
+        return compressor, dictionary_id, compressed
+    
+    # Decoding
+    
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a stored payload, with or without a header.
+        
+        Args:
+            data: Stored bytes (or text from a headerless entry)
+        
+        Returns:
+            Any: The stored value
+        
+        Raises:
+            CodecError: If the payload needs a library that is not installed
+        """
+        if isinstance(data, bytes) and data[:len(MAGIC)] == MAGIC:
+            magic, version, serializer_id, compressor_id, dictionary_id = HEADER.unpack_from(data)
+            if version != FORMAT_VERSION:
+                raise CodecError(f"Unsupported payload format version {version}")
+            body = self._decompress(compressor_id, dictionary_id, data[HEADER.size:])
+            value = self._deserialize(serializer_id, body)
+            with self._lock:
+                self._stats["decoded"] += 1
+        else:
+            value = self._decode_legacy(data)
+            with self._lock:
+                self._stats["legacy_decoded"] += 1
+        
+        # Handle special case for binary data
+        if isinstance(value, dict) and "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return value
+    
+    @staticmethod
+    def _decode_legacy(data: Union[bytes, str]) -> Any:
+        text = data.decode('utf-8', errors='replace') if isinstance(data, bytes) else data
+        try:
+            return json.loads(text)
+        except (json.JSONDecodeError, ValueError):
+            # Return as string if not valid JSON
+            return text
+    
+    def _decompress(self, compressor_id: int, dictionary_id: int, body: bytes) -> bytes:
+        if compressor_id == COMPRESSOR_IDS["none"]:
+            return body
+        if compressor_id == COMPRESSOR_IDS["zlib"]:
+            return zlib.decompress(body)
+        if compressor_id == COMPRESSOR_IDS["zstd"]:
+            if zstandard is None:
+                raise CodecError("Payload is zstd-compressed but zstandard is not installed")
+            if dictionary_id and dictionary_id not in self._dictionaries and not self._load_dictionary(dictionary_id):
+                raise CodecError(f"zstd dictionary {dictionary_id} is not available")
+            return self._zstd_decompressor(dictionary_id).decompress(body)
+        if compressor_id == COMPRESSOR_IDS["lz4"]:
+            if lz4_frame is None:
+                raise CodecError("Payload is lz4-compressed but lz4 is not installed")
+            return lz4_frame.decompress(body)
+        raise CodecError(f"Unknown compressor id {compressor_id}")
+    
+    @staticmethod
+    def _deserialize(serializer_id: int, body: bytes) -> Any:
+        if serializer_id == SERIALIZER_IDS["msgpack"]:
+            if msgpack is None:
+                raise CodecError("Payload is msgpack-encoded but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        if serializer_id in (SERIALIZER_IDS["orjson"], SERIALIZER_IDS["json"]):
+            # Both write JSON; stdlib json also accepts the NaN/Infinity it may have written
+            if orjson is not None:
+                try:
+                    return orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    pass
+            return json.loads(body)
+        raise CodecError(f"Unknown serializer id {serializer_id}")
+    
+    # zstd dictionaries
+    
+    def _zstd_compressor(self, dictionary_id: int) -> Any:
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        if dictionary_id not in compressors:
+            dictionary = self._dictionaries.get(dictionary_id)
+            compressors[dictionary_id] = (
+                zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary)
+                if dictionary is not None else zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            )
+        return compressors[dictionary_id]
+    
+    def _zstd_decompressor(self, dictionary_id: int) -> Any:
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        if dictionary_id not in decompressors:
+            dictionary = self._dictionaries.get(dictionary_id)
+            decompressors[dictionary_id] = (
+                zstandard.ZstdDecompressor(dict_data=dictionary)
+                if dictionary is not None else zstandard.ZstdDecompressor()
+            )
+        return decompressors[dictionary_id]
+    
+    def _load_dictionaries(self) -> None:
+        """Load saved dictionaries; the newest one compresses new payloads."""
+        if not self.dictionary_dir.is_dir():
+            return
+        for path in sorted(self.dictionary_dir.glob(f"*{DICTIONARY_SUFFIX}"), key=lambda p: p.stat().st_mtime):
+            dictionary = self._read_dictionary(path)
+            if dictionary is not None:
+                with self._lock:
+                    self._dictionaries[dictionary.dict_id()] = dictionary
+                    self._active_dictionary_id = dictionary.dict_id()
+    
+    def _load_dictionary(self, dictionary_id: int) -> bool:
+        """
+        Load one dictionary by id, e.g. trained by another process after this one started.
+        
+        Returns:
+            bool: True if the dictionary is now available
+        """
+        if self.dictionary_dir is None:
+            return False
+        dictionary = self._read_dictionary(self.dictionary_dir / f"{dictionary_id}{DICTIONARY_SUFFIX}")
+        if dictionary is None or dictionary.dict_id() != dictionary_id:
+            return False
+        with self._lock:
+            self._dictionaries[dictionary_id] = dictionary
+            if not self._active_dictionary_id:
+                self._active_dictionary_id = dictionary_id  # No need to train one here
+        return True
+    
+    @staticmethod
+    def _read_dictionary(path: Path) -> Optional[Any]:
+        try:
+            return zstandard.ZstdCompressionDict(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                "Skipping unreadable zstd dictionary",
+                extra={"path": str(path), "error": str(e)}
+            )
+            return None
+    
+    def _maybe_add_sample(self, body: bytes) -> None:
+        """Collect large bodies until there are enough to train the first dictionary."""
+        if self.dictionary_dir is None or self._active_dictionary_id:
+            return
+        with self._lock:
+            if len(self._samples) >= DICTIONARY_SAMPLES:
+                return
+            self._samples.append(body[:DICTIONARY_SAMPLE_BYTES])
+            if len(self._samples) < DICTIONARY_SAMPLES:
+                return
+            samples, self._samples = self._samples, []
+        self._train_shared_dictionary(samples)
+    
+    def _train_shared_dictionary(self, samples: List[bytes]) -> None:
+        """
+        Train the first dictionary once across processes sharing the directory.
+        
+        Training runs under an exclusive lock file; a process that finds a
+        dictionary already saved (by another process) adopts it instead.
+        """
+        if zstandard is None:
+            return
+        try:
+            self.dictionary_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.dictionary_dir / DICTIONARY_LOCK_FILE, 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                self._load_dictionaries()
+                if not self._active_dictionary_id:
+                    self.train_dictionary(samples)
+        except OSError as e:
+            logger.warning(
+                "zstd dictionary training lock failed",
+                extra={"error": str(e)}
+            )
+    
+    def train_dictionary(self, samples: List[bytes]) -> Optional[int]:
+        """
+        Train and save a zstd dictionary; new payloads compress with it.
+        
+        Args:
+            samples: Representative serialized bodies
+        
+        Returns:
+            The dictionary id, or None if zstd is unavailable or training failed
+        """
+        if zstandard is None or self.dictionary_dir is None:
+            return None
+        try:
+            dictionary = zstandard.train_dictionary(DICTIONARY_SIZE, samples)
+            dictionary_id = dictionary.dict_id()
+            self._write_dictionary(dictionary)
+        except Exception as e:
+            logger.warning(
+                "zstd dictionary training failed",
+                extra={"samples": len(samples), "error": str(e)}
+            )
+            return None
+        
+        with self._lock:
+            self._dictionaries[dictionary_id] = dictionary
+            self._active_dictionary_id = dictionary_id
+        logger.info(
+            "Trained zstd dictionary",
+            extra={"dictionary_id": dictionary_id, "samples": len(samples)}
+        )
+        return dictionary_id
+    
+    def _write_dictionary(self, dictionary: Any) -> None:
+        # Written whole and renamed, so readers in other processes never see a partial file
+        self.dictionary_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.dictionary_dir, suffix='.tmp', delete=False) as tmp:
+            tmp.write(dictionary.as_bytes())
+        try:
+            os.replace(tmp.name, self.dictionary_dir / f"{dictionary.dict_id()}{DICTIONARY_SUFFIX}")
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+    
+    def save_dictionaries(self) -> None:
+        """Write every loaded dictionary back to the dictionary directory (after a flush removed it)."""
+        if self.dictionary_dir is None:
+            return
+        with self._lock:
+            dictionaries = list(self._dictionaries.values())
+        for dictionary in dictionaries:
+            self._write_dictionary(dictionary)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get codec statistics.
+        
+        Returns:
+            Dict[str, Any]: Codec selection, payload counts and compression ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            compressors = dict(self._compressor_counts)
+        return {
+            "serializer": self.serializer,
+            "compression": self.compression,
+            "compressors": compressors,
+            "active_dictionary_id": self._active_dictionary_id or None,
+            "compression_ratio": (
+                stats["raw_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 1.0
+            ),
+            **stats
+        }
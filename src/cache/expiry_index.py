@@ -0,0 +1,337 @@
+"""
+Time-bucketed expiry index for file storage.
+
+Tracks every stored key with its expiry time, grouped into fixed-width time
+buckets, so expiry cleanup pops only the buckets that are due instead of
+walking the storage tree and parsing every metadata file. The index is
+persisted as a snapshot; the snapshot is removed on the first change after
+it is written, so a snapshot on disk is always current and a missing one
+(first start, crash) means the index is rebuilt from storage.
+
+The index is private to one process. With several processes on the same
+storage (e.g. uvicorn workers), an exclusive index is owned by whichever
+process takes its lock file first; the others do not track keys and fall
+back to walking storage. Their writes leave a stale marker next to the
+snapshot, so the owner neither trusts nor writes a snapshot that could miss
+keys it never saw.
+"""
+
+import fcntl
+import heapq
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+
+SNAPSHOT_VERSION = 1
+
+
+def iso_to_epoch(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a stored expires_at (naive UTC ISO string) to epoch seconds.
+    
+    Raises:
+        ValueError: If the value is not an ISO timestamp
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class ExpiryIndex:
+    """
+    Key -> expiry map with expiring keys bucketed by time.
+    
+    Thread-safe; storage operations update it from I/O threads. Until the
+    index is complete (snapshot loaded or storage walked) it records changes
+    and merges them over the loaded entries, so writes made during a rebuild
+    are not overwritten by what the rebuild read earlier.
+    """
+    
+    def __init__(self, snapshot_path: Optional[Path] = None, bucket_seconds: int = 60, exclusive: bool = False):
+        """
+        Initialize an empty, incomplete index.
+        
+        Args:
+            snapshot_path: Where the index is persisted (None keeps it in memory only)
+            bucket_seconds: Width of an expiry bucket
+            exclusive: Take the snapshot's lock file; if another process holds
+                it, this index stays inactive (owner is False)
+        """
+        self.snapshot_path = snapshot_path
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.complete = False
+        
+        self._exclusive = exclusive and snapshot_path is not None
+        self._owner_pid: Optional[int] = os.getpid()
+        self._lock_file = None
+        self._stale_marker: Optional[Path] = None
+        if self._exclusive:
+            self._stale_marker = snapshot_path.with_name(snapshot_path.name + ".stale")
+            if not self._acquire_lock_file(snapshot_path.with_name(snapshot_path.name + ".lock")):
+                self._owner_pid = None
+        
+        self._lock = threading.Lock()
+        self._expiry: Dict[str, Optional[float]] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+        self._bucket_heap: List[int] = []  # Bucket ids present in _buckets
+        self._removed_while_building: Set[str] = set()
+        # True while the snapshot file may match memory; the first change removes it
+        self._snapshot_current = snapshot_path is not None
+    
+    def __len__(self) -> int:
+        return len(self._expiry)
+    
+    @property
+    def owner(self) -> bool:
+        """Whether this process maintains the index (False: walk storage instead)."""
+        if self._owner_pid is None:
+            return False
+        # A forked child does not inherit the lock file's ownership
+        return not self._exclusive or self._owner_pid == os.getpid()
+    
+    def _acquire_lock_file(self, lock_path: Path) -> bool:
+        try:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(lock_path, 'a')
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+            return False
+    
+    def close(self) -> None:
+        """Give up ownership so another process (or a new instance) can take the index."""
+        if self._lock_file is not None:
+            self._lock_file.close()  # Releases the flock
+            self._lock_file = None
+        self._owner_pid = None
+    
+    def _mark_stale(self) -> None:
+        """Record a write the owner's index did not see (non-owner processes)."""
+        if self._stale_marker is None:
+            return
+        try:
+            if not self._stale_marker.exists():
+                self._stale_marker.touch()
+        except OSError:
+            pass
+    
+    # Changes
+    
+    def set(self, key: str, expires_at: Optional[float]) -> None:
+        """Record a key's expiry (None: never expires)."""
+        if not self.owner:
+            self._mark_stale()
+            return
+        with self._lock:
+            self._unlink_snapshot()
+            self._removed_while_building.discard(key)
+            self._remove(key)
+            self._add(key, expires_at)
+    
+    def discard(self, key: str) -> None:
+        """Forget a deleted key."""
+        if not self.owner:
+            self._mark_stale()
+            return
+        with self._lock:
+            self._unlink_snapshot()
+            if not self.complete:
+                self._removed_while_building.add(key)
+            self._remove(key)
+    
+    def clear(self) -> None:
+        """Forget all keys (storage was flushed); the empty index is complete."""
+        if not self.owner:
+            self._mark_stale()
+            return
+        with self._lock:
+            self._unlink_snapshot()
+            self._expiry.clear()
+            self._buckets.clear()
+            self._bucket_heap.clear()
+            self._removed_while_building.clear()
+            self.complete = True
+    
+    def _add(self, key: str, expires_at: Optional[float]) -> None:
+        self._expiry[key] = expires_at
+        if expires_at is None:
+            return
+        bucket = int(expires_at // self.bucket_seconds)
+        members = self._buckets.get(bucket)
+        if members is None:
+            members = self._buckets[bucket] = set()
+            heapq.heappush(self._bucket_heap, bucket)
+        members.add(key)
+    
+    def _remove(self, key: str) -> None:
+        # Emptied buckets stay until pop_due reaches them
+        expires_at = self._expiry.pop(key, None)
+        if expires_at is not None:
+            members = self._buckets.get(int(expires_at // self.bucket_seconds))
+            if members is not None:
+                members.discard(key)
+    
+    # Queries
+    
+    def pop_due(self, now: float, limit: int) -> List[str]:
+        """
+        Remove and return up to limit keys whose expiry is at or before now.
+        
+        Only buckets starting at or before now are visited, oldest first.
+        """
+        due: List[str] = []
+        with self._lock:
+            while self._bucket_heap and len(due) < limit:
+                bucket = self._bucket_heap[0]
+                if bucket * self.bucket_seconds > now:
+                    break
+                
+                members = self._buckets[bucket]
+                for key in [key for key in members if self._expiry[key] <= now][:limit - len(due)]:
+                    members.discard(key)
+                    del self._expiry[key]
+                    due.append(key)
+                
+                if members:
+                    break  # Limit reached, or the rest of the current bucket is not due yet
+                heapq.heappop(self._bucket_heap)
+                del self._buckets[bucket]
+            
+            if due:
+                self._unlink_snapshot()
+        return due
+    
+    def due_count(self, now: float) -> int:
+        """Number of keys already expired and waiting for cleanup."""
+        with self._lock:
+            return sum(
+                1 for bucket in self._bucket_heap if bucket * self.bucket_seconds <= now
+                for key in self._buckets[bucket] if self._expiry[key] <= now
+            )
+    
+    # Loading and persistence
+    
+    def merge(self, entries: Dict[str, Optional[float]], from_snapshot: bool = False) -> None:
+        """
+        Complete the index with entries read from a snapshot or storage walk.
+        
+        Keys changed or removed since the index was created keep their
+        recorded state.
+        
+        Args:
+            entries: Key -> expiry (epoch seconds, or None)
+            from_snapshot: Entries came from the snapshot file, which stays current
+                unless the index changed before the merge
+        """
+        with self._lock:
+            if not from_snapshot:
+                self._snapshot_current = False
+            for key, expires_at in entries.items():
+                if key not in self._expiry and key not in self._removed_while_building:
+                    self._add(key, expires_at)
+            self._removed_while_building.clear()
+            self.complete = True
+    
+    def load_snapshot(self) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Read the persisted entries.
+        
+        Returns:
+            The snapshot's entries, or None if there is no usable snapshot
+                (including one another process wrote around; the marker is
+                cleared, as the caller now rebuilds from storage)
+        """
+        if self.snapshot_path is None or not self.owner:
+            return None
+        if self._stale_marker is not None and self._stale_marker.exists():
+            # Drop the snapshot before the marker, so a crash cannot leave it trusted
+            try:
+                self.snapshot_path.unlink(missing_ok=True)
+                self._stale_marker.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        entries = snapshot.get("entries")
+        return entries if isinstance(entries, dict) else None
+    
+    def save(self) -> bool:
+        """
+        Persist the index if it is complete and changed since the last save.
+        
+        Returns:
+            bool: True if a snapshot was written
+        """
+        if self.snapshot_path is None or not self.owner:
+            return False
+        with self._lock:
+            if self._stale_marker is not None and self._stale_marker.exists():
+                # Another process wrote keys this index never saw
+                self._unlink_snapshot()
+                return False
+            if not self.complete or self._snapshot_current:
+                return False
+            snapshot = {"version": SNAPSHOT_VERSION, "entries": dict(self._expiry)}
+            
+            tmp_path = None
+            try:
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(mode='w', delete=False,
+                                                 dir=self.snapshot_path.parent,
+                                                 suffix='.tmp') as tmp:
+                    json.dump(snapshot, tmp)
+                    tmp_path = tmp.name
+                os.replace(tmp_path, self.snapshot_path)
+            except OSError:
+                if tmp_path:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                return False
+            
+            self._snapshot_current = True
+            return True
+    
+    def _unlink_snapshot(self) -> None:
+        if self._snapshot_current:
+            try:
+                self.snapshot_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            self._snapshot_current = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+        
+        Returns:
+            Dict[str, Any]: Index size and state
+        """
+        with self._lock:
+            return {
+                "owner": self.owner,
+                "complete": self.complete,
+                "entry_count": len(self._expiry),
+                "expiring_count": sum(len(members) for members in self._buckets.values()),
+                "bucket_count": len(self._buckets),
+                "bucket_seconds": self.bucket_seconds,
+                "snapshot_current": self._snapshot_current
+            }
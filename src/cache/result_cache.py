@@ -6,9 +6,11 @@ cache key generation based on file hash and analysis configuration, and
 smart invalidation patterns using file-based storage.
 """
 
+import asyncio
 import hashlib
 import json
 import time
+import weakref
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
@@ -21,6 +23,26 @@ from ..models.shared.enums import AnalysisDepth, AnalysisFocus
 from .base import FileStorageClient
 
 
+# Caches whose buffered access tracking is flushed at application shutdown
+_live_caches: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+
+
+async def flush_result_caches() -> int:
+    """
+    Flush the buffered access tracking of every live ResultCache.
+    
+    Called from the application shutdown path so hits counted since the
+    last batch are not lost.
+    
+    Returns:
+        int: Number of cache entries whose access record was updated
+    """
+    updated = 0
+    for cache in list(_live_caches):
+        updated += await cache.flush_access_stats()
+    return updated
+
+
 @dataclass
 class CacheEntry:
     """Cache entry with metadata."""
@@ -60,7 +82,8 @@ class ResultCache:
     - Cache statistics and monitoring
     - Compression for large results
     - Cache warming and preloading
-    - LRU-style access tracking
+    - LRU-style access tracking, buffered in memory and flushed in batches
+      so cache hits never rewrite the cached payload
     """
     
     # Cache key patterns
@@ -73,6 +96,11 @@ class ResultCache:
     # Cache version for schema evolution
     CACHE_VERSION = "1.0"
     
+    # Buffered access tracking and statistics are flushed after this many
+    # events or this many seconds, whichever comes first
+    ACCESS_FLUSH_BATCH = 100
+    ACCESS_FLUSH_INTERVAL_SECONDS = 30.0
+    
     def __init__(self, storage_client: Optional[FileStorageClient] = None, settings: Optional[Settings] = None):
         """
         Initialize result cache.
@@ -99,6 +127,15 @@ class ResultCache:
             'invalidations': 0,
             'errors': 0
         }
+        
+        # Unflushed access counts per cache key (count, last_accessed) and
+        # statistic increments, written in one batch by flush_access_stats
+        self._pending_access: Dict[str, Tuple[int, float]] = {}
+        self._pending_stats: Dict[str, int] = {}
+        self._pending_events = 0
+        self._last_flush = time.monotonic()
+        self._flush_lock = asyncio.Lock()
+        _live_caches.add(self)
     
     async def _get_storage(self) -> FileStorageClient:
         """Get file storage client instance."""
@@ -322,8 +359,8 @@ class ResultCache:
                     await self._update_stats("miss")
                     return None
                 
-                # Update access statistics
-                await self._update_access_stats(cache_key)
+                # Track the access in memory; the payload is never rewritten on a hit
+                self._record_access(cache_key)
                 await self._update_stats("hit")
                 
                 self.logger.debug(
@@ -456,8 +493,9 @@ class ResultCache:
                 except (KeyError, TypeError):
                     pass  # Continue with deletion even if metadata is corrupted
             
-            # Delete the cache entry
+            # Delete the cache entry and its access record
             deleted_count = await storage.delete(cache_key)
+            await self._forget_access(storage, [cache_key])
             
             if deleted_count > 0:
                 await self._update_stats("delete")
@@ -504,6 +542,7 @@ class ResultCache:
                 count = await storage.delete(cache_key)
                 if count > 0:
                     deleted_count += count
+            await self._forget_access(storage, cache_keys)
             
             # Delete the file set
             await storage.delete(file_set_key)
@@ -552,6 +591,7 @@ class ResultCache:
                 count = await storage.delete(cache_key)
                 if count > 0:
                     deleted_count += count
+            await self._forget_access(storage, cache_keys)
             
             # Delete the tag set
             await storage.delete(tag_set_key)
@@ -590,6 +630,8 @@ class ResultCache:
                 return None
             
             entry_data = cached_data
+            access_count, last_accessed = await self._get_access(storage, cache_key)
+            access_count += entry_data.get('access_count', 0)
             
             # Calculate derived fields
             current_time = time.time()
@@ -606,7 +648,10 @@ class ResultCache:
                 'file_hash': entry_data.get('file_hash', '')[:16] + '...',
                 'config_hash': entry_data.get('config_hash'),
                 'tags': entry_data.get('tags', []),
-                'access_count': entry_data.get('access_count', 0),
+                'access_count': access_count,
+                'last_accessed': (
+                    datetime.fromtimestamp(last_accessed, timezone.utc).isoformat() if last_accessed else None
+                ),
                 'data_size_bytes': len(json.dumps(entry_data.get('data', {})))
             }
             
@@ -653,11 +698,11 @@ class ResultCache:
         try:
             storage = await self._get_storage()
             
-            # Get cached stats
+            # Persisted stats plus increments not flushed yet
             stats = await storage.get(self.CACHE_STATS_KEY) or {}
-            
-            # Merge with in-memory stats
-            all_stats = {**stats, **self._stats}
+            all_stats = dict(stats)
+            for key, increment in self._pending_stats.items():
+                all_stats[key] = int(all_stats.get(key, 0)) + increment
             
             # Calculate hit ratio
             hits = int(all_stats.get('hits', 0))
@@ -707,49 +752,123 @@ class ResultCache:
             if stat_key in self._stats:
                 self._stats[stat_key] += count
             
-            # Also update persistent stats periodically
+            # Persistent stats are updated in batches
             await self._update_cache_stats(stat_key, count)
             
         except Exception:
             pass  # Don't fail operations due to stats errors
     
-    async def _update_cache_stats(self, key: str, increment: int = 1) -> None:
-        """Update persistent cache statistics."""
+    async def _update_cache_stats(self, key: str, increment: Any = 1) -> None:
+        """
+        Update persistent cache statistics.
+        
+        Integer increments are buffered and written by the next batch flush;
+        other values are written immediately.
+        """
         try:
-            storage = await self._get_storage()
-            
-            # Get current stats
-            stats = await storage.get(self.CACHE_STATS_KEY) or {}
-            
-            # Update the specific stat
             if isinstance(increment, int):
-                current_value = int(stats.get(key, 0))
-                stats[key] = current_value + increment
-            else:
-                stats[key] = increment
+                self._pending_stats[key] = self._pending_stats.get(key, 0) + increment
+                self._pending_events += 1
+                await self._maybe_flush()
+                return
             
-            # Save updated stats
+            storage = await self._get_storage()
+            stats = await storage.get(self.CACHE_STATS_KEY) or {}
+            stats[key] = increment
             await storage.set(self.CACHE_STATS_KEY, stats)
             
         except Exception:
             pass  # Don't fail operations due to stats errors
     
-    async def _update_access_stats(self, cache_key: str) -> None:
-        """Update access statistics for cache entry."""
-        try:
-            storage = await self._get_storage()
+    def _record_access(self, cache_key: str) -> None:
+        """Count a cache hit in memory."""
+        count, _ = self._pending_access.get(cache_key, (0, 0.0))
+        self._pending_access[cache_key] = (count + 1, time.time())
+        self._pending_events += 1
+    
+    async def _maybe_flush(self) -> None:
+        """Flush buffered access tracking when the batch is full or the interval has passed."""
+        if self._pending_events >= self.ACCESS_FLUSH_BATCH or \
+                time.monotonic() - self._last_flush >= self.ACCESS_FLUSH_INTERVAL_SECONDS:
+            await self.flush_access_stats()
+    
+    async def flush_access_stats(self) -> int:
+        """
+        Write buffered access counts and statistics to storage.
+        
+        Access counts go to a small per-entry record (RESULT_METADATA_KEY)
+        that expires with the entry; statistics are merged into
+        CACHE_STATS_KEY with a single read-modify-write.
+        
+        Returns:
+            int: Number of cache entries whose access record was updated
+        """
+        async with self._flush_lock:
+            access, self._pending_access = self._pending_access, {}
+            stats, self._pending_stats = self._pending_stats, {}
+            self._pending_events = 0
+            self._last_flush = time.monotonic()
+            if not access and not stats:
+                return 0
             
-            # Get the cache entry
-            cached_data = await storage.get(cache_key)
-            if cached_data and isinstance(cached_data, dict):
-                # Update access count and timestamp
-                cached_data['access_count'] = cached_data.get('access_count', 0) + 1
-                cached_data['last_accessed'] = time.time()
+            updated = 0
+            try:
+                storage = await self._get_storage()
                 
-                # Save updated entry (without changing TTL)
-                await storage.set(cache_key, cached_data, xx=True)  # Only update existing
-            
-        except Exception:
-            pass  # Don't fail operations due to access stats errors
-
-
+                if stats:
+                    persisted = await storage.get(self.CACHE_STATS_KEY) or {}
+                    for key, increment in stats.items():
+                        persisted[key] = int(persisted.get(key, 0)) + increment
+                    await storage.set(self.CACHE_STATS_KEY, persisted)
+                    stats = {}
+                
+                for cache_key, (count, last_accessed) in list(access.items()):
+                    ttl = await storage.ttl(cache_key)
+                    if ttl != -2:  # Skip entries deleted or expired since the hit
+                        meta_key = self.RESULT_METADATA_KEY.format(cache_key=cache_key)
+                        record = await storage.get(meta_key) or {}
+                        record = {
+                            'access_count': int(record.get('access_count', 0)) + count,
+                            'last_accessed': max(last_accessed, record.get('last_accessed') or 0.0)
+                        }
+                        await storage.set(meta_key, record, ttl=ttl if ttl > 0 else None)
+                        updated += 1
+                    del access[cache_key]
+                
+                return updated
+                
+            except Exception as e:
+                # Put back what was not written; the next flush retries it
+                self._restore_pending(access, stats)
+                self.logger.warning(
+                    "Failed to flush cache access statistics",
+                    extra={"entries": len(access), "error": str(e)}
+                )
+                return updated
+    
+    def _restore_pending(self, access: Dict[str, Tuple[int, float]], stats: Dict[str, int]) -> None:
+        """Merge unwritten access counts and statistics back into the buffers."""
+        for key, increment in stats.items():
+            self._pending_stats[key] = self._pending_stats.get(key, 0) + increment
+        for cache_key, (count, last_accessed) in access.items():
+            pending_count, pending_last = self._pending_access.get(cache_key, (0, 0.0))
+            self._pending_access[cache_key] = (pending_count + count, max(pending_last, last_accessed))
+    
+    async def _get_access(self, storage: FileStorageClient, cache_key: str) -> Tuple[int, Optional[float]]:
+        """Access count and last access time for an entry, including unflushed hits."""
+        record = await storage.get(self.RESULT_METADATA_KEY.format(cache_key=cache_key)) or {}
+        count = int(record.get('access_count', 0))
+        last_accessed = record.get('last_accessed')
+        pending_count, pending_last = self._pending_access.get(cache_key, (0, None))
+        if pending_count:
+            count += pending_count
+            last_accessed = max(pending_last, last_accessed or 0.0)
+        return count, last_accessed
+    
+    async def _forget_access(self, storage: FileStorageClient, cache_keys: List[str]) -> None:
+        """Drop buffered and stored access tracking for deleted entries."""
+        for cache_key in cache_keys:
+            self._pending_access.pop(cache_key, None)
+        meta_keys = [self.RESULT_METADATA_KEY.format(cache_key=cache_key) for cache_key in cache_keys]
+        if meta_keys:
+            await storage.delete(*meta_keys)
@@ -0,0 +1,237 @@
+"""
+Single-file SQLite storage backend.
+
+Keeps every key in one SQLite database instead of a .json/.meta/.lock file
+triple per key. Reads go through SQLite's memory-mapped I/O, and expiry
+times live in a partial index so expiry cleanup touches only expired rows.
+Selected with STORAGE_BACKEND=sqlite; the interface is FileStorageClient's.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import Settings
+from .base import FileStorageClient
+from .expiry_index import ExpiryIndex
+
+
+DATABASE_FILE = "storage.db"
+
+# How long a writer waits for another connection's write lock
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at) WHERE expires_at IS NOT NULL",
+)
+
+_LIVE = "(expires_at IS NULL OR expires_at > ?)"
+
+
+class SQLiteStorageClient(FileStorageClient):
+    """
+    FileStorageClient backed by one SQLite database file.
+    
+    Operation bodies run on the client's I/O thread pool, each thread with
+    its own connection; WAL mode lets reads proceed while a write commits.
+    """
+    
+    def __init__(self, settings: Optional[Settings] = None):
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        super().__init__(settings)
+        
+        self.database_path = self.base_path / DATABASE_FILE
+        self.mmap_bytes = getattr(self.settings.storage, 'sqlite_mmap_mb', 256) * 1024 * 1024
+        
+        # Expiry times live in the entries_expires_at index; the file index stays empty
+        self._expiry_index.close()
+        self._expiry_index = ExpiryIndex(bucket_seconds=self._expiry_index.bucket_seconds)
+        self._expiry_index.clear()
+        
+        connection = self._connection()
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.database_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+    
+    async def disconnect(self) -> None:
+        """Close storage and all per-thread connections."""
+        await super().disconnect()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+    
+    def _expires_at(self, ttl: Optional[int], exists: bool) -> Optional[float]:
+        """Expiry for a write, with the same TTL rules as the file backend."""
+        if ttl is not None:
+            return time.time() + ttl
+        if not exists:  # New key gets default TTL
+            return time.time() + self.default_ttl_hours * 3600
+        return None  # Overwrites without ttl do not expire
+    
+    # Operation bodies (I/O thread)
+    
+    def _get_sync(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            f"SELECT value FROM entries WHERE key = ? AND {_LIVE}", (key, time.time())
+        ).fetchone()
+        return self._deserialize_value(row[0]) if row else None
+    
+    def _set_sync(self, key: str, value: Any, ttl: Optional[int], nx: bool, xx: bool) -> bool:
+        serialized_value = self._serialize_value(value)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            exists = connection.execute(
+                f"SELECT 1 FROM entries WHERE key = ? AND {_LIVE}", (key, time.time())
+            ).fetchone() is not None
+            
+            if (nx and exists) or (xx and not exists):
+                connection.execute("ROLLBACK")
+                return False
+            
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, serialized_value, time.time(), self._expires_at(ttl, exists))
+            )
+            connection.execute("COMMIT")
+            return True
+        
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    
+    def _delete_sync(self, keys: Tuple[str, ...]) -> int:
+        placeholders = ", ".join("?" * len(keys))
+        connection = self._connection()
+        cursor = connection.execute(f"DELETE FROM entries WHERE key IN ({placeholders})", keys)
+        return cursor.rowcount
+    
+    def _exists_sync(self, keys: Tuple[str, ...]) -> int:
+        # Duplicate keys count once per occurrence, as in the file backend
+        placeholders = ", ".join("?" * len(keys))
+        found = {
+            row[0] for row in self._connection().execute(
+                f"SELECT key FROM entries WHERE key IN ({placeholders}) AND {_LIVE}", (*keys, time.time())
+            )
+        }
+        return sum(1 for key in keys if key in found)
+    
+    def _is_expired_sync(self, key: str) -> bool:
+        return not self._get_expiry(key)[0]
+    
+    def _get_expiry(self, key: str) -> Tuple[bool, Optional[float]]:
+        """(live, expires_at) for a key; live is False when missing or expired."""
+        row = self._connection().execute("SELECT expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[0] is not None and row[0] <= time.time()):
+            return False, None
+        return True, row[0]
+    
+    def _expire_sync(self, key: str, seconds: int) -> bool:
+        cursor = self._connection().execute(
+            f"UPDATE entries SET expires_at = ? WHERE key = ? AND {_LIVE}",
+            (time.time() + seconds, key, time.time())
+        )
+        return cursor.rowcount > 0
+    
+    def _ttl_sync(self, key: str) -> int:
+        live, expires_at = self._get_expiry(key)
+        if not live:
+            return -2
+        if expires_at is None:
+            return -1  # No expiration
+        return int(expires_at - time.time())
+    
+    def _keys_sync(self, pattern: str) -> List[str]:
+        # Same simplified matching as the file backend: "*" or a substring
+        if pattern == "*":
+            rows = self._connection().execute(f"SELECT key FROM entries WHERE {_LIVE}", (time.time(),))
+        else:
+            rows = self._connection().execute(
+                f"SELECT key FROM entries WHERE instr(key, ?) > 0 AND {_LIVE}", (pattern, time.time())
+            )
+        return [row[0] for row in rows]
+    
+    def _flushdb_sync(self) -> bool:
+        try:
+            self._connection().execute("DELETE FROM entries")
+            return True
+        
+        except sqlite3.Error as e:
+            self.logger.error(
+                "Error flushing storage",
+                extra={"error": str(e)}
+            )
+            return False
+    
+    def _cleanup_expired_batch_sync(self, limit: int) -> Tuple[int, int]:
+        # Range scan of the expiry index: cost grows with expired rows only
+        cursor = self._connection().execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ? LIMIT ?)",
+            (time.time(), limit)
+        )
+        return cursor.rowcount, cursor.rowcount
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get client performance statistics.
+        
+        Returns:
+            Dict[str, Any]: Performance metrics
+        """
+        stats = super().get_stats()
+        try:
+            connection = self._connection()
+            page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+            entry_count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            expiring_count, due_count = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0) FROM entries WHERE expires_at IS NOT NULL",
+                (time.time(),)
+            ).fetchone()
+            stats["storage_stats"].update({
+                "backend": "sqlite",
+                "database_path": str(self.database_path),
+                "total_size_bytes": page_count * page_size,
+                "entry_count": entry_count,
+                "mmap_bytes": self.mmap_bytes
+            })
+            stats["expiry_index"].update({
+                "entry_count": entry_count,
+                "expiring_count": expiring_count,
+                "due_count": due_count
+            })
+        except sqlite3.Error:
+            pass
+        return stats
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Import knowledge base CLI for bin2nlp.
+
+Exports and imports import explanations as JSON Lines so air-gapped
+deployments can be seeded from a connected one.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from ..cache.base import get_file_storage_client, close_file_storage_client
+from ..llm.import_knowledge import ImportKnowledgeBase
+
+
+async def _with_knowledge_base(operation):
+    """Run an operation against the knowledge base on the configured file storage."""
+    storage = await get_file_storage_client()
+    try:
+        return await operation(ImportKnowledgeBase(storage))
+    finally:
+        await close_file_storage_client()
+
+
+def cmd_export(args):
+    """Write every stored explanation to a JSON Lines file."""
+    async def export(knowledge_base):
+        await knowledge_base.ensure_seeded()
+        return await knowledge_base.export_entries()
+
+    try:
+        entries = asyncio.run(_with_knowledge_base(export))
+        with open(args.file, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+        print(f"✅ Exported {len(entries)} import explanations to {args.file}")
+        return 0
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+
+
+def cmd_import(args):
+    """Load explanations from a JSON Lines file."""
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+    except Exception as e:
+        print(f"❌ Failed to read {args.file}: {e}")
+        return 1
+
+    try:
+        written = asyncio.run(_with_knowledge_base(
+            lambda knowledge_base: knowledge_base.import_entries(entries, overwrite=args.overwrite)
+        ))
+        print(f"✅ Imported {written} of {len(entries)} import explanations")
+        return 0
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+
+
+def cmd_seed(args):
+    """Write the built-in well-known imports if not already present."""
+    try:
+        asyncio.run(_with_knowledge_base(lambda knowledge_base: knowledge_base.ensure_seeded()))
+        print("✅ Import knowledge base seeded")
+        return 0
+    except Exception as e:
+        print(f"❌ Seeding failed: {e}")
+        return 1
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="bin2nlp Import Knowledge Base Utility",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s export imports.jsonl             # Export all explanations
+  %(prog)s import imports.jsonl             # Load explanations, keeping existing ones
+  %(prog)s import imports.jsonl --overwrite # Load explanations, replacing existing ones
+  %(prog)s seed                             # Write the built-in well-known imports
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    export_parser = subparsers.add_parser("export", help="Export explanations to JSON Lines")
+    export_parser.add_argument("file", help="Output file path")
+    export_parser.set_defaults(func=cmd_export)
+
+    import_parser = subparsers.add_parser("import", help="Import explanations from JSON Lines")
+    import_parser.add_argument("file", help="Input file path")
+    import_parser.add_argument("--overwrite", action="store_true", help="Replace existing entries")
+    import_parser.set_defaults(func=cmd_import)
+
+    seed_parser = subparsers.add_parser("seed", help="Seed well-known imports")
+    seed_parser.set_defaults(func=cmd_seed)
+
+    args = parser.parse_args()
+
+    if not hasattr(args, "func"):
+        parser.print_help()
+        return 1
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
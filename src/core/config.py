@@ -275,6 +275,19 @@ class StorageSettings(BaseSettings):
         description="Enable file compression"
     )
     
+    serializer: str = Field(
+        default="auto",
+        pattern="^(auto|json|orjson|msgpack)$",
+        description="Stored value serializer (auto picks msgpack, then orjson, then json)"
+    )
+    
+    compression_min_bytes: int = Field(
+        default=512,
+        ge=0,
+        le=1048576,
+        description="Smallest serialized value that is compressed"
+    )
+    
     cleanup_interval_hours: int = Field(
         default=6,
         ge=1,
@@ -282,6 +295,47 @@ class StorageSettings(BaseSettings):
         description="Cleanup interval in hours"
     )
     
+    io_threads: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Threads running blocking file I/O off the event loop"
+    )
+    
+    io_queue_depth: int = Field(
+        default=256,
+        ge=1,
+        le=10000,
+        description="Maximum file operations queued or running before callers wait"
+    )
+    
+    expiry_bucket_seconds: int = Field(
+        default=60,
+        ge=1,
+        le=86400,
+        description="Width of the expiry index time buckets in seconds"
+    )
+    
+    cleanup_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=100000,
+        description="Expired entries removed per cleanup batch"
+    )
+    
+    backend: str = Field(
+        default="files",
+        pattern="^(files|sqlite)$",
+        description="Storage backend: one file per key, or a single SQLite database"
+    )
+    
+    sqlite_mmap_mb: int = Field(
+        default=256,
+        ge=0,
+        le=65536,
+        description="Memory-mapped read window of the SQLite backend in MB (0 disables mmap)"
+    )
+    
     @field_validator('base_path')
     @classmethod
     def validate_base_path(cls, v: Union[str, Path]) -> Path:
@@ -416,6 +470,28 @@ class LLMSettings(BaseSettings):
         description="Default Ollama model"
     )
     
+    ollama_endpoints: List[str] = Field(
+        default_factory=list,
+        description="Additional Ollama API base URLs; requests are balanced across these and ollama_base_url"
+    )
+    
+    ollama_num_parallel: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=64,
+        description="Parallel requests per Ollama server (discovered by probing when unset)"
+    )
+    
+    ollama_keep_alive: str = Field(
+        default="30m",
+        description="How long Ollama keeps models loaded between requests"
+    )
+    
+    ollama_tokenizer_file: Optional[str] = Field(
+        default=None,
+        description="Local tokenizer.json for the Ollama model, used for exact token counts"
+    )
+    
     # Common Provider Settings
     default_temperature: float = Field(
         default=0.1,
@@ -626,12 +702,22 @@ class LLMSettings(BaseSettings):
                 "requests_per_minute": self.requests_per_minute,
                 "tokens_per_minute": self.tokens_per_minute,
                 "daily_spend_limit": 0.0,  # Free local inference
-                "monthly_spend_limit": 0.0  # Free local inference
+                "monthly_spend_limit": 0.0,  # Free local inference
+                "provider_specific": self.get_ollama_options()
             }
         
         else:
             raise ValueError(f"Unknown provider: {provider_id}")
     
+    def get_ollama_options(self) -> Dict[str, Any]:
+        """Endpoint balancing, parallelism, keep-alive and tokenizer options for the Ollama provider."""
+        return {
+            "endpoints": self.ollama_endpoints,
+            "num_parallel": self.ollama_num_parallel,
+            "keep_alive": self.ollama_keep_alive,
+            "tokenizer_file": self.ollama_tokenizer_file
+        }
+    
     def get_enabled_provider_configs(self) -> Dict[str, Dict[str, Any]]:
         """Get configurations for all enabled providers."""
         configs = {}
@@ -0,0 +1,208 @@
+"""
+Binary Profile
+
+Computes a BinaryProfile once per decompilation: architecture, compiler
+hints, obfuscation indicators, function size distribution and crypto
+constant hits, plus the trait flags that prompt selection and provider
+scoring look up instead of re-deriving heuristics per prompt.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+
+from ..models.decompilation.basic_results import (
+    BasicFunctionInfo,
+    BasicImportInfo,
+    BasicStringInfo,
+    BinaryProfile,
+    DecompilationMetadata
+)
+
+
+# Thresholds shared with the previous per-prompt heuristics
+HIGH_FUNCTION_COUNT = 50
+COMPLEX_IMPORT_COUNT = 30
+COMPLEX_CALL_COUNT = 10
+LARGE_AVERAGE_FUNCTION_SIZE = 1000
+
+# Few imports for this many functions suggests a packed or statically resolved binary
+MINIMAL_IMPORTS = 5
+MINIMAL_IMPORTS_MIN_FUNCTIONS = 20
+
+# Shannon entropy (bits per character) above which a long string looks encoded or encrypted
+HIGH_ENTROPY_BITS = 4.8
+HIGH_ENTROPY_MIN_LENGTH = 32
+
+SECURITY_LIBRARIES = {"kernel32", "ntdll", "advapi32", "wininet", "ws2_32"}
+CRYPTO_LIBRARIES = {"bcrypt", "cryptsp", "crypt32", "libcrypto", "libssl", "libgcrypt", "libsodium"}
+DYNAMIC_RESOLUTION_APIS = {"getprocaddress", "ldrgetprocedureaddress", "dlsym"}
+PACKER_SECTIONS = ("upx", "aspack", "themida", "vmp", "mpress", "petite", "nsp")
+
+# Well-known algorithm constants, as 32-bit immediates
+CRYPTO_CONSTANTS = {
+    0x67452301: "md5_sha1",
+    0xefcdab89: "md5_sha1",
+    0xd76aa478: "md5",
+    0xc3d2e1f0: "sha1",
+    0x5a827999: "sha1",
+    0x6a09e667: "sha256",
+    0xbb67ae85: "sha256",
+    0x428a2f98: "sha256",
+    0xedb88320: "crc32",
+    0x04c11db7: "crc32",
+    0x9e3779b9: "tea",
+    0x637c777b: "aes",
+    0xc66363a5: "aes",
+    0x61707865: "chacha_salsa",
+}
+
+CRYPTO_STRINGS = {
+    "expand 32-byte k": "chacha_salsa",
+    "expand 16-byte k": "chacha_salsa",
+    "abcdefghijklmnopqrstuvwxyz0123456789+/": "base64",
+}
+
+# Substring of a string, import library or symbol name -> compiler/runtime
+COMPILER_MARKERS = (
+    ("gcc: (", "gcc"),
+    ("clang version", "clang"),
+    ("mingw", "mingw"),
+    ("microsoft (r)", "msvc"),
+    ("vcruntime", "msvc"),
+    ("msvcr", "msvc"),
+    ("msvcp", "msvc"),
+    ("libstdc++", "gcc"),
+    ("libc++", "clang"),
+    ("go build", "go"),
+    ("runtime.gopanic", "go"),
+    ("/rustc/", "rust"),
+    ("core::panicking", "rust"),
+    ("borland", "delphi"),
+    ("embarcadero", "delphi"),
+)
+
+_HEX_RE = re.compile(r"0x([0-9a-fA-F]{6,8})\b")
+_SIMD_RE = re.compile(r"\b(v?p(xor|add|sub|shuf|mul|and)\w*|movdq[au]|v(mov|add|mul|xor)\w+)\b|\b[yz]mm\d+\b")
+
+
+def _library_stem(library: str) -> str:
+    return library.lower().rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+def _entropy(text: str) -> float:
+    counts = Counter(text)
+    return -sum(count / len(text) * math.log2(count / len(text)) for count in counts.values())
+
+
+def _percentile(ordered: List[int], fraction: float) -> int:
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _compiler_hints(haystacks: Iterable[str]) -> List[str]:
+    hints: Set[str] = set()
+    for text in haystacks:
+        lowered = text.lower()
+        for marker, compiler in COMPILER_MARKERS:
+            if marker in lowered:
+                hints.add(compiler)
+    return sorted(hints)
+
+
+def _crypto_constants(functions: List[BasicFunctionInfo], strings: List[BasicStringInfo]) -> List[str]:
+    hits: Set[str] = set()
+    for func in functions:
+        for match in _HEX_RE.findall(func.assembly_code or ""):
+            algorithm = CRYPTO_CONSTANTS.get(int(match, 16))
+            if algorithm:
+                hits.add(algorithm)
+    for string in strings:
+        lowered = string.value.lower()
+        for marker, algorithm in CRYPTO_STRINGS.items():
+            if marker in lowered:
+                hits.add(algorithm)
+    return sorted(hits)
+
+
+def build_binary_profile(
+    functions: List[BasicFunctionInfo],
+    imports: List[BasicImportInfo],
+    strings: List[BasicStringInfo],
+    metadata: Optional[DecompilationMetadata] = None
+) -> BinaryProfile:
+    """
+    Compute the data characteristics of a decompiled binary.
+
+    Args:
+        functions: Extracted functions (with assembly when available)
+        imports: Extracted imports
+        strings: Extracted strings
+        metadata: Decompilation metadata (architecture, sections)
+
+    Returns:
+        BinaryProfile with its selection traits filled in
+    """
+    sizes = sorted(func.size for func in functions)
+    libraries = {_library_stem(imp.library_name) for imp in imports}
+    import_names = {(imp.function_name or "").lower() for imp in imports}
+    string_values = [string.value for string in strings]
+    sections = [section.lower() for section in (metadata.sections if metadata else [])]
+
+    obfuscation: Set[str] = set()
+    if any(packer in section for section in sections for packer in PACKER_SECTIONS):
+        obfuscation.add("packer_sections")
+    if len(imports) < MINIMAL_IMPORTS and len(functions) >= MINIMAL_IMPORTS_MIN_FUNCTIONS:
+        obfuscation.add("minimal_imports")
+    if any(name.startswith(api) for name in import_names for api in DYNAMIC_RESOLUTION_APIS):
+        obfuscation.add("dynamic_api_resolution")
+    if any(
+        len(value) >= HIGH_ENTROPY_MIN_LENGTH and _entropy(value) > HIGH_ENTROPY_BITS
+        for value in string_values
+    ):
+        obfuscation.add("high_entropy_strings")
+
+    crypto_constants = _crypto_constants(functions, strings)
+
+    traits: Set[str] = set()
+    if len(functions) > HIGH_FUNCTION_COUNT:
+        traits.add("high_function_count")
+    if sizes and sum(sizes) / len(sizes) > LARGE_AVERAGE_FUNCTION_SIZE:
+        traits.add("large_functions")
+    if any(len(func.calls_to) > COMPLEX_CALL_COUNT for func in functions):
+        traits.add("complex_calls")
+    if len(imports) > COMPLEX_IMPORT_COUNT:
+        traits.add("complex_imports")
+    if SECURITY_LIBRARIES & libraries:
+        traits.add("suspicious_apis")
+    if CRYPTO_LIBRARIES & libraries or crypto_constants:
+        traits.add("crypto_functions")
+    if any(len(value) > 50 and not any(c.isalpha() for c in value) for value in string_values) or \
+            "high_entropy_strings" in obfuscation:
+        traits.add("obfuscated_strings")
+    if obfuscation & {"packer_sections", "minimal_imports", "dynamic_api_resolution"}:
+        traits.add("packed")
+    if any(_SIMD_RE.search(func.assembly_code or "") for func in functions):
+        traits.add("simd_instructions")
+    if any("http" in value.lower() for value in string_values):
+        traits.add("has_urls")
+    if any("\\" in value or "/" in value for value in string_values):
+        traits.add("has_file_paths")
+
+    return BinaryProfile(
+        architecture=metadata.architecture if metadata else None,
+        compiler_hints=_compiler_hints(
+            [*string_values, *(imp.library_name for imp in imports), *(func.name for func in functions)]
+        ),
+        obfuscation_indicators=sorted(obfuscation),
+        crypto_constants=crypto_constants,
+        function_count=len(functions),
+        import_count=len(imports),
+        string_count=len(strings),
+        median_function_size=_percentile(sizes, 0.5),
+        p90_function_size=_percentile(sizes, 0.9),
+        max_function_size=sizes[-1] if sizes else 0,
+        traits=sorted(traits)
+    )
@@ -22,13 +22,15 @@ from pydantic import BaseModel, Field
 from ..models.shared.enums import FileFormat, Platform
 from ..models.decompilation.basic_results import (
     BasicDecompilationResult, DecompilationMetadata,
-    BasicFunctionInfo, BasicStringInfo, BasicImportInfo
+    BasicFunctionInfo, BasicStringInfo, BasicImportInfo, BinaryProfile
 )
 from ..models.decompilation.results import (
     DecompilationResult, FunctionTranslation, ImportTranslation, 
     StringTranslation, OverallSummary, LLMProviderMetadata
 )
 from .r2_session import R2Session
+from .binary_profile import build_binary_profile
+from .xref_index import XrefIndex
 from ..core.exceptions import BinaryAnalysisException
 from ..core.logging import get_logger, time_operation
 from ..core.metrics import (
@@ -169,10 +171,13 @@ class DecompilationEngine:
                     # Step 3: Radare2 decompilation with timing
                     functions, imports, strings = await self._perform_r2_decompilation(file_path)
                     
+                    # Step 4: Profile the binary once for prompt selection and provider scoring
+                    profile = self._build_profile(functions, imports, strings, metadata)
+                    
                     # Calculate actual duration
                     duration_seconds = time.perf_counter() - start_time
                     
-                    # Step 4: Create basic result
+                    # Step 5: Create basic result
                     result = BasicDecompilationResult(
                         decompilation_id=self._generate_id(),
                         metadata=metadata,
@@ -180,7 +185,8 @@ class DecompilationEngine:
                         imports=imports,
                         strings=strings,
                         success=True,
-                        duration_seconds=duration_seconds
+                        duration_seconds=duration_seconds,
+                        profile=profile
                     )
                     
                     # Record detailed metrics
@@ -362,17 +368,27 @@ class DecompilationEngine:
             async with R2Session(file_path) as r2:
                 # No explicit analysis needed - extract_functions will handle it
                 
+                # r2 xrefs to each function, import and string, by address
+                function_xrefs: Dict[str, List[Dict[str, Any]]] = {}
+                import_xrefs: Dict[str, List[Dict[str, Any]]] = {}
+                string_xrefs: Dict[str, List[Dict[str, Any]]] = {}
+                
                 # Extract functions
                 if self.config.extract_functions:
-                    functions = await self._extract_functions(r2)
+                    functions = await self._extract_functions(r2, function_xrefs)
                 
                 # Extract imports  
                 if self.config.extract_imports:
-                    imports = await self._extract_imports(r2)
+                    imports = await self._extract_imports(r2, import_xrefs)
                 
                 # Extract strings
                 if self.config.extract_strings:
-                    strings = await self._extract_strings(r2)
+                    strings = await self._extract_strings(r2, string_xrefs)
+                
+                if functions:
+                    self._attach_references(
+                        functions, imports, strings, function_xrefs, import_xrefs, string_xrefs
+                    )
             
         except Exception as e:
             logger.warning(
@@ -384,8 +400,49 @@ class DecompilationEngine:
         
         return functions, imports, strings
     
-    async def _extract_functions(self, r2: R2Session) -> List[BasicFunctionInfo]:
-        """Extract function information from radare2."""
+    def _build_profile(
+        self,
+        functions: List[BasicFunctionInfo],
+        imports: List[BasicImportInfo],
+        strings: List[BasicStringInfo],
+        metadata: DecompilationMetadata
+    ) -> Optional[BinaryProfile]:
+        """Compute the binary's data characteristics; None if profiling fails."""
+        try:
+            return build_binary_profile(functions, imports, strings, metadata)
+        except Exception as e:
+            logger.warning("binary_profile_failed", error=str(e))
+            return None
+    
+    def _attach_references(
+        self,
+        functions: List[BasicFunctionInfo],
+        imports: List[BasicImportInfo],
+        strings: List[BasicStringInfo],
+        function_xrefs: Dict[str, List[Dict[str, Any]]],
+        import_xrefs: Dict[str, List[Dict[str, Any]]],
+        string_xrefs: Dict[str, List[Dict[str, Any]]]
+    ) -> None:
+        """Fill each function's callees, imports and strings from r2 xrefs, most referenced first."""
+        try:
+            index = XrefIndex(functions, imports, strings)
+            for func in functions:
+                index.add_function_xrefs(func, function_xrefs.get(func.address))
+            for imp in imports:
+                if imp.address:
+                    index.add_import_xrefs(imp, import_xrefs.get(imp.address))
+            for string in strings:
+                index.add_string_xrefs(string, string_xrefs.get(string.address))
+            index.apply()
+        except Exception as e:
+            logger.warning("xref_attribution_failed", error=str(e))
+    
+    async def _extract_functions(
+        self,
+        r2: R2Session,
+        xrefs: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[BasicFunctionInfo]:
+        """Extract function information from radare2 (collecting xrefs to each function into xrefs)."""
         functions = []
         
         try:
@@ -421,6 +478,8 @@ class DecompilationEngine:
                             logger.debug(f"Assembly extraction result for {address}: {assembly_dict is not None}")
                             # Extract the assembly string from the dictionary
                             assembly_code = assembly_dict.get("assembly", "") if assembly_dict else None
+                            if assembly_dict and xrefs is not None:
+                                xrefs[address] = assembly_dict.get("cross_references") or []
                             if assembly_code:
                                 logger.info(f"Successfully extracted {len(assembly_code)} characters of assembly code for function {name}")
                             else:
@@ -456,8 +515,12 @@ class DecompilationEngine:
         
         return functions
     
-    async def _extract_imports(self, r2: R2Session) -> List[BasicImportInfo]:
-        """Extract import information from radare2."""
+    async def _extract_imports(
+        self,
+        r2: R2Session,
+        xrefs: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[BasicImportInfo]:
+        """Extract import information from radare2 (collecting xrefs to each import into xrefs)."""
         imports = []
         
         try:
@@ -485,6 +548,8 @@ class DecompilationEngine:
                     )
                     
                     imports.append(import_info)
+                    if xrefs is not None and import_info.address:
+                        xrefs[import_info.address] = imp.get('cross_references') or []
                     
                 except Exception as e:
                     logger.debug("import_extraction_error", imp=imp, error=str(e))
@@ -495,8 +560,12 @@ class DecompilationEngine:
         
         return imports
     
-    async def _extract_strings(self, r2: R2Session) -> List[BasicStringInfo]:
-        """Extract string information from radare2."""
+    async def _extract_strings(
+        self,
+        r2: R2Session,
+        xrefs: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[BasicStringInfo]:
+        """Extract string information from radare2 (collecting xrefs to each string into xrefs)."""
         strings = []
         
         try:
@@ -539,6 +608,8 @@ class DecompilationEngine:
                     )
                     
                     strings.append(string_info)
+                    if xrefs is not None:
+                        xrefs[string_info.address] = string_entry.get('cross_references') or []
                     
                 except Exception as e:
                     logger.debug("string_extraction_error", string=string_entry, error=str(e))
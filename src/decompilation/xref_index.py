@@ -0,0 +1,190 @@
+"""
+Cross-Reference Index
+
+Attributes radare2 cross-references to the functions they originate from,
+using an address-range index over the extracted functions, and ranks each
+function's callees, imports and strings by how often its own instructions
+reference them. Functions without xref data fall back to the addresses and
+import symbols in their disassembly operands.
+"""
+
+import bisect
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from ..models.decompilation.basic_results import BasicFunctionInfo, BasicImportInfo, BasicStringInfo
+
+
+T = TypeVar("T")
+
+# r2 xref types that make the target a callee (CODE covers tail-call jumps)
+CALL_XREF_TYPES = {"CALL", "CODE", "C"}
+
+_HEX_RE = re.compile(r"0x([0-9a-fA-F]+)")
+_IMPORT_SYMBOL_RE = re.compile(r"\bsym\.imp\.([\w@$.]+)")
+
+
+def _parse_address(value: Any) -> Optional[int]:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        match = _HEX_RE.search(value)
+        if match:
+            return int(match.group(1), 16)
+    return None
+
+
+class AddressRangeIndex(Generic[T]):
+    """Maps addresses to the item whose [start, start + size) range contains them."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int, T]]):
+        ordered = sorted(ranges, key=lambda entry: entry[0])
+        self._starts = [start for start, _, _ in ordered]
+        self._ends = [start + max(size, 1) for start, size, _ in ordered]
+        self._items = [item for _, _, item in ordered]
+
+    def lookup(self, address: int) -> Optional[T]:
+        position = bisect.bisect_right(self._starts, address) - 1
+        if position >= 0 and address < self._ends[position]:
+            return self._items[position]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@dataclass
+class _References:
+    counts: Counter = field(default_factory=Counter)
+    # Lowest referencing instruction address per target, for stable tie-breaks
+    first_seen: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, target: str, from_address: int) -> None:
+        self.counts[target] += 1
+        if from_address < self.first_seen.get(target, from_address + 1):
+            self.first_seen[target] = from_address
+
+    def ranked(self) -> List[str]:
+        return sorted(self.counts, key=lambda target: (-self.counts[target], self.first_seen[target]))
+
+
+class XrefIndex:
+    """
+    Per-function references built from r2 xrefs.
+
+    Targets are keyed by callee name, import display name and string address,
+    matching BasicFunctionInfo.calls_to, imports_used and strings_referenced.
+    """
+
+    def __init__(
+        self,
+        functions: List[BasicFunctionInfo],
+        imports: List[BasicImportInfo],
+        strings: List[BasicStringInfo]
+    ):
+        self.functions = functions
+        self._function_ranges: AddressRangeIndex[BasicFunctionInfo] = AddressRangeIndex(
+            (int(func.address, 16), func.size, func) for func in functions
+        )
+        self._function_entries = {int(func.address, 16): func for func in functions}
+        self._string_ranges: AddressRangeIndex[BasicStringInfo] = AddressRangeIndex(
+            (int(string.address, 16), string.size, string) for string in strings
+        )
+        self._imports_by_address = {
+            int(imp.address, 16): imp for imp in imports if imp.address
+        }
+        self._imports_by_name = {imp.function_name: imp for imp in imports if imp.function_name}
+        self._references: Dict[str, Dict[str, _References]] = {}
+
+    def _refs(self, func: BasicFunctionInfo, kind: str) -> _References:
+        return self._references.setdefault(func.address, {}).setdefault(kind, _References())
+
+    def owner(self, xref: Dict[str, Any]) -> Optional[BasicFunctionInfo]:
+        """Function containing the referencing instruction of an r2 xref."""
+        from_address = _parse_address(xref.get("from"))
+        if from_address is not None:
+            func = self._function_ranges.lookup(from_address)
+            if func is not None:
+                return func
+        return self._function_entries.get(_parse_address(xref.get("fcn_addr")))
+
+    def add_import_xrefs(self, imp: BasicImportInfo, xrefs: Optional[List[Dict[str, Any]]]) -> None:
+        """Record the r2 xrefs (axtj) to an import."""
+        self._add(xrefs, "imports", imp.display_name)
+
+    def add_string_xrefs(self, string: BasicStringInfo, xrefs: Optional[List[Dict[str, Any]]]) -> None:
+        """Record the r2 xrefs (axtj) to a string."""
+        self._add(xrefs, "strings", string.address)
+
+    def add_function_xrefs(self, callee: BasicFunctionInfo, xrefs: Optional[List[Dict[str, Any]]]) -> None:
+        """Record the r2 xrefs (axtj) to a function's entry point; call xrefs make it a callee."""
+        calls = [xref for xref in xrefs or [] if str(xref.get("type", "")).upper() in CALL_XREF_TYPES]
+        self._add(calls, "calls", callee.name, exclude=callee)
+
+    def _add(
+        self,
+        xrefs: Optional[List[Dict[str, Any]]],
+        kind: str,
+        target: str,
+        exclude: Optional[BasicFunctionInfo] = None
+    ) -> None:
+        for xref in xrefs or []:
+            if not isinstance(xref, dict):
+                continue
+            func = self.owner(xref)
+            if func is None or func is exclude:
+                continue
+            self._refs(func, kind).add(target, _parse_address(xref.get("from")) or 0)
+
+    def scan_instructions(self, func: BasicFunctionInfo) -> None:
+        """Attribute references from the function's own disassembly operands."""
+        for line in (func.assembly_code or "").splitlines():
+            addresses = [int(match, 16) for match in _HEX_RE.findall(line)]
+            if not addresses:
+                continue
+            # The first address on an r2 listing line is the instruction itself
+            from_address, operands = addresses[0], addresses[1:]
+            for name in _IMPORT_SYMBOL_RE.findall(line):
+                imp = self._imports_by_name.get(name)
+                if imp is not None:
+                    self._refs(func, "imports").add(imp.display_name, from_address)
+            for address in operands:
+                string = self._string_ranges.lookup(address)
+                if string is not None:
+                    self._refs(func, "strings").add(string.address, from_address)
+                    continue
+                imp = self._imports_by_address.get(address)
+                if imp is not None:
+                    self._refs(func, "imports").add(imp.display_name, from_address)
+                    continue
+                callee = self._function_entries.get(address)
+                if callee is not None and callee is not func and "call" in line:
+                    self._refs(func, "calls").add(callee.name, from_address)
+
+    def ranked(self, func: BasicFunctionInfo, kind: str) -> List[str]:
+        """Targets of one kind (calls, imports, strings) referenced by func, most referenced first."""
+        refs = self._references.get(func.address, {}).get(kind)
+        return refs.ranked() if refs else []
+
+    def apply(self) -> None:
+        """
+        Fill calls_to, imports_used and strings_referenced in relevance order.
+
+        Functions with no xref-derived references are scanned for operand
+        references first; calls_from is filled from the resulting callees.
+        """
+        for func in self.functions:
+            if func.address not in self._references:
+                self.scan_instructions(func)
+        callers: Dict[str, List[str]] = {}
+        for func in self.functions:
+            func.calls_to = self.ranked(func, "calls") or func.calls_to
+            func.imports_used = self.ranked(func, "imports") or func.imports_used
+            func.strings_referenced = self.ranked(func, "strings") or func.strings_referenced
+            for callee in func.calls_to:
+                callers.setdefault(callee, []).append(func.name)
+        for func in self.functions:
+            if func.name in callers and not func.calls_from:
+                func.calls_from = callers[func.name]
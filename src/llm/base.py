@@ -5,10 +5,13 @@ Abstract base class and configuration models for multi-LLM provider integration.
 Defines the unified interface that all provider implementations must follow.
 """
 
+import hashlib
+import json
+import re
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Awaitable
 from uuid import uuid4
 
 from pydantic import BaseModel, Field, SecretStr, field_validator, ConfigDict
@@ -17,6 +20,10 @@ import httpx
 from ..core.exceptions import BinaryAnalysisException
 from ..core.metrics import time_async_operation, OperationType, increment_counter
 from ..core.circuit_breaker import get_circuit_breaker, CircuitBreakerConfig
+from .prompt_budget import PromptBudget, TokenCounter
+from .rate_limit import AdaptiveRateLimiter, get_rate_limiter, parse_retry_after
+from .batch import BATCH_POLL_INTERVAL_SECONDS, BATCH_TIMEOUT_SECONDS
+from .structured_output import OutputSchema, StructuredOutputError, parse_with_repair
 from ..models.decompilation.results import (
     FunctionTranslation, 
     ImportTranslation, 
@@ -26,6 +33,29 @@ from ..models.decompilation.results import (
 )
 
 
+# Long-tail functions get a smaller input budget and a short answer
+BRIEF_BUDGET_RATIO = 0.35
+BRIEF_DETAIL_INSTRUCTION = (
+    "Keep this answer brief: explain in 1-2 sentences what the function does. "
+    "Skip the detailed breakdown."
+)
+
+
+# Binary-level context keys that are identical for every request in a job.
+# They form the static, cacheable prompt prefix together with the system prompt.
+STATIC_CONTEXT_KEYS = ("binary_info", "analysis_summary", "translation_settings", "imports", "binary_traits")
+
+
+# Import fields used when a batched reply has no section for an import; never
+# stored in the import knowledge base
+IMPORT_SUMMARY_UNAVAILABLE = "Analysis not available"
+IMPORT_CONTEXT_UNAVAILABLE = "Context not available"
+
+
+# Attempts per request when the vendor answers 429; waits happen in the shared limiter queue
+MAX_RATE_LIMIT_ATTEMPTS = 4
+
+
 class LLMProviderType(str, Enum):
     """Supported LLM provider types."""
     OPENAI = "openai"
@@ -155,6 +185,18 @@ class LLMConfig(BaseModel):
         description="Maximum tokens for response generation"
     )
     
+    structured_output: bool = Field(
+        default=False,
+        description="Request schema-constrained JSON for function translations and summaries"
+    )
+    
+    max_input_tokens: Optional[int] = Field(
+        default=None,
+        ge=256,
+        le=1000000,
+        description="Token budget for prompt input (defaults to a per-provider budget)"
+    )
+    
     timeout_seconds: int = Field(
         default=30,
         ge=5,
@@ -276,11 +318,19 @@ class LLMProvider(ABC):
     binary decompilation translation tasks.
     """
     
+    # Whether the provider marks the static prompt prefix as cacheable
+    supports_prompt_caching: bool = False
+    
+    # Most strings one interpret_strings call reads (None: no limit)
+    max_strings_per_request: Optional[int] = None
+    
     def __init__(self, config: LLMConfig):
         """Initialize the provider with configuration."""
         self.config = config
         self.client: Optional[httpx.AsyncClient] = None
         self._last_health_check: Optional[ProviderHealthStatus] = None
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = None
+        self._prompt_pipeline = None
         
         # Initialize circuit breaker for this provider
         circuit_config = CircuitBreakerConfig(
@@ -342,6 +392,107 @@ class LLMProvider(ABC):
         async with self.circuit_breaker.call():
             return await func(*args, **kwargs)
     
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter:
+        """Rate limiter shared by all providers using the same credential."""
+        if self._rate_limiter is None:
+            provider_id = self.get_provider_id()
+            self._rate_limiter = get_rate_limiter(
+                getattr(provider_id, "value", provider_id),
+                self.config.api_key.get_secret_value(),
+                self.config.endpoint_url,
+                requests_per_minute=self.config.requests_per_minute,
+                tokens_per_minute=self.config.tokens_per_minute
+            )
+        return self._rate_limiter
+    
+    def _create_rate_limited_http_client(self) -> httpx.AsyncClient:
+        """HTTP client for vendor SDKs whose responses feed the shared rate limiter."""
+        return httpx.AsyncClient(
+            timeout=self.config.timeout_seconds,
+            event_hooks={"response": [self._observe_rate_limit_headers]}
+        )
+    
+    async def _observe_rate_limit_headers(self, response: httpx.Response) -> None:
+        """Learn limits from response headers and keep SDKs from retrying 429s on their own."""
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429:
+            # Backoff is coordinated by the shared limiter across all jobs
+            response.headers["x-should-retry"] = "false"
+    
+    def _estimate_request_tokens(self, texts: List[str], max_tokens: int, model: Optional[str] = None) -> int:
+        """Tokens a request counts against the per-minute limit (input plus requested output)."""
+        return sum(self.count_tokens_many(texts, model)) + max_tokens
+    
+    async def _rate_limited_call(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        rate_limit_errors: Tuple[type, ...],
+        usage_tokens: Callable[[Any], int]
+    ) -> Any:
+        """
+        Send a vendor request through the shared rate limiter.
+        
+        Rate-limit errors re-enter the limiter queue (which is paused and slowed
+        down by the 429) until MAX_RATE_LIMIT_ATTEMPTS is reached. This is the
+        only retry loop for 429s; other failures return their reserved tokens
+        to the limiter and are raised.
+        
+        Args:
+            request: Coroutine factory performing the vendor call
+            estimated_tokens: Tokens reserved before sending
+            rate_limit_errors: Vendor exception types signalling a 429
+            usage_tokens: Actual tokens used, read from the vendor response
+        """
+        limiter = self.rate_limiter
+        for attempt in range(1, MAX_RATE_LIMIT_ATTEMPTS + 1):
+            await limiter.acquire(estimated_tokens)
+            try:
+                response = await request()
+            except rate_limit_errors as e:
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                limiter.record_rate_limited(parse_retry_after(headers))
+                if attempt == MAX_RATE_LIMIT_ATTEMPTS:
+                    raise
+                continue
+            except Exception:
+                # Cancelled requests keep their reservation: the vendor may have billed them
+                limiter.release(estimated_tokens)
+                raise
+            limiter.record_success()
+            limiter.reconcile(estimated_tokens, usage_tokens(response))
+            return response
+    
+    def supports_batch(self) -> bool:
+        """Whether the provider can run function translations through a vendor batch API."""
+        return False
+    
+    async def translate_functions_batch(
+        self,
+        functions: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        poll_interval_seconds: float = BATCH_POLL_INTERVAL_SECONDS,
+        timeout_seconds: float = BATCH_TIMEOUT_SECONDS
+    ) -> List[Optional[FunctionTranslation]]:
+        """
+        Translate many functions in one offline batch job.
+        
+        A batch still running at the deadline is cancelled and the requests
+        it finished are returned; a batch abandoned after an error is cancelled.
+        
+        Args:
+            functions: Function data dicts, as for translate_function
+            context: Shared translation context
+            poll_interval_seconds: Delay between batch status polls
+            timeout_seconds: Deadline for the batch to finish
+            
+        Returns:
+            Translations aligned with the input (None where a request failed or
+            did not finish)
+        """
+        raise NotImplementedError(f"{self.get_provider_id()} does not support batch translation")
+    
     @abstractmethod
     async def cleanup(self) -> None:
         """Cleanup provider resources and connections."""
@@ -486,18 +637,30 @@ class LLMProvider(ABC):
         """
         pass
     
-    @abstractmethod
-    def count_tokens(self, text: str) -> int:
+    def count_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
         Count tokens in given text using provider's tokenization.
         
         Args:
             text: Text to tokenize
+            model: Model whose tokenizer to use (defaults to the configured model)
             
         Returns:
             Number of tokens
         """
-        pass
+        return self.get_token_counter(model).count(text)
+    
+    def count_tokens_many(self, texts: List[str], model: Optional[str] = None) -> List[int]:
+        """Count tokens for several texts, tokenizing uncached texts in one batch."""
+        return self.get_token_counter(model).count_many(texts)
+    
+    def get_token_counter(self, model: Optional[str] = None) -> TokenCounter:
+        """Get the token counter for this provider's tokenizer."""
+        return TokenCounter(
+            self.config.provider_id,
+            model or self.config.default_model,
+            options=self.config.provider_specific
+        )
     
     def get_provider_id(self) -> str:
         """Get provider identifier."""
@@ -507,6 +670,170 @@ class LLMProvider(ABC):
         """Get default model name."""
         return self.config.default_model
     
+    def get_prompt_budget(self, model: Optional[str] = None, detail_level: Optional[str] = None) -> PromptBudget:
+        """Get the input token budget for prompts sent to this provider."""
+        budget = PromptBudget.for_config(self.config, model)
+        if detail_level == "brief":
+            budget.max_input_tokens = int(budget.max_input_tokens * BRIEF_BUDGET_RATIO)
+        return budget
+    
+    def _split_context(self, context: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split context into the static binary-level part and the per-request remainder."""
+        static: Dict[str, Any] = {}
+        dynamic: Dict[str, Any] = {}
+        for key, value in (context or {}).items():
+            (static if key in STATIC_CONTEXT_KEYS else dynamic)[key] = value
+        return static, dynamic
+    
+    def _build_static_context(self, context: Optional[Dict[str, Any]]) -> str:
+        """Render the binary-level context deterministically so it forms a stable prompt prefix."""
+        static, _ = self._split_context(context)
+        if not static:
+            return ""
+        return "**Binary Context:**\n" + json.dumps(static, sort_keys=True, separators=(",", ":"), default=str)
+    
+    def _prompt_cache_key(self, prefix: str) -> str:
+        """Stable key identifying a cacheable prompt prefix."""
+        return hashlib.sha256(f"{self.config.default_model}\n{prefix}".encode("utf-8")).hexdigest()[:32]
+    
+    def _is_brief(self, function_data: Dict[str, Any]) -> bool:
+        """Whether a function was ranked into the brief (long-tail) translation tier."""
+        return function_data.get("detail_level") == "brief"
+    
+    def _apply_detail_level(self, prompt: str, function_data: Dict[str, Any]) -> str:
+        """Append the brief-mode instruction for long-tail functions."""
+        if self._is_brief(function_data):
+            return f"{prompt}\n\n{BRIEF_DETAIL_INSTRUCTION}"
+        return prompt
+    
+    def _format_function_calls(self, function_data: Dict[str, Any], default: str = "") -> str:
+        """Format called functions, annotated with callee summaries when already translated."""
+        summaries = function_data.get("callee_summaries") or {}
+        calls = list(function_data.get("calls_to") or [])
+        calls += [name for name in summaries if name not in calls]
+        if not calls:
+            return default
+        return ", ".join(
+            f"{name} ({summaries[name]})" if summaries.get(name) else name
+            for name in calls
+        )
+    
+    def get_prompt_pipeline(self):
+        """Get the shared prompt pipeline that builds this provider's function prompts."""
+        if self._prompt_pipeline is None:
+            # Imported here: the prompts package imports this module
+            from .prompt_pipeline import PromptPipeline
+            self._prompt_pipeline = PromptPipeline(
+                str(getattr(self.config.provider_id, "value", self.config.provider_id))
+            )
+        return self._prompt_pipeline
+    
+    def build_function_prompt(
+        self,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        output_instructions: Optional[str] = None
+    ):
+        """
+        Build a function translation prompt through the shared prompt pipeline.
+        
+        Returns:
+            FunctionPrompt whose system prompt and static context form the
+            cacheable prefix and whose user prompt carries the function
+        """
+        _, dynamic_context = self._split_context(context)
+        return self.get_prompt_pipeline().function_prompt(
+            function_data,
+            context,
+            budget=self.get_prompt_budget(detail_level=function_data.get("detail_level")),
+            function_calls=self._format_function_calls(function_data),
+            static_context=self._build_static_context(context),
+            dynamic_context=dynamic_context,
+            output_instructions=output_instructions
+        )
+    
+    def _estimate_confidence(self, content: str, function_data: Dict[str, Any]) -> float:
+        """Estimate confidence score based on response quality."""
+        confidence = 0.5  # Base confidence
+        
+        # Boost confidence for detailed responses
+        if len(content) > 200:
+            confidence += 0.1
+        
+        # Boost for function name mentions
+        func_name = function_data.get('name', '')
+        if func_name and func_name in content:
+            confidence += 0.1
+        
+        # Boost for technical terms
+        technical_terms = ['function', 'parameter', 'return', 'variable', 'register', 'memory']
+        term_count = sum(1 for term in technical_terms if term in content.lower())
+        confidence += min(0.2, term_count * 0.05)
+        
+        return min(1.0, confidence)
+    
+    def _extract_import_section(self, content: str, import_list: List[Dict[str, Any]], position: int) -> Optional[str]:
+        """
+        The part of a batched import reply that discusses one import.
+        
+        The section starts at the first line naming the import and no other
+        requested import, and runs until the next such line for another
+        import. Returns None when the reply has no such line for the import or
+        says nothing after it.
+        """
+        names = {str(item.get("function") or "") for item in import_list} - {""}
+        name = str(import_list[position].get("function") or "")
+        if not name:
+            return None
+        
+        lines = content.splitlines()
+        starts: Dict[str, int] = {}
+        for index, line in enumerate(lines):
+            named = [other for other in names if re.search(rf"(?<!\w){re.escape(other)}(?!\w)", line)]
+            if len(named) == 1:
+                starts.setdefault(named[0], index)
+        if name not in starts:
+            return None
+        
+        start = starts[name]
+        end = min((index for index in starts.values() if index > start), default=len(lines))
+        heading = re.sub(rf"^.*?(?<!\w){re.escape(name)}(?!\w)[\s*:#`-]*", "", lines[start])
+        body = "\n".join([heading, *lines[start + 1:end]]).strip(" \n*#-")
+        return body or None
+    
+    def _extract_import_field(self, section: str, label: str) -> Optional[str]:
+        """Text after a labelled item (e.g. "2. **Usage Patterns**: ...") in an import section."""
+        match = re.search(
+            rf"{re.escape(label)}[^:\n]*:\**\s*(.*?)(?=\n\s*(?:[-*]\s*)?\d+\.|\n\s*\n|$)",
+            section,
+            re.IGNORECASE | re.DOTALL
+        )
+        if not match:
+            return None
+        return match.group(1).strip() or None
+    
+    async def _parse_structured_output(
+        self,
+        reply: Union[str, Dict[str, Any]],
+        schema: OutputSchema,
+        reask: Callable[[str, str], Awaitable[Union[str, Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fields of a structured reply, repaired with one cheap re-ask if needed.
+        
+        Returns None when the reply cannot be repaired so callers fall back to
+        free-text parsing of the reply instead of retranslating.
+        """
+        try:
+            return await parse_with_repair(reply, schema, reask)
+        except (StructuredOutputError, LLMProviderException):
+            increment_counter(
+                "llm_structured_output_fallbacks", 1,
+                provider=str(getattr(self.config.provider_id, "value", self.config.provider_id)),
+                schema=schema.name
+            )
+            return None
+    
     def is_within_rate_limits(self) -> bool:
         """Check if provider is within rate limits."""
         if self._last_health_check:
@@ -547,7 +874,9 @@ class LLMProvider(ABC):
         model: str, 
         tokens_used: int, 
         processing_time_ms: int,
-        cost_estimate: Optional[float] = None
+        cost_estimate: Optional[float] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None
     ) -> LLMProviderMetadata:
         """Create provider metadata object."""
         return LLMProviderMetadata(
@@ -559,5 +888,7 @@ class LLMProvider(ABC):
             custom_endpoint=self.config.endpoint_url,
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens,
-            cost_estimate_usd=cost_estimate
+            cost_estimate_usd=cost_estimate,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens
         )
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Offline Batch Execution
+
+Shared helpers for vendor batch APIs: request ids, JSONL (de)serialization and
+polling. Batch jobs trade latency (up to 24 hours) for lower cost and much
+higher throughput limits, which suits low-priority corpus runs.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Job priorities that run through vendor batch APIs when the provider supports them
+BATCH_PRIORITIES = {"low"}
+
+# Polling cadence and overall deadline for a submitted batch
+BATCH_POLL_INTERVAL_SECONDS = 30.0
+BATCH_TIMEOUT_SECONDS = 24 * 3600.0
+
+# How long a cancelled batch may take to settle before its finished requests are abandoned
+BATCH_CANCEL_TIMEOUT_SECONDS = 600.0
+
+# Vendors bill batch requests at half the interactive price
+BATCH_COST_DISCOUNT = 0.5
+
+_CUSTOM_ID_PREFIX = "fn-"
+
+
+class BatchTimeoutError(TimeoutError):
+    """Raised when a batch does not finish before the deadline."""
+
+
+def batch_custom_id(index: int) -> str:
+    """Request id for the function at the given position in the batch."""
+    return f"{_CUSTOM_ID_PREFIX}{index}"
+
+
+def parse_custom_id(custom_id: str) -> Optional[int]:
+    """Position encoded in a request id, or None for foreign ids."""
+    if not custom_id or not custom_id.startswith(_CUSTOM_ID_PREFIX):
+        return None
+    try:
+        return int(custom_id[len(_CUSTOM_ID_PREFIX):])
+    except ValueError:
+        return None
+
+
+def to_jsonl(records: Iterable[Dict[str, Any]]) -> bytes:
+    """Serialize records as JSON Lines."""
+    return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+
+
+def parse_jsonl(text: str) -> List[Dict[str, Any]]:
+    """Parse JSON Lines, skipping blank lines."""
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+async def poll_until(
+    retrieve: Callable[[], Awaitable[T]],
+    is_finished: Callable[[T], bool],
+    interval_seconds: float = BATCH_POLL_INTERVAL_SECONDS,
+    timeout_seconds: float = BATCH_TIMEOUT_SECONDS
+) -> T:
+    """
+    Poll a batch until it reaches a terminal state.
+
+    Args:
+        retrieve: Coroutine function returning the current batch object
+        is_finished: Whether the batch object is in a terminal state
+        interval_seconds: Delay between polls
+        timeout_seconds: Overall deadline
+
+    Raises:
+        BatchTimeoutError: If the batch is still running at the deadline
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        batch = await retrieve()
+        if is_finished(batch):
+            return batch
+        if time.monotonic() + interval_seconds > deadline:
+            raise BatchTimeoutError(f"Batch not finished after {timeout_seconds:.0f}s")
+        await asyncio.sleep(interval_seconds)
+
+
+async def cancel_and_settle(
+    cancel: Callable[[], Awaitable[Any]],
+    retrieve: Callable[[], Awaitable[T]],
+    is_finished: Callable[[T], bool],
+    interval_seconds: float = BATCH_POLL_INTERVAL_SECONDS,
+    timeout_seconds: float = BATCH_CANCEL_TIMEOUT_SECONDS
+) -> T:
+    """
+    Cancel a batch and poll until it reaches a terminal state.
+
+    Requests that finished before the cancellation keep their results, so a
+    batch that missed its deadline still hands back the work it completed.
+
+    Raises:
+        BatchTimeoutError: If the batch has not settled by the deadline
+    """
+    await cancel()
+    return await poll_until(retrieve, is_finished, interval_seconds, timeout_seconds)
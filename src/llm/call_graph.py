@@ -0,0 +1,258 @@
+"""
+Call Graph Translation Scheduling
+
+Bottom-up scheduling of function translations over the binary's call graph.
+Callees are translated before their callers so caller prompts can reuse callee summaries.
+"""
+
+import asyncio
+import heapq
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from ..core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Matches the operand of call instructions in r2 listings (call sym.foo, call fcn.00401000, call 0x401000)
+_CALL_RE = re.compile(r"\bcall[qlw]?\s+(?:qword\s+|dword\s+)?([\w.@$:\[\]+-]+)", re.IGNORECASE)
+_HEX_RE = re.compile(r"0x([0-9a-fA-F]+)")
+
+MAX_SUMMARY_CHARS = 160
+
+
+def summarize_translation(description: Optional[str], max_chars: int = MAX_SUMMARY_CHARS) -> str:
+    """Reduce a function description to a one-line summary for use in caller prompts."""
+    if not description:
+        return ""
+    text = " ".join(description.split())
+    match = re.search(r"(?<=[.!?])\s", text)
+    summary = text[:match.start()] if match else text
+    if len(summary) > max_chars:
+        summary = summary[:max_chars - 3].rstrip() + "..."
+    return summary
+
+
+def parse_address(value: Any) -> Optional[int]:
+    """Parse an address given as int or hex string."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        match = _HEX_RE.search(value)
+        if match:
+            return int(match.group(1), 16)
+    return None
+
+
+class CallGraph:
+    """
+    Directed call graph over a binary's functions.
+
+    Nodes are function indices; edges point from caller to callee. Edges come
+    from calls_to when available and from call instructions in the assembly otherwise.
+    """
+
+    def __init__(self, functions: List[Any]):
+        self.functions = functions
+        self.names: List[str] = [getattr(func, "name", f"func_{i}") for i, func in enumerate(functions)]
+        self.callees: List[Set[int]] = [set() for _ in functions]
+        self.callers: List[Set[int]] = [set() for _ in functions]
+
+        self._by_name: Dict[str, int] = {}
+        self._by_address: Dict[int, int] = {}
+        for index, func in enumerate(functions):
+            self._by_name.setdefault(self.names[index], index)
+            address = parse_address(getattr(func, "address", None))
+            if address is not None:
+                self._by_address.setdefault(address, index)
+
+        for index, func in enumerate(functions):
+            for target in self._call_targets(func):
+                callee = self.resolve(target)
+                if callee is not None and callee != index:
+                    self.callees[index].add(callee)
+                    self.callers[callee].add(index)
+
+    def _call_targets(self, func: Any) -> Iterable[str]:
+        calls_to = getattr(func, "calls_to", None) or []
+        if calls_to:
+            return calls_to
+        assembly_code = getattr(func, "assembly_code", None) or ""
+        return _CALL_RE.findall(assembly_code)
+
+    def resolve(self, target: str) -> Optional[int]:
+        """Resolve a call target (name or address) to a function index."""
+        if target in self._by_name:
+            return self._by_name[target]
+        address = parse_address(target)
+        if address is None:
+            # r2 auto-names functions fcn.<hex address> without a 0x prefix
+            suffix = target.rsplit(".", 1)[-1]
+            if re.fullmatch(r"[0-9a-fA-F]{4,}", suffix):
+                address = int(suffix, 16)
+        if address is not None:
+            return self._by_address.get(address)
+        return None
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Compute strongly connected components (iterative Tarjan).
+
+        Returns:
+            Components in reverse topological order (callees before callers)
+        """
+        index_counter = 0
+        indices: Dict[int, int] = {}
+        lowlinks: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+
+        for root in range(len(self.functions)):
+            if root in indices:
+                continue
+            work = [(root, iter(sorted(self.callees[root])))]
+            indices[root] = lowlinks[root] = index_counter
+            index_counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in indices:
+                        indices[child] = lowlinks[child] = index_counter
+                        index_counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.callees[child]))))
+                        advanced = True
+                        break
+                    elif child in on_stack:
+                        lowlinks[node] = min(lowlinks[node], indices[child])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indices[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        return components
+
+
+class CallGraphScheduler:
+    """
+    Schedules function translations bottom-up over the call graph.
+
+    A function becomes ready once all of its callees (outside its own
+    recursion cycle) have finished, so independent subtrees run concurrently
+    while callers always see their callees' summaries.
+    """
+
+    def __init__(self, functions: List[Any], max_concurrency: int = 4):
+        self.graph = CallGraph(functions)
+        self.max_concurrency = max(1, max_concurrency)
+        self.summaries: Dict[str, str] = {}
+
+    def callee_summaries(self, index: int) -> Dict[str, str]:
+        """Summaries of the already translated callees of a function."""
+        result = {}
+        for callee in sorted(self.graph.callees[index]):
+            name = self.graph.names[callee]
+            if name in self.summaries:
+                result[name] = self.summaries[name]
+        return result
+
+    async def run(
+        self,
+        translate: Callable[[int, Dict[str, str]], Awaitable[Optional[str]]],
+        priority: Optional[Callable[[int], Any]] = None
+    ) -> None:
+        """
+        Run translate for every function in dependency order.
+
+        Args:
+            translate: Coroutine taking (function index, callee summaries) and
+                returning the function's description (or None on failure)
+            priority: Optional sort key for ready functions (lower runs first);
+                defaults to the original function order
+        """
+        priority = priority or (lambda index: index)
+        components = self.graph.strongly_connected_components()
+        component_of: Dict[int, int] = {}
+        for comp_id, members in enumerate(components):
+            for member in members:
+                component_of[member] = comp_id
+
+        # Component dependency counts: a component waits on its distinct callee components
+        waiting: List[Set[int]] = [set() for _ in components]
+        dependents: List[Set[int]] = [set() for _ in components]
+        for comp_id, members in enumerate(components):
+            for member in members:
+                for callee in self.graph.callees[member]:
+                    callee_comp = component_of[callee]
+                    if callee_comp != comp_id:
+                        waiting[comp_id].add(callee_comp)
+                        dependents[callee_comp].add(comp_id)
+
+        remaining_in_component = [len(members) for members in components]
+        ready: List[Any] = []
+
+        def release(comp_id: int) -> None:
+            for member in components[comp_id]:
+                heapq.heappush(ready, (priority(member), member))
+
+        for comp_id in range(len(components)):
+            if not waiting[comp_id]:
+                release(comp_id)
+
+        running: Set[asyncio.Task] = set()
+        task_nodes: Dict[asyncio.Task, int] = {}
+
+        async def run_one(index: int) -> Optional[str]:
+            return await translate(index, self.callee_summaries(index))
+
+        while ready or running:
+            while ready and len(running) < self.max_concurrency:
+                _, index = heapq.heappop(ready)
+                task = asyncio.create_task(run_one(index))
+                running.add(task)
+                task_nodes[task] = index
+
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = task_nodes.pop(task)
+                try:
+                    description = task.result()
+                except Exception as e:
+                    logger.warning(
+                        "call_graph_translation_failed",
+                        function=self.graph.names[index],
+                        error=str(e)
+                    )
+                    description = None
+
+                summary = summarize_translation(description)
+                if summary:
+                    self.summaries[self.graph.names[index]] = summary
+
+                comp_id = component_of[index]
+                remaining_in_component[comp_id] -= 1
+                if remaining_in_component[comp_id] == 0:
+                    for dependent in dependents[comp_id]:
+                        waiting[dependent].discard(comp_id)
+                        if not waiting[dependent]:
+                            release(dependent)
@@ -0,0 +1,143 @@
+"""
+Local-First Translation Cascade
+
+Drafts every function with a local model and escalates only low-confidence
+drafts to the remote provider, tracking the cost and latency saved compared
+with sending everything to the remote provider.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .base import LLMProvider, TranslationOperationType
+from ..core.logging import get_logger
+from ..core.metrics import increment_counter
+from ..models.decompilation.results import FunctionTranslation
+
+
+logger = get_logger(__name__)
+
+# Drafts scoring below this are re-translated by the remote provider
+DEFAULT_CASCADE_CONFIDENCE_THRESHOLD = 0.7
+
+
+@dataclass
+class CascadeStats:
+    """Counters for one job's cascade run."""
+    drafted: int = 0
+    accepted: int = 0
+    escalated: int = 0
+    local_failures: int = 0
+    remote_failures: int = 0
+    local_time_ms: float = 0.0
+    remote_time_ms: float = 0.0
+    remote_calls: int = 0
+    remote_cost_usd: float = 0.0
+    avoided_cost_usd: float = 0.0
+
+
+class CascadeTranslator:
+    """
+    Translates functions local-first with remote escalation.
+
+    Exposes translate_function so it can stand in for a provider in the
+    translation service.
+    """
+
+    def __init__(
+        self,
+        local_provider: LLMProvider,
+        remote_provider: LLMProvider,
+        confidence_threshold: float = DEFAULT_CASCADE_CONFIDENCE_THRESHOLD
+    ):
+        self.local_provider = local_provider
+        self.remote_provider = remote_provider
+        self.confidence_threshold = confidence_threshold
+        self.stats = CascadeStats()
+
+    async def translate_function(
+        self,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> FunctionTranslation:
+        """
+        Draft locally and escalate when the draft is missing or below the threshold.
+
+        A failed escalation returns the local draft when there is one.
+        """
+        draft = None
+        start = time.monotonic()
+        try:
+            draft = await self.local_provider.translate_function(function_data=function_data, context=context)
+            self.stats.drafted += 1
+        except Exception as e:
+            self.stats.local_failures += 1
+            logger.warning(f"Local draft failed for {function_data.get('name')}: {e}")
+        finally:
+            self.stats.local_time_ms += (time.monotonic() - start) * 1000
+
+        if draft is not None and draft.confidence_score >= self.confidence_threshold:
+            self.stats.accepted += 1
+            self.stats.avoided_cost_usd += self._remote_cost_estimate(function_data, draft)
+            increment_counter("llm_cascade_accepted", 1)
+            return draft
+
+        self.stats.escalated += 1
+        increment_counter("llm_cascade_escalated", 1)
+        start = time.monotonic()
+        try:
+            translation = await self.remote_provider.translate_function(function_data=function_data, context=context)
+        except Exception:
+            self.stats.remote_failures += 1
+            if draft is not None:
+                logger.warning(f"Escalation failed for {function_data.get('name')}, keeping local draft")
+                return draft
+            raise
+        finally:
+            self.stats.remote_time_ms += (time.monotonic() - start) * 1000
+            self.stats.remote_calls += 1
+
+        self.stats.remote_cost_usd += translation.llm_provider.cost_estimate_usd or 0.0
+        return translation
+
+    def _remote_cost_estimate(self, function_data: Dict[str, Any], draft: FunctionTranslation) -> float:
+        """What the remote provider would have charged for a function the local model handled."""
+        tokens = self.remote_provider.count_tokens(function_data.get("assembly_code") or "")
+        tokens += draft.llm_provider.tokens_used
+        return self.remote_provider.get_cost_estimate(tokens, TranslationOperationType.FUNCTION_TRANSLATION) or 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Escalation counts and savings compared with remote-only translation.
+
+        Times are summed per-call latencies, so they compare work done rather
+        than the job's wall-clock time under concurrency.
+        """
+        stats = self.stats
+        remote_provider_id = self.remote_provider.get_provider_id()
+        remote_only_cost = stats.remote_cost_usd + stats.avoided_cost_usd
+        report = {
+            "local_model": self.local_provider.get_default_model(),
+            "remote_provider": str(getattr(remote_provider_id, "value", remote_provider_id)),
+            "confidence_threshold": self.confidence_threshold,
+            "drafted": stats.drafted,
+            "accepted": stats.accepted,
+            "escalated": stats.escalated,
+            "local_failures": stats.local_failures,
+            "remote_failures": stats.remote_failures,
+            "remote_cost_usd": round(stats.remote_cost_usd, 6),
+            "estimated_remote_only_cost_usd": round(remote_only_cost, 6),
+            "estimated_cost_saved_usd": round(stats.avoided_cost_usd, 6),
+            "local_time_ms": round(stats.local_time_ms),
+            "remote_time_ms": round(stats.remote_time_ms),
+            "estimated_remote_only_time_ms": None,
+            "estimated_time_saved_ms": None,
+        }
+        # Remote-only latency is extrapolated from the escalations actually sent
+        if stats.remote_calls:
+            translated = stats.accepted + stats.escalated
+            remote_only_time = stats.remote_time_ms / stats.remote_calls * translated
+            report["estimated_remote_only_time_ms"] = round(remote_only_time)
+            report["estimated_time_saved_ms"] = round(remote_only_time - stats.local_time_ms - stats.remote_time_ms)
+        return report
@@ -0,0 +1,200 @@
+"""
+Function Ranking for Translation
+
+Scores decompiled functions by analytical importance so the most relevant ones are translated first.
+Top-ranked functions get full detail; the long tail is translated briefly or skipped.
+"""
+
+import math
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .call_graph import CallGraph, parse_address
+
+
+# Names radare2 and common toolchains give to program entry points
+ENTRY_POINT_NAMES = {
+    "entry0", "main", "sym.main", "_start", "sym._start", "start",
+    "WinMain", "sym.WinMain", "wmain", "DllMain", "sym.DllMain",
+}
+
+# Relative weights of the ranking signals (normalized to 0..1 before weighting)
+RANKING_WEIGHTS = {
+    "entry_proximity": 0.30,
+    "xrefs": 0.25,
+    "imports": 0.20,
+    "strings": 0.15,
+    "size": 0.10,
+}
+
+DEFAULT_IMPORTANT_FUNCTIONS = 20
+
+_IMPORT_CALL_RE = re.compile(r"\bsym\.imp\.[\w.@$]+")
+_STRING_REF_RE = re.compile(r"\bstr\.[\w.]+")
+
+DETAIL_FULL = "full"
+DETAIL_BRIEF = "brief"
+DETAIL_SKIP = "skip"
+
+
+@dataclass
+class RankedFunction:
+    """Ranking result for a single function."""
+    index: int
+    name: str
+    score: float
+    rank: int
+    detail_level: str
+    entry_distance: Optional[int] = None
+
+    @property
+    def is_important(self) -> bool:
+        """Whether the function is in the important (top-K) set."""
+        return self.detail_level == DETAIL_FULL
+
+
+class FunctionRanker:
+    """
+    Ranks functions by entry-point proximity, xref count, import usage,
+    string references and size.
+    """
+
+    def __init__(
+        self,
+        important_count: int = DEFAULT_IMPORTANT_FUNCTIONS,
+        max_functions: Optional[int] = None,
+        tail_mode: str = DETAIL_BRIEF,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        if tail_mode not in (DETAIL_BRIEF, DETAIL_SKIP):
+            raise ValueError(f"Invalid tail mode: {tail_mode}")
+        self.important_count = max(0, important_count)
+        self.max_functions = max_functions
+        self.tail_mode = tail_mode
+        self.weights = weights or RANKING_WEIGHTS
+
+    def rank(
+        self,
+        functions: List[Any],
+        graph: Optional[CallGraph] = None,
+        entry_point: Optional[str] = None
+    ) -> List[RankedFunction]:
+        """
+        Rank functions and assign detail levels.
+
+        Args:
+            functions: Decompiled functions (BasicFunctionInfo-like objects)
+            graph: Call graph over the same functions (built if omitted)
+            entry_point: Entry point address from the binary metadata
+
+        Returns:
+            Ranked functions in original order
+        """
+        if not functions:
+            return []
+        graph = graph or CallGraph(functions)
+
+        distances = self._entry_distances(functions, graph, entry_point)
+        signals = {
+            "entry_proximity": [
+                1.0 / (1 + distances[i]) if distances[i] is not None else 0.0
+                for i in range(len(functions))
+            ],
+            "xrefs": [
+                math.log1p(
+                    len(graph.callers[i]) + len(graph.callees[i]) + len(getattr(func, "calls_from", None) or [])
+                )
+                for i, func in enumerate(functions)
+            ],
+            "imports": [math.log1p(self._import_count(func)) for func in functions],
+            "strings": [math.log1p(self._string_count(func)) for func in functions],
+            "size": [math.log1p(getattr(func, "size", 0) or 0) for func in functions],
+        }
+
+        scores = [0.0] * len(functions)
+        for signal, values in signals.items():
+            peak = max(values) or 1.0
+            weight = self.weights.get(signal, 0.0)
+            for i, value in enumerate(values):
+                scores[i] += weight * value / peak
+
+        order = sorted(range(len(functions)), key=lambda i: (-scores[i], i))
+        limit = len(functions) if self.max_functions is None else max(0, self.max_functions)
+
+        ranked: List[Optional[RankedFunction]] = [None] * len(functions)
+        for rank, index in enumerate(order):
+            if rank >= limit:
+                detail_level = DETAIL_SKIP
+            elif rank < self.important_count:
+                detail_level = DETAIL_FULL
+            else:
+                detail_level = self.tail_mode
+            ranked[index] = RankedFunction(
+                index=index,
+                name=graph.names[index],
+                score=round(scores[index], 4),
+                rank=rank,
+                detail_level=detail_level,
+                entry_distance=distances[index]
+            )
+        return ranked
+
+    def schedule_priorities(self, ranked: List[RankedFunction], graph: CallGraph) -> Dict[int, int]:
+        """
+        Effective scheduling priority per function.
+
+        A callee inherits the best rank of any caller so that important
+        functions are not held back by low-ranked helpers they depend on.
+        """
+        priority = {r.index: r.rank for r in ranked}
+        # Components come callees-first; walk them callers-first to push ranks down
+        for component in reversed(graph.strongly_connected_components()):
+            best = min(priority[i] for i in component)
+            for index in component:
+                priority[index] = best
+            for index in component:
+                for callee in graph.callees[index]:
+                    if priority[callee] > best:
+                        priority[callee] = best
+        return priority
+
+    def _entry_distances(
+        self,
+        functions: List[Any],
+        graph: CallGraph,
+        entry_point: Optional[str]
+    ) -> List[Optional[int]]:
+        """BFS call distance from entry points (None when unreachable)."""
+        entries = {i for i, name in enumerate(graph.names) if name in ENTRY_POINT_NAMES}
+        entry_address = parse_address(entry_point) if entry_point else None
+        if entry_address is not None:
+            for i, func in enumerate(functions):
+                if parse_address(getattr(func, "address", None)) == entry_address:
+                    entries.add(i)
+
+        distances: List[Optional[int]] = [None] * len(functions)
+        queue = deque()
+        for entry in entries:
+            distances[entry] = 0
+            queue.append(entry)
+        while queue:
+            node = queue.popleft()
+            for callee in graph.callees[node]:
+                if distances[callee] is None:
+                    distances[callee] = distances[node] + 1
+                    queue.append(callee)
+        return distances
+
+    def _import_count(self, func: Any) -> int:
+        imports_used = getattr(func, "imports_used", None) or []
+        if imports_used:
+            return len(imports_used)
+        return len(set(_IMPORT_CALL_RE.findall(getattr(func, "assembly_code", None) or "")))
+
+    def _string_count(self, func: Any) -> int:
+        strings_referenced = getattr(func, "strings_referenced", None) or []
+        if strings_referenced:
+            return len(strings_referenced)
+        return len(set(_STRING_REF_RE.findall(getattr(func, "assembly_code", None) or "")))
@@ -0,0 +1,287 @@
+"""
+Live Provider Stats and Hedged Translation
+
+Process-wide request statistics per provider (rolling latency window, EWMA
+latency and error rate), fed by every translation job and read by
+LLMProviderFactory for latency-aware routing, and the hedged translator
+translation jobs use for function requests.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+from .base import LLMProvider
+from ..core.logging import get_logger
+from ..core.metrics import increment_counter
+from ..models.decompilation.results import FunctionTranslation
+
+
+logger = get_logger(__name__)
+
+# Smoothing factors for live latency and error-rate tracking
+LATENCY_EWMA_ALPHA = 0.3
+ERROR_EWMA_ALPHA = 0.2
+
+# Recent latencies kept per provider for percentile estimates
+LATENCY_WINDOW_SIZE = 100
+
+# Samples required before a provider's p95 is trusted as a hedge delay
+MIN_HEDGE_SAMPLES = 5
+
+
+@dataclass
+class ProviderStats:
+    """Statistics and metrics for a provider."""
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    average_latency_ms: float = 0.0
+    last_used: Optional[datetime] = None
+    consecutive_failures: int = 0
+    health_check_failures: int = 0
+    error_rate_ewma: float = 0.0
+    recent_latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+
+    @property
+    def p95_latency_ms(self) -> Optional[float]:
+        """95th percentile of recent successful request latencies."""
+        if not self.recent_latencies_ms:
+            return None
+        ordered = sorted(self.recent_latencies_ms)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    @property
+    def expected_latency_ms(self) -> Optional[float]:
+        """Latency until a successful answer, accounting for the live error rate."""
+        if not self.recent_latencies_ms:
+            return None
+        return self.average_latency_ms / max(0.05, 1.0 - self.error_rate_ewma)
+
+    @property
+    def success_rate(self) -> float:
+        """Calculate success rate as percentage."""
+        if self.total_requests == 0:
+            return 100.0
+        return (self.successful_requests / self.total_requests) * 100.0
+
+    @property
+    def failure_rate(self) -> float:
+        """Calculate failure rate as percentage."""
+        return 100.0 - self.success_rate
+
+    @property
+    def is_healthy(self) -> bool:
+        """Check if provider appears healthy based on stats."""
+        return (
+            self.consecutive_failures < 5 and
+            self.health_check_failures < 3 and
+            self.success_rate >= 80.0
+        )
+
+    def record_success(self, tokens_used: int, cost: float, latency_ms: float) -> None:
+        """Count a successful request and update the live latency figures."""
+        self.total_requests += 1
+        self.successful_requests += 1
+        self.total_tokens += tokens_used
+        self.total_cost += cost
+        self.last_used = datetime.utcnow()
+        self.consecutive_failures = 0  # Reset failure counter
+        self.error_rate_ewma *= 1.0 - ERROR_EWMA_ALPHA
+        self.recent_latencies_ms.append(latency_ms)
+
+        # Update rolling average latency
+        if self.average_latency_ms == 0:
+            self.average_latency_ms = latency_ms
+        else:
+            # Exponential moving average
+            self.average_latency_ms = (
+                (1.0 - LATENCY_EWMA_ALPHA) * self.average_latency_ms + LATENCY_EWMA_ALPHA * latency_ms
+            )
+
+    def record_failure(self) -> None:
+        """Count a failed request and update the live error rate."""
+        self.total_requests += 1
+        self.failed_requests += 1
+        self.consecutive_failures += 1
+        self.error_rate_ewma = (1.0 - ERROR_EWMA_ALPHA) * self.error_rate_ewma + ERROR_EWMA_ALPHA
+        self.last_used = datetime.utcnow()
+
+
+# Live stats shared by every job and factory in this process, keyed by provider id
+_live_stats: Dict[str, ProviderStats] = {}
+
+
+def provider_key(provider: Any) -> str:
+    """Live-stats key of a provider instance (its provider id)."""
+    get_id = getattr(provider, "get_provider_id", None)
+    provider_id = get_id() if get_id is not None else type(provider).__name__
+    return str(getattr(provider_id, "value", provider_id))
+
+
+def get_live_stats(provider_id: str) -> ProviderStats:
+    """Get the shared live stats for a provider, creating them on first use."""
+    provider_id = str(getattr(provider_id, "value", provider_id))
+    stats = _live_stats.get(provider_id)
+    if stats is None:
+        stats = ProviderStats()
+        _live_stats[provider_id] = stats
+    return stats
+
+
+def reset_live_stats() -> None:
+    """Drop all live stats (used by tests)."""
+    _live_stats.clear()
+
+
+@dataclass
+class HedgeStats:
+    """Counters for one job's hedged requests."""
+    hedged: int = 0
+    hedge_wins: int = 0
+    fallbacks: int = 0
+
+
+class HedgedTranslator:
+    """
+    Translates functions on the job's provider, hedging slow requests.
+
+    Every request's latency or failure is recorded in the live stats of the
+    provider that served it. With a hedge provider, a request still running
+    once the primary's rolling p95 has passed (after MIN_HEDGE_SAMPLES
+    requests, and while the hedge provider is healthy) is duplicated to the
+    hedge provider; the first success wins and the other request is
+    cancelled, which is not recorded as a failure. A failed request falls
+    over to the hedge provider.
+
+    Exposes translate_function and passes every other attribute through to
+    the primary provider so it can stand in for it in the translation
+    service and as the cascade's remote provider.
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        hedge: Optional[LLMProvider] = None,
+        hedge_after_ms: Optional[float] = None
+    ):
+        self.primary = primary
+        self.hedge = hedge
+        self.hedge_after_ms = hedge_after_ms
+        self.stats = HedgeStats()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
+
+    def hedge_delay_ms(self) -> Optional[float]:
+        """How long a request may run before it is hedged, or None to never hedge."""
+        if self.hedge is None:
+            return None
+        if self.hedge_after_ms is not None:
+            return self.hedge_after_ms
+        primary_stats = get_live_stats(provider_key(self.primary))
+        if len(primary_stats.recent_latencies_ms) < MIN_HEDGE_SAMPLES:
+            return None
+        if not get_live_stats(provider_key(self.hedge)).is_healthy:
+            return None
+        return primary_stats.p95_latency_ms
+
+    async def translate_function(
+        self,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> FunctionTranslation:
+        """
+        Translate on the primary, hedging or falling over to the hedge provider.
+
+        Raises:
+            The last request's error when every provider tried fails
+        """
+        delay_ms = self.hedge_delay_ms()
+        standby = self.hedge
+        hedged = False
+        last_error: Optional[BaseException] = None
+        pending: Dict[asyncio.Task, LLMProvider] = {}
+
+        def launch(provider: LLMProvider) -> None:
+            task = asyncio.create_task(self._call(provider, dict(function_data), context))
+            pending[task] = provider
+
+        launch(self.primary)
+        try:
+            while pending:
+                timeout = None
+                if standby is not None and delay_ms is not None:
+                    timeout = delay_ms / 1000.0
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    self.stats.hedged += 1
+                    increment_counter("llm_hedged_requests", 1, provider=provider_key(self.primary))
+                    logger.info(f"Hedging slow request for {function_data.get('name')} with {provider_key(standby)}")
+                    launch(standby)
+                    standby = None
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        if hedged and provider is self.hedge:
+                            self.stats.hedge_wins += 1
+                            increment_counter("llm_hedge_wins", 1, provider=provider_key(provider))
+                        return task.result()
+                    last_error = task.exception()
+
+                if not pending and standby is not None:
+                    self.stats.fallbacks += 1
+                    logger.info(f"Falling back to {provider_key(standby)} after failure: {last_error}")
+                    launch(standby)
+                    standby = None
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    async def _call(
+        self,
+        provider: LLMProvider,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]]
+    ) -> FunctionTranslation:
+        """Translate on one provider and feed the outcome into its live stats."""
+        stats = get_live_stats(provider_key(provider))
+        start = time.monotonic()
+        try:
+            translation = await provider.translate_function(function_data=function_data, context=context)
+        except asyncio.CancelledError:
+            # Lost a hedge race; not a provider failure
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+
+        metadata = getattr(translation, "llm_provider", None)
+        tokens_used = getattr(metadata, "tokens_used", None)
+        cost = getattr(metadata, "cost_estimate_usd", None)
+        stats.record_success(
+            tokens_used if isinstance(tokens_used, int) else 0,
+            cost if isinstance(cost, (int, float)) else 0.0,
+            (time.monotonic() - start) * 1000
+        )
+        return translation
+
+    def report(self) -> Dict[str, Any]:
+        """Hedge counts for the job's translation data."""
+        return {
+            "hedge_provider": provider_key(self.hedge) if self.hedge is not None else None,
+            "hedged": self.stats.hedged,
+            "hedge_wins": self.stats.hedge_wins,
+            "fallbacks": self.stats.fallbacks
+        }
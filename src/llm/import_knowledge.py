@@ -0,0 +1,337 @@
+"""
+Import Explanation Knowledge Base
+
+Persistent, cross-job store of import explanations keyed by (library, symbol,
+quality tier). Consulted before explain_imports so that well-known APIs such as
+kernel32!CreateFileW or libc!memcpy are explained once and only genuinely
+unknown imports reach the provider.
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..core.logging import get_logger
+from ..models.decompilation.results import ImportTranslation, LLMProviderMetadata
+from .base import IMPORT_CONTEXT_UNAVAILABLE, IMPORT_SUMMARY_UNAVAILABLE
+
+if TYPE_CHECKING:
+    from ..cache.base import FileStorageClient
+
+logger = get_logger(__name__)
+
+# Explanation quality, lowest first: local models, hosted models, hand-written entries
+QUALITY_TIERS = ("local", "cloud", "curated")
+QUALITY_LOCAL = "local"
+QUALITY_CLOUD = "cloud"
+QUALITY_CURATED = "curated"
+
+# Providers whose explanations are stored at the local tier
+LOCAL_PROVIDERS = {"ollama"}
+
+# Entries are long-lived; the storage backend requires a TTL
+IMPORT_KNOWLEDGE_TTL_SECONDS = 365 * 24 * 3600
+
+# Bump when WELL_KNOWN_IMPORTS changes so existing stores are re-seeded
+SEED_VERSION = "1"
+
+ENTRY_KEY_PREFIX = "import_kb:entry:"
+SEED_MARKER_KEY = "import_kb:seeded:{version}"
+
+_LIBRARY_SUFFIX_RE = re.compile(r"(\.(dll|drv|sys|dylib|so)(\.[\d.]+)?)$")
+
+# (library, symbol, summary, security implications) seeded on first use
+WELL_KNOWN_IMPORTS: Tuple[Tuple[str, str, str, Optional[str]], ...] = (
+    ("kernel32", "CreateFileA", "Opens or creates a file, device, pipe or console handle (ANSI path).",
+     "Access to arbitrary files and devices; check the path and requested access rights."),
+    ("kernel32", "CreateFileW", "Opens or creates a file, device, pipe or console handle (UTF-16 path).",
+     "Access to arbitrary files and devices; check the path and requested access rights."),
+    ("kernel32", "ReadFile", "Reads bytes from a file or I/O device handle.", None),
+    ("kernel32", "WriteFile", "Writes bytes to a file or I/O device handle.",
+     "Can modify files, including dropping payloads."),
+    ("kernel32", "CloseHandle", "Closes an open kernel object handle.", None),
+    ("kernel32", "GetProcAddress", "Resolves the address of an exported function from a loaded module.",
+     "Used for dynamic API resolution, common in packers and malware to hide imports."),
+    ("kernel32", "LoadLibraryA", "Loads a DLL into the process address space (ANSI name).",
+     "Runtime loading can hide dependencies or load attacker-controlled DLLs."),
+    ("kernel32", "LoadLibraryW", "Loads a DLL into the process address space (UTF-16 name).",
+     "Runtime loading can hide dependencies or load attacker-controlled DLLs."),
+    ("kernel32", "VirtualAlloc", "Reserves or commits pages in the calling process's virtual address space.",
+     "Executable allocations are typical of shellcode loaders and unpackers."),
+    ("kernel32", "VirtualAllocEx", "Reserves or commits memory in another process.",
+     "Classic first step of process injection."),
+    ("kernel32", "VirtualProtect", "Changes the protection of committed pages in the calling process.",
+     "Making memory executable at runtime is typical of unpackers and shellcode."),
+    ("kernel32", "WriteProcessMemory", "Writes data into the memory of another process.",
+     "Core primitive of process injection."),
+    ("kernel32", "CreateRemoteThread", "Starts a thread that runs in another process.",
+     "Core primitive of process injection."),
+    ("kernel32", "CreateProcessA", "Creates a new process and its primary thread (ANSI command line).",
+     "Launches other programs; check the command line."),
+    ("kernel32", "CreateProcessW", "Creates a new process and its primary thread (UTF-16 command line).",
+     "Launches other programs; check the command line."),
+    ("kernel32", "ExitProcess", "Terminates the calling process and all of its threads.", None),
+    ("kernel32", "GetModuleHandleA", "Returns the handle of a module already loaded in the process (ANSI name).", None),
+    ("kernel32", "GetModuleHandleW", "Returns the handle of a module already loaded in the process (UTF-16 name).", None),
+    ("kernel32", "Sleep", "Suspends the calling thread for a number of milliseconds.",
+     "Long sleeps are used to evade sandboxes."),
+    ("kernel32", "IsDebuggerPresent", "Reports whether the process is running under a user-mode debugger.",
+     "Anti-debugging check."),
+    ("advapi32", "RegOpenKeyExA", "Opens a registry key (ANSI name).", None),
+    ("advapi32", "RegOpenKeyExW", "Opens a registry key (UTF-16 name).", None),
+    ("advapi32", "RegSetValueExA", "Sets the data of a registry value (ANSI name).",
+     "Writes to Run keys are a common persistence mechanism."),
+    ("advapi32", "RegSetValueExW", "Sets the data of a registry value (UTF-16 name).",
+     "Writes to Run keys are a common persistence mechanism."),
+    ("advapi32", "OpenProcessToken", "Opens the access token associated with a process.",
+     "Often precedes privilege adjustment."),
+    ("advapi32", "AdjustTokenPrivileges", "Enables or disables privileges in an access token.",
+     "Enabling SeDebugPrivilege allows access to other processes."),
+    ("ws2_32", "WSAStartup", "Initializes the Winsock library for the process.", "Indicates network capability."),
+    ("ws2_32", "socket", "Creates a socket bound to a transport provider.", "Indicates network capability."),
+    ("ws2_32", "connect", "Opens a connection on a socket to a remote address.",
+     "Outbound connections may be command-and-control traffic."),
+    ("ws2_32", "send", "Sends data on a connected socket.", "Possible data exfiltration."),
+    ("ws2_32", "recv", "Receives data from a connected socket.", None),
+    ("wininet", "InternetOpenA", "Initializes the WinINet library and returns a session handle.",
+     "Indicates HTTP/FTP capability."),
+    ("wininet", "InternetOpenUrlA", "Opens an HTTP or FTP URL.", "Downloads content; check the URL."),
+    ("user32", "MessageBoxA", "Displays a modal message box (ANSI text).", None),
+    ("user32", "SetWindowsHookExA", "Installs a hook procedure into a hook chain.",
+     "Keyboard hooks are used by keyloggers."),
+    ("user32", "GetAsyncKeyState", "Returns whether a key is currently pressed.", "Polling keys is typical of keyloggers."),
+    ("libc", "memcpy", "Copies n bytes between non-overlapping memory areas.",
+     "Overflows if the length exceeds the destination size."),
+    ("libc", "memset", "Fills n bytes of memory with a constant byte.", None),
+    ("libc", "strcpy", "Copies a NUL-terminated string including the terminator.",
+     "No bounds check; classic buffer overflow source."),
+    ("libc", "strncpy", "Copies at most n bytes of a string, padding with NULs.",
+     "Does not NUL-terminate when the source is n bytes or longer."),
+    ("libc", "strlen", "Returns the length of a NUL-terminated string.", None),
+    ("libc", "strcmp", "Compares two NUL-terminated strings.", None),
+    ("libc", "malloc", "Allocates a block of heap memory.", None),
+    ("libc", "free", "Releases a heap block allocated by malloc, calloc or realloc.",
+     "Double free or use after free corrupts the heap."),
+    ("libc", "printf", "Writes formatted output to stdout.", "A non-constant format string is a format-string vulnerability."),
+    ("libc", "sprintf", "Writes formatted output to a buffer.", "No bounds check; prefer snprintf."),
+    ("libc", "fopen", "Opens a file and returns a stream.", None),
+    ("libc", "fread", "Reads items from a stream.", None),
+    ("libc", "fwrite", "Writes items to a stream.", None),
+    ("libc", "system", "Runs a command through /bin/sh.", "Command injection if the argument is attacker-influenced."),
+    ("libc", "execve", "Replaces the process image with a new program.", "Launches other programs; check the arguments."),
+    ("libc", "fork", "Creates a child process duplicating the caller.", None),
+    ("libc", "socket", "Creates a communication endpoint.", "Indicates network capability."),
+    ("libc", "connect", "Connects a socket to a remote address.",
+     "Outbound connections may be command-and-control traffic."),
+    ("libc", "ptrace", "Traces or controls another process.", "Also used as an anti-debugging check on itself."),
+    ("libc", "__libc_start_main", "glibc startup routine that runs initializers and calls main.", None),
+)
+
+
+def normalize_library(library: Optional[str]) -> str:
+    """Canonical library name: lowercase without extension or version ("libc.so.6" -> "libc")."""
+    if not library:
+        return "unknown"
+    return _LIBRARY_SUFFIX_RE.sub("", library.strip().lower()) or "unknown"
+
+
+def normalize_symbol(symbol: Optional[str]) -> str:
+    """Canonical symbol name without radare2 prefixes or ELF symbol versions."""
+    if not symbol:
+        return "unknown"
+    symbol = symbol.strip()
+    for prefix in ("sym.imp.", "imp."):
+        if symbol.startswith(prefix):
+            symbol = symbol[len(prefix):]
+    return symbol.split("@", 1)[0] or "unknown"
+
+
+def provider_quality(provider_id: Any) -> str:
+    """Quality tier for explanations produced by a provider."""
+    provider_name = str(getattr(provider_id, "value", provider_id)).lower()
+    return QUALITY_LOCAL if provider_name in LOCAL_PROVIDERS else QUALITY_CLOUD
+
+
+def entry_key(library: str, symbol: str, quality: str) -> str:
+    """Storage key of an explanation."""
+    return f"{ENTRY_KEY_PREFIX}{quality}:{normalize_library(library)}:{normalize_symbol(symbol)}"
+
+
+class ImportKnowledgeBase:
+    """
+    Shared import-explanation store on top of file storage.
+
+    Lookups accept entries at the requested quality tier or better, so a job
+    on a hosted model never reuses an explanation written by a local model.
+    """
+
+    def __init__(self, storage_client: Optional["FileStorageClient"] = None):
+        self.storage_client = storage_client
+        self._seeded = False
+        self._seed_lock = asyncio.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    async def _get_storage(self) -> "FileStorageClient":
+        """Get file storage client instance."""
+        if self.storage_client is None:
+            from ..cache.base import get_file_storage_client
+            self.storage_client = await get_file_storage_client()
+        return self.storage_client
+
+    async def ensure_seeded(self) -> None:
+        """Write WELL_KNOWN_IMPORTS the first time the store is used."""
+        if self._seeded:
+            return
+        async with self._seed_lock:
+            if self._seeded:
+                return
+            storage = await self._get_storage()
+            marker = SEED_MARKER_KEY.format(version=SEED_VERSION)
+            if not await storage.exists(marker):
+                entries = [
+                    {
+                        "library": library,
+                        "function": symbol,
+                        "summary": summary,
+                        "security_implications": security,
+                        "quality": QUALITY_CURATED,
+                        "provider": "curated",
+                        "model": "curated",
+                    }
+                    for library, symbol, summary, security in WELL_KNOWN_IMPORTS
+                ]
+                await self.import_entries(entries, overwrite=True)
+                await storage.set(marker, {"entries": len(entries)}, ttl=IMPORT_KNOWLEDGE_TTL_SECONDS)
+                logger.info(f"Seeded import knowledge base with {len(entries)} well-known imports")
+            self._seeded = True
+
+    async def lookup_many(
+        self,
+        import_list: List[Dict[str, Any]],
+        quality: str = QUALITY_CLOUD
+    ) -> Tuple[Dict[int, ImportTranslation], List[int]]:
+        """
+        Find stored explanations for imports.
+
+        Args:
+            import_list: Provider import entries ("library", "function")
+            quality: Minimum acceptable quality tier
+
+        Returns:
+            (explanations by position, positions with no acceptable entry)
+        """
+        await self.ensure_seeded()
+        storage = await self._get_storage()
+        tiers = QUALITY_TIERS[QUALITY_TIERS.index(quality):][::-1]
+
+        async def find(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            for tier in tiers:
+                entry = await storage.get(entry_key(item.get("library"), item.get("function"), tier))
+                if entry:
+                    return entry
+            return None
+
+        entries = await asyncio.gather(*(find(item) for item in import_list))
+        found: Dict[int, ImportTranslation] = {}
+        missing: List[int] = []
+        for position, (item, entry) in enumerate(zip(import_list, entries)):
+            if entry is None:
+                missing.append(position)
+            else:
+                found[position] = self._to_translation(entry, item)
+
+        self._stats["hits"] += len(found)
+        self._stats["misses"] += len(missing)
+        return found, missing
+
+    async def store_many(self, translations: List[ImportTranslation], quality: str) -> int:
+        """
+        Store provider explanations at the given quality tier.
+
+        Explanations the provider could not produce (the reply had no section
+        for the import) are skipped so the fallback text is never reused.
+        """
+        entries = [
+            {
+                "library": t.library_name,
+                "function": t.function_name,
+                "summary": t.api_documentation_summary,
+                "usage_context": None if t.usage_context == IMPORT_CONTEXT_UNAVAILABLE else t.usage_context,
+                "parameters_description": t.parameters_description,
+                "security_implications": t.security_implications,
+                "quality": quality,
+                "provider": t.llm_provider.provider,
+                "model": t.llm_provider.model,
+            }
+            for t in translations
+            if t.library_name and t.function_name and t.function_name != "unknown"
+            and t.api_documentation_summary != IMPORT_SUMMARY_UNAVAILABLE
+        ]
+        return await self.import_entries(entries, overwrite=True)
+
+    async def export_entries(self) -> List[Dict[str, Any]]:
+        """All stored explanations, for seeding other deployments."""
+        storage = await self._get_storage()
+        keys = sorted(await storage.keys(ENTRY_KEY_PREFIX))
+        entries = await asyncio.gather(*(storage.get(key) for key in keys))
+        return [entry for entry in entries if entry]
+
+    async def import_entries(self, entries: List[Dict[str, Any]], overwrite: bool = False) -> int:
+        """
+        Bulk-load explanations (e.g. an export from a connected deployment).
+
+        Args:
+            entries: Entries with library, function, summary and quality
+            overwrite: Replace existing entries instead of keeping them
+
+        Returns:
+            Number of entries written
+        """
+        storage = await self._get_storage()
+        written = 0
+        for entry in entries:
+            quality = entry.get("quality", QUALITY_CURATED)
+            if quality not in QUALITY_TIERS or not entry.get("function") or not entry.get("summary"):
+                logger.warning(f"Skipping invalid import knowledge entry: {entry.get('library')}!{entry.get('function')}")
+                continue
+            record = {**entry, "quality": quality, "stored_at": datetime.utcnow().isoformat()}
+            key = entry_key(entry.get("library"), entry["function"], quality)
+            if await storage.set(key, record, ttl=IMPORT_KNOWLEDGE_TTL_SECONDS, nx=not overwrite):
+                written += 1
+        self._stats["stored"] += written
+        return written
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters since startup."""
+        return dict(self._stats)
+
+    def _to_translation(self, entry: Dict[str, Any], item: Dict[str, Any]) -> ImportTranslation:
+        """ImportTranslation for a stored entry, named as in the binary being analyzed."""
+        return ImportTranslation(
+            library_name=item.get("library") or entry["library"],
+            function_name=item.get("function") or entry["function"],
+            api_documentation_summary=entry["summary"],
+            usage_context=entry.get("usage_context") or "See API documentation summary",
+            parameters_description=entry.get("parameters_description"),
+            security_implications=entry.get("security_implications"),
+            confidence_score=0.95 if entry.get("quality") == QUALITY_CURATED else 0.8,
+            llm_provider=LLMProviderMetadata(
+                provider=entry.get("provider") or "knowledge_base",
+                model=entry.get("model") or "unknown",
+                tokens_used=0,
+                processing_time_ms=0
+            )
+        )
+
+
+# Global instance
+_import_knowledge_base: Optional[ImportKnowledgeBase] = None
+
+
+def get_import_knowledge_base() -> ImportKnowledgeBase:
+    """Get the shared import knowledge base."""
+    global _import_knowledge_base
+    if _import_knowledge_base is None:
+        _import_knowledge_base = ImportKnowledgeBase()
+    return _import_knowledge_base
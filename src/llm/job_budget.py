@@ -0,0 +1,159 @@
+"""
+Job Budget
+
+Per-job token and cost limits for LLM translation. Usage is accounted live
+from the provider metadata on each result. Near the limit the remaining
+functions are translated in brief mode (optionally on a cheaper model); once
+the next request would overrun it, the rest are left untranslated.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from ..core.logging import get_logger
+from ..core.metrics import increment_counter
+
+
+logger = get_logger(__name__)
+
+# Fraction of the budget after which remaining functions are translated briefly
+DEFAULT_BUDGET_DEGRADE_AT = 0.8
+
+
+class JobBudget:
+    """
+    Token and cost accounting for one translation job.
+
+    Limits are optional; an unlimited budget still accounts usage so it can be
+    reported. Results sharing one metadata object (a batched import or string
+    request) are counted once.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+        degrade_at: float = DEFAULT_BUDGET_DEGRADE_AT
+    ):
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        if max_cost_usd is not None and max_cost_usd <= 0:
+            raise ValueError("max_cost_usd must be positive")
+        if not 0.0 < degrade_at <= 1.0:
+            raise ValueError("degrade_at must be in (0, 1]")
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.degrade_at = degrade_at
+        self.tokens_used = 0
+        self.cost_usd = 0.0
+        self.requests = 0
+        self.in_flight = 0
+        self.degraded = False
+        self.exhausted = False
+        self.skipped: List[str] = []
+        # Counted metadata by id; holding the objects keeps their ids from being reused
+        self._seen: Dict[int, Any] = {}
+
+    @classmethod
+    def from_config(cls, llm_config: Dict[str, Any]) -> "JobBudget":
+        """Budget from the max_job_tokens / max_job_cost_usd / budget_degrade_at request options."""
+        return cls(
+            max_tokens=llm_config.get("max_job_tokens"),
+            max_cost_usd=llm_config.get("max_job_cost_usd"),
+            degrade_at=llm_config.get("budget_degrade_at") or DEFAULT_BUDGET_DEGRADE_AT
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens is not None or self.max_cost_usd is not None
+
+    def fraction_used(
+        self,
+        extra_requests: int = 0,
+        estimated_tokens: int = 0,
+        estimated_cost_usd: float = 0.0
+    ) -> float:
+        """
+        Largest fraction of either limit spent, optionally projecting more requests.
+
+        Projected requests cost the average so far, or the given estimate
+        while no result has been accounted yet.
+        """
+        fractions = [0.0]
+        if self.requests:
+            average_tokens = self.tokens_used / self.requests
+            average_cost = self.cost_usd / self.requests
+        else:
+            average_tokens, average_cost = estimated_tokens, estimated_cost_usd
+        if self.max_tokens is not None:
+            fractions.append((self.tokens_used + extra_requests * average_tokens) / self.max_tokens)
+        if self.max_cost_usd is not None:
+            fractions.append((self.cost_usd + extra_requests * average_cost) / self.max_cost_usd)
+        return max(fractions)
+
+    def reserve(self, estimated_tokens: int = 0, estimated_cost_usd: float = 0.0) -> bool:
+        """
+        Reserve room for one more request of any kind.
+
+        Returns False when the requests already in flight plus this one would
+        likely exceed the budget. Until the first result arrives each request
+        is projected at the given estimate, so the first wave of concurrent
+        requests cannot overrun it. Release the reservation with finish().
+        """
+        projected = self.fraction_used(self.in_flight + 1, estimated_tokens, estimated_cost_usd)
+        if self.enabled and (self.exhausted or projected > 1.0):
+            return False
+        self.in_flight += 1
+        return True
+
+    def try_start(self, name: str, estimated_tokens: int = 0, estimated_cost_usd: float = 0.0) -> bool:
+        """Reserve room for one more function request, recording the function as skipped if there is none."""
+        if self.reserve(estimated_tokens, estimated_cost_usd):
+            return True
+        self.skipped.append(name)
+        increment_counter("llm_budget_skipped_functions", 1)
+        return False
+
+    def finish(self, result: Any = None) -> None:
+        """Release a reservation and account the result's usage."""
+        self.in_flight = max(0, self.in_flight - 1)
+        self.record(result)
+
+    def record(self, result: Any) -> None:
+        """Account the usage of a result, or of every result in a list/tuple."""
+        if isinstance(result, (list, tuple)):
+            for item in result:
+                self.record(item)
+            return
+        metadata = getattr(result, "llm_provider", None)
+        if metadata is None or id(metadata) in self._seen:
+            return
+        self._seen[id(metadata)] = metadata
+        self.requests += 1
+        self.tokens_used += getattr(metadata, "tokens_used", 0) or 0
+        self.cost_usd += getattr(metadata, "cost_estimate_usd", None) or 0.0
+        self._update_state()
+
+    def _update_state(self) -> None:
+        if not self.enabled:
+            return
+        fraction = self.fraction_used()
+        if fraction >= 1.0 and not self.exhausted:
+            self.exhausted = True
+            logger.warning(f"Job budget exhausted: {self.tokens_used} tokens, ${self.cost_usd:.4f}")
+            increment_counter("llm_budget_exhausted", 1)
+        if fraction >= self.degrade_at and not self.degraded:
+            self.degraded = True
+            logger.info(f"Job budget {fraction:.0%} used, translating remaining functions briefly")
+            increment_counter("llm_budget_degraded", 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.max_tokens,
+            "max_cost_usd": self.max_cost_usd,
+            "tokens_used": self.tokens_used,
+            "cost_usd": round(self.cost_usd, 6),
+            "fraction_used": round(self.fraction_used(), 3) if self.enabled else None,
+            "degraded": self.degraded,
+            "exhausted": self.exhausted,
+            "skipped_functions": len(self.skipped),
+        }
@@ -0,0 +1,304 @@
+"""
+Prompt Budget Management
+
+Token budgeting and context trimming for prompts sent to LLM providers.
+Compresses radare2 assembly listings and fits prompt sections to a per-provider input budget.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.logging import get_logger
+from .tokenization import (
+    CHARS_PER_TOKEN,
+    DEFAULT_CHARS_PER_TOKEN,
+    EstimateTokenizer,
+    count_tokens,
+    count_tokens_many,
+    get_tokenizer,
+)
+
+
+logger = get_logger(__name__)
+
+
+# Default input budgets (tokens) when LLMConfig.max_input_tokens is not set
+DEFAULT_INPUT_BUDGETS = {
+    "openai": 12000,
+    "anthropic": 24000,
+    "gemini": 24000,
+    "ollama": 3000,
+}
+DEFAULT_INPUT_BUDGET = 8000
+
+# Assembly compression settings
+MAX_REPEAT_BLOCK_LINES = 8
+MIN_ELIDED_LINES = 4
+
+_BOX_DRAWING_CHARS = "│┌└├┤┐┘─═╎╭╰<>:|`\\/ \t"
+_INSTRUCTION_RE = re.compile(r"0x[0-9a-fA-F]+\s+(?:[0-9a-fA-F]{2,}\s+)?(.*)$")
+_KEPT_COMMENT_PREFIXES = ("; var ", "; arg ", ";-- ")
+
+
+class TokenCounter:
+    """
+    Per-provider token counter.
+
+    Counts with the tokenizer registered for the provider and model (tiktoken
+    for OpenAI models, a configured tokenizer file, or the calibrated
+    characters-per-token estimate) through the shared token count cache.
+    """
+
+    def __init__(
+        self,
+        provider_id: str,
+        model: Optional[str] = None,
+        use_tokenizer: bool = True,
+        options: Optional[Dict[str, Any]] = None
+    ):
+        self.provider_id = str(getattr(provider_id, "value", provider_id))
+        self.model = model
+        self.chars_per_token = CHARS_PER_TOKEN.get(self.provider_id, DEFAULT_CHARS_PER_TOKEN)
+        if use_tokenizer:
+            self.tokenizer = get_tokenizer(self.provider_id, model, options)
+        else:
+            self.tokenizer = EstimateTokenizer(self.chars_per_token)
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self.tokenizer.is_exact
+
+    def count(self, text: str) -> int:
+        """Count tokens in text."""
+        if not text:
+            return 0
+        return count_tokens(text, self.tokenizer)
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        """Count tokens for several texts in one batch."""
+        return count_tokens_many(texts, self.tokenizer)
+
+
+def _instruction_key(line: str) -> str:
+    """Normalize an r2 listing line to its instruction text (address and bytes removed)."""
+    stripped = line.strip(_BOX_DRAWING_CHARS)
+    match = _INSTRUCTION_RE.search(stripped)
+    if match:
+        return " ".join(match.group(1).split())
+    return " ".join(stripped.split())
+
+
+def _is_comment_line(line: str) -> bool:
+    """Check whether a line is an r2 comment (xrefs, annotations) worth dropping."""
+    stripped = line.strip(_BOX_DRAWING_CHARS)
+    if not stripped.startswith(";"):
+        return False
+    return not stripped.startswith(_KEPT_COMMENT_PREFIXES)
+
+
+def _is_nop(key: str) -> bool:
+    """Check whether a normalized instruction is a NOP of any width."""
+    mnemonic = key.split(" ", 1)[0].lower() if key else ""
+    return mnemonic.startswith("nop") or key.lower() == "xchg ax, ax"
+
+
+def _drop_comments(lines: List[str]) -> List[str]:
+    return [line for line in lines if line.strip() and not _is_comment_line(line)]
+
+
+def _collapse_nops(lines: List[str]) -> List[str]:
+    result: List[str] = []
+    i = 0
+    while i < len(lines):
+        if _is_nop(_instruction_key(lines[i])):
+            j = i
+            while j < len(lines) and _is_nop(_instruction_key(lines[j])):
+                j += 1
+            run = j - i
+            result.append(lines[i])
+            if run > 1:
+                result.append(f"; ... {run - 1} more nop instructions")
+            i = j
+        else:
+            result.append(lines[i])
+            i += 1
+    return result
+
+
+def _elide_repeats(lines: List[str]) -> List[str]:
+    keys = [_instruction_key(line) for line in lines]
+    result: List[str] = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        best_block = 0
+        best_copies = 1
+        for block in range(1, MAX_REPEAT_BLOCK_LINES + 1):
+            if i + 2 * block > n:
+                break
+            pattern = keys[i:i + block]
+            copies = 1
+            while keys[i + copies * block:i + (copies + 1) * block] == pattern:
+                copies += 1
+            if block * (copies - 1) > best_block * (best_copies - 1):
+                best_block, best_copies = block, copies
+
+        if best_copies > 1 and best_block * (best_copies - 1) >= MIN_ELIDED_LINES:
+            result.extend(lines[i:i + best_block])
+            result.append(
+                f"; ... previous {best_block} instruction(s) repeated {best_copies - 1} more times"
+            )
+            i += best_block * best_copies
+        else:
+            result.append(lines[i])
+            i += 1
+    return result
+
+
+def compress_assembly(assembly_code: str) -> str:
+    """
+    Compress an r2 assembly listing without losing instruction semantics.
+
+    Drops r2 comment lines (xrefs and annotations, keeping var/arg/flag lines),
+    collapses runs of NOP padding, and elides consecutively repeated blocks.
+
+    Args:
+        assembly_code: Raw assembly listing
+
+    Returns:
+        Compressed listing
+    """
+    if not assembly_code:
+        return ""
+
+    lines = assembly_code.splitlines()
+    lines = _drop_comments(lines)
+    lines = _collapse_nops(lines)
+    lines = _elide_repeats(lines)
+    return "\n".join(lines)
+
+
+class PromptBudget:
+    """
+    Input token budget for a single prompt.
+
+    Callers measure the fixed parts of a prompt, then fit the variable sections
+    (assembly, decompiled code, context) into what remains.
+    """
+
+    def __init__(self, counter: TokenCounter, max_input_tokens: int):
+        self.counter = counter
+        self.max_input_tokens = max_input_tokens
+
+    @classmethod
+    def for_config(cls, config: Any, model: Optional[str] = None) -> "PromptBudget":
+        """Create a budget from an LLMConfig."""
+        provider_id = str(getattr(config.provider_id, "value", config.provider_id))
+        max_input_tokens = getattr(config, "max_input_tokens", None) or DEFAULT_INPUT_BUDGETS.get(
+            provider_id, DEFAULT_INPUT_BUDGET
+        )
+        counter = TokenCounter(provider_id, model or config.default_model, options=getattr(config, "provider_specific", None))
+        return cls(counter, max_input_tokens)
+
+    def count(self, text: str) -> int:
+        """Count tokens in text."""
+        return self.counter.count(text)
+
+    def remaining(self, *fixed_parts: str) -> int:
+        """Tokens left after the given fixed prompt parts."""
+        used = sum(self.counter.count_many(list(fixed_parts)))
+        return max(0, self.max_input_tokens - used)
+
+    def split(self, available: int, weights: Dict[str, float]) -> Dict[str, int]:
+        """Split available tokens between named sections by weight."""
+        total = sum(weights.values()) or 1.0
+        return {name: int(available * weight / total) for name, weight in weights.items()}
+
+    def fit_text(self, text: str, max_tokens: int, marker: str = "... [{omitted} lines omitted] ...") -> str:
+        """
+        Fit text to max_tokens by keeping its head and tail lines.
+
+        Args:
+            text: Text to fit
+            max_tokens: Token limit for the result
+            marker: Line inserted in place of the omitted middle
+
+        Returns:
+            Text that fits within max_tokens
+        """
+        if not text or self.count(text) <= max_tokens:
+            return text or ""
+        if max_tokens <= 0:
+            return ""
+
+        lines = text.splitlines()
+
+        def render(keep: int) -> str:
+            head = (keep * 2 + 2) // 3
+            tail = keep - head
+            kept = lines[:head] + [marker.format(omitted=len(lines) - keep)]
+            if tail:
+                kept += lines[-tail:]
+            return "\n".join(kept)
+
+        # Binary search for the largest number of lines that fits
+        low, high = 0, len(lines) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count(render(mid)) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+
+        result = render(low)
+        if low == 0 and self.count(result) > max_tokens:
+            # Single oversized line: fall back to a character cut
+            max_chars = int(max_tokens * self.counter.chars_per_token)
+            return text[:max_chars]
+        return result
+
+    def fit_assembly(self, assembly_code: str, max_tokens: int) -> str:
+        """Compress assembly and trim it to max_tokens."""
+        compressed = compress_assembly(assembly_code)
+        return self.fit_text(compressed, max_tokens, marker="; ... [{omitted} lines omitted] ...")
+
+    def fit_context(self, context: Optional[Dict[str, Any]], max_tokens: int) -> str:
+        """
+        Serialize context as compact JSON within max_tokens.
+
+        Empty values are dropped, and the largest top-level entries are removed
+        first when the serialized context is over budget.
+
+        Args:
+            context: Context dictionary
+            max_tokens: Token limit for the result
+
+        Returns:
+            Compact JSON string (empty string if nothing fits)
+        """
+        if not context or max_tokens <= 0:
+            return ""
+
+        entries: List[Tuple[str, str]] = []
+        for key, value in context.items():
+            if value is None or value == "" or value == [] or value == {}:
+                continue
+            entries.append((key, json.dumps(value, separators=(",", ":"), default=str)))
+
+        def render(items: List[Tuple[str, str]]) -> str:
+            if not items:
+                return ""
+            return "{" + ",".join(f"{json.dumps(k)}:{v}" for k, v in items) + "}"
+
+        result = render(entries)
+        dropped = []
+        while entries and self.count(result) > max_tokens:
+            largest = max(range(len(entries)), key=lambda idx: len(entries[idx][1]))
+            dropped.append(entries.pop(largest)[0])
+            result = render(entries)
+
+        if dropped:
+            logger.debug("prompt_context_trimmed", dropped_keys=dropped, max_tokens=max_tokens)
+        return result
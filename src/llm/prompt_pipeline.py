@@ -0,0 +1,201 @@
+"""
+Prompt Pipeline
+
+Builds function translation prompts for every provider from the versioned
+templates in llm/prompts: select a template with the contextual prompt
+manager (or use the one a prompt experiment assigned), build its variables
+with ContextBuilder, render the compiled template and fit code and
+per-function context into the provider's input budget. Binary-level context
+is returned separately so providers can place it in their cacheable prompt
+prefix.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ..core.logging import get_logger
+from .base import BRIEF_DETAIL_INSTRUCTION, TranslationOperationType
+from .prompt_budget import PromptBudget
+from .prompts import (
+    AnalysisContext,
+    ContextualPromptManager,
+    PromptTemplate,
+    TranslationQuality,
+    contextual_prompt_manager,
+    get_template_by_id
+)
+
+
+logger = get_logger(__name__)
+
+# translation_settings.quality_level (API translation_detail) to template quality
+QUALITY_BY_DETAIL = {
+    "basic": TranslationQuality.BRIEF,
+    "brief": TranslationQuality.BRIEF,
+    "standard": TranslationQuality.STANDARD,
+    "detailed": TranslationQuality.COMPREHENSIVE,
+    "comprehensive": TranslationQuality.COMPREHENSIVE,
+}
+
+# Template variables filled from the budgeted code sections
+CODE_FIELDS = ("assembly_code", "decompiled_code")
+
+NOT_AVAILABLE = "Not available"
+NONE_IDENTIFIED = "None identified"
+
+
+@dataclass(frozen=True)
+class FunctionPrompt:
+    """A rendered function translation prompt."""
+    template_id: str
+    system_prompt: str
+    static_context: str
+    user_prompt: str
+
+
+class PromptPipeline:
+    """
+    Function prompt construction shared by all providers.
+
+    One pipeline is created per provider instance; template selection and
+    provider adaptation are cached by the prompt manager and templates.
+    """
+
+    def __init__(self, provider_id: str, prompt_manager: Optional[ContextualPromptManager] = None):
+        self.provider_id = provider_id
+        self.prompt_manager = prompt_manager or contextual_prompt_manager
+
+    def function_prompt(
+        self,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]],
+        budget: PromptBudget,
+        function_calls: str,
+        static_context: str,
+        dynamic_context: Dict[str, Any],
+        output_instructions: Optional[str] = None
+    ) -> FunctionPrompt:
+        """
+        Build the prompt for one function translation.
+
+        Args:
+            function_data: Function information (name, address, code, calls...)
+            context: Full translation context
+            budget: Input token budget for the request
+            function_calls: Formatted callees, annotated with callee summaries
+            static_context: Rendered binary-level context (cacheable prefix)
+            dynamic_context: Per-request context appended to the user prompt
+            output_instructions: Structured output instructions for the system prompt
+
+        Returns:
+            FunctionPrompt with system prompt, static context and user prompt
+        """
+        context = context or {}
+        brief = function_data.get("detail_level") == "brief"
+        quality = self._quality(context, brief)
+        if function_data.get("prompt_template_id"):
+            # Template assigned by a prompt experiment
+            template = get_template_by_id(function_data["prompt_template_id"])
+        else:
+            template = self.select_template(function_data, context)
+
+        system_prompt = template.get_adapted_prompt(self.provider_id)[0]
+        if output_instructions:
+            system_prompt = f"{system_prompt}\n\n{output_instructions}"
+
+        variables = self._template_variables(function_data, context, quality, function_calls)
+        renderer = template.get_renderer(self.provider_id)
+
+        # Fit code and per-function context into what the fixed text leaves
+        fixed = renderer.render({**variables, **{field: "" for field in CODE_FIELDS}})
+        available = budget.remaining(system_prompt, static_context, fixed)
+        high_level_code = function_data.get("pseudocode") or function_data.get("decompiled_code")
+        shares = budget.split(
+            available,
+            {"code": 0.45, "assembly": 0.45, "context": 0.1} if high_level_code
+            else {"assembly": 0.85, "context": 0.15}
+        )
+        variables["assembly_code"] = (
+            budget.fit_assembly(function_data.get("assembly_code") or "", shares["assembly"]) or NOT_AVAILABLE
+        )
+        variables["decompiled_code"] = (
+            budget.fit_text(high_level_code, shares["code"]) if high_level_code else NOT_AVAILABLE
+        )
+
+        buffer = io.StringIO()
+        renderer.render_into(buffer, variables)
+        context_json = budget.fit_context(dynamic_context, shares["context"])
+        if context_json:
+            buffer.write(f"\n\n**Context Information:**\n{context_json}")
+        if brief:
+            buffer.write(f"\n\n{BRIEF_DETAIL_INSTRUCTION}")
+
+        return FunctionPrompt(
+            template_id=template.template_id,
+            system_prompt=system_prompt,
+            static_context=static_context,
+            user_prompt=buffer.getvalue()
+        )
+
+    def select_template(self, function_data: Dict[str, Any], context: Optional[Dict[str, Any]]) -> PromptTemplate:
+        """
+        Template the function would be translated with, ignoring experiment assignments.
+
+        Selection follows the function's tier, the job's translation detail,
+        its analysis context and the binary's traits.
+        """
+        context = context or {}
+        return self.prompt_manager.select_prompt(
+            TranslationOperationType.FUNCTION_TRANSLATION,
+            self.provider_id,
+            self._analysis_context(context),
+            self._quality(context, function_data.get("detail_level") == "brief"),
+            binary_traits=context.get("binary_traits")
+        )
+
+    def _quality(self, context: Dict[str, Any], brief: bool) -> TranslationQuality:
+        """Template quality for the function's tier and the job's translation detail."""
+        if brief:
+            return TranslationQuality.BRIEF
+        detail = (context.get("translation_settings") or {}).get("quality_level")
+        return QUALITY_BY_DETAIL.get(str(getattr(detail, "value", detail)), TranslationQuality.STANDARD)
+
+    def _analysis_context(self, context: Dict[str, Any]) -> Optional[AnalysisContext]:
+        """Analysis context requested for the job, if any (None selects the standard templates)."""
+        requested = context.get("analysis_context")
+        if requested is None:
+            return None
+        try:
+            return AnalysisContext(requested)
+        except ValueError:
+            logger.warning(f"Unknown analysis context {requested!r}, using standard prompts")
+            return None
+
+    def _template_variables(
+        self,
+        function_data: Dict[str, Any],
+        context: Dict[str, Any],
+        quality: TranslationQuality,
+        function_calls: str
+    ) -> Dict[str, Any]:
+        """Template variables from ContextBuilder, formatted for rendering."""
+        variables = self.prompt_manager.build_context_for_operation(
+            TranslationOperationType.FUNCTION_TRANSLATION,
+            function_data,
+            file_info=context.get("binary_info"),
+            quality_level=quality
+        )
+        variables["function_calls"] = function_calls or NONE_IDENTIFIED
+        for name, value in list(variables.items()):
+            if isinstance(value, bool):
+                variables[name] = "Yes" if value else "No"
+            elif isinstance(value, (list, tuple)):
+                variables[name] = ", ".join(str(item) for item in value) or NONE_IDENTIFIED
+            elif value is None:
+                variables[name] = NOT_AVAILABLE
+        for name in ("file_name", "file_format", "file_platform", "file_architecture"):
+            variables.setdefault(name, "unknown")
+        for name in ("related_functions", "relevant_imports", "relevant_strings"):
+            variables.setdefault(name, NONE_IDENTIFIED)
+        return variables
@@ -10,6 +10,7 @@ from .base import (
     TranslationQuality,
     ContextBuilder
 )
+from .renderer import CompiledPrompt, compile_prompt
 from .function_translation import (
     get_function_prompt, 
     list_available_function_prompts,
@@ -39,6 +40,12 @@ from .manager import (
     AnalysisContext,
     contextual_prompt_manager
 )
+from .experiments import (
+    PromptExperiment,
+    PromptExperimentManager,
+    get_template_by_id,
+    prompt_experiment_manager
+)
 
 __all__ = [
     # Base classes and utilities
@@ -46,6 +53,8 @@ __all__ = [
     'PromptVersion', 
     'TranslationQuality',
     'ContextBuilder',
+    'CompiledPrompt',
+    'compile_prompt',
     
     # Function translation
     'get_function_prompt',
@@ -74,5 +83,11 @@ __all__ = [
     # Context-aware management
     'ContextualPromptManager',
     'AnalysisContext',
-    'contextual_prompt_manager'
+    'contextual_prompt_manager',
+    
+    # Template experiments
+    'PromptExperiment',
+    'PromptExperimentManager',
+    'get_template_by_id',
+    'prompt_experiment_manager'
 ]
\ No newline at end of file
@@ -8,10 +8,12 @@ across all providers with versioning and optimization capabilities.
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict, PrivateAttr
+
+from .renderer import CompiledPrompt, compile_prompt
 
 
 class PromptVersion(str, Enum):
@@ -159,6 +161,9 @@ class PromptTemplate(BaseModel):
         description="Development and optimization notes"
     )
     
+    # Adapted prompts by provider, keyed with the source text so edited copies recompute
+    _adapted: Dict[Tuple[str, str, str], Tuple[str, str]] = PrivateAttr(default_factory=dict)
+    
     @field_validator('template_id')
     @classmethod
     def validate_template_id(cls, v: str) -> str:
@@ -177,12 +182,22 @@ class PromptTemplate(BaseModel):
         """
         Get provider-adapted system and user prompts.
         
+        The adaptation is computed once per provider and reused.
+        
         Args:
             provider_id: LLM provider identifier
             
         Returns:
             Tuple of (system_prompt, user_prompt_template) adapted for provider
         """
+        key = (provider_id, self.system_prompt, self.user_prompt_template)
+        adapted = self._adapted.get(key)
+        if adapted is None:
+            adapted = self._adapted[key] = self._adapt(provider_id)
+        return adapted
+    
+    def _adapt(self, provider_id: str) -> Tuple[str, str]:
+        """Apply the provider's prefix/suffix/replace adaptations."""
         system_prompt = self.system_prompt
         user_prompt = self.user_prompt_template
         
@@ -212,12 +227,22 @@ class PromptTemplate(BaseModel):
         
         return system_prompt, user_prompt
     
-    def render_user_prompt(self, context: Dict[str, Any]) -> str:
+    def get_renderer(self, provider_id: Optional[str] = None) -> CompiledPrompt:
+        """
+        Get the compiled user prompt, adapted for provider_id when given.
+        
+        Use render_into on the result to write prompts into a reused buffer.
+        """
+        user_prompt = self.get_adapted_prompt(provider_id)[1] if provider_id else self.user_prompt_template
+        return compile_prompt(user_prompt)
+    
+    def render_user_prompt(self, context: Dict[str, Any], provider_id: Optional[str] = None) -> str:
         """
         Render user prompt template with provided context variables.
         
         Args:
             context: Dictionary of variables to substitute in template
+            provider_id: Render the provider-adapted template instead
             
         Returns:
             Rendered user prompt string
@@ -225,11 +250,7 @@ class PromptTemplate(BaseModel):
         Raises:
             KeyError: If required template variables are missing
         """
-        try:
-            return self.user_prompt_template.format(**context)
-        except KeyError as e:
-            missing_var = str(e).strip("'")
-            raise KeyError(f"Missing required template variable: {missing_var}")
+        return self.get_renderer(provider_id).render(context)
     
     def update_metrics(
         self, 
@@ -354,6 +375,20 @@ class ContextBuilder:
             context["file_platform"] = file_info.get("platform", "unknown")
             context["file_architecture"] = file_info.get("architecture", "unknown")
         
+        # Keep only what the function's own instructions reference, most referenced first
+        related_functions = ContextBuilder._rank_by_reference(
+            related_functions, function_data.get("calls_to"),
+            lambda func: (func.get("name"),)
+        )
+        imports = ContextBuilder._rank_by_reference(
+            imports, function_data.get("imports_used"),
+            lambda imp: (f"{imp.get('library', 'unknown')}!{imp.get('function', 'unknown')}", imp.get("function"))
+        )
+        strings = ContextBuilder._rank_by_reference(
+            strings, function_data.get("strings_referenced"),
+            lambda s: (s.get("address"),)
+        )
+        
         # Add related functions for context (limited by quality level)
         if related_functions:
             limit = {"brief": 3, "standard": 5, "comprehensive": 10}[quality_level]
@@ -381,6 +416,31 @@ class ContextBuilder:
         
         return context
     
+    @staticmethod
+    def _rank_by_reference(
+        candidates: Optional[List[Dict[str, Any]]],
+        references: Optional[List[str]],
+        keys: Callable[[Dict[str, Any]], Tuple[Optional[str], ...]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Filter candidates to those in a function's reference list, in its order.
+        
+        Reference lists are ranked by relevance during decompilation. Without
+        one the candidates are used as given.
+        """
+        if not candidates or references is None:
+            return candidates
+        rank = {}
+        for position, reference in enumerate(references):
+            rank.setdefault(reference, position)
+        ranked = []
+        for candidate in candidates:
+            positions = [rank[key] for key in keys(candidate) if key in rank]
+            if positions:
+                ranked.append((min(positions), candidate))
+        ranked.sort(key=lambda entry: entry[0])
+        return [candidate for _, candidate in ranked]
+    
     @staticmethod
     def build_import_context(
         imports: List[Dict[str, Any]],
@@ -0,0 +1,264 @@
+"""
+Prompt Template Experiments
+
+A/B experiments that send a share of function translations to alternative
+prompt templates (e.g. a terser v2 prompt) and record input/output tokens,
+latency and confidence per template, so prompts can be compared on cost and
+quality before one is made the default.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ...core.logging import get_logger
+from ...core.metrics import increment_counter
+from .base import PromptTemplate
+from .function_translation import FUNCTION_TRANSLATION_PROMPTS, SPECIALIZED_FUNCTION_PROMPTS
+from .import_explanation import IMPORT_EXPLANATION_PROMPTS, SPECIALIZED_IMPORT_PROMPTS
+from .overall_summary import OVERALL_SUMMARY_PROMPTS, SPECIALIZED_SUMMARY_PROMPTS
+from .string_interpretation import STRING_INTERPRETATION_PROMPTS, SPECIALIZED_STRING_PROMPTS
+
+logger = get_logger(__name__)
+
+# Assignment resolution: shares are in percent with two decimals
+ASSIGNMENT_BUCKETS = 10000
+
+
+def _iter_templates() -> Iterator[PromptTemplate]:
+    for prompts in (FUNCTION_TRANSLATION_PROMPTS, IMPORT_EXPLANATION_PROMPTS,
+                    STRING_INTERPRETATION_PROMPTS, OVERALL_SUMMARY_PROMPTS):
+        for versions in prompts.values():
+            yield from versions.values()
+    for specialized in (SPECIALIZED_FUNCTION_PROMPTS, SPECIALIZED_IMPORT_PROMPTS,
+                        SPECIALIZED_STRING_PROMPTS, SPECIALIZED_SUMMARY_PROMPTS):
+        yield from specialized.values()
+
+
+def get_template_by_id(template_id: str) -> PromptTemplate:
+    """
+    Look up a registered prompt template by its template_id.
+
+    Raises:
+        KeyError: If no template has this id
+    """
+    for template in _iter_templates():
+        if template.template_id == template_id:
+            return template
+    raise KeyError(f"Unknown prompt template: {template_id}")
+
+
+class TemplateArmStats:
+    """Accumulated results for one template in an experiment."""
+
+    def __init__(self, template_id: str):
+        self.template_id = template_id
+        self.requests = 0
+        self.failures = 0
+        self.tokens_used = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.token_split_requests = 0
+        self.latency_ms = 0.0
+        self.confidence = 0.0
+        self.cost_usd = 0.0
+
+    def record(self, result: Any) -> None:
+        self.requests += 1
+        if result is None:
+            self.failures += 1
+            return
+        metadata = getattr(result, "llm_provider", None)
+        if metadata is not None:
+            self.tokens_used += getattr(metadata, "tokens_used", 0) or 0
+            self.latency_ms += getattr(metadata, "processing_time_ms", 0) or 0
+            self.cost_usd += getattr(metadata, "cost_estimate_usd", None) or 0.0
+            input_tokens = getattr(metadata, "input_tokens", None)
+            output_tokens = getattr(metadata, "output_tokens", None)
+            if input_tokens is not None and output_tokens is not None:
+                self.input_tokens += input_tokens
+                self.output_tokens += output_tokens
+                self.token_split_requests += 1
+        self.confidence += getattr(result, "confidence_score", 0.0) or 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        successes = self.requests - self.failures
+
+        def average(total: float, count: int) -> Optional[float]:
+            return round(total / count, 3) if count else None
+
+        return {
+            "template_id": self.template_id,
+            "requests": self.requests,
+            "success_rate": average(successes, self.requests),
+            "avg_tokens": average(self.tokens_used, successes),
+            "avg_input_tokens": average(self.input_tokens, self.token_split_requests),
+            "avg_output_tokens": average(self.output_tokens, self.token_split_requests),
+            "avg_latency_ms": average(self.latency_ms, successes),
+            "avg_confidence": average(self.confidence, successes),
+            "avg_cost_usd": round(self.cost_usd / successes, 6) if successes else None,
+        }
+
+
+class PromptExperiment:
+    """
+    Traffic split between a control template and alternative templates.
+
+    Assignment is a stable hash of the experiment id and the unit key (e.g.
+    job id and function address), so retries of the same function use the
+    same template.
+    """
+
+    def __init__(
+        self,
+        experiment_id: str,
+        control_template_id: str,
+        variants: Dict[str, float],
+        description: Optional[str] = None
+    ):
+        control = get_template_by_id(control_template_id)
+        if not variants:
+            raise ValueError("An experiment needs at least one variant template")
+        for template_id, share in variants.items():
+            variant = get_template_by_id(template_id)
+            if variant.operation_type != control.operation_type:
+                raise ValueError(f"Variant {template_id} is not a {control.operation_type} template")
+            if template_id == control_template_id:
+                raise ValueError("The control template cannot also be a variant")
+            if share <= 0:
+                raise ValueError(f"Variant {template_id} needs a positive traffic share")
+        if sum(variants.values()) > 100:
+            raise ValueError("Variant traffic shares exceed 100%")
+
+        self.experiment_id = experiment_id
+        self.operation_type = control.operation_type
+        self.control_template_id = control_template_id
+        self.variants = dict(variants)
+        self.description = description
+        self.started_at = datetime.utcnow()
+        self.stopped_at: Optional[datetime] = None
+        self.arms: Dict[str, TemplateArmStats] = {
+            template_id: TemplateArmStats(template_id)
+            for template_id in [control_template_id, *variants]
+        }
+
+    @property
+    def active(self) -> bool:
+        return self.stopped_at is None
+
+    def assign(self, unit_key: str) -> str:
+        """Template id for a unit of work (control unless the key hashes into a variant's share)."""
+        digest = hashlib.sha256(f"{self.experiment_id}:{unit_key}".encode("utf-8")).digest()
+        bucket = int.from_bytes(digest[:8], "big") % ASSIGNMENT_BUCKETS
+        threshold = 0.0
+        for template_id, share in self.variants.items():
+            threshold += share * ASSIGNMENT_BUCKETS / 100
+            if bucket < threshold:
+                return template_id
+        return self.control_template_id
+
+    def record(self, template_id: str, result: Any) -> None:
+        """Record a translation result (None for a failure) against its template."""
+        arm = self.arms.get(template_id)
+        if arm is None:
+            return
+        arm.record(result)
+        template = get_template_by_id(template_id)
+        confidence = getattr(result, "confidence_score", None)
+        metadata = getattr(result, "llm_provider", None)
+        template.update_metrics(
+            success=result is not None,
+            quality_score=confidence * 10 if confidence is not None else None,
+            response_time_ms=getattr(metadata, "processing_time_ms", None)
+        )
+        increment_counter(
+            "prompt_experiment_results", 1,
+            experiment=self.experiment_id, template=template_id, success=str(result is not None)
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Per-template averages with each variant's relative change against the control."""
+        control = self.arms[self.control_template_id].summary()
+        variants = []
+        for template_id in self.variants:
+            summary = self.arms[template_id].summary()
+            summary["traffic_percent"] = self.variants[template_id]
+            summary["change_vs_control"] = {
+                name: self._relative_change(summary[name], control[name])
+                for name in ("avg_tokens", "avg_input_tokens", "avg_output_tokens",
+                             "avg_latency_ms", "avg_confidence", "avg_cost_usd")
+            }
+            variants.append(summary)
+        control["traffic_percent"] = round(100 - sum(self.variants.values()), 2)
+        return {
+            "experiment_id": self.experiment_id,
+            "operation_type": self.operation_type,
+            "description": self.description,
+            "active": self.active,
+            "started_at": self.started_at.isoformat(),
+            "stopped_at": self.stopped_at.isoformat() if self.stopped_at else None,
+            "control": control,
+            "variants": variants,
+        }
+
+    @staticmethod
+    def _relative_change(value: Optional[float], baseline: Optional[float]) -> Optional[float]:
+        if value is None or not baseline:
+            return None
+        return round(value / baseline - 1, 4)
+
+
+class PromptExperimentManager:
+    """Registry of prompt experiments; at most one is active per operation type."""
+
+    def __init__(self):
+        self.experiments: Dict[str, PromptExperiment] = {}
+
+    def start(self, experiment: PromptExperiment) -> PromptExperiment:
+        """
+        Register and start an experiment.
+
+        Raises:
+            ValueError: If the id is taken or another experiment for the same
+                operation is active
+        """
+        if experiment.experiment_id in self.experiments:
+            raise ValueError(f"Experiment {experiment.experiment_id} already exists")
+        if self.active(experiment.operation_type) is not None:
+            raise ValueError(f"Another {experiment.operation_type} experiment is already active")
+        self.experiments[experiment.experiment_id] = experiment
+        logger.info(
+            f"Started prompt experiment {experiment.experiment_id}: "
+            f"{experiment.control_template_id} vs {', '.join(experiment.variants)}"
+        )
+        return experiment
+
+    def stop(self, experiment_id: str) -> PromptExperiment:
+        """
+        Stop assigning traffic to an experiment; its results stay in the report.
+
+        Raises:
+            KeyError: If the experiment does not exist
+        """
+        experiment = self.experiments[experiment_id]
+        if experiment.stopped_at is None:
+            experiment.stopped_at = datetime.utcnow()
+        return experiment
+
+    def active(self, operation_type: str = "function_translation") -> Optional[PromptExperiment]:
+        """The running experiment for an operation type, if any."""
+        for experiment in self.experiments.values():
+            if experiment.active and experiment.operation_type == operation_type:
+                return experiment
+        return None
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Comparison reports for all experiments, newest first."""
+        return [
+            experiment.report()
+            for experiment in sorted(self.experiments.values(), key=lambda e: e.started_at, reverse=True)
+        ]
+
+
+# Global instance for easy access
+prompt_experiment_manager = PromptExperimentManager()
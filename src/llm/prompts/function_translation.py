@@ -9,6 +9,13 @@ from typing import Dict, List
 from .base import PromptTemplate, PromptVersion, TranslationQuality
 
 
+# Claude's responses are scored from this section (AnthropicProvider._extract_confidence_score)
+CONFIDENCE_ASSESSMENT_INSTRUCTION = (
+    "\n\nEnd with a **Confidence Assessment**: how confident you are in this analysis, "
+    "as a percentage, and why."
+)
+
+
 # Function Translation - Standard Quality (v1)
 FUNCTION_TRANSLATION_STANDARD_V1 = PromptTemplate(
     template_id="function_translation_standard_v1",
@@ -84,10 +91,48 @@ Provide a clear, structured explanation in 2-4 paragraphs.""",
     provider_adaptations={
         "anthropic": {
             "system_prompt_suffix": "\n\nUse your reasoning capabilities to think through the analysis step by step. Be thorough but concise, and highlight any areas where you're uncertain about the interpretation.",
-            "user_prompt_suffix": "\n\nPlease think through this analysis carefully and show your reasoning for key conclusions."
+            "user_prompt_suffix": "\n\nPlease think through this analysis carefully and show your reasoning for key conclusions." + CONFIDENCE_ASSESSMENT_INSTRUCTION
         },
+        # OpenAI and Ollama send the same instructions in fewer tokens
         "openai": {
-            "user_prompt_suffix": "\n\nFormat your response with clear section headers if the analysis is complex."
+            "system_prompt_replace": """You are an expert binary analyst. Translate assembly and decompiled functions into clear natural language explanations for developers, security analysts and reverse engineers.
+
+Cover the function's purpose, parameters, return value, key logic flow, notable patterns or algorithms, security implications and relationships to other functions.""",
+            "user_prompt_replace": """Explain this function:
+
+**Function:**
+- Name: {function_name}
+- Address: {function_address} ({function_size} bytes)
+- Entry Point: {is_entry_point}
+- Calls to: {function_calls}
+- Variables: {variables}
+- File: {file_name} ({file_format}, {file_platform}, {file_architecture})
+- Related: functions {related_functions}; imports {relevant_imports}; strings {relevant_strings}
+
+**Assembly Code:**
+```assembly
+{assembly_code}
+```
+
+**Decompiled Code:**
+```c
+{decompiled_code}
+```
+
+Explain its purpose, parameters, logic flow, return value and security considerations in 2-4 paragraphs, with section headers if the analysis is complex."""
+        },
+        "ollama": {
+            "system_prompt_replace": "You are an expert reverse engineer. Explain clearly and accurately what binary functions do.",
+            "user_prompt_replace": """Explain what this function does.
+
+- Name: {function_name}
+- Address: {function_address} ({function_size} bytes)
+- Calls to: {function_calls}
+
+Assembly:
+{assembly_code}
+
+Cover its purpose, key operations and notable behavior."""
         },
         "gemini": {
             "system_prompt_suffix": "\n\nFocus on performance implications and competitive analysis insights where relevant.",
@@ -99,6 +144,43 @@ Provide a clear, structured explanation in 2-4 paragraphs.""",
 )
 
 
+# Function Translation - Standard Quality (v2)
+# Terser instructions than v1; a candidate for prompt experiments
+FUNCTION_TRANSLATION_STANDARD_V2 = PromptTemplate(
+    template_id="function_translation_standard_v2",
+    version=PromptVersion.V2,
+    operation_type="function_translation",
+    quality_level=TranslationQuality.STANDARD,
+    
+    system_prompt="""You are an expert binary analyst. Explain decompiled functions clearly and accurately for developers, security analysts and reverse engineers: purpose, inputs, outputs, logic and security-relevant behavior.""",
+
+    user_prompt_template="""Explain this function.
+
+**Function:** {function_name} at {function_address} ({function_size} bytes, entry point: {is_entry_point})
+
+**Assembly Code:**
+```assembly
+{assembly_code}
+```
+
+**Decompiled Code:**
+```c
+{decompiled_code}
+```
+
+**Calls:** {function_calls}
+**Variables:** {variables}
+
+Cover purpose, parameters, logic flow, return value and security considerations in 2-3 paragraphs.""",
+
+    expected_tokens=300,
+    temperature=0.1,
+    max_tokens=800,
+    
+    notes="Terse standard quality variant with fewer instruction tokens"
+)
+
+
 # Function Translation - Brief Quality (v1)
 FUNCTION_TRANSLATION_BRIEF_V1 = PromptTemplate(
     template_id="function_translation_brief_v1", 
@@ -142,7 +224,7 @@ Provide a concise 1-2 paragraph explanation covering:
     
     provider_adaptations={
         "anthropic": {
-            "user_prompt_suffix": "\n\nBe concise but thorough in your reasoning."
+            "user_prompt_suffix": "\n\nBe concise but thorough in your reasoning." + CONFIDENCE_ASSESSMENT_INSTRUCTION
         },
         "gemini": {
             "user_prompt_suffix": "\n\nFocus on performance and optimization aspects."
@@ -242,7 +324,7 @@ Provide a detailed, expert-level analysis in 4-8 paragraphs with specific techni
     provider_adaptations={
         "anthropic": {
             "system_prompt_suffix": "\n\nLeverage your deep reasoning capabilities to provide nuanced analysis with detailed justifications. Consider multiple interpretations and highlight areas of uncertainty.",
-            "user_prompt_suffix": "\n\nProvide detailed reasoning for your conclusions and highlight any areas where interpretation is uncertain or multiple explanations are possible."
+            "user_prompt_suffix": "\n\nProvide detailed reasoning for your conclusions and highlight any areas where interpretation is uncertain or multiple explanations are possible." + CONFIDENCE_ASSESSMENT_INSTRUCTION
         },
         "openai": {
             "user_prompt_suffix": "\n\nStructure your response with clear headings and subsections for easy navigation."
@@ -335,7 +417,7 @@ Focus on actionable security insights for defenders and analysts.""",
     provider_adaptations={
         "anthropic": {
             "system_prompt_suffix": "\n\nBe thorough in your security assessment but responsible in how you present potentially sensitive information. Focus on defensive applications.",
-            "user_prompt_suffix": "\n\nProvide detailed security reasoning while being responsible about potential misuse of this information."
+            "user_prompt_suffix": "\n\nProvide detailed security reasoning while being responsible about potential misuse of this information." + CONFIDENCE_ASSESSMENT_INSTRUCTION
         },
         "openai": {
             "user_prompt_suffix": "\n\nOrganize your security analysis with clear risk levels and defensive recommendations."
@@ -418,7 +500,7 @@ Provide technical analysis suitable for algorithm optimization and performance t
     provider_adaptations={
         "anthropic": {
             "system_prompt_suffix": "\n\nUse step-by-step reasoning to analyze the algorithmic complexity and provide detailed justifications for your assessments.",
-            "user_prompt_suffix": "\n\nShow your reasoning for complexity analysis and algorithm identification."
+            "user_prompt_suffix": "\n\nShow your reasoning for complexity analysis and algorithm identification." + CONFIDENCE_ASSESSMENT_INSTRUCTION
         },
         "openai": {
             "user_prompt_suffix": "\n\nInclude specific complexity notations and performance benchmarks where applicable."
@@ -439,7 +521,8 @@ FUNCTION_TRANSLATION_PROMPTS: Dict[str, Dict[str, PromptTemplate]] = {
         PromptVersion.V1: FUNCTION_TRANSLATION_BRIEF_V1
     },
     TranslationQuality.STANDARD: {
-        PromptVersion.V1: FUNCTION_TRANSLATION_STANDARD_V1
+        PromptVersion.V1: FUNCTION_TRANSLATION_STANDARD_V1,
+        PromptVersion.V2: FUNCTION_TRANSLATION_STANDARD_V2
     },
     TranslationQuality.COMPREHENSIVE: {
         PromptVersion.V1: FUNCTION_TRANSLATION_COMPREHENSIVE_V1
@@ -7,7 +7,7 @@ context, provider capabilities, and analysis requirements.
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, FrozenSet, Iterable, Optional, List, Tuple
 from enum import Enum
 
 from .base import (
@@ -26,6 +26,11 @@ from ..base import TranslationOperationType
 
 logger = get_logger(__name__)
 
+# BinaryProfile traits grouped by the prompt adaptation they trigger
+COMPLEXITY_TRAITS = frozenset({"high_function_count", "complex_imports"})
+SECURITY_TRAITS = frozenset({"suspicious_apis", "obfuscated_strings", "crypto_functions", "packed"})
+PERFORMANCE_TRAITS = frozenset({"optimization_patterns", "simd_instructions"})
+
 
 class AnalysisContext(str, Enum):
     """Context types for intelligent prompt selection."""
@@ -49,7 +54,15 @@ class ContextualPromptManager:
         self.templates: Dict[str, PromptTemplate] = {}
         self.context_preferences: Dict[AnalysisContext, Dict[str, Any]] = {}
         self.provider_preferences: Dict[str, Dict[str, Any]] = {}
+        # Selections by (operation, provider, context, quality, binary traits)
+        self._selection_cache: Dict[
+            Tuple[Any, str, AnalysisContext, Optional[TranslationQuality], FrozenSet[str]], PromptTemplate
+        ] = {}
         self._setup_default_preferences()
+    
+    def clear_selection_cache(self) -> None:
+        """Forget cached selections; call after changing context or provider preferences."""
+        self._selection_cache.clear()
         
     def _setup_default_preferences(self) -> None:
         """Setup default context and provider preferences."""
@@ -171,24 +184,60 @@ class ContextualPromptManager:
         self,
         operation_type: TranslationOperationType,
         provider_id: str,
-        context: AnalysisContext = AnalysisContext.REVERSE_ENGINEERING,
+        context: Optional[AnalysisContext] = AnalysisContext.REVERSE_ENGINEERING,
         quality_override: Optional[TranslationQuality] = None,
-        data_characteristics: Optional[Dict[str, Any]] = None
+        data_characteristics: Optional[Dict[str, Any]] = None,
+        binary_traits: Optional[Iterable[str]] = None
     ) -> PromptTemplate:
         """
         Intelligently select the most appropriate prompt template.
         
+        Selections are cached by (operation, provider, context, quality,
+        traits), so a job passing its BinaryProfile traits resolves every
+        prompt after the first with one lookup.
+        
         Args:
             operation_type: Type of translation operation
             provider_id: LLM provider identifier
-            context: Analysis context for intelligent selection
+            context: Analysis context for intelligent selection (None for the standard templates)
             quality_override: Override default quality level
-            data_characteristics: Characteristics of the data being analyzed
+            data_characteristics: Ad-hoc characteristics (analyze_data_characteristics output)
+            binary_traits: Precomputed BinaryProfile traits of the binary
             
         Returns:
             Optimally selected prompt template
         """
+        traits = frozenset(binary_traits or ())
+        if data_characteristics:
+            traits |= self._traits_from_characteristics(data_characteristics)
+        
+        cache_key = (operation_type, provider_id, context, quality_override, traits)
+        cached = self._selection_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
+        template = self._select_prompt(operation_type, provider_id, context, quality_override, traits)
+        self._selection_cache[cache_key] = template
+        return template
+    
+    @staticmethod
+    def _traits_from_characteristics(data_characteristics: Dict[str, Any]) -> FrozenSet[str]:
+        """Flatten an analyze_data_characteristics result into the set of true indicators."""
+        return frozenset(
+            name
+            for indicators in data_characteristics.values() if isinstance(indicators, dict)
+            for name, value in indicators.items() if value
+        )
+    
+    def _select_prompt(
+        self,
+        operation_type: TranslationOperationType,
+        provider_id: str,
+        context: Optional[AnalysisContext],
+        quality_override: Optional[TranslationQuality],
+        traits: FrozenSet[str]
+    ) -> PromptTemplate:
+        """Resolve a prompt template from the context preferences (uncached)."""
         # Get context preferences
         context_prefs = self.context_preferences.get(context, {})
         
@@ -202,9 +251,10 @@ class ContextualPromptManager:
             specialized_type = specialized_prefs[operation_type.value]
         
         # Adapt based on data characteristics
-        if data_characteristics:
+        if traits:
             quality_level, specialized_type = self._adapt_for_data_characteristics(
-                quality_level, specialized_type, data_characteristics, context
+                quality_level, specialized_type, traits, context,
+                brief_requested=quality_override == TranslationQuality.BRIEF
             )
         
         # Select appropriate prompt template
@@ -220,7 +270,7 @@ class ContextualPromptManager:
             else:
                 raise ValueError(f"Unknown operation type: {operation_type}")
             
-            logger.info(f"Selected prompt: {template.template_id} for {operation_type} with {provider_id}")
+            logger.debug(f"Selected prompt: {template.template_id} for {operation_type} with {provider_id}")
             return template
             
         except KeyError as e:
@@ -239,18 +289,20 @@ class ContextualPromptManager:
         self,
         quality_level: TranslationQuality,
         specialized_type: Optional[str],
-        data_characteristics: Dict[str, Any],
-        context: AnalysisContext
+        traits: FrozenSet[str],
+        context: AnalysisContext,
+        brief_requested: bool = False
     ) -> Tuple[TranslationQuality, Optional[str]]:
-        """Adapt prompt selection based on data characteristics."""
+        """
+        Adapt prompt selection based on the binary's characteristic traits.
         
-        # Adapt based on data complexity
-        complexity_indicators = data_characteristics.get("complexity_indicators", {})
+        An explicitly requested brief quality (e.g. a brief-tier function) is
+        kept; only a context's default brief quality is upgraded.
+        """
         
         # High complexity data may benefit from comprehensive analysis
-        if complexity_indicators.get("high_function_count", False) or \
-           complexity_indicators.get("complex_imports", False):
-            if quality_level == TranslationQuality.BRIEF:
+        if traits & COMPLEXITY_TRAITS:
+            if quality_level == TranslationQuality.BRIEF and not brief_requested:
                 quality_level = TranslationQuality.STANDARD
             elif quality_level == TranslationQuality.STANDARD and context in [
                 AnalysisContext.VULNERABILITY_RESEARCH, AnalysisContext.SOFTWARE_AUDIT
@@ -258,21 +310,14 @@ class ContextualPromptManager:
                 quality_level = TranslationQuality.COMPREHENSIVE
         
         # Adapt based on security indicators
-        security_indicators = data_characteristics.get("security_indicators", {})
-        if security_indicators.get("suspicious_apis", False) or \
-           security_indicators.get("obfuscated_strings", False) or \
-           security_indicators.get("crypto_functions", False):
-            
+        if traits & SECURITY_TRAITS:
             # Switch to security-focused analysis
             if not specialized_type or specialized_type not in ["security_analysis", "malware_analysis"]:
                 if context in [AnalysisContext.MALWARE_ANALYSIS, AnalysisContext.THREAT_INTELLIGENCE]:
                     specialized_type = "security_analysis"
         
         # Adapt based on performance indicators
-        performance_indicators = data_characteristics.get("performance_indicators", {})
-        if performance_indicators.get("optimization_patterns", False) or \
-           performance_indicators.get("simd_instructions", False):
-            
+        if traits & PERFORMANCE_TRAITS:
             if context == AnalysisContext.PERFORMANCE_ANALYSIS:
                 specialized_type = "algorithm_analysis"
         
@@ -383,6 +428,9 @@ class ContextualPromptManager:
         """
         Analyze data characteristics to inform prompt selection.
         
+        For ad-hoc data; decompiled binaries carry a precomputed BinaryProfile
+        whose traits can be passed to select_prompt directly.
+        
         Args:
             data: Analysis data to characterize
             
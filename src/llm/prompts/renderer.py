@@ -0,0 +1,88 @@
+"""
+Compiled Prompt Rendering
+
+User prompt templates are parsed once into literal and field segments and
+rendered by writing the segments in order, either joined into one string or
+into a caller-owned buffer that can be reused across renders. Large fields
+such as assembly listings are written as-is instead of going through
+str.format for every function.
+"""
+
+import string
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+
+# Compiled templates kept by compile_prompt (one per distinct template string)
+COMPILED_PROMPT_CACHE_SIZE = 256
+
+_formatter = string.Formatter()
+
+
+class CompiledPrompt:
+    """
+    A str.format template parsed into segments.
+
+    Produces the same text as template.format(**context). Templates using
+    attribute/index lookups or nested format specs are rendered with
+    str.format directly.
+    """
+
+    __slots__ = ("template", "fields", "_segments", "_simple")
+
+    def __init__(self, template: str):
+        self.template = template
+        self._segments: List[Tuple[str, Optional[str], str, Optional[str]]] = list(_formatter.parse(template))
+        self.fields = tuple(dict.fromkeys(name for _, name, _, _ in self._segments if name is not None))
+        self._simple = all(
+            name.isidentifier() and "{" not in (spec or "")
+            for _, name, spec, _ in self._segments if name is not None
+        )
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Render the template with context variables.
+
+        Raises:
+            KeyError: If a required template variable is missing
+        """
+        if not self._simple:
+            return self._format(context)
+        return "".join(self._parts(context))
+
+    def render_into(self, buffer: TextIO, context: Dict[str, Any]) -> None:
+        """Write the rendered template to buffer (e.g. a reused io.StringIO)."""
+        if not self._simple:
+            buffer.write(self._format(context))
+            return
+        for part in self._parts(context):
+            buffer.write(part)
+
+    def _parts(self, context: Dict[str, Any]) -> List[str]:
+        parts = []
+        for literal, name, spec, conversion in self._segments:
+            if literal:
+                parts.append(literal)
+            if name is None:
+                continue
+            try:
+                value = context[name]
+            except KeyError:
+                raise KeyError(f"Missing required template variable: {name}")
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            parts.append(value if type(value) is str and not spec else format(value, spec))
+        return parts
+
+    def _format(self, context: Dict[str, Any]) -> str:
+        try:
+            return self.template.format(**context)
+        except KeyError as e:
+            missing_var = str(e).strip("'")
+            raise KeyError(f"Missing required template variable: {missing_var}")
+
+
+@lru_cache(maxsize=COMPILED_PROMPT_CACHE_SIZE)
+def compile_prompt(template: str) -> CompiledPrompt:
+    """Compile a template string, reusing the compiled form for repeated templates."""
+    return CompiledPrompt(template)
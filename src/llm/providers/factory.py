@@ -7,7 +7,7 @@ load balancing, and intelligent provider selection based on cost, performance, a
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 from ..base import (
@@ -18,6 +18,7 @@ from ..base import (
     ProviderHealthStatus,
     TranslationOperationType
 )
+from ..hedging import ProviderStats, get_live_stats
 from ...core.logging import get_logger
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
@@ -27,41 +28,6 @@ from .ollama_provider import OllamaProvider
 logger = get_logger(__name__)
 
 
-@dataclass
-class ProviderStats:
-    """Statistics and metrics for a provider."""
-    total_requests: int = 0
-    successful_requests: int = 0
-    failed_requests: int = 0
-    total_tokens: int = 0
-    total_cost: float = 0.0
-    average_latency_ms: float = 0.0
-    last_used: Optional[datetime] = None
-    consecutive_failures: int = 0
-    health_check_failures: int = 0
-    
-    @property
-    def success_rate(self) -> float:
-        """Calculate success rate as percentage."""
-        if self.total_requests == 0:
-            return 100.0
-        return (self.successful_requests / self.total_requests) * 100.0
-    
-    @property
-    def failure_rate(self) -> float:
-        """Calculate failure rate as percentage."""
-        return 100.0 - self.success_rate
-    
-    @property
-    def is_healthy(self) -> bool:
-        """Check if provider appears healthy based on stats."""
-        return (
-            self.consecutive_failures < 5 and 
-            self.health_check_failures < 3 and
-            self.success_rate >= 80.0
-        )
-
-
 @dataclass 
 class ProviderPreferences:
     """User preferences for LLM provider selection."""
@@ -145,7 +111,8 @@ class LLMProviderFactory:
         
         # Initialize stats if not exists
         if provider_id not in self.provider_stats:
-            self.provider_stats[provider_id] = ProviderStats()
+            # Shared with translation jobs, which record their live request latencies
+            self.provider_stats[provider_id] = get_live_stats(provider_id)
         
         logger.info(f"Added provider configuration: {provider_id}")
     
@@ -284,20 +251,29 @@ class LLMProviderFactory:
         if not available_providers:
             raise AllProvidersUnavailableException(0, {})
         
-        best_provider = available_providers[0]
-        lowest_latency = float('inf')
-        
-        for provider_id in available_providers:
-            health = self._last_health_checks.get(provider_id)
-            if health and health.api_latency_ms:
-                latency = health.api_latency_ms
-                if latency < lowest_latency:
-                    lowest_latency = latency
-                    best_provider = provider_id
+        best_provider = self._rank_providers_by_latency(available_providers)[0]
+        lowest_latency = self._live_latency_ms(best_provider) or float('inf')
         
         logger.info(f"Selected performance-optimized provider: {best_provider} (latency: {lowest_latency:.1f}ms)")
         return best_provider
     
+    def _live_latency_ms(self, provider_id: str) -> Optional[float]:
+        """Expected latency from live request stats, falling back to the last health check."""
+        stats = self.provider_stats.get(provider_id)
+        if stats and stats.expected_latency_ms is not None:
+            return stats.expected_latency_ms
+        health = self._last_health_checks.get(provider_id)
+        return health.api_latency_ms if health and health.api_latency_ms else None
+    
+    def _rank_providers_by_latency(self, available_providers: List[str]) -> List[str]:
+        """Order providers fastest first; providers without latency data go last."""
+        def sort_key(item: Tuple[int, str]) -> Tuple[float, int]:
+            position, provider_id = item
+            latency = self._live_latency_ms(provider_id)
+            return (latency if latency is not None else float('inf'), position)
+        
+        return [provider_id for _, provider_id in sorted(enumerate(available_providers), key=sort_key)]
+    
     def _select_balanced_provider(
         self, 
         available_providers: List[str], 
@@ -328,16 +304,17 @@ class LLMProviderFactory:
         stats = self.provider_stats.get(provider_id, ProviderStats())
         health = self._last_health_checks.get(provider_id)
         
-        # Base score from success rate
-        score = stats.success_rate / 100.0  # 0.0 - 1.0
+        # Base score from overall and recent success rate
+        score = min(stats.success_rate / 100.0, 1.0 - stats.error_rate_ewma)  # 0.0 - 1.0
         
         # Penalty for consecutive failures
         failure_penalty = min(0.3, stats.consecutive_failures * 0.1)
         score -= failure_penalty
         
-        # Bonus for low latency (if available)
-        if health and health.api_latency_ms:
-            latency_bonus = max(0.0, (1000 - health.api_latency_ms) / 1000) * 0.2
+        # Bonus for low latency (live request latency, else last health check)
+        latency_ms = self._live_latency_ms(provider_id)
+        if latency_ms:
+            latency_bonus = max(0.0, (1000 - latency_ms) / 1000) * 0.2
             score += latency_bonus
         
         # Cost factor (lower cost = higher score)
@@ -502,28 +479,11 @@ class LLMProviderFactory:
         latency_ms: int
     ) -> None:
         """Record successful request statistics."""
-        stats = self.provider_stats[provider_id]
-        stats.total_requests += 1
-        stats.successful_requests += 1
-        stats.total_tokens += tokens_used
-        stats.total_cost += cost
-        stats.last_used = datetime.utcnow()
-        stats.consecutive_failures = 0  # Reset failure counter
-        
-        # Update rolling average latency
-        if stats.average_latency_ms == 0:
-            stats.average_latency_ms = latency_ms
-        else:
-            # Exponential moving average
-            stats.average_latency_ms = 0.7 * stats.average_latency_ms + 0.3 * latency_ms
+        self.provider_stats[provider_id].record_success(tokens_used, cost, latency_ms)
     
     def record_request_failure(self, provider_id: str, error: Exception) -> None:
         """Record failed request statistics."""
-        stats = self.provider_stats[provider_id]
-        stats.total_requests += 1
-        stats.failed_requests += 1
-        stats.consecutive_failures += 1
-        stats.last_used = datetime.utcnow()
+        self.provider_stats[provider_id].record_failure()
         
         logger.warning(f"Request failed for provider {provider_id}: {error}")
     
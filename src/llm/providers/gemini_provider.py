@@ -6,18 +6,21 @@ Supports Gemini-pro, Gemini-pro-vision, Gemini-flash with multimodal capabilitie
 """
 
 import asyncio
+import functools
 import json
 import re
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
 import httpx
 from google import generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from google.generativeai.types import GenerationConfig, HarmCategory, HarmBlockThreshold
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..base import (
+    IMPORT_CONTEXT_UNAVAILABLE,
+    IMPORT_SUMMARY_UNAVAILABLE,
     LLMProvider, 
     LLMConfig, 
     LLMProviderException, 
@@ -66,11 +69,21 @@ class GeminiProvider(LLMProvider):
         "gemini-flash": {"context_window": 32768, "multimodal": False}
     }
     
+    # Static prompt prefixes are stored as Gemini cached content when large enough
+    supports_prompt_caching = True
+    max_strings_per_request = 40
+    CONTEXT_CACHE_MIN_TOKENS = 4096
+    CONTEXT_CACHE_TTL_SECONDS = 3600
+    
     def __init__(self, config: LLMConfig):
         """Initialize Gemini provider with configuration."""
         super().__init__(config)
         self.genai_model = None
-        self._token_count_cache: Dict[str, int] = {}
+        self._generation_config: Optional[GenerationConfig] = None
+        self._safety_settings: Optional[Dict[Any, Any]] = None
+        self._cached_contents: Dict[str, Any] = {}
+        self._uncacheable_prefixes: set = set()
+        self._cache_lock = asyncio.Lock()
         
     async def initialize(self) -> None:
         """Initialize the Gemini client and configuration."""
@@ -97,6 +110,8 @@ class GeminiProvider(LLMProvider):
                 HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE  # Allow security content
             }
             
+            self._generation_config = generation_config
+            self._safety_settings = safety_settings
             self.genai_model = genai.GenerativeModel(
                 model_name=model_name,
                 generation_config=generation_config,
@@ -115,29 +130,77 @@ class GeminiProvider(LLMProvider):
     
     async def cleanup(self) -> None:
         """Cleanup Gemini client resources."""
-        # Gemini client doesn't require explicit cleanup
+        # Delete context caches created by this provider so they stop accruing storage cost
+        for cached_content in self._cached_contents.values():
+            try:
+                await asyncio.get_event_loop().run_in_executor(None, cached_content.delete)
+            except Exception:
+                pass
+        self._cached_contents.clear()
         self.genai_model = None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((Exception,))  # Gemini uses generic exceptions
-    )
+    async def _get_cached_model(self, prefix: str):
+        """
+        Get a model bound to cached content holding the static prompt prefix.
+        
+        Args:
+            prefix: Static prompt prefix (instructions and binary context)
+            
+        Returns:
+            GenerativeModel using the cached content, or None when the prefix is
+            below the caching minimum or caching is unavailable
+        """
+        min_tokens = self.config.provider_specific.get("context_cache_min_tokens", self.CONTEXT_CACHE_MIN_TOKENS)
+        if self.count_tokens(prefix) < min_tokens:
+            return None
+        
+        key = self._prompt_cache_key(prefix)
+        if key in self._uncacheable_prefixes:
+            return None
+        
+        async with self._cache_lock:
+            cached_content = self._cached_contents.get(key)
+            if cached_content is None:
+                try:
+                    cached_content = await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        functools.partial(
+                            genai.caching.CachedContent.create,
+                            model=self.config.default_model,
+                            contents=[prefix],
+                            ttl=timedelta(seconds=self.CONTEXT_CACHE_TTL_SECONDS)
+                        )
+                    )
+                except Exception:
+                    # Model or account without context caching: fall back to plain prompts
+                    self._uncacheable_prefixes.add(key)
+                    increment_counter("llm_prompt_cache_failures", 1, provider="gemini")
+                    return None
+                self._cached_contents[key] = cached_content
+        
+        return genai.GenerativeModel.from_cached_content(
+            cached_content,
+            generation_config=self._generation_config,
+            safety_settings=self._safety_settings
+        )
+    
     async def _make_completion_request(
         self, 
         prompt: str,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        cacheable_prefix: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Make completion request with retry logic."""
+        """Make a completion request through the shared rate limiter."""
         if not self.genai_model:
             raise LLMServiceUnavailableException(self.get_provider_id(), "Model not initialized")
         
         try:
             start_time = time.time()
             
-            # Update generation config if overrides provided
+            # Per-request generation overrides apply to whichever model serves the call
+            generation_config = None
             if temperature is not None or max_tokens is not None:
                 generation_config = GenerationConfig(
                     temperature=temperature or self.config.temperature,
@@ -145,24 +208,45 @@ class GeminiProvider(LLMProvider):
                     top_p=0.8,
                     top_k=40
                 )
-                
-                # Create new model instance with updated config if needed
-                if model and model != self.config.default_model:
-                    temp_model = genai.GenerativeModel(
-                        model_name=model,
-                        generation_config=generation_config
-                    )
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None, temp_model.generate_content, prompt
-                    )
-                else:
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None, self.genai_model.generate_content, prompt
-                    )
-            else:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, self.genai_model.generate_content, prompt
+            
+            # Serve the static prefix from a context cache when possible; otherwise
+            # send it first so implicit prefix caching can still apply. Cached content
+            # is bound to the default model, so another model always gets it inline.
+            cached_model = None
+            if model and model != self.config.default_model:
+                generator = genai.GenerativeModel(
+                    model_name=model,
+                    generation_config=generation_config or self._generation_config,
+                    safety_settings=self._safety_settings
                 )
+            else:
+                generator = self.genai_model
+                if cacheable_prefix:
+                    cached_model = await self._get_cached_model(cacheable_prefix)
+                if cached_model is not None:
+                    generator = cached_model
+            if cacheable_prefix and cached_model is None:
+                prompt = f"{cacheable_prefix}\n\n{prompt}"
+            
+            generate = functools.partial(generator.generate_content, prompt)
+            if generation_config is not None:
+                generate = functools.partial(generator.generate_content, prompt, generation_config=generation_config)
+            
+            estimated_tokens = self._estimate_request_tokens(
+                [prompt], max_tokens or self.config.max_tokens, model
+            )
+            
+            def limited_tokens(response) -> int:
+                usage_metadata = getattr(response, "usage_metadata", None)
+                total = getattr(usage_metadata, "total_token_count", 0)
+                return total if isinstance(total, int) else 0
+            
+            response = await self._rate_limited_call(
+                lambda: asyncio.get_event_loop().run_in_executor(None, generate),
+                estimated_tokens,
+                (ResourceExhausted,),
+                limited_tokens
+            )
             
             processing_time_ms = int((time.time() - start_time) * 1000)
             
@@ -170,7 +254,15 @@ class GeminiProvider(LLMProvider):
             content = response.text if response.text else ""
             
             # Estimate token usage (Gemini doesn't always provide exact counts)
-            input_tokens = self.count_tokens(prompt)
+            usage_metadata = getattr(response, "usage_metadata", None)
+            cached_tokens = getattr(usage_metadata, "cached_content_token_count", 0)
+            cached_tokens = cached_tokens if isinstance(cached_tokens, int) else 0
+            if cached_model is not None and not cached_tokens:
+                cached_tokens = self.count_tokens(cacheable_prefix)
+            if cached_tokens:
+                increment_counter("llm_prompt_cache_read_tokens", cached_tokens, provider="gemini")
+            
+            input_tokens = self.count_tokens(prompt) + (cached_tokens if cached_model is not None else 0)
             output_tokens = self.count_tokens(content)
             total_tokens = input_tokens + output_tokens
             
@@ -180,6 +272,7 @@ class GeminiProvider(LLMProvider):
                 "tokens_used": total_tokens,
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
+                "cached_input_tokens": cached_tokens,
                 "processing_time_ms": processing_time_ms
             }
             
@@ -187,7 +280,7 @@ class GeminiProvider(LLMProvider):
             error_message = str(e).lower()
             
             # Handle different types of Gemini errors
-            if "quota exceeded" in error_message or "rate limit" in error_message:
+            if isinstance(e, ResourceExhausted) or "quota exceeded" in error_message or "rate limit" in error_message:
                 raise LLMRateLimitException(self.get_provider_id())
             elif "invalid api key" in error_message or "unauthorized" in error_message:
                 raise LLMAuthenticationException(self.get_provider_id(), str(e))
@@ -208,15 +301,15 @@ class GeminiProvider(LLMProvider):
             OperationType.LLM_REQUEST,
             "gemini_function_translation",
             provider="gemini",
-            model=self.config.model_name,
-            operation_type="function_translation",
+            model=self.config.default_model,
+            operation="function_translation",
             function_name=function_data.get('name', 'unknown')
         ):
             # Increment attempt counter
             increment_counter("llm_requests", 1, 
                             provider="gemini", 
                             operation="function_translation",
-                            model=self.config.model_name)
+                            model=self.config.default_model)
             
             try:
                 # Call with circuit breaker protection
@@ -232,7 +325,7 @@ class GeminiProvider(LLMProvider):
                 increment_counter("llm_failures", 1,
                                 provider="gemini",
                                 operation="function_translation",
-                                model=self.config.model_name,
+                                model=self.config.default_model,
                                 error_type=e.__class__.__name__)
                 raise
 
@@ -243,52 +336,16 @@ class GeminiProvider(LLMProvider):
     ) -> FunctionTranslation:
         """Internal method to perform function translation."""
         try:
-            prompt = f"""You are an expert binary analysis assistant specializing in performance analysis and code optimization. Analyze this decompiled function with focus on efficiency, algorithms, and optimization opportunities.
-
-            **Function Information:**
-            - Name: {function_data.get('name', 'unknown')}
-            - Address: {function_data.get('address', 'unknown')}  
-            - Size: {function_data.get('size', 0)} bytes
-            - Complexity: {function_data.get('complexity_score', 'unknown')}
-
-            **Assembly Code:**
-            ```assembly
-            {function_data.get('assembly_code', 'Not available')}
-            ```
-
-            **Decompiled Code:**
-            ```c
-            {function_data.get('decompiled_code', 'Not available')}
-            ```
-
-            **Function Context:**
-            - Calls to: {', '.join(function_data.get('calls_to', [])) or 'None'}
-            - Variables: {', '.join(function_data.get('variables', [])) or 'None'}
-
-            **Additional Context:**
-            {json.dumps(context or {}, indent=2)}
-
-            Please provide analysis focusing on:
-
-            1. **Function Purpose**: What does this function accomplish?
-
-            2. **Algorithm Analysis**: What algorithms or patterns are used?
-
-            3. **Performance Characteristics**: Efficiency, complexity, bottlenecks
-
-            4. **Optimization Opportunities**: How could this be optimized?
-
-            5. **SIMD/Vectorization**: Any SIMD instructions or vectorization opportunities?
-
-            6. **Memory Usage**: Stack usage, heap allocations, memory patterns
-
-            7. **Security Considerations**: Buffer overflows, input validation, etc.
-
-            8. **Competitive Insights**: How does this compare to common implementations?
-
-            Provide detailed technical analysis with actionable insights."""
-
-            response = await self._make_completion_request(prompt)
+            # Instructions and binary-level context form the static, cacheable prefix
+            prompt = self.build_function_prompt(function_data, context)
+            static_prefix = prompt.system_prompt
+            if prompt.static_context:
+                static_prefix = f"{static_prefix}\n\n{prompt.static_context}"
+
+            response = await self._make_completion_request(
+                prompt.user_prompt,
+                cacheable_prefix=static_prefix
+            )
         
             content = response["content"]
         
@@ -302,7 +359,9 @@ class GeminiProvider(LLMProvider):
             model=response["model"],
             tokens_used=response["tokens_used"],
             processing_time_ms=response["processing_time_ms"],
-            cost_estimate=self._calculate_cost(response["input_tokens"], response["output_tokens"], response["model"])
+            cost_estimate=self._calculate_cost(response["input_tokens"], response["output_tokens"], response["model"]),
+            input_tokens=response["input_tokens"],
+            output_tokens=response["output_tokens"]
             )
             provider_metadata.api_version = "v1"
         
@@ -327,7 +386,7 @@ class GeminiProvider(LLMProvider):
             increment_counter("llm_failures", 1,
                             provider="gemini",
                             operation="function_translation",
-                            model=self.config.model_name,
+                            model=self.config.default_model,
                             error_type=e.__class__.__name__)
             raise
     
@@ -377,20 +436,21 @@ Focus on providing actionable competitive intelligence and performance insights.
         )
         provider_metadata.api_version = "v1"
         
-        for import_item in import_list:
-            import_analysis = self._extract_import_competitive_analysis(content, import_item)
+        for position, import_item in enumerate(import_list):
+            import_analysis = self._extract_import_competitive_analysis(content, import_list, position)
             
             translation = ImportTranslation(
                 library_name=import_item.get('library', 'unknown'),
                 function_name=import_item.get('function', 'unknown'),
-                api_documentation_summary=import_analysis.get('functionality', 'Analysis not available'),
-                usage_context=import_analysis.get('usage_patterns', 'Context not available'),
+                api_documentation_summary=import_analysis['functionality'] or IMPORT_SUMMARY_UNAVAILABLE,
+                usage_context=import_analysis['usage_patterns'] or IMPORT_CONTEXT_UNAVAILABLE,
                 parameters_description=import_analysis.get('parameters'),
                 return_value_description=import_analysis.get('returns'),
                 security_implications=import_analysis.get('security'),
                 alternative_apis=import_analysis.get('alternatives', []),
                 common_misuses=import_analysis.get('misuses', []),
-                confidence_score=0.85,  # Gemini provides detailed analysis
+                # Gemini provides detailed analysis when it covers the import
+                confidence_score=0.85 if import_analysis['functionality'] else 0.3,
                 llm_provider=provider_metadata
             )
             translations.append(translation)
@@ -407,8 +467,7 @@ Focus on providing actionable competitive intelligence and performance insights.
         if not string_list:
             return []
         
-        # Process strings in batches for efficiency
-        limited_strings = string_list[:40]  # Larger batch for efficient Gemini processing
+        limited_strings = string_list[:self.max_strings_per_request]
         
         prompt = f"""You are an expert at analyzing strings for performance patterns, optimization hints, and competitive insights.
 
@@ -644,21 +703,7 @@ Provide detailed, actionable insights for technical and business stakeholders.""
         output_cost = (output_tokens / 1000) * costs["output"]
         
         return input_cost + output_cost
-    
-    def count_tokens(self, text: str) -> int:
-        """Count tokens using approximation."""
-        if text in self._token_count_cache:
-            return self._token_count_cache[text]
-        
-        # Gemini uses similar tokenization to other models
-        token_count = max(1, len(text) // 4)
         
-        # Cache the result
-        if len(self._token_count_cache) < 1000:
-            self._token_count_cache[text] = token_count
-        
-        return token_count
-    
     def _calculate_cost(self, input_tokens: int, output_tokens: int, model: str) -> Optional[float]:
         """Calculate actual cost based on token usage."""
         if model not in self.MODEL_COSTS:
@@ -720,17 +765,24 @@ Provide detailed, actionable insights for technical and business stakeholders.""
         
         return sections
     
-    def _extract_import_competitive_analysis(self, content: str, import_item: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_import_competitive_analysis(
+        self,
+        content: str,
+        import_list: List[Dict[str, Any]],
+        position: int
+    ) -> Dict[str, Any]:
         """Extract competitive analysis for imports."""
-        function_name = import_item.get('function', 'unknown')
+        section = self._extract_import_section(content, import_list, position)
+        if section is None:
+            return {'functionality': None, 'usage_patterns': None, 'alternatives': [], 'security': None, 'misuses': []}
         
-        # Placeholder for sophisticated parsing
+        # Sections follow the numbered headings requested in the prompt
         return {
-            'functionality': f"Competitive analysis for {function_name}",
-            'usage_patterns': "Performance-optimized usage patterns",
-            'alternatives': ['Alternative implementations'],
-            'security': "Security considerations from competitive perspective",
-            'misuses': ['Common performance anti-patterns']
+            'functionality': self._extract_import_field(section, 'API Functionality') or section,
+            'usage_patterns': self._extract_import_field(section, 'Common Usage Patterns'),
+            'alternatives': [],
+            'security': self._extract_import_field(section, 'Security Considerations'),
+            'misuses': []
         }
     
     def _extract_string_performance_analysis(self, content: str, string_item: Dict[str, Any]) -> Dict[str, Any]:
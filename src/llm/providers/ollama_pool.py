@@ -0,0 +1,324 @@
+"""
+Ollama Endpoint Pool
+
+Schedules requests across one or more Ollama servers. Each server's
+parallelism (OLLAMA_NUM_PARALLEL) is discovered by probing, requests beyond
+the total capacity wait in a local FIFO queue, and work goes to the endpoint
+with the fewest outstanding requests relative to its parallelism. Loaded
+models are kept resident with periodic keep_alive pings. One pool per
+endpoint set is shared by every provider (and so every job) in the process.
+"""
+
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
+import httpx
+from openai import AsyncOpenAI
+
+from ...core.logging import get_logger
+from ...core.metrics import increment_counter, set_gauge
+
+
+logger = get_logger(__name__)
+
+# Parallelism assumed when discovery fails (Ollama's conservative default)
+DEFAULT_PARALLELISM = 1
+
+# Largest parallelism probed; probe sizes double from 2 up to this
+MAX_PROBE_PARALLELISM = 8
+
+# A probe batch counts as parallel if it finishes within this multiple of a single request
+PARALLEL_PROBE_TOLERANCE = 1.6
+
+# How long Ollama keeps a model loaded after a request, and how often it is refreshed
+DEFAULT_KEEP_ALIVE = "30m"
+KEEP_ALIVE_INTERVAL_SECONDS = 240.0
+
+# How long an endpoint that failed to connect is skipped
+ENDPOINT_RETRY_SECONDS = 30.0
+
+# Discovered parallelism per (native URL, model), shared by provider instances
+_discovered_parallelism: Dict[tuple, int] = {}
+
+
+def native_api_url(endpoint_url: str) -> str:
+    """Ollama's native API root for an OpenAI-compatible base URL."""
+    url = endpoint_url.rstrip("/")
+    return url[:-3] if url.endswith("/v1") else url
+
+
+class OllamaEndpoint:
+    """One Ollama server: OpenAI-compatible client, native API client and load counters."""
+
+    def __init__(self, endpoint_url: str, api_key: str, timeout_seconds: float, parallelism: Optional[int] = None):
+        self.endpoint_url = endpoint_url
+        self.native_url = native_api_url(endpoint_url)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=endpoint_url,
+            timeout=timeout_seconds,
+            max_retries=2,  # Fewer retries for local server
+        )
+        self.http = httpx.AsyncClient(base_url=self.native_url, timeout=timeout_seconds)
+        self.configured_parallelism = parallelism
+        self.parallelism = parallelism or DEFAULT_PARALLELISM
+        self.outstanding = 0
+        self.completed = 0
+        self.failures = 0
+        self.unavailable_until = 0.0
+
+    @property
+    def load(self) -> float:
+        """Outstanding requests relative to parallelism."""
+        return self.outstanding / self.parallelism
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.outstanding < self.parallelism
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.unavailable_until
+
+    async def keep_alive(self, model: str, keep_alive: str = DEFAULT_KEEP_ALIVE) -> None:
+        """Load a model (if needed) and extend how long Ollama keeps it resident."""
+        response = await self.http.post("/api/generate", json={"model": model, "keep_alive": keep_alive})
+        response.raise_for_status()
+
+    async def _probe(self, model: str, count: int, keep_alive: str) -> float:
+        """Wall time of count concurrent one-token generations."""
+        payload = {
+            "model": model,
+            "prompt": "OK",
+            "stream": False,
+            "keep_alive": keep_alive,
+            "options": {"num_predict": 1},
+        }
+        start = time.monotonic()
+        responses = await asyncio.gather(*(self.http.post("/api/generate", json=payload) for _ in range(count)))
+        for response in responses:
+            response.raise_for_status()
+        return time.monotonic() - start
+
+    async def discover_parallelism(self, model: str, keep_alive: str = DEFAULT_KEEP_ALIVE) -> int:
+        """
+        Find how many requests the server runs in parallel.
+
+        Uses the configured value when given. Otherwise warms the model, then
+        doubles the number of concurrent one-token requests while a batch still
+        completes in about the time of a single request.
+        """
+        if self.configured_parallelism:
+            return self.parallelism
+        cache_key = (self.native_url, model)
+        if cache_key in _discovered_parallelism:
+            self.parallelism = _discovered_parallelism[cache_key]
+            return self.parallelism
+
+        try:
+            await self._probe(model, 1, keep_alive)  # Loads the model so its load time is not measured
+            single = max(await self._probe(model, 1, keep_alive), 1e-3)
+            parallelism = 1
+            count = 2
+            while count <= MAX_PROBE_PARALLELISM:
+                if await self._probe(model, count, keep_alive) > single * PARALLEL_PROBE_TOLERANCE:
+                    break
+                parallelism = count
+                count *= 2
+        except Exception as e:
+            logger.warning(f"Ollama parallelism discovery failed for {self.native_url}: {e}")
+            return self.parallelism
+
+        self.parallelism = parallelism
+        _discovered_parallelism[cache_key] = parallelism
+        logger.info(f"Ollama endpoint {self.native_url} runs {parallelism} requests in parallel")
+        return parallelism
+
+    async def close(self) -> None:
+        await self.client.close()
+        await self.http.aclose()
+
+
+class OllamaEndpointPool:
+    """Least-outstanding-requests dispatch over Ollama endpoints with a local wait queue."""
+
+    def __init__(self, endpoints: List[OllamaEndpoint], keep_alive: str = DEFAULT_KEEP_ALIVE):
+        if not endpoints:
+            raise ValueError("At least one Ollama endpoint is required")
+        self.endpoints = endpoints
+        self.keep_alive = keep_alive
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queued = 0
+        self.max_queued = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._warm_models: Set[str] = set()
+        self._keep_alive_task: Optional[asyncio.Task] = None
+
+    @property
+    def capacity(self) -> int:
+        """Total parallel requests across endpoints."""
+        return sum(endpoint.parallelism for endpoint in self.endpoints)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def start(self, model: str) -> None:
+        """
+        Discover parallelism on every endpoint and keep the model resident.
+
+        Does nothing for a model the pool already keeps warm, so providers
+        sharing the pool do not re-warm it for every job.
+        """
+        if model in self._warm_models and self._keep_alive_task is not None:
+            return
+        self._warm_models.add(model)
+        await self.ping()
+        await asyncio.gather(*(endpoint.discover_parallelism(model, self.keep_alive) for endpoint in self.endpoints))
+        if self._keep_alive_task is None:
+            self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
+        set_gauge("ollama_pool_capacity", self.capacity)
+
+    def mark_warm(self, model: str) -> None:
+        """Include a model in keep_alive pings."""
+        self._warm_models.add(model)
+
+    async def ping(self) -> None:
+        """Refresh keep_alive for every warm model on every endpoint."""
+        for endpoint in self.endpoints:
+            for model in list(self._warm_models):
+                try:
+                    await endpoint.keep_alive(model, self.keep_alive)
+                except Exception as e:
+                    logger.debug(f"Ollama keep_alive ping failed for {endpoint.native_url}: {e}")
+
+    async def _keep_alive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(KEEP_ALIVE_INTERVAL_SECONDS)
+            await self.ping()
+
+    def _select(self) -> Optional[OllamaEndpoint]:
+        """Endpoint with free capacity and the lowest relative load, preferring available ones."""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.has_capacity and e.is_available(now)]
+        if not candidates and not any(e.is_available(now) for e in self.endpoints):
+            # Every endpoint recently failed: try them again rather than stall
+            candidates = [e for e in self.endpoints if e.has_capacity]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda e: (e.load, e.outstanding))
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[OllamaEndpoint]:
+        """Wait for capacity, then hold a slot on the least-loaded endpoint."""
+        condition = self._get_condition()
+        async with condition:
+            endpoint = self._select()
+            if endpoint is None:
+                self.queued += 1
+                self.max_queued = max(self.max_queued, self.queued)
+                try:
+                    while endpoint is None:
+                        await condition.wait()
+                        endpoint = self._select()
+                finally:
+                    self.queued -= 1
+            endpoint.outstanding += 1
+        try:
+            yield endpoint
+        finally:
+            endpoint.outstanding -= 1
+            endpoint.completed += 1
+            async with condition:
+                condition.notify()
+
+    def mark_failed(self, endpoint: OllamaEndpoint) -> None:
+        """Skip an endpoint that could not be reached for a while."""
+        endpoint.failures += 1
+        endpoint.unavailable_until = time.monotonic() + ENDPOINT_RETRY_SECONDS
+        increment_counter("ollama_endpoint_failures", 1, endpoint=endpoint.native_url)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint load and queue depth."""
+        return {
+            "capacity": self.capacity,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "endpoints": [
+                {
+                    "url": endpoint.endpoint_url,
+                    "parallelism": endpoint.parallelism,
+                    "outstanding": endpoint.outstanding,
+                    "completed": endpoint.completed,
+                    "failures": endpoint.failures,
+                }
+                for endpoint in self.endpoints
+            ],
+        }
+
+    async def close(self) -> None:
+        """Stop keep_alive pings and close endpoint clients."""
+        if self._keep_alive_task:
+            self._keep_alive_task.cancel()
+            try:
+                await self._keep_alive_task
+            except asyncio.CancelledError:
+                pass
+            self._keep_alive_task = None
+        for endpoint in self.endpoints:
+            await endpoint.close()
+
+
+# Pools shared by every provider in the process, keyed by endpoint set and credential
+_endpoint_pools: Dict[str, OllamaEndpointPool] = {}
+
+
+def endpoint_pool_key(endpoint_urls: Sequence[str], api_key: str) -> str:
+    """Registry key for a set of endpoints (the API key itself is never stored)."""
+    urls = sorted({native_api_url(url) for url in endpoint_urls})
+    credential = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return f"{','.join(urls)}:{credential}"
+
+
+def get_endpoint_pool(
+    endpoint_urls: Sequence[str],
+    api_key: str,
+    timeout_seconds: float,
+    num_parallel: Optional[int] = None,
+    keep_alive: str = DEFAULT_KEEP_ALIVE
+) -> OllamaEndpointPool:
+    """
+    Get the shared pool for a set of endpoints, creating it on first use.
+
+    Options apply when the pool is created; later callers share its
+    parallelism, queue and keep_alive schedule. A pool created on another
+    (e.g. finished) event loop is replaced, since its clients cannot be used.
+    """
+    key = endpoint_pool_key(endpoint_urls, api_key)
+    loop = asyncio.get_running_loop()
+    pool = _endpoint_pools.get(key)
+    if pool is None or pool.loop is not loop:
+        pool = OllamaEndpointPool(
+            [
+                OllamaEndpoint(url, api_key=api_key, timeout_seconds=timeout_seconds, parallelism=num_parallel)
+                for url in endpoint_urls
+            ],
+            keep_alive=keep_alive
+        )
+        pool.loop = loop
+        _endpoint_pools[key] = pool
+    return pool
+
+
+async def close_endpoint_pools() -> None:
+    """Close every shared pool (on shutdown and in tests)."""
+    pools = list(_endpoint_pools.values())
+    _endpoint_pools.clear()
+    for pool in pools:
+        try:
+            await pool.close()
+        except Exception as e:
+            logger.debug(f"Ollama pool close failed: {e}")
@@ -13,7 +13,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 import httpx
-from openai import AsyncOpenAI, APIError, RateLimitError, AuthenticationError
+from openai import AsyncOpenAI, APIError, APIConnectionError, RateLimitError, AuthenticationError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..base import (
@@ -27,6 +27,7 @@ from ..base import (
     TranslationOperationType
 )
 from ...core.metrics import time_async_operation, OperationType, increment_counter
+from .ollama_pool import DEFAULT_KEEP_ALIVE, OllamaEndpointPool, get_endpoint_pool
 from ...models.decompilation.results import (
     FunctionTranslation, 
     ImportTranslation, 
@@ -59,12 +60,16 @@ class OllamaProvider(LLMProvider):
         "docker": "http://ollama:11434/v1"
     }
     
+    # Tokens of binary-level context sent to local models; larger entries
+    # (the import list) are dropped first to leave the small window for code
+    STATIC_CONTEXT_MAX_TOKENS = 64
+    
     def __init__(self, config: LLMConfig):
         """Initialize Ollama provider with configuration."""
         super().__init__(config)
         self.openai_client: Optional[AsyncOpenAI] = None
+        self.pool: Optional[OllamaEndpointPool] = None
         self._available_models: List[str] = []
-        self._token_count_cache: Dict[str, int] = {}
         
         # Set Ollama-specific defaults if not provided
         if not config.endpoint_url:
@@ -76,19 +81,34 @@ class OllamaProvider(LLMProvider):
             config.api_key = SecretStr("ollama-no-auth-required")
     
     async def initialize(self) -> None:
-        """Initialize the Ollama client and discover available models."""
+        """
+        Initialize endpoint clients, discover available models and server parallelism.
+        
+        provider_specific options: "endpoints" (additional Ollama URLs balanced
+        with endpoint_url), "num_parallel" (skip parallelism discovery) and
+        "keep_alive" (how long models stay loaded).
+        """
         try:
-            # Initialize OpenAI-compatible client for Ollama
-            self.openai_client = AsyncOpenAI(
+            options = self.config.provider_specific
+            endpoint_urls = [self.config.endpoint_url]
+            endpoint_urls += [url for url in options.get("endpoints") or [] if url not in endpoint_urls]
+            # Shared with every other provider on the same endpoints, so jobs queue together
+            self.pool = get_endpoint_pool(
+                endpoint_urls,
                 api_key=self.config.api_key.get_secret_value(),
-                base_url=self.config.endpoint_url,
-                timeout=self.config.timeout_seconds,
-                max_retries=2,  # Fewer retries for local server
+                timeout_seconds=self.config.timeout_seconds,
+                num_parallel=options.get("num_parallel"),
+                keep_alive=options.get("keep_alive") or DEFAULT_KEEP_ALIVE
             )
+            # Model discovery and health checks use the primary endpoint
+            self.openai_client = self.pool.endpoints[0].client
             
             # Discover available models
             await self._discover_models()
             
+            # Warm the default model and size the dispatch queue to the servers
+            await self.pool.start(self._select_model_for_task("code"))
+            
             increment_counter("ollama_provider_initialized")
             
         except Exception as e:
@@ -99,11 +119,15 @@ class OllamaProvider(LLMProvider):
             )
     
     async def cleanup(self) -> None:
-        """Cleanup Ollama provider resources."""
-        if self.openai_client:
-            await self.openai_client.close()
+        """
+        Cleanup Ollama provider resources.
+        
+        The endpoint pool is shared process-wide and stays open, keeping its
+        models warm for later jobs; close_endpoint_pools closes it on shutdown.
+        """
+        self.pool = None
+        self.openai_client = None
         self._available_models.clear()
-        self._token_count_cache.clear()
     
     async def _discover_models(self) -> None:
         """Discover available models from Ollama instance."""
@@ -139,8 +163,14 @@ class OllamaProvider(LLMProvider):
             # Select best model for code analysis
             model = self._select_model_for_task("code")
             
-            # Build prompt for function translation
-            prompt = self._build_function_prompt(function_data, context)
+            # Build prompt for function translation; local context windows hold
+            # the assembly listing only, as before the shared prompt pipeline
+            prompt = self.build_function_prompt(
+                {**function_data, "pseudocode": None, "decompiled_code": None}, context
+            )
+            system_prompt = prompt.system_prompt
+            if prompt.static_context:
+                system_prompt = f"{system_prompt}\n\n{prompt.static_context}"
             
             # Make API call with circuit breaker protection
             response = await self._protected_call(
@@ -148,15 +178,17 @@ class OllamaProvider(LLMProvider):
                 self._make_completion_request,
                 model=model,
                 messages=[
-                    {"role": "system", "content": "You are an expert reverse engineer analyzing binary code. Provide clear, detailed explanations of assembly code functionality."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt.user_prompt}
                 ],
                 temperature=self.config.temperature,
                 max_tokens=self.config.max_tokens
             )
             
             # Parse response into structured format
-            result = self._parse_function_response(response, function_data)
+            result = self._parse_function_response(
+                response, function_data, processing_time_ms=int((time.time() - start_time) * 1000)
+            )
             
             increment_counter("ollama_function_translation_success")
             
@@ -183,8 +215,7 @@ class OllamaProvider(LLMProvider):
         try:
             model = self._select_model_for_task("analysis")
             
-            results = []
-            for import_data in import_list:
+            async def explain(import_data: Dict[str, Any]) -> ImportTranslation:
                 prompt = self._build_import_prompt(import_data, context)
                 
                 response = await self._protected_call(
@@ -199,8 +230,10 @@ class OllamaProvider(LLMProvider):
                     max_tokens=512  # Shorter responses for imports
                 )
                 
-                result = self._parse_import_response(response, import_data)
-                results.append(result)
+                return self._parse_import_response(response, import_data)
+            
+            # Dispatched together; the endpoint pool bounds how many run at once
+            results = list(await asyncio.gather(*(explain(import_data) for import_data in import_list)))
             
             increment_counter("ollama_import_explanation_success")
             return results
@@ -226,8 +259,7 @@ class OllamaProvider(LLMProvider):
         try:
             model = self._select_model_for_task("analysis")
             
-            results = []
-            for string_data in string_list:
+            async def interpret(string_data: Dict[str, Any]) -> StringTranslation:
                 prompt = self._build_string_prompt(string_data, context)
                 
                 response = await self._protected_call(
@@ -242,8 +274,9 @@ class OllamaProvider(LLMProvider):
                     max_tokens=256  # Short responses for strings
                 )
                 
-                result = self._parse_string_response(response, string_data)
-                results.append(result)
+                return self._parse_string_response(response, string_data)
+            
+            results = list(await asyncio.gather(*(interpret(string_data) for string_data in string_list)))
             
             increment_counter("ollama_string_interpretation_success")
             return results
@@ -343,23 +376,7 @@ class OllamaProvider(LLMProvider):
     def get_cost_estimate(self, token_count: int, operation_type: TranslationOperationType) -> float:
         """Ollama is free - always return 0."""
         return 0.0
-    
-    def count_tokens(self, text: str) -> int:
-        """Estimate tokens for Ollama (similar to GPT tokenization)."""
-        # Simple approximation: ~4 characters per token
-        # Cache results for performance
-        if text in self._token_count_cache:
-            return self._token_count_cache[text]
-        
-        # Rough estimate based on text length
-        token_count = max(1, len(text) // 4)
-        
-        # Cache result (limit cache size)
-        if len(self._token_count_cache) < 1000:
-            self._token_count_cache[text] = token_count
         
-        return token_count
-    
     def _select_model_for_task(self, task_type: str) -> str:
         """Select appropriate model based on task type."""
         if not self._available_models:
@@ -378,33 +395,32 @@ class OllamaProvider(LLMProvider):
         return self._available_models[0]
     
     async def _make_completion_request(self, **kwargs) -> Any:
-        """Make a chat completion request to Ollama."""
-        return await self.openai_client.chat.completions.create(**kwargs)
+        """Make a chat completion request on the least-loaded Ollama endpoint."""
+        if not self.pool:
+            return await self.openai_client.chat.completions.create(**kwargs)
+        pool = self.pool
+        pool.mark_warm(kwargs.get("model") or self.config.default_model)
+        # An unreachable endpoint is skipped and the request moves to the next one
+        for attempt in range(len(pool.endpoints)):
+            async with pool.acquire() as endpoint:
+                try:
+                    return await endpoint.client.chat.completions.create(**kwargs)
+                except APIConnectionError:
+                    pool.mark_failed(endpoint)
+                    if attempt == len(pool.endpoints) - 1:
+                        raise
     
-    def _build_function_prompt(self, function_data: Dict[str, Any], context: Optional[Dict[str, Any]]) -> str:
-        """Build prompt for function analysis."""
-        name = function_data.get("name", "unknown")
-        address = function_data.get("address", "unknown")
-        assembly_code = function_data.get("assembly_code", "")
-        
-        prompt = f"""Analyze this assembly function and explain what it does:
-
-Function: {name}
-Address: {address}
-Size: {function_data.get('size', 0)} bytes
-
-Assembly Code:
-{assembly_code[:2000]}  # Limit to prevent token overflow
-
-Please provide:
-1. A clear explanation of what this function does
-2. Key operations and logic flow
-3. Any notable patterns or behaviors
-4. Potential purpose or role in the program
-
-Keep the explanation technical but accessible."""
-        
-        return prompt
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Endpoint parallelism, outstanding requests and queue depth."""
+        return self.pool.get_stats() if self.pool else {}
+    
+    def _build_static_context(self, context: Optional[Dict[str, Any]]) -> str:
+        """Binary-level context fitted to STATIC_CONTEXT_MAX_TOKENS."""
+        static, _ = self._split_context(context)
+        fitted = self.get_prompt_budget().fit_context(
+            {key: static[key] for key in sorted(static)}, self.STATIC_CONTEXT_MAX_TOKENS
+        )
+        return f"**Binary Context:**\n{fitted}" if fitted else ""
     
     def _build_import_prompt(self, import_data: Dict[str, Any], context: Optional[Dict[str, Any]]) -> str:
         """Build prompt for import analysis."""
@@ -465,7 +481,12 @@ Based on the decompilation data, provide:
 
 Focus on high-level insights."""
     
-    def _parse_function_response(self, response: Any, function_data: Dict[str, Any]) -> FunctionTranslation:
+    def _parse_function_response(
+        self,
+        response: Any,
+        function_data: Dict[str, Any],
+        processing_time_ms: int = 100
+    ) -> FunctionTranslation:
         """Parse Ollama response into FunctionTranslation."""
         explanation = response.choices[0].message.content if response.choices else "Translation unavailable"
         
@@ -474,7 +495,7 @@ Focus on high-level insights."""
             provider="ollama",
             model=self.config.default_model,
             tokens_used=self._estimate_tokens(explanation),
-            processing_time_ms=100,  # Approximate for local inference
+            processing_time_ms=processing_time_ms,
             api_version="v1",
             cost_estimate=0.0,  # Free local inference
             timestamp=datetime.utcnow()
@@ -489,7 +510,8 @@ Focus on high-level insights."""
             parameters_explanation="",  # Optional field
             return_value_explanation="",  # Optional field
             security_analysis="",  # Optional field
-            confidence_score=0.8,  # Default confidence for local model
+            # Scored like hosted responses so cascade mode can decide what to escalate
+            confidence_score=self._estimate_confidence(explanation, function_data),
             llm_provider=provider_metadata
         )
     
@@ -533,5 +555,5 @@ Focus on high-level insights."""
         )
     
     def _estimate_tokens(self, text: str) -> int:
-        """Quick token estimation for metrics."""
-        return max(1, len(text) // 4)
\ No newline at end of file
+        """Token count for metrics (at least one)."""
+        return max(1, self.count_tokens(text))
\ No newline at end of file
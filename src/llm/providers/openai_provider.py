@@ -7,16 +7,17 @@ Supports GPT-4, GPT-3.5-turbo, and OpenAI-compatible endpoints (Ollama, LM Studi
 
 import asyncio
 import json
+import math
 import re
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-import httpx
 from openai import AsyncOpenAI, APIError, RateLimitError, AuthenticationError
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..base import (
+    IMPORT_CONTEXT_UNAVAILABLE,
+    IMPORT_SUMMARY_UNAVAILABLE,
     LLMProvider, 
     LLMConfig, 
     LLMProviderException, 
@@ -26,6 +27,28 @@ from ..base import (
     ProviderHealthStatus,
     TranslationOperationType
 )
+from ..rate_limit import parse_retry_after
+from ..structured_output import (
+    FUNCTION_TRANSLATION_SCHEMA,
+    OVERALL_SUMMARY_SCHEMA,
+    OutputSchema,
+    StructuredOutputError,
+    merge_usage,
+    output_instructions,
+    parse_output,
+)
+from ..batch import (
+    BATCH_COST_DISCOUNT,
+    BATCH_POLL_INTERVAL_SECONDS,
+    BATCH_TIMEOUT_SECONDS,
+    BatchTimeoutError,
+    batch_custom_id,
+    cancel_and_settle,
+    parse_custom_id,
+    parse_jsonl,
+    poll_until,
+    to_jsonl,
+)
 from ...core.metrics import time_async_operation, OperationType, increment_counter
 from ...models.decompilation.results import (
     FunctionTranslation, 
@@ -59,12 +82,15 @@ class OpenAIProvider(LLMProvider):
         "gpt-3.5-turbo-16k": {"input": 0.003, "output": 0.004}
     }
     
+    # OpenAI caches identical prompt prefixes automatically; static content goes first
+    supports_prompt_caching = True
+    max_strings_per_request = 50
+    
     def __init__(self, config: LLMConfig):
         """Initialize OpenAI provider with configuration."""
         super().__init__(config)
         self.openai_client: Optional[AsyncOpenAI] = None
         self.endpoint_type = self._detect_endpoint_type()
-        self._token_count_cache: Dict[str, int] = {}
         
     def _detect_endpoint_type(self) -> str:
         """Detect the type of OpenAI endpoint based on configuration."""
@@ -73,7 +99,9 @@ class OpenAIProvider(LLMProvider):
         
         url = self.config.endpoint_url.lower()
         
-        if "openai.azure.com" in url:
+        if "api.openai.com" in url:
+            return "openai"
+        elif "openai.azure.com" in url:
             return "azure"
         elif "localhost:11434" in url or "ollama" in url:
             return "ollama"
@@ -99,6 +127,9 @@ class OpenAIProvider(LLMProvider):
             if self.config.organization and self.endpoint_type == "openai":
                 client_kwargs["organization"] = self.config.organization
             
+            # Responses feed the shared rate limiter; 429 backoff is coordinated there
+            client_kwargs["http_client"] = self._create_rate_limited_http_client()
+            
             self.openai_client = AsyncOpenAI(**client_kwargs)
             
             # Test connection
@@ -117,19 +148,16 @@ class OpenAIProvider(LLMProvider):
             await self.openai_client.close()
             self.openai_client = None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((RateLimitError, httpx.TimeoutException))
-    )
     async def _make_completion_request(
         self, 
         messages: List[Dict[str, str]], 
         model: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Make completion request with retry logic."""
+        """Make a completion request through the shared rate limiter."""
         if not self.openai_client:
             raise LLMServiceUnavailableException(self.get_provider_id(), "Client not initialized")
         
@@ -137,36 +165,62 @@ class OpenAIProvider(LLMProvider):
         request_temperature = temperature if temperature is not None else self.config.temperature
         request_max_tokens = max_tokens or self.config.max_tokens
         
+        # Route requests sharing a prefix to the same cache (official API only;
+        # compatible servers may reject unknown fields)
+        request_kwargs: Dict[str, Any] = {}
+        if prompt_cache_key and self.endpoint_type == "openai":
+            request_kwargs["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        if response_format:
+            request_kwargs["response_format"] = response_format
+        
+        estimated_tokens = self._estimate_request_tokens(
+            [message.get("content") or "" for message in messages], request_max_tokens, request_model
+        )
+        
         try:
             start_time = time.time()
             
-            response = await self.openai_client.chat.completions.create(
-                model=request_model,
-                messages=messages,
-                temperature=request_temperature,
-                max_tokens=request_max_tokens,
-                top_p=1.0,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
+            response = await self._rate_limited_call(
+                lambda: self.openai_client.chat.completions.create(
+                    model=request_model,
+                    messages=messages,
+                    temperature=request_temperature,
+                    max_tokens=request_max_tokens,
+                    top_p=1.0,
+                    frequency_penalty=0.0,
+                    presence_penalty=0.0,
+                    **request_kwargs
+                ),
+                estimated_tokens,
+                (RateLimitError,),
+                lambda r: r.usage.total_tokens if r.usage else 0
             )
             
             processing_time_ms = int((time.time() - start_time) * 1000)
             
+            cached_tokens = 0
+            if response.usage and getattr(response.usage, "prompt_tokens_details", None):
+                cached_tokens = getattr(response.usage.prompt_tokens_details, "cached_tokens", 0) or 0
+            if cached_tokens:
+                increment_counter("llm_prompt_cache_read_tokens", cached_tokens, provider="openai")
+            
             return {
                 "content": response.choices[0].message.content,
                 "model": response.model,
                 "tokens_used": response.usage.total_tokens if response.usage else 0,
                 "input_tokens": response.usage.prompt_tokens if response.usage else 0,
                 "output_tokens": response.usage.completion_tokens if response.usage else 0,
+                "cached_input_tokens": cached_tokens,
                 "processing_time_ms": processing_time_ms
             }
             
         except AuthenticationError as e:
             raise LLMAuthenticationException(self.get_provider_id(), str(e))
         except RateLimitError as e:
-            # Extract retry-after header if available
-            retry_after = getattr(e, 'retry_after', None)
-            raise LLMRateLimitException(self.get_provider_id(), retry_after)
+            retry_after = parse_retry_after(e.response.headers)
+            raise LLMRateLimitException(
+                self.get_provider_id(), math.ceil(retry_after) if retry_after is not None else None
+            )
         except APIError as e:
             if "service_unavailable" in str(e).lower():
                 raise LLMServiceUnavailableException(self.get_provider_id(), str(e))
@@ -214,111 +268,80 @@ class OpenAIProvider(LLMProvider):
                                 error_type=e.__class__.__name__)
                 raise
     
-    async def _do_translate_function(
-        self, 
+    def _build_function_messages(
+        self,
         function_data: Dict[str, Any],
         context: Optional[Dict[str, Any]] = None
-    ) -> FunctionTranslation:
-        """Internal method to perform function translation."""
-        try:
-            # Build system prompt
-            system_prompt = """You are an expert binary analysis assistant specializing in translating assembly code and decompiled functions into clear, natural language explanations.
-
-Your task is to analyze the provided function data and create a comprehensive, human-readable explanation that would be valuable for developers, security analysts, and reverse engineers.
-
-Focus on:
-1. The function's primary purpose and behavior
-2. Input parameters and their types
-3. Return values and their significance  
-4. Key operations and logic flow
-5. Any notable patterns, algorithms, or security implications
-6. Cross-references to other functions or external dependencies
-
-Provide your analysis in a structured format with clear explanations."""
-
-            # Build user prompt with function data
-            # Determine the best available code representation
-            pseudocode = function_data.get('pseudocode')
-            decompiled_code = function_data.get('decompiled_code')
-            assembly_code = function_data.get('assembly_code', '')
-            
-            # Prioritize pseudocode, then decompiled_code, then assembly_code
-            code_section = ""
-            if pseudocode:
-                code_section = f"""**Pseudocode:**
-```c
-{pseudocode}
-```
-
-**Assembly Code:**
-```assembly
-{assembly_code}
-```"""
-            elif decompiled_code:
-                code_section = f"""**Decompiled Code:**
-```c
-{decompiled_code}
-```
-
-**Assembly Code:**
-```assembly
-{assembly_code}
-```"""
-            else:
-                code_section = f"""**Assembly Code:**
-```assembly
-{assembly_code}
-```"""
-
-            user_prompt = f"""Please translate this binary function into a natural language explanation:
-
-**Function Information:**
-- Name: {function_data.get('name', 'unknown')}
-- Address: {function_data.get('address', 'unknown')}
-- Size: {function_data.get('size', 0)} bytes
-
-{code_section}
-
-**Function Calls:** {', '.join(function_data.get('calls_to', []))}
-**Called By:** {', '.join(function_data.get('calls_from', []))}
-**Variables:** {', '.join(function_data.get('variables', []))}
-**External APIs Used:** {', '.join(function_data.get('imports_used', []))}
-**String References:** {', '.join(function_data.get('strings_referenced', [])[:5])}  
-
-**Context Information:**
-{json.dumps(context or {}, indent=2)}
-
-Provide a comprehensive explanation in 2-4 paragraphs that explains what this function does, how it works, and why it matters."""
-
-            messages = [
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for a function translation request."""
+        prompt = self.build_function_prompt(
+            function_data,
+            context,
+            output_instructions=(
+                output_instructions(FUNCTION_TRANSLATION_SCHEMA) if self.config.structured_output else None
+            )
+        )
+        # Static binary-level context joins the system prompt as a stable, cacheable prefix
+        system_prompt = prompt.system_prompt
+        if prompt.static_context:
+            system_prompt = f"{system_prompt}\n\n{prompt.static_context}"
+        return [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-            ]
-        
-            response = await self._make_completion_request(messages)
-        
-            # Parse the response and create FunctionTranslation
-            content = response["content"]
+            {"role": "user", "content": prompt.user_prompt}
+        ]
+    
+    def _build_function_translation(
+        self,
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]],
+        response: Dict[str, Any],
+        cost_multiplier: float = 1.0,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> FunctionTranslation:
+        """
+        Create a FunctionTranslation from a completion response.
+        
+        Uses structured output fields when given (or when a structured reply
+        parses as-is) and falls back to free-text extraction otherwise.
+        """
+        content = response["content"]
+        if fields is None and self.config.structured_output:
+            try:
+                fields = parse_output(content, FUNCTION_TRANSLATION_SCHEMA)
+            except StructuredOutputError:
+                fields = None
         
-            # Extract confidence score from content (simple heuristic)
-            confidence_score = self._estimate_confidence(content, function_data)
+        # Extract confidence score from content (simple heuristic)
+        confidence_score = self._estimate_confidence(content, function_data)
         
-            # Create provider metadata
-            provider_metadata = self._create_provider_metadata(
+        cost_estimate = self._calculate_cost(response["input_tokens"], response["output_tokens"], response["model"])
+        provider_metadata = self._create_provider_metadata(
             model=response["model"],
             tokens_used=response["tokens_used"],
             processing_time_ms=response["processing_time_ms"],
-            cost_estimate=self._calculate_cost(response["input_tokens"], response["output_tokens"], response["model"])
-            )
-            provider_metadata.api_version = "v1"
-        
-            # Record success
-            increment_counter("llm_success", 1,
-                        provider="openai",
-                        operation="function_translation", 
-                        model=self.config.default_model)
+            cost_estimate=cost_estimate * cost_multiplier if cost_estimate is not None else None,
+            input_tokens=response["input_tokens"],
+            output_tokens=response["output_tokens"]
+        )
+        provider_metadata.api_version = "v1"
         
+        if fields:
             return FunctionTranslation(
+                function_name=function_data.get('name', 'unknown'),
+                address=function_data.get('address', '0x0'),
+                size=function_data.get('size', 0),
+                assembly_code=function_data.get('assembly_code'),
+                natural_language_description=fields["natural_language_description"],
+                parameters_explanation=fields["parameters_explanation"],
+                return_value_explanation=fields["return_value_explanation"],
+                assembly_summary=fields["assembly_summary"],
+                security_analysis=fields["security_analysis"],
+                confidence_score=fields["confidence_score"],
+                llm_provider=provider_metadata,
+                context_used=context or {}
+            )
+        
+        return FunctionTranslation(
             function_name=function_data.get('name', 'unknown'),
             address=function_data.get('address', '0x0'),
             size=function_data.get('size', 0),
@@ -330,7 +353,31 @@ Provide a comprehensive explanation in 2-4 paragraphs that explains what this fu
             confidence_score=confidence_score,
             llm_provider=provider_metadata,
             context_used=context or {}
+        )
+    
+    async def _do_translate_function(
+        self, 
+        function_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> FunctionTranslation:
+        """Internal method to perform function translation."""
+        try:
+            messages = self._build_function_messages(function_data, context)
+            response_format = self._response_format(FUNCTION_TRANSLATION_SCHEMA)
+            response = await self._make_completion_request(
+                messages,
+                prompt_cache_key=self._prompt_cache_key(messages[0]["content"]),
+                response_format=response_format
             )
+            fields = await self._parse_structured_reply(response, FUNCTION_TRANSLATION_SCHEMA)
+            
+            # Record success
+            increment_counter("llm_success", 1,
+                        provider="openai",
+                        operation="function_translation", 
+                        model=self.config.default_model)
+            
+            return self._build_function_translation(function_data, context, response, fields=fields)
         
         except Exception as e:
             # Record failure
@@ -341,6 +388,117 @@ Provide a comprehensive explanation in 2-4 paragraphs that explains what this fu
                             error_type=e.__class__.__name__)
             raise
     
+    def supports_batch(self) -> bool:
+        """The Batch API is only available on the official OpenAI endpoint."""
+        return self.endpoint_type == "openai"
+    
+    async def translate_functions_batch(
+        self,
+        functions: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        poll_interval_seconds: float = BATCH_POLL_INTERVAL_SECONDS,
+        timeout_seconds: float = BATCH_TIMEOUT_SECONDS
+    ) -> List[Optional[FunctionTranslation]]:
+        """Translate functions through the OpenAI Batch API (JSONL file upload)."""
+        if not self.openai_client:
+            raise LLMServiceUnavailableException(self.get_provider_id(), "Client not initialized")
+        if not functions:
+            return []
+        
+        model = self.config.default_model
+        records = []
+        for index, function_data in enumerate(functions):
+            messages = self._build_function_messages(function_data, context)
+            body: Dict[str, Any] = {
+                "model": model,
+                "messages": messages,
+                "temperature": self.config.temperature,
+                "max_tokens": self.config.max_tokens,
+            }
+            if self.endpoint_type == "openai":
+                body["prompt_cache_key"] = self._prompt_cache_key(messages[0]["content"])
+            if self.config.structured_output:
+                body["response_format"] = self._response_format(FUNCTION_TRANSLATION_SCHEMA)
+            records.append({
+                "custom_id": batch_custom_id(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            })
+        
+        batch_id = None
+        settled = False
+        try:
+            input_file = await self.openai_client.files.create(
+                file=("functions.jsonl", to_jsonl(records), "application/jsonl"),
+                purpose="batch"
+            )
+            batch = await self.openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            batch_id = batch.id
+            increment_counter("llm_batches_submitted", 1, provider="openai", requests=len(records))
+            
+            def retrieve():
+                return self.openai_client.batches.retrieve(batch_id)
+            
+            def finished(b) -> bool:
+                return b.status in ("completed", "failed", "expired", "cancelled")
+            
+            try:
+                batch = await poll_until(retrieve, finished, poll_interval_seconds, timeout_seconds)
+            except BatchTimeoutError:
+                # Cancelled batches still write the requests that completed to the output file
+                increment_counter("llm_batches_cancelled", 1, provider="openai", reason="timeout")
+                batch = await cancel_and_settle(
+                    lambda: self.openai_client.batches.cancel(batch_id), retrieve, finished, poll_interval_seconds
+                )
+            settled = True
+            
+            if not batch.output_file_id:
+                raise LLMProviderException(
+                    f"OpenAI batch {batch.id} ended with status {batch.status}",
+                    self.get_provider_id(),
+                    "BATCH_FAILED"
+                )
+            output = await self.openai_client.files.content(batch.output_file_id)
+        except APIError as e:
+            raise LLMProviderException(f"OpenAI batch error: {str(e)}", self.get_provider_id(), "BATCH_FAILED")
+        finally:
+            if batch_id is not None and not settled:
+                await self._cancel_batch(batch_id)
+        
+        translations: List[Optional[FunctionTranslation]] = [None] * len(functions)
+        for result in parse_jsonl(output.text):
+            index = parse_custom_id(result.get("custom_id"))
+            response = result.get("response") or {}
+            if index is None or index >= len(functions) or response.get("status_code") != 200:
+                continue
+            body = response.get("body") or {}
+            usage = body.get("usage") or {}
+            completion = {
+                "content": body["choices"][0]["message"]["content"],
+                "model": body.get("model", model),
+                "tokens_used": usage.get("total_tokens", 0),
+                "input_tokens": usage.get("prompt_tokens", 0),
+                "output_tokens": usage.get("completion_tokens", 0),
+                "processing_time_ms": 0
+            }
+            translations[index] = self._build_function_translation(
+                functions[index], context, completion, cost_multiplier=BATCH_COST_DISCOUNT
+            )
+        return translations
+    
+    async def _cancel_batch(self, batch_id: str) -> None:
+        """Best-effort cancel of a batch abandoned after an error, so it stops running and billing."""
+        try:
+            await self.openai_client.batches.cancel(batch_id)
+            increment_counter("llm_batches_cancelled", 1, provider="openai", reason="error")
+        except Exception:
+            pass
+    
     async def explain_imports(
         self, 
         import_list: List[Dict[str, Any]],
@@ -357,7 +515,7 @@ Provide a comprehensive explanation in 2-4 paragraphs that explains what this fu
             "openai_import_explanation",
             provider="openai",
             model=self.config.default_model,
-            operation_type="import_explanation",
+            operation="import_explanation",
             import_count=len(import_list)
         ):
             # Increment attempt counter
@@ -429,18 +587,18 @@ For each import, provide:
             )
             provider_metadata.api_version = "v1"
         
-            for import_item in import_list:
+            for position, import_item in enumerate(import_list):
                 # Extract relevant explanation for this specific import
-                import_explanation = self._extract_import_explanation(content, import_item)
+                import_explanation = self._extract_import_explanation(content, import_list, position)
                 
                 translation = ImportTranslation(
                     library_name=import_item.get('library', 'unknown'),
                     function_name=import_item.get('function', 'unknown'),
-                    api_documentation_summary=import_explanation.get('summary', 'Analysis not available'),
-                    usage_context=import_explanation.get('usage', 'Context not available'),
+                    api_documentation_summary=import_explanation['summary'] or IMPORT_SUMMARY_UNAVAILABLE,
+                    usage_context=import_explanation['usage'] or IMPORT_CONTEXT_UNAVAILABLE,
                     parameters_description=import_explanation.get('parameters'),
                     security_implications=import_explanation.get('security'),
-                    confidence_score=0.8,  # Default confidence for OpenAI
+                    confidence_score=0.8 if import_explanation['summary'] else 0.3,
                     llm_provider=provider_metadata
                 )
                 translations.append(translation)
@@ -478,7 +636,7 @@ For each import, provide:
             "openai_string_interpretation",
             provider="openai",
             model=self.config.default_model,
-            operation_type="string_interpretation",
+            operation="string_interpretation",
             string_count=len(string_list)
         ):
             # Increment attempt counter
@@ -517,7 +675,7 @@ For each import, provide:
 Analyze the provided strings and determine their likely usage, meaning, and potential security relevance. Consider encoding, content patterns, and contextual clues."""
         
             # Limit string list to avoid token limits
-            limited_strings = string_list[:50]  # Process up to 50 strings at once
+            limited_strings = string_list[:self.max_strings_per_request]
         
             user_prompt = f"""Please analyze these strings found in a binary:
 
@@ -598,7 +756,7 @@ For each string, analyze:
             "openai_overall_summary",
             provider="openai",
             model=self.config.default_model,
-            operation_type="overall_summary"
+            operation="overall_summary"
         ):
             # Increment attempt counter
             increment_counter("llm_requests", 1, 
@@ -640,6 +798,8 @@ Focus on:
 4. Security analysis (both defensive and offensive capabilities)
 5. Technology stack and dependencies
 6. Risk assessment and behavioral indicators"""
+            if self.config.structured_output:
+                system_prompt = f"{system_prompt}\n\n{output_instructions(OVERALL_SUMMARY_SCHEMA)}"
         
             user_prompt = f"""Please analyze this complete binary decompilation and provide a comprehensive summary:
 
@@ -668,7 +828,12 @@ Provide a comprehensive analysis covering all aspects of this program."""
             {"role": "user", "content": user_prompt}
             ]
         
-            response = await self._make_completion_request(messages, max_tokens=4096)  # Longer response for summary
+            response = await self._make_completion_request(
+                messages,
+                max_tokens=4096,  # Longer response for summary
+                response_format=self._response_format(OVERALL_SUMMARY_SCHEMA)
+            )
+            fields = await self._parse_structured_reply(response, OVERALL_SUMMARY_SCHEMA)
         
             content = response["content"]
         
@@ -680,15 +845,18 @@ Provide a comprehensive analysis covering all aspects of this program."""
             )
             provider_metadata.api_version = "v1"
         
-            # Parse the comprehensive response
-            summary_data = self._parse_summary_response(content)
-        
             # Record success
             increment_counter("llm_success", 1,
                         provider="openai",
                         operation="overall_summary",
                         model=self.config.default_model)
         
+            if fields:
+                return OverallSummary(**fields, llm_provider=provider_metadata)
+        
+            # Parse the comprehensive response
+            summary_data = self._parse_summary_response(content)
+        
             return OverallSummary(
             program_purpose=summary_data.get('purpose', 'Purpose not determined'),
             main_functionality=summary_data.get('functionality', 'Functionality analysis not available'),
@@ -711,6 +879,41 @@ Provide a comprehensive analysis covering all aspects of this program."""
                             error_type=e.__class__.__name__)
             raise
     
+    def _response_format(self, schema: OutputSchema) -> Optional[Dict[str, Any]]:
+        """
+        response_format for structured output, or None when it is disabled.
+        
+        The official API enforces the schema; compatible servers get JSON mode
+        with the schema described in the prompt.
+        """
+        if not self.config.structured_output:
+            return None
+        if self.endpoint_type == "openai":
+            return {
+                "type": "json_schema",
+                "json_schema": {"name": schema.name, "schema": schema.json_schema, "strict": True}
+            }
+        return {"type": "json_object"}
+    
+    async def _parse_structured_reply(self, response: Dict[str, Any], schema: OutputSchema) -> Optional[Dict[str, Any]]:
+        """Structured fields of a reply (repair usage is added to response), or None in free-text mode."""
+        if not self.config.structured_output:
+            return None
+        repairs: List[Dict[str, Any]] = []
+        
+        async def reask(system_prompt: str, user_prompt: str) -> str:
+            repair = await self._make_completion_request(
+                [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+                temperature=0.0,
+                response_format=self._response_format(schema)
+            )
+            repairs.append(repair)
+            return repair["content"]
+        
+        fields = await self._parse_structured_output(response["content"], schema, reask)
+        merge_usage(response, repairs)
+        return fields
+    
     async def health_check(self) -> ProviderHealthStatus:
         """Check provider availability and API status."""
         if not self.openai_client:
@@ -791,23 +994,7 @@ Provide a comprehensive analysis covering all aspects of this program."""
         output_cost = (output_tokens / 1000) * costs["output"]
         
         return input_cost + output_cost
-    
-    def count_tokens(self, text: str) -> int:
-        """Count tokens in given text using rough estimation."""
-        # Simple approximation: ~4 characters per token for English text
-        # In production, would use tiktoken library for accurate counting
-        if text in self._token_count_cache:
-            return self._token_count_cache[text]
-        
-        # Rough estimation
-        token_count = max(1, len(text) // 4)
-        
-        # Cache the result
-        if len(self._token_count_cache) < 1000:  # Prevent memory bloat
-            self._token_count_cache[text] = token_count
         
-        return token_count
-    
     def _calculate_cost(self, input_tokens: int, output_tokens: int, model: str) -> Optional[float]:
         """Calculate actual cost based on token usage."""
         if self.endpoint_type != "openai" or model not in self.MODEL_COSTS:
@@ -827,26 +1014,6 @@ Provide a comprehensive analysis covering all aspects of this program."""
         costs = self.MODEL_COSTS[model]
         return (costs["input"] + costs["output"]) / 2000  # Average per token
     
-    def _estimate_confidence(self, content: str, function_data: Dict[str, Any]) -> float:
-        """Estimate confidence score based on response quality."""
-        confidence = 0.5  # Base confidence
-        
-        # Boost confidence for detailed responses
-        if len(content) > 200:
-            confidence += 0.1
-        
-        # Boost for function name mentions
-        func_name = function_data.get('name', '')
-        if func_name and func_name in content:
-            confidence += 0.1
-        
-        # Boost for technical terms
-        technical_terms = ['function', 'parameter', 'return', 'variable', 'register', 'memory']
-        term_count = sum(1 for term in technical_terms if term in content.lower())
-        confidence += min(0.2, term_count * 0.05)
-        
-        return min(1.0, confidence)
-    
     def _extract_parameters_explanation(self, content: str) -> Optional[str]:
         """Extract parameter explanation from response."""
         # Simple pattern matching to find parameter information
@@ -893,17 +1060,22 @@ Provide a comprehensive analysis covering all aspects of this program."""
         
         return None
     
-    def _extract_import_explanation(self, content: str, import_item: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    def _extract_import_explanation(
+        self,
+        content: str,
+        import_list: List[Dict[str, Any]],
+        position: int
+    ) -> Dict[str, Optional[str]]:
         """Extract explanation for a specific import from the response."""
-        function_name = import_item.get('function', 'unknown')
+        section = self._extract_import_section(content, import_list, position)
+        if section is None:
+            return {'summary': None, 'usage': None, 'parameters': None, 'security': None}
         
-        # Simple heuristic to extract relevant sections
-        # In practice, would use more sophisticated parsing
         return {
-            'summary': f"Analysis for {function_name} from response content",
-            'usage': "Common usage patterns identified",
+            'summary': self._extract_import_field(section, 'Purpose and functionality') or section,
+            'usage': self._extract_import_field(section, 'Common usage patterns'),
             'parameters': None,
-            'security': "Security implications noted" if 'security' in content.lower() else None
+            'security': self._extract_import_field(section, 'Security considerations')
         }
     
     def _extract_string_analysis(self, content: str, string_item: Dict[str, Any]) -> Dict[str, Optional[str]]:
@@ -0,0 +1,380 @@
+"""
+Adaptive Client-Side Rate Limiting
+
+Process-wide token buckets per (provider, credential) shared by every job.
+Learns request and token limits from vendor response headers, backs off on 429s,
+and grants capacity round-robin across jobs so one job cannot starve the others.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+from ..core.logging import get_logger
+from ..core.metrics import increment_counter, set_gauge
+
+
+logger = get_logger(__name__)
+
+
+# Job (or other owner) on whose behalf the current task calls the provider.
+# Set by the translation service; asyncio tasks inherit it automatically.
+rate_limit_owner: ContextVar[Optional[str]] = ContextVar("rate_limit_owner", default=None)
+
+# Bucket capacity as a fraction of the per-minute limit (10 seconds of burst)
+BURST_FRACTION = 1 / 6
+
+# Multiplicative decrease on 429, additive increase on success
+MIN_RATE_FACTOR = 0.1
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_STEP = 0.05
+
+# Backoff when a 429 carries no retry-after
+DEFAULT_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# Response headers carrying limits, per vendor: (limit, remaining)
+REQUEST_LIMIT_HEADERS = (
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining"),
+)
+TOKEN_LIMIT_HEADERS = (
+    ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+    ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+    ("anthropic-ratelimit-input-tokens-limit", "anthropic-ratelimit-input-tokens-remaining"),
+)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Parse retry-after-ms / retry-after (seconds or HTTP date) headers."""
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitSnapshot:
+    """Point-in-time view of a limiter for stats and monitoring."""
+    key: str
+    requests_per_minute: int
+    tokens_per_minute: int
+    rate_factor: float
+    available_requests: float
+    available_tokens: float
+    waiting: int
+    paused_for_seconds: float
+    rate_limited_count: int
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket over requests and tokens per minute with fair queuing.
+
+    Waiters are grouped by owner (job) and served round-robin; within an owner
+    they are served FIFO. The effective rate shrinks on 429 responses and
+    recovers gradually on success.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.key = key
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.tokens_per_minute = max(1, tokens_per_minute)
+        self.rate_factor = 1.0
+        self.rate_limited_count = 0
+        self._clock = clock
+        self._request_level = self._request_capacity
+        self._token_level = self._token_capacity
+        self._last_refill = clock()
+        self._paused_until = 0.0
+        self._consecutive_limited = 0
+        self._waiters: Dict[Optional[str], Deque[Tuple[asyncio.Future, int]]] = {}
+        self._owners: Deque[Optional[str]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def _request_rate(self) -> float:
+        return self.requests_per_minute * self.rate_factor / 60.0
+
+    @property
+    def _token_rate(self) -> float:
+        return self.tokens_per_minute * self.rate_factor / 60.0
+
+    @property
+    def _request_capacity(self) -> float:
+        return max(1.0, self.requests_per_minute * self.rate_factor * BURST_FRACTION)
+
+    @property
+    def _token_capacity(self) -> float:
+        return max(1.0, self.tokens_per_minute * self.rate_factor * BURST_FRACTION)
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers queued for capacity."""
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        self._request_level = min(self._request_capacity, self._request_level + elapsed * self._request_rate)
+        self._token_level = min(self._token_capacity, self._token_level + elapsed * self._token_rate)
+
+    def _wait_time(self, now: float, tokens: int) -> float:
+        if now < self._paused_until:
+            return self._paused_until - now
+        wait = 0.0
+        if self._request_level < 1.0:
+            wait = max(wait, (1.0 - self._request_level) / self._request_rate)
+        # Requests larger than the bucket go through once it is full (and leave it in debt)
+        needed = min(float(tokens), self._token_capacity)
+        if tokens and self._token_level < needed:
+            wait = max(wait, (needed - self._token_level) / self._token_rate)
+        return wait
+
+    def _consume(self, tokens: int) -> None:
+        self._request_level -= 1.0
+        self._token_level -= tokens
+
+    async def acquire(self, tokens: int = 0, owner: Optional[str] = None) -> None:
+        """
+        Wait for capacity to send one request of the given token size.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+            owner: Fairness group (defaults to the rate_limit_owner context)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Limiter is process-wide; rebind timers to the current event loop
+            if self._timer is not None:
+                self._timer.cancel()
+            self._loop = loop
+            self._timer = None
+            self._waiters.clear()
+            self._owners.clear()
+
+        owner = owner if owner is not None else rate_limit_owner.get()
+        now = self._clock()
+        self._refill(now)
+        if not self._owners and self._wait_time(now, tokens) <= 0:
+            self._consume(tokens)
+            return
+
+        future = loop.create_future()
+        if owner not in self._waiters:
+            self._waiters[owner] = deque()
+            self._owners.append(owner)
+        self._waiters[owner].append((future, tokens))
+        if self._timer is None:
+            self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation: give the capacity back
+                self._request_level += 1.0
+                self._token_level += tokens
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant queued callers round-robin by owner while capacity allows."""
+        self._timer = None
+        now = self._clock()
+        self._refill(now)
+
+        while self._owners:
+            owner = self._owners[0]
+            queue = self._waiters[owner]
+            while queue and queue[0][0].done():
+                queue.popleft()
+            if not queue:
+                self._owners.popleft()
+                del self._waiters[owner]
+                continue
+
+            future, tokens = queue[0]
+            wait = self._wait_time(now, tokens)
+            if wait > 0:
+                self._timer = self._loop.call_later(wait + 0.001, self._dispatch)
+                set_gauge("llm_rate_limit_waiting", self.waiting, limiter=self.key)
+                return
+
+            queue.popleft()
+            self._consume(tokens)
+            future.set_result(None)
+            self._owners.popleft()
+            if queue:
+                self._owners.append(owner)
+            else:
+                del self._waiters[owner]
+
+        set_gauge("llm_rate_limit_waiting", 0, limiter=self.key)
+
+    def _reschedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._owners and self._loop is not None and not self._loop.is_closed():
+            self._timer = self._loop.call_soon(self._dispatch)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once actual usage is known."""
+        if actual_tokens <= 0:
+            return
+        self._token_level += estimated_tokens - actual_tokens
+        if estimated_tokens > actual_tokens:
+            self._reschedule()
+
+    def release(self, estimated_tokens: int) -> None:
+        """Return the tokens reserved for a request that failed without a usable response."""
+        if estimated_tokens <= 0:
+            return
+        self._token_level = min(self._token_capacity, self._token_level + estimated_tokens)
+        self._reschedule()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Learn limits and remaining capacity from vendor rate-limit headers."""
+        changed = False
+        for limit_name, remaining_name in REQUEST_LIMIT_HEADERS:
+            limit = _header_int(headers, limit_name)
+            remaining = _header_int(headers, remaining_name)
+            if limit:
+                changed |= limit != self.requests_per_minute
+                self.requests_per_minute = limit
+            if remaining is not None:
+                self._request_level = min(self._request_level, float(remaining))
+            if limit or remaining is not None:
+                break
+        for limit_name, remaining_name in TOKEN_LIMIT_HEADERS:
+            limit = _header_int(headers, limit_name)
+            remaining = _header_int(headers, remaining_name)
+            if limit:
+                changed |= limit != self.tokens_per_minute
+                self.tokens_per_minute = limit
+            if remaining is not None:
+                self._token_level = min(self._token_level, float(remaining))
+            if limit or remaining is not None:
+                break
+        if changed:
+            self._reschedule()
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429: pause all callers and halve the rate."""
+        self.rate_limited_count += 1
+        self._consecutive_limited += 1
+        self.rate_factor = max(MIN_RATE_FACTOR, self.rate_factor * RATE_DECREASE_FACTOR)
+        if retry_after is None:
+            retry_after = DEFAULT_BACKOFF_SECONDS * (2 ** (self._consecutive_limited - 1))
+        retry_after = min(MAX_BACKOFF_SECONDS, max(0.0, retry_after))
+
+        now = self._clock()
+        self._refill(now)
+        self._paused_until = max(self._paused_until, now + retry_after)
+        # Start from an empty request bucket at the reduced rate once the pause ends
+        self._request_level = min(self._request_level, 0.0)
+        self._token_level = min(self._token_level, self._token_capacity)
+
+        increment_counter("llm_rate_limited", 1, limiter=self.key)
+        logger.warning(
+            "llm_rate_limited",
+            limiter=self.key,
+            retry_after=round(retry_after, 2),
+            rate_factor=round(self.rate_factor, 3),
+            waiting=self.waiting
+        )
+        self._reschedule()
+
+    def record_success(self) -> None:
+        """Recover the rate gradually after successful requests."""
+        self._consecutive_limited = 0
+        if self.rate_factor < 1.0:
+            self.rate_factor = min(1.0, self.rate_factor + RATE_INCREASE_STEP)
+
+    def snapshot(self) -> RateLimitSnapshot:
+        """Current limiter state."""
+        now = self._clock()
+        self._refill(now)
+        return RateLimitSnapshot(
+            key=self.key,
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            rate_factor=round(self.rate_factor, 3),
+            available_requests=round(self._request_level, 2),
+            available_tokens=round(self._token_level, 2),
+            waiting=self.waiting,
+            paused_for_seconds=round(max(0.0, self._paused_until - now), 2),
+            rate_limited_count=self.rate_limited_count
+        )
+
+
+# Process-wide registry keyed by (provider, credential, endpoint)
+_rate_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def rate_limiter_key(provider_id: str, api_key: str, endpoint_url: Optional[str] = None) -> str:
+    """Registry key for a provider credential (the API key itself is never stored)."""
+    credential = hashlib.sha256(f"{api_key}\n{endpoint_url or ''}".encode("utf-8")).hexdigest()[:16]
+    return f"{provider_id}:{credential}"
+
+
+def get_rate_limiter(
+    provider_id: str,
+    api_key: str,
+    endpoint_url: Optional[str] = None,
+    requests_per_minute: int = 60,
+    tokens_per_minute: int = 40000
+) -> AdaptiveRateLimiter:
+    """Get the shared rate limiter for a provider credential, creating it on first use."""
+    key = rate_limiter_key(provider_id, api_key, endpoint_url)
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(key, requests_per_minute, tokens_per_minute)
+        _rate_limiters[key] = limiter
+    return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Snapshots of all active rate limiters."""
+    return {key: limiter.snapshot().__dict__ for key, limiter in _rate_limiters.items()}
+
+
+def reset_rate_limiters() -> None:
+    """Drop all limiters (used by tests and on configuration reload)."""
+    _rate_limiters.clear()
@@ -0,0 +1,197 @@
+"""
+String Preprocessing for Interpretation
+
+Reduces the strings extracted from a binary (often tens of thousands, mostly
+format strings, locale tables and duplicates) to a small set of cluster
+representatives packed into interpret_strings batches, and fans the
+interpretations back out to every member string.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+# Shortest string worth interpreting
+MIN_STRING_LENGTH = 4
+
+# Strings below this Shannon entropy (bits per character) are padding or fill patterns
+MIN_STRING_ENTROPY = 1.5
+
+# Minimum share of letters and digits; lower means separators, tables or binary junk
+MIN_ALNUM_RATIO = 0.5
+
+# Letters needed once format specifiers are removed ("%s: %d" carries no meaning)
+MIN_LETTERS_AFTER_FORMAT = 3
+
+# Strings per interpret_strings call (lowered to the provider's max_strings_per_request)
+# and characters per batch
+STRING_BATCH_SIZE = 50
+STRING_BATCH_MAX_CHARS = 6000
+
+# Longest string value sent in a prompt; longer values are truncated
+MAX_PROMPT_STRING_CHARS = 200
+
+# Always kept regardless of the heuristics: URLs, IPs, paths, registry keys, emails
+_INTERESTING_RE = re.compile(
+    r"(?i)(https?://|ftp://|\b\d{1,3}(\.\d{1,3}){3}\b|^/[\w.-]+/|[a-z]:\\|\\\\|hkey_|software\\|[\w.+-]+@[\w-]+\.[\w.]+)"
+)
+_FORMAT_SPEC_RE = re.compile(r"%[-+ #0]*(\d+|\*)?(\.(\d+|\*))?(hh|h|ll|l|L|z|j|t)?[diouxXeEfgGcspn%]")
+_HEX_RE = re.compile(r"0x[0-9a-f]+")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Toolchain and runtime strings present in nearly every binary
+NOISE_PREFIXES = (
+    "GCC: (", "GLIBC_", "GLIBCXX_", "CXXABI_", "__gmon_start__", "_ITM_", "__cxa_",
+    ".text", ".data", ".rodata", ".bss", ".note", ".gnu", ".eh_frame", ".dynamic",
+)
+
+_VOWELS = set("aeiouyAEIOUY")
+
+
+@dataclass
+class StringCluster:
+    """Strings sharing a normalized template, interpreted once through a representative."""
+    key: str
+    members: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def representative(self) -> Dict[str, Any]:
+        """First member, with its value truncated for the prompt."""
+        first = self.members[0]
+        if len(first["content"]) <= MAX_PROMPT_STRING_CHARS:
+            return first
+        return {**first, "content": first["content"][:MAX_PROMPT_STRING_CHARS]}
+
+
+@dataclass
+class StringPlan:
+    """Result of preprocessing: clusters to interpret and what was removed."""
+    clusters: List[StringCluster]
+    total: int
+    unique: int
+    filtered: int
+
+    def batches(
+        self,
+        batch_size: int = STRING_BATCH_SIZE,
+        max_chars: int = STRING_BATCH_MAX_CHARS
+    ) -> List[List[StringCluster]]:
+        """Pack clusters into batches bounded by count and prompt characters."""
+        batches: List[List[StringCluster]] = []
+        current: List[StringCluster] = []
+        chars = 0
+        for cluster in self.clusters:
+            length = len(cluster.representative["content"])
+            if current and (len(current) >= batch_size or chars + length > max_chars):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(cluster)
+            chars += length
+        if current:
+            batches.append(current)
+        return batches
+
+    def stats(self) -> Dict[str, int]:
+        """Counts for reporting alongside the interpretations."""
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "filtered": self.filtered,
+            "clusters": len(self.clusters),
+            "batches": len(self.batches()),
+        }
+
+
+def shannon_entropy(text: str) -> float:
+    """Shannon entropy of the characters in text, in bits per character."""
+    if not text:
+        return 0.0
+    counts = Counter(text)
+    length = len(text)
+    return -sum(count / length * math.log2(count / length) for count in counts.values())
+
+
+def is_low_information(value: str) -> bool:
+    """Whether a string is unlikely to tell an analyst anything (padding, format-only, noise)."""
+    stripped = value.strip()
+    if _INTERESTING_RE.search(stripped):
+        return False
+    if len(stripped) < MIN_STRING_LENGTH:
+        return True
+    if stripped.startswith(NOISE_PREFIXES):
+        return True
+    if shannon_entropy(stripped) < MIN_STRING_ENTROPY:
+        return True
+    if sum(c.isalnum() for c in stripped) / len(stripped) < MIN_ALNUM_RATIO:
+        return True
+    if sum(c.isalpha() for c in _FORMAT_SPEC_RE.sub("", stripped)) < MIN_LETTERS_AFTER_FORMAT:
+        return True
+    # Single letter-only tokens without vowels are instruction bytes or mangling, not words
+    if stripped.isalpha() and len(stripped) >= 6 and not any(c in _VOWELS for c in stripped):
+        return True
+    return False
+
+
+def cluster_key(value: str) -> str:
+    """Template of a string with numbers and format specifiers normalized."""
+    key = _FORMAT_SPEC_RE.sub("%", value.strip().lower())
+    key = _HEX_RE.sub("#", key)
+    key = _DIGITS_RE.sub("0", key)
+    return _SPACE_RE.sub(" ", key)
+
+
+def prepare_strings(string_list: List[Dict[str, Any]]) -> StringPlan:
+    """
+    Deduplicate, filter and cluster strings for interpretation.
+
+    Args:
+        string_list: Provider string entries with at least a "content" key
+
+    Returns:
+        StringPlan whose clusters keep every surviving string (duplicates included)
+    """
+    seen: Dict[str, bool] = {}
+    clusters: Dict[str, StringCluster] = {}
+    filtered = 0
+    for item in string_list:
+        value = item.get("content") or ""
+        keep = seen.get(value)
+        if keep is None:
+            keep = seen[value] = not is_low_information(value)
+            if not keep:
+                filtered += 1
+        if not keep:
+            continue
+        key = cluster_key(value)
+        cluster = clusters.get(key)
+        if cluster is None:
+            cluster = clusters[key] = StringCluster(key=key)
+        cluster.members.append(item)
+    return StringPlan(
+        clusters=list(clusters.values()),
+        total=len(string_list),
+        unique=len(seen),
+        filtered=filtered,
+    )
+
+
+def fan_out(
+    batch: List[StringCluster],
+    interpretations: List[Any]
+) -> List[Tuple[Dict[str, Any], Any]]:
+    """
+    Pair each member string with its cluster representative's interpretation.
+
+    interpretations are positional, matching the representatives sent for
+    the batch; clusters without an interpretation are dropped.
+    """
+    pairs: List[Tuple[Dict[str, Any], Any]] = []
+    for cluster, interpretation in zip(batch, interpretations):
+        if interpretation is None:
+            continue
+        pairs.extend((member, interpretation) for member in cluster.members)
+    return pairs
@@ -0,0 +1,212 @@
+"""
+Structured Output
+
+JSON schemas derived from the translation result models, a fast decoder for
+JSON replies, and a one-shot repair re-ask for replies that do not match.
+Providers request schema-constrained output (response_format, tool use) and
+fall back to free-text parsing only when repair also fails.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from ..core.logging import get_logger
+from ..core.metrics import increment_counter
+from ..models.decompilation.results import FunctionTranslation, OverallSummary
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    orjson = None
+
+
+logger = get_logger(__name__)
+
+# Fields the model fills in; identifiers and metadata come from the request
+FUNCTION_OUTPUT_FIELDS = (
+    "natural_language_description",
+    "parameters_explanation",
+    "return_value_explanation",
+    "assembly_summary",
+    "security_analysis",
+    "confidence_score",
+)
+SUMMARY_OUTPUT_FIELDS = (
+    "program_purpose",
+    "main_functionality",
+    "architecture_overview",
+    "data_flow_description",
+    "security_analysis",
+    "technology_stack",
+    "key_insights",
+    "potential_use_cases",
+    "risk_assessment",
+    "behavioral_indicators",
+    "confidence_score",
+)
+
+# Longest malformed reply sent back in a repair request
+MAX_REPAIR_CHARS = 12000
+
+# Keywords vendors reject in strict schemas
+_UNSUPPORTED_SCHEMA_KEYS = ("title", "default", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")
+
+
+class StructuredOutputError(ValueError):
+    """A reply that is not valid JSON for the requested schema."""
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """JSON schema for one kind of structured reply."""
+    name: str
+    json_schema: Dict[str, Any]
+    nullable: Tuple[str, ...] = field(default=())
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.json_schema["properties"])
+
+
+def _strip_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    cleaned = {k: v for k, v in schema.items() if k not in _UNSUPPORTED_SCHEMA_KEYS}
+    if "items" in cleaned:
+        cleaned["items"] = _strip_schema(cleaned["items"])
+    if "anyOf" in cleaned:
+        cleaned["anyOf"] = [_strip_schema(option) for option in cleaned["anyOf"]]
+    return cleaned
+
+
+def schema_for(model: Type[BaseModel], fields: Tuple[str, ...], name: str) -> OutputSchema:
+    """
+    Derive a strict JSON schema for some of a model's fields.
+
+    Every field is required; optional fields are nullable instead, as strict
+    vendor modes require. Descriptions come from the model's Field definitions.
+    """
+    properties = model.model_json_schema()["properties"]
+    schema_properties = {name_: _strip_schema(properties[name_]) for name_ in fields}
+    nullable = tuple(
+        name_ for name_, prop in schema_properties.items()
+        if any(option.get("type") == "null" for option in prop.get("anyOf", []))
+    )
+    return OutputSchema(
+        name=name,
+        json_schema={
+            "type": "object",
+            "properties": schema_properties,
+            "required": list(fields),
+            "additionalProperties": False,
+        },
+        nullable=nullable,
+    )
+
+
+FUNCTION_TRANSLATION_SCHEMA = schema_for(FunctionTranslation, FUNCTION_OUTPUT_FIELDS, "function_translation")
+OVERALL_SUMMARY_SCHEMA = schema_for(OverallSummary, SUMMARY_OUTPUT_FIELDS, "overall_summary")
+
+
+def output_instructions(schema: OutputSchema) -> str:
+    """Prompt text describing the JSON reply, for modes that do not carry the schema."""
+    lines = ["Respond with only a JSON object with these keys:"]
+    for name, prop in schema.json_schema["properties"].items():
+        optional = " (or null)" if name in schema.nullable else ""
+        lines.append(f"- {name}{optional}: {prop.get('description', '')}")
+    return "\n".join(lines)
+
+
+def decode_json(content: str) -> Any:
+    """Decode a JSON reply, tolerating code fences and text around the object."""
+    text = (content or "").strip()
+    if not text.startswith("{"):
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end < start:
+            raise StructuredOutputError("Reply contains no JSON object")
+        text = text[start:end + 1]
+    try:
+        return orjson.loads(text) if orjson is not None else json.loads(text)
+    except ValueError as e:
+        raise StructuredOutputError(f"Invalid JSON: {e}")
+
+
+def _check_type(name: str, value: Any, prop: Dict[str, Any]) -> Any:
+    types = [option.get("type") for option in prop.get("anyOf", [prop])]
+    if value is None:
+        if "null" in types:
+            return None
+        raise StructuredOutputError(f"{name} must not be null")
+    if "string" in types and isinstance(value, str):
+        return value
+    if "number" in types and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if "array" in types and isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    raise StructuredOutputError(f"{name} has the wrong type")
+
+
+def validate_output(data: Any, schema: OutputSchema) -> Dict[str, Any]:
+    """Check a decoded reply against the schema and return its fields."""
+    if not isinstance(data, dict):
+        raise StructuredOutputError("Reply is not a JSON object")
+    fields: Dict[str, Any] = {}
+    for name, prop in schema.json_schema["properties"].items():
+        if name not in data and name not in schema.nullable:
+            raise StructuredOutputError(f"Missing field {name}")
+        fields[name] = _check_type(name, data.get(name), prop)
+    if fields.get("confidence_score") is not None:
+        fields["confidence_score"] = min(1.0, max(0.0, fields["confidence_score"]))
+    return fields
+
+
+def parse_output(content: Union[str, Dict[str, Any]], schema: OutputSchema) -> Dict[str, Any]:
+    """Decode (unless already decoded, as with tool input) and validate a reply."""
+    data = content if isinstance(content, dict) else decode_json(content)
+    return validate_output(data, schema)
+
+
+def repair_prompts(content: Union[str, Dict[str, Any]], error: str, schema: OutputSchema) -> Tuple[str, str]:
+    """System and user prompts asking the model to fix its own reply (without the original input)."""
+    if isinstance(content, dict):
+        content = json.dumps(content, default=str)
+    system_prompt = (
+        "You correct malformed JSON. Keep the meaning of the reply and change only what is needed "
+        "to match the schema.\n\n" + output_instructions(schema)
+    )
+    user_prompt = f"Problem: {error}\n\nReply to correct:\n{content[:MAX_REPAIR_CHARS]}"
+    return system_prompt, user_prompt
+
+
+async def parse_with_repair(
+    content: Union[str, Dict[str, Any]],
+    schema: OutputSchema,
+    reask: Callable[[str, str], Awaitable[Union[str, Dict[str, Any]]]]
+) -> Dict[str, Any]:
+    """
+    Parse a structured reply, re-asking once with a repair prompt if it does not match.
+
+    Args:
+        content: Reply text, or tool input already decoded by the vendor SDK
+        schema: Expected schema
+        reask: Sends (system_prompt, user_prompt) and returns the corrected reply
+
+    Raises:
+        StructuredOutputError: If the repaired reply does not match either
+    """
+    try:
+        return parse_output(content, schema)
+    except StructuredOutputError as e:
+        logger.info(f"Repairing {schema.name} reply: {e}")
+        increment_counter("llm_structured_output_repairs", 1, schema=schema.name)
+        repaired = await reask(*repair_prompts(content, str(e), schema))
+    return parse_output(repaired, schema)
+
+
+def merge_usage(response: Dict[str, Any], extra: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add the usage of repair requests to a completion response."""
+    for other in extra:
+        for key in ("tokens_used", "input_tokens", "output_tokens", "processing_time_ms"):
+            response[key] = (response.get(key) or 0) + (other.get(key) or 0)
+    return response
@@ -0,0 +1,293 @@
+"""
+Tokenizer Registry
+
+Pluggable token counting for LLM providers. OpenAI-compatible models use
+tiktoken, any provider can use a vendor tokenizer file loaded offline with the
+Hugging Face tokenizers library, and everything else falls back to a
+calibrated characters-per-token estimate. Exact counts are memoized in a
+shared LRU keyed by text hash.
+"""
+
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.logging import get_logger
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is optional at runtime
+    tiktoken = None
+
+try:
+    from tokenizers import Tokenizer as HFTokenizer
+except ImportError:  # pragma: no cover - tokenizers is optional at runtime
+    HFTokenizer = None
+
+
+logger = get_logger(__name__)
+
+
+# Calibrated characters-per-token ratios used when no tokenizer is available.
+# Assembly listings tokenize denser than prose, so the ratios are deliberately
+# conservative to avoid overrunning the context window.
+CHARS_PER_TOKEN = {
+    "openai": 3.6,
+    "anthropic": 3.3,
+    "gemini": 3.8,
+    "ollama": 3.2,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Entries kept in the shared token count cache
+TOKEN_COUNT_CACHE_SIZE = 20000
+
+# Encoding used for OpenAI-compatible models tiktoken does not know
+DEFAULT_TIKTOKEN_ENCODING = "cl100k_base"
+
+
+class Tokenizer:
+    """Counts tokens for one provider/model; subclasses implement _encode_lengths."""
+
+    name = "estimate"
+    is_exact = False
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        return self._encode_lengths(texts)
+
+    def _encode_lengths(self, texts: List[str]) -> List[int]:
+        raise NotImplementedError
+
+
+class EstimateTokenizer(Tokenizer):
+    """Calibrated characters-per-token estimate."""
+
+    def __init__(self, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+        self.name = f"estimate:{chars_per_token}"
+
+    def _encode_lengths(self, texts: List[str]) -> List[int]:
+        return [math.ceil(len(text) / self.chars_per_token) for text in texts]
+
+
+class TiktokenTokenizer(Tokenizer):
+    """tiktoken encoding for OpenAI-compatible models."""
+
+    is_exact = True
+
+    def __init__(self, encoding: Any):
+        self.encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    def _encode_lengths(self, texts: List[str]) -> List[int]:
+        if len(texts) == 1:
+            return [len(self.encoding.encode_ordinary(texts[0]))]
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+
+
+class FileTokenizer(Tokenizer):
+    """Vendor tokenizer loaded from a local tokenizer.json (e.g. the model behind an Ollama tag)."""
+
+    is_exact = True
+
+    def __init__(self, tokenizer: Any, path: str):
+        self.tokenizer = tokenizer
+        self.name = f"file:{path}"
+
+    def _encode_lengths(self, texts: List[str]) -> List[int]:
+        encodings = self.tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+
+class TokenCountCache:
+    """Bounded LRU of token counts keyed by (tokenizer, text hash)."""
+
+    def __init__(self, max_entries: int = TOKEN_COUNT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+
+    @staticmethod
+    def key(tokenizer: Tokenizer, text: str) -> Tuple[str, bytes]:
+        return tokenizer.name, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[int]:
+        count = self._entries.get(key)
+        if count is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return count
+
+    def put(self, key: Tuple[str, bytes], count: int) -> None:
+        self._entries[key] = count
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_token_count_cache = TokenCountCache()
+
+
+def get_token_count_cache() -> TokenCountCache:
+    """Get the process-wide token count cache."""
+    return _token_count_cache
+
+
+def count_tokens_many(texts: Iterable[str], tokenizer: Tokenizer) -> List[int]:
+    """
+    Count tokens for several texts, tokenizing only cache misses in one batch.
+
+    Estimates are cheaper than hashing the text, so only exact tokenizers
+    go through the cache.
+    """
+    texts = list(texts)
+    counts = [0] * len(texts)
+    if not tokenizer.is_exact:
+        pending = [i for i, text in enumerate(texts) if text]
+        for i, count in zip(pending, tokenizer.count_many([texts[i] for i in pending])):
+            counts[i] = count
+        return counts
+
+    cache = _token_count_cache
+    misses: Dict[Tuple[str, bytes], List[int]] = {}
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        key = cache.key(tokenizer, text)
+        if key in misses:
+            misses[key].append(i)
+            continue
+        cached = cache.get(key)
+        if cached is None:
+            misses[key] = [i]
+        else:
+            counts[i] = cached
+
+    if misses:
+        keys = list(misses)
+        for key, count in zip(keys, tokenizer.count_many([texts[misses[key][0]] for key in keys])):
+            cache.put(key, count)
+            for i in misses[key]:
+                counts[i] = count
+    return counts
+
+
+def count_tokens(text: str, tokenizer: Tokenizer) -> int:
+    """Count tokens in text through the shared cache."""
+    return count_tokens_many([text], tokenizer)[0]
+
+
+# Tokenizer factories by provider: (model, options) -> Tokenizer or None
+TokenizerFactory = Callable[[Optional[str], Dict[str, Any]], Optional[Tokenizer]]
+
+_encoding_cache: Dict[str, Any] = {}
+
+
+def _get_encoding(model: Optional[str]):
+    """Return a cached tiktoken encoding for the model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+
+    key = model or DEFAULT_TIKTOKEN_ENCODING
+    if key in _encoding_cache:
+        return _encoding_cache[key]
+
+    encoding = None
+    try:
+        encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
+    except KeyError:
+        try:
+            encoding = tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
+        except Exception as e:
+            logger.debug("tiktoken_encoding_unavailable", model=model, error=str(e))
+    except Exception as e:
+        # Encoding files may need a download that is not possible offline
+        logger.debug("tiktoken_encoding_unavailable", model=model, error=str(e))
+
+    _encoding_cache[key] = encoding
+    return encoding
+
+
+def tiktoken_factory(model: Optional[str], options: Dict[str, Any]) -> Optional[Tokenizer]:
+    encoding = _get_encoding(model)
+    return TiktokenTokenizer(encoding) if encoding is not None else None
+
+
+def file_factory(model: Optional[str], options: Dict[str, Any]) -> Optional[Tokenizer]:
+    """Load options["tokenizer_file"] with the tokenizers library when both are available."""
+    path = options.get("tokenizer_file")
+    if not path or HFTokenizer is None:
+        return None
+    try:
+        return FileTokenizer(HFTokenizer.from_file(str(path)), str(path))
+    except Exception as e:
+        logger.warning(f"Failed to load tokenizer file {path}: {e}")
+        return None
+
+
+_factories: Dict[str, List[TokenizerFactory]] = {
+    "openai": [file_factory, tiktoken_factory],
+    "anthropic": [file_factory],
+    "gemini": [file_factory],
+    "ollama": [file_factory],
+}
+
+_tokenizers: Dict[Tuple[str, Optional[str], Optional[str]], Tokenizer] = {}
+
+
+def register_tokenizer(provider_id: str, factory: TokenizerFactory, first: bool = True) -> None:
+    """Add a tokenizer factory for a provider, tried before (or after) the existing ones."""
+    factories = _factories.setdefault(str(getattr(provider_id, "value", provider_id)), [])
+    if first:
+        factories.insert(0, factory)
+    else:
+        factories.append(factory)
+    _tokenizers.clear()
+
+
+def get_tokenizer(provider_id: str, model: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> Tokenizer:
+    """
+    Get the tokenizer for a provider and model.
+
+    Factories registered for the provider are tried in order; the calibrated
+    estimate is used when none of them produces a tokenizer.
+    """
+    provider_id = str(getattr(provider_id, "value", provider_id))
+    options = options or {}
+    cache_key = (provider_id, model, options.get("tokenizer_file"))
+    tokenizer = _tokenizers.get(cache_key)
+    if tokenizer is not None:
+        return tokenizer
+
+    for factory in _factories.get(provider_id, []):
+        tokenizer = factory(model, options)
+        if tokenizer is not None:
+            break
+    else:
+        tokenizer = EstimateTokenizer(CHARS_PER_TOKEN.get(provider_id, DEFAULT_CHARS_PER_TOKEN))
+
+    _tokenizers[cache_key] = tokenizer
+    logger.debug(f"Using {tokenizer.name} tokenizer for {provider_id}/{model}")
+    return tokenizer
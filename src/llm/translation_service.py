@@ -6,14 +6,29 @@ handling provider selection, context preparation, and result merging.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import json
+import time
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
 from datetime import datetime
 
-from .base import LLMConfig, LLMProviderType
+from .base import LLMConfig, LLMProviderType, TranslationOperationType
 from .providers.openai_provider import OpenAIProvider
 from .providers.anthropic_provider import AnthropicProvider
 from .providers.gemini_provider import GeminiProvider
 from .prompts.manager import ContextualPromptManager
+from .prompts.experiments import prompt_experiment_manager
+from .prompt_pipeline import PromptPipeline
+from .call_graph import CallGraph, CallGraphScheduler
+from .function_ranking import FunctionRanker, RankedFunction, DEFAULT_IMPORTANT_FUNCTIONS, DETAIL_BRIEF, DETAIL_SKIP
+from .batch import BATCH_PRIORITIES, BATCH_POLL_INTERVAL_SECONDS, BATCH_TIMEOUT_SECONDS
+from .rate_limit import rate_limit_owner, get_rate_limit_stats
+from .string_filtering import STRING_BATCH_SIZE, StringPlan, prepare_strings, fan_out
+from .cascade import CascadeTranslator, DEFAULT_CASCADE_CONFIDENCE_THRESHOLD
+from .hedging import HedgedTranslator
+from .import_knowledge import (
+    ImportKnowledgeBase, get_import_knowledge_base, normalize_library, normalize_symbol, provider_quality
+)
+from .job_budget import JobBudget
 from ..models.decompilation.results import (
     FunctionTranslation, ImportTranslation, StringTranslation, OverallSummary,
     DecompilationResult, LLMProviderMetadata
@@ -23,6 +38,18 @@ from ..core.metrics import increment_counter, time_async_operation, OperationTyp
 
 logger = get_logger(__name__)
 
+# Concurrent function translations per job (independent call-graph subtrees)
+DEFAULT_TRANSLATION_CONCURRENCY = 4
+
+# Imports listed in the shared binary context block
+MAX_CONTEXT_IMPORTS = 100
+
+# Imports sent to the import-explanation pass
+MAX_EXPLAINED_IMPORTS = 100
+
+# Function results the overall summary waits for before it starts
+DEFAULT_SUMMARY_AFTER_FUNCTIONS = 10
+
 
 class TranslationServiceOrchestrator:
     """
@@ -32,8 +59,9 @@ class TranslationServiceOrchestrator:
     and result merging for decompilation analysis.
     """
     
-    def __init__(self):
+    def __init__(self, import_knowledge: Optional[ImportKnowledgeBase] = None):
         self.prompt_manager = ContextualPromptManager()
+        self.import_knowledge = import_knowledge
         # No persistent providers - create on demand from request parameters
     
     async def _create_provider_from_config(self, llm_config: Dict[str, Any]):
@@ -128,7 +156,8 @@ class TranslationServiceOrchestrator:
                 endpoint_url=endpoint_url,
                 max_tokens=4000,
                 temperature=0.1,
-                timeout_seconds=30
+                timeout_seconds=30,
+                structured_output=bool(llm_config.get("structured_output"))
             )
             return OpenAIProvider(config)
         elif provider_type_str == "anthropic":
@@ -139,7 +168,8 @@ class TranslationServiceOrchestrator:
                 endpoint_url=endpoint_url,
                 max_tokens=4000,
                 temperature=0.1,
-                timeout_seconds=30
+                timeout_seconds=30,
+                structured_output=bool(llm_config.get("structured_output"))
             )
             return AnthropicProvider(config)
         elif provider_type_str == "gemini":
@@ -163,7 +193,8 @@ class TranslationServiceOrchestrator:
                 endpoint_url=endpoint_url,
                 max_tokens=4000,
                 temperature=0.1,
-                timeout_seconds=30
+                timeout_seconds=30,
+                provider_specific=self._ollama_options()
             )
             return OllamaProvider(config)
         else:
@@ -173,15 +204,49 @@ class TranslationServiceOrchestrator:
         self,
         decompilation_result: DecompilationResult,
         llm_config: Dict[str, Any],
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> DecompilationResult:
         """
         Translate a complete decompilation result using LLM providers.
         
+        Functions are ranked by importance; the top important_functions are
+        translated at full detail, the rest in brief mode (or skipped with
+        tail_mode="skip"), and at most max_functions are translated.
+        Low-priority jobs (or execution_mode="batch") use the provider's batch
+        API when it has one. Import explanation and string interpretation run
+        concurrently with function translation, and the overall summary starts
+        once summary_after_functions results exist (0 starts it right away,
+        from imports, strings and metadata). With cascade=True every
+        function is drafted by a local Ollama model and only low-confidence
+        drafts are sent to the request's provider.
+        
+        Function requests feed the provider's live latency and error stats.
+        With hedge_provider set (and no budget), a function request still
+        running past the provider's rolling p95 latency is duplicated to the
+        hedge provider (hedge_model) and the first answer wins; failed
+        requests also fall over to it.
+        
+        With max_job_tokens or max_job_cost_usd set, usage is accounted from
+        each result as it arrives: past budget_degrade_at of the budget the
+        remaining functions are translated in brief mode (on
+        budget_fallback_model when given), and functions whose request would
+        overrun the budget are left untranslated. Import, string and summary
+        requests reserve budget the same way and are skipped when it has no
+        room. Budgeted jobs do not use the batch API, which cannot be stopped
+        part-way.
+        
+        While a function-translation prompt experiment is running, full-detail
+        functions on the concurrent path whose normal template is the
+        experiment's control are assigned a template by the experiment, and
+        their results are recorded against it.
+        
         Args:
             decompilation_result: The original decompilation result
             llm_config: LLM configuration from API request
             context: Additional context for translation
+            progress_callback: Optional coroutine receiving translation progress
+                (completed/total, coverage of the important set and budget usage)
             
         Returns:
             Enhanced decompilation result with LLM translations
@@ -201,63 +266,288 @@ class TranslationServiceOrchestrator:
             provider_count=1  # Single on-demand provider per request
         ):
             increment_counter("llm_translation_requests", 1)
+            provider = None
+            cascade = None
+            fallback_provider = None
+            hedge_provider = None
             
             try:
                 # Create provider from request configuration
                 provider = await self._create_provider_from_config(llm_config)
                 await provider.initialize()
                 provider_id = llm_config.get("llm_provider")
+                budget = JobBudget.from_config(llm_config)
+                
+                # Function requests record live latency and are hedged when a hedge provider is set;
+                # budgeted jobs are not hedged since the cancelled duplicate's usage is unknown
+                if llm_config.get("hedge_provider") and not budget.enabled:
+                    hedge_provider = await self._create_hedge_provider(llm_config)
+                hedged = HedgedTranslator(provider, hedge_provider)
+                
+                # Cascade mode drafts every function locally and escalates weak drafts
+                cascade = await self._create_cascade(hedged, llm_config) if llm_config.get("cascade") else None
+                function_translator = cascade or hedged
                 
                 # Prepare translation context
                 translation_context = self._prepare_translation_context(
                     decompilation_result, llm_config, context
                 )
                 
-                # Translate functions (if any)
-                translated_functions = []
-                for func in decompilation_result.functions:
+                # Rank functions so the important set is translated first at full detail
+                functions = list(decompilation_result.functions)
+                references = self._build_reference_lookup(decompilation_result)
+                important_functions = llm_config.get("important_functions")
+                ranker = FunctionRanker(
+                    important_count=(
+                        DEFAULT_IMPORTANT_FUNCTIONS if important_functions is None else important_functions
+                    ),
+                    max_functions=llm_config.get("max_functions"),
+                    tail_mode=llm_config.get("tail_mode") or DETAIL_BRIEF
+                )
+                graph = CallGraph(functions)
+                metadata = getattr(decompilation_result, 'metadata', None)
+                ranked = ranker.rank(functions, graph, entry_point=getattr(metadata, 'entry_point', None))
+                priorities = ranker.schedule_priorities(ranked, graph)
+                selected = [r for r in ranked if r.detail_level != DETAIL_SKIP]
+                skipped = [r.name for r in ranked if r.detail_level == DETAIL_SKIP]
+                
+                progress = {
+                    "total": len(selected),
+                    "completed": 0,
+                    "translated": 0,
+                    "important_total": sum(1 for r in selected if r.is_important),
+                    "important_translated": 0,
+                    "skipped": len(skipped)
+                }
+                # Full-detail functions take part in the running prompt experiment, if any
+                experiment = prompt_experiment_manager.active(TranslationOperationType.FUNCTION_TRANSLATION.value)
+                if budget.enabled:
+                    progress["budget"] = budget.get_stats()
+                fallback_lock = asyncio.Lock()
+                fallback_failed = False
+                
+                async def degraded_translator():
+                    """Provider for the cheaper budget_fallback_model, created on first use."""
+                    nonlocal fallback_provider, fallback_failed
+                    fallback_model = llm_config.get("budget_fallback_model")
+                    if cascade or not fallback_model or fallback_failed:
+                        return function_translator
+                    async with fallback_lock:
+                        if fallback_provider is None and not fallback_failed:
+                            try:
+                                candidate = await self._create_provider_from_config(
+                                    {**llm_config, "llm_model": fallback_model}
+                                )
+                                await candidate.initialize()
+                                fallback_provider = candidate
+                                logger.info(f"Job budget nearly spent, switching to {fallback_model}")
+                            except Exception as e:
+                                logger.warning(f"Budget fallback model {fallback_model} unavailable: {e}")
+                                fallback_failed = True
+                    return fallback_provider or function_translator
+                
+                # Imports, strings and the overall summary run as separate passes
+                # alongside function translation; the summary starts once the first
+                # summary_after_functions results exist so job time is the longest pass
+                translations: Dict[int, FunctionTranslation] = {}
+                summary_after = llm_config.get("summary_after_functions")
+                if summary_after is None:
+                    summary_after = DEFAULT_SUMMARY_AFTER_FUNCTIONS
+                summary_ready = asyncio.Event()
+                pass_timings: Dict[str, float] = {}
+                passes_started = time.monotonic()
+                
+                def function_results_available() -> None:
+                    if len(translations) >= min(summary_after, progress["total"]):
+                        summary_ready.set()
+                
+                async def summarize() -> Optional[OverallSummary]:
+                    await summary_ready.wait()
+                    summary_data = self._build_summary_data(
+                        decompilation_result, [translations[index] for index in sorted(translations)]
+                    )
+                    if not self._reserve(
+                        budget, provider, [json.dumps(summary_data, default=str)], TranslationOperationType.OVERALL_SUMMARY
+                    ):
+                        logger.info("Job budget exhausted, skipping the overall summary")
+                        return None
+                    summary = None
                     try:
-                        function_data = {
-                            "name": func.name,
-                            "address": func.address,
-                            "size": func.size,
-                            "assembly_code": func.assembly_code,
-                            "pseudocode": getattr(func, 'pseudocode', None),
-                            "decompiled_code": getattr(func, 'decompiled_code', None),
-                            "calls_to": getattr(func, 'calls_to', []),
-                            "calls_from": getattr(func, 'calls_from', []),
-                            "variables": getattr(func, 'variables', []),
-                            "imports_used": getattr(func, 'imports_used', []),
-                            "strings_referenced": getattr(func, 'strings_referenced', [])
-                        }
-                        
-                        translation = await provider.translate_function(
-                            function_data=function_data,
-                            context=translation_context
+                        summary = await provider.generate_overall_summary(summary_data, translation_context)
+                    finally:
+                        budget.finish(summary)
+                    return summary
+                
+                pass_operations = {}
+                if llm_config.get("translate_imports", True) and decompilation_result.imports:
+                    import_list = [
+                        self._build_import_data(imp) for imp in decompilation_result.imports[:MAX_EXPLAINED_IMPORTS]
+                    ]
+                    pass_operations["imports"] = lambda: self._explain_imports(
+                        provider, import_list, translation_context, budget
+                    )
+                string_plan: Optional[StringPlan] = None
+                if llm_config.get("translate_strings", True) and decompilation_result.strings:
+                    string_plan = prepare_strings(
+                        [self._build_string_data(string) for string in decompilation_result.strings]
+                    )
+                    pass_operations["strings"] = lambda: self._interpret_strings(
+                        provider, string_plan, translation_context,
+                        llm_config.get("translation_concurrency", DEFAULT_TRANSLATION_CONCURRENCY), budget
+                    )
+                if llm_config.get("generate_summary", True):
+                    pass_operations["summary"] = summarize
+                    function_results_available()  # A zero threshold starts the summary right away
+                
+                # Share provider rate limits fairly with other jobs on the same credential;
+                # set before the pass tasks are created so they inherit the owner
+                owner_token = rate_limit_owner.set(decompilation_result.decompilation_id)
+                pass_tasks = {
+                    name: asyncio.create_task(self._run_pass(name, operation, passes_started, pass_timings))
+                    for name, operation in pass_operations.items()
+                }
+                try:
+                    # Low-priority jobs go through the vendor batch API when available;
+                    # anything it does not translate continues on the concurrent path
+                    pending = selected
+                    if not cascade and not budget.enabled and self._use_batch_mode(llm_config):
+                        pending = await self._translate_in_batch(
+                            provider, functions, selected, translation_context, llm_config,
+                            translations, progress, progress_callback, references
                         )
-                        translated_functions.append(translation)
+                        function_results_available()
+                    
+                    # Translate bottom-up over the call graph so callers see callee summaries
+                    scheduler = CallGraphScheduler(
+                        [functions[r.index] for r in pending],
+                        max_concurrency=llm_config.get("translation_concurrency", DEFAULT_TRANSLATION_CONCURRENCY)
+                    )
+                    
+                    async def translate_one(position: int, callee_summaries: Dict[str, str]) -> Optional[str]:
+                        ranking = pending[position]
+                        func = functions[ranking.index]
+                        function_data = self._build_function_data(func, references)
+                        estimate = (0, 0.0)
+                        if budget.enabled and not budget.requests:
+                            estimate = self._estimate_usage(provider, [function_data.get("assembly_code") or ""])
+                        if not budget.try_start(ranking.name, *estimate):
+                            progress["completed"] += 1
+                            progress["budget"] = budget.get_stats()
+                            await self._report_progress(progress_callback, progress)
+                            return None
+                        function_data["detail_level"] = ranking.detail_level
+                        if callee_summaries:
+                            function_data["callee_summaries"] = callee_summaries
+                        translator = function_translator
+                        if budget.degraded:
+                            function_data["detail_level"] = DETAIL_BRIEF
+                            translator = await degraded_translator()
+                        elif experiment is not None and ranking.detail_level != DETAIL_BRIEF and (
+                            self._selected_function_template(provider, function_data, translation_context)
+                            == experiment.control_template_id
+                        ):
+                            function_data["prompt_template_id"] = experiment.assign(
+                                f"{decompilation_result.decompilation_id}:{func.address}"
+                            )
                         
-                    except Exception as e:
-                        logger.error(f"Failed to translate function {func.name}: {e}")
-                        continue
-                
-                # TODO: Translate imports and strings when we have more data
+                        translation = None
+                        try:
+                            translation = await translator.translate_function(
+                                function_data=function_data,
+                                context=translation_context
+                            )
+                            translations[ranking.index] = translation
+                        except Exception as e:
+                            logger.error(f"Failed to translate function {func.name}: {e}")
+                        finally:
+                            budget.finish(translation)
+                            if "prompt_template_id" in function_data:
+                                experiment.record(function_data["prompt_template_id"], translation)
+                        
+                        progress["completed"] += 1
+                        if budget.enabled:
+                            progress["budget"] = budget.get_stats()
+                        if translation is not None:
+                            progress["translated"] += 1
+                            if ranking.is_important:
+                                progress["important_translated"] += 1
+                            function_results_available()
+                        await self._report_progress(progress_callback, progress)
+                        
+                        return translation.natural_language_description if translation else None
+                    
+                    await scheduler.run(
+                        translate_one,
+                        priority=lambda position: (priorities[pending[position].index], pending[position].rank)
+                    )
+                    pass_timings["functions"] = round(time.monotonic() - passes_started, 3)
+                    
+                    # Fewer successes than the threshold: summarize whatever was translated
+                    summary_ready.set()
+                    pass_results = dict(zip(pass_tasks, await asyncio.gather(*pass_tasks.values())))
+                finally:
+                    rate_limit_owner.reset(owner_token)
+                    for task in pass_tasks.values():
+                        task.cancel()
+                translated_functions = [translations[index] for index in sorted(translations)]
+                ranking_by_name = {r.name: r for r in ranked}
+                import_translations = pass_results.get("imports") or []
+                string_translations = pass_results.get("strings") or []
+                overall_summary = pass_results.get("summary")
                 
                 # Return both the original result and the translation data separately
-                logger.info(f"Completed LLM translation: {len(translated_functions)} functions translated")
+                logger.info(
+                    f"Completed LLM translation: {len(translated_functions)} functions, "
+                    f"{len(import_translations)} imports, {len(string_translations)} strings translated"
+                )
                 increment_counter("llm_translation_success", 1)
                 
                 # Store translation data for return
-                if translated_functions:
+                if translated_functions or import_translations or string_translations or overall_summary:
                     translation_data = {
                         "functions": [
                             {
                                 "function_name": t.function_name,
                                 "description": t.natural_language_description,
-                                "confidence": t.confidence_score
+                                "confidence": t.confidence_score,
+                                "rank": ranking_by_name[t.function_name].rank if t.function_name in ranking_by_name else None,
+                                "detail_level": ranking_by_name[t.function_name].detail_level if t.function_name in ranking_by_name else None
                             }
                             for t in translated_functions
                         ],
+                        "imports": [
+                            {
+                                "library": t.library_name,
+                                "function": t.function_name,
+                                "summary": t.api_documentation_summary,
+                                "security_implications": t.security_implications
+                            }
+                            for t in import_translations
+                        ],
+                        "strings": [
+                            {
+                                "value": member["content"],
+                                "address": member["address"],
+                                "interpretation": t.interpretation,
+                                "usage_context": t.usage_context,
+                                "security_analysis": t.security_analysis
+                            }
+                            for member, t in string_translations
+                        ],
+                        "string_stats": string_plan.stats() if string_plan else None,
+                        "summary": {
+                            "program_purpose": overall_summary.program_purpose,
+                            "main_functionality": overall_summary.main_functionality,
+                            "security_analysis": overall_summary.security_analysis,
+                            "risk_assessment": overall_summary.risk_assessment,
+                            "key_insights": overall_summary.key_insights
+                        } if overall_summary else None,
+                        "pass_timings": pass_timings,
+                        "cascade": cascade.report() if cascade else None,
+                        "hedging": hedged.report() if hedge_provider else None,
+                        "coverage": self._coverage_summary(progress),
+                        "untranslated_functions": skipped + budget.skipped,
+                        "budget": budget.get_stats(),
                         "provider": provider_id,
                         "translation_time": datetime.utcnow().isoformat()
                     }
@@ -265,13 +555,480 @@ class TranslationServiceOrchestrator:
                     # Return a tuple: (decompilation_result, translation_data)
                     return decompilation_result, translation_data
                 else:
-                    logger.warning("No translated functions to return")
+                    logger.warning("No translation results to return")
                     return decompilation_result, None
                 
             except Exception as e:
                 logger.error(f"Translation failed: {e}")
                 increment_counter("llm_translation_failures", 1)
                 return decompilation_result, None
+            finally:
+                # Providers are created per job; release their clients (Ollama pools stay shared)
+                await self._release_providers(provider, cascade, fallback_provider, hedge_provider)
+    
+    def _ollama_options(self) -> Dict[str, Any]:
+        """Configured Ollama endpoints, parallelism and keep-alive (empty when settings are unavailable)."""
+        try:
+            from ..core.config import get_settings
+            return get_settings().llm.get_ollama_options()
+        except Exception:
+            return {}
+    
+    async def _release_providers(
+        self,
+        provider,
+        cascade: Optional[CascadeTranslator],
+        fallback_provider=None,
+        hedge_provider=None
+    ) -> None:
+        """Clean up a job's providers; failures are logged, not raised."""
+        for resource in (cascade.local_provider if cascade else None, fallback_provider, hedge_provider, provider):
+            if resource is None:
+                continue
+            try:
+                await resource.cleanup()
+            except Exception as e:
+                logger.debug(f"Provider cleanup failed: {e}")
+    
+    async def _create_hedge_provider(self, llm_config: Dict[str, Any]):
+        """
+        Provider that slow or failed function requests are hedged to.
+        
+        Returns None (no hedging) when it cannot be created.
+        """
+        try:
+            hedge_provider = await self._create_provider_from_config({
+                "llm_provider": llm_config["hedge_provider"],
+                "llm_model": llm_config.get("hedge_model"),
+                "structured_output": llm_config.get("structured_output")
+            })
+            await hedge_provider.initialize()
+        except Exception as e:
+            logger.warning(f"Hedge provider {llm_config['hedge_provider']} unavailable, hedging disabled: {e}")
+            return None
+        return hedge_provider
+    
+    async def _create_cascade(self, remote_provider, llm_config: Dict[str, Any]) -> Optional[CascadeTranslator]:
+        """
+        Pair a local Ollama provider with the request's provider for cascade mode.
+        
+        Returns None (remote-only translation) when the local model is unavailable.
+        """
+        from .providers.ollama_provider import OllamaProvider
+        local_provider = OllamaProvider(LLMConfig(
+            provider_id=LLMProviderType.OLLAMA,
+            api_key="ollama-no-auth",
+            default_model=llm_config.get("local_llm_model") or "phi4",
+            endpoint_url=llm_config.get("local_llm_endpoint_url") or OllamaProvider.DEFAULT_ENDPOINTS["local"],
+            max_tokens=4000,
+            temperature=0.1,
+            timeout_seconds=30,
+            provider_specific=self._ollama_options()
+        ))
+        try:
+            await local_provider.initialize()
+        except Exception as e:
+            logger.warning(f"Local model unavailable, cascade disabled: {e}")
+            return None
+        return CascadeTranslator(
+            local_provider,
+            remote_provider,
+            confidence_threshold=llm_config.get("cascade_confidence_threshold", DEFAULT_CASCADE_CONFIDENCE_THRESHOLD)
+        )
+    
+    def _selected_function_template(
+        self,
+        provider,
+        function_data: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Id of the template the provider's prompt pipeline would normally pick.
+        
+        A prompt experiment only replaces its control template, so functions
+        routed to a quality tier or analysis-context template keep it.
+        """
+        get_pipeline = getattr(provider, "get_prompt_pipeline", None)
+        pipeline = get_pipeline() if get_pipeline is not None else PromptPipeline(str(provider.get_provider_id()))
+        try:
+            return pipeline.select_template(function_data, context).template_id
+        except Exception as e:
+            logger.warning(f"Could not select a function prompt template: {e}")
+            return None
+    
+    def _estimate_usage(
+        self,
+        provider,
+        texts: List[str],
+        operation_type: TranslationOperationType = TranslationOperationType.FUNCTION_TRANSLATION
+    ) -> Tuple[int, float]:
+        """
+        Tokens and cost to reserve for a request before any usage is known.
+        
+        Counts the request's input texts plus the full output allowance, so it
+        errs high; (0, 0.0) for providers that cannot estimate.
+        """
+        estimate_tokens = getattr(provider, "_estimate_request_tokens", None)
+        config = getattr(provider, "config", None)
+        if estimate_tokens is None or config is None:
+            return 0, 0.0
+        try:
+            tokens = estimate_tokens(texts, config.max_tokens)
+            cost = provider.get_cost_estimate(tokens, operation_type) or 0.0
+        except Exception as e:
+            logger.warning(f"Could not estimate {operation_type.value} request usage: {e}")
+            return 0, 0.0
+        return tokens, cost
+    
+    def _reserve(
+        self,
+        budget: Optional[JobBudget],
+        provider,
+        texts: List[str],
+        operation_type: TranslationOperationType
+    ) -> bool:
+        """
+        Reserve budget for an import, string or summary request.
+        
+        As for functions, the request is projected at an estimate until the
+        first result is accounted. Always True without a budget.
+        """
+        if budget is None:
+            return True
+        estimate = (0, 0.0)
+        if budget.enabled and not budget.requests:
+            estimate = self._estimate_usage(provider, texts, operation_type)
+        return budget.reserve(*estimate)
+    
+    def _use_batch_mode(self, llm_config: Dict[str, Any]) -> bool:
+        """Whether a job should use the offline batch path (explicit mode or low priority)."""
+        execution_mode = llm_config.get("execution_mode")
+        if execution_mode in ("batch", "interactive"):
+            return execution_mode == "batch"
+        return llm_config.get("priority") in BATCH_PRIORITIES
+    
+    async def _translate_in_batch(
+        self,
+        provider,
+        functions: List[Any],
+        selected: List[RankedFunction],
+        translation_context: Dict[str, Any],
+        llm_config: Dict[str, Any],
+        translations: Dict[int, FunctionTranslation],
+        progress: Dict[str, Any],
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+        references: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+    ) -> List[RankedFunction]:
+        """
+        Translate selected functions in one vendor batch.
+        
+        Returns:
+            Ranked functions still untranslated: those the batch did not
+            return (a timed-out batch is cancelled and keeps what it finished),
+            or all of them when the provider has no batch support or the batch
+            fails outright
+        """
+        if not provider.supports_batch():
+            logger.info(f"Provider {provider.get_provider_id()} has no batch API, using concurrent translation")
+            return selected
+        
+        batch_input = []
+        for ranking in selected:
+            function_data = self._build_function_data(functions[ranking.index], references)
+            function_data["detail_level"] = ranking.detail_level
+            batch_input.append(function_data)
+        
+        try:
+            results = await provider.translate_functions_batch(
+                batch_input,
+                translation_context,
+                poll_interval_seconds=llm_config.get("batch_poll_interval_seconds", BATCH_POLL_INTERVAL_SECONDS),
+                timeout_seconds=llm_config.get("batch_timeout_seconds", BATCH_TIMEOUT_SECONDS)
+            )
+        except Exception as e:
+            logger.warning(f"Batch translation failed, falling back to concurrent translation: {e}")
+            increment_counter("llm_batch_fallbacks", 1)
+            return selected
+        
+        remaining = []
+        for ranking, translation in zip(selected, results):
+            if translation is None:
+                remaining.append(ranking)
+                continue
+            translations[ranking.index] = translation
+            progress["completed"] += 1
+            progress["translated"] += 1
+            if ranking.is_important:
+                progress["important_translated"] += 1
+        
+        logger.info(f"Batch translated {len(selected) - len(remaining)}/{len(selected)} functions")
+        await self._report_progress(progress_callback, progress)
+        return remaining
+    
+    async def _explain_imports(
+        self,
+        provider,
+        import_list: List[Dict[str, Any]],
+        translation_context: Dict[str, Any],
+        budget: Optional[JobBudget] = None
+    ) -> List[ImportTranslation]:
+        """
+        Explain imports, asking the provider only about those missing from the knowledge base.
+        
+        New provider explanations are stored for later jobs. If the knowledge
+        base is unavailable every import goes to the provider. Explanations are
+        matched to imports by library and function name, since providers may
+        skip, reorder or add entries; only matched explanations are stored.
+        """
+        knowledge_base = self.import_knowledge or get_import_knowledge_base()
+        quality = provider_quality(provider.get_provider_id())
+        try:
+            known, missing = await knowledge_base.lookup_many(import_list, quality)
+        except Exception as e:
+            logger.warning(f"Import knowledge base lookup failed: {e}")
+            known, missing = {}, list(range(len(import_list)))
+        
+        increment_counter("llm_import_knowledge_hits", len(known))
+        logger.info(f"Import knowledge base: {len(known)} known, {len(missing)} sent to provider")
+        
+        if missing:
+            requested = [import_list[i] for i in missing]
+            if not self._reserve(budget, provider, [json.dumps(requested)], TranslationOperationType.IMPORT_EXPLANATION):
+                logger.info(f"Job budget exhausted, {len(missing)} imports left unexplained")
+                return [known[position] for position in sorted(known)]
+            explained = None
+            try:
+                explained = await provider.explain_imports(requested, translation_context)
+            finally:
+                if budget is not None:
+                    budget.finish(explained)
+            matched = self._match_import_explanations(import_list, missing, explained)
+            known.update(matched)
+            try:
+                await knowledge_base.store_many(list(matched.values()), quality)
+            except Exception as e:
+                logger.warning(f"Failed to store import explanations: {e}")
+        
+        return [known[position] for position in sorted(known)]
+    
+    def _match_import_explanations(
+        self,
+        import_list: List[Dict[str, Any]],
+        missing: List[int],
+        explained: List[ImportTranslation]
+    ) -> Dict[int, ImportTranslation]:
+        """
+        Map provider explanations to import positions by name.
+        
+        An explanation naming a different library still matches when its
+        function name is unique among the requested imports. Unmatched and
+        duplicate explanations are dropped.
+        """
+        by_name: Dict[Tuple[str, str], int] = {}
+        by_symbol: Dict[str, Optional[int]] = {}
+        for position in missing:
+            library = normalize_library(import_list[position].get("library"))
+            symbol = normalize_symbol(import_list[position].get("function"))
+            by_name.setdefault((library, symbol), position)
+            by_symbol[symbol] = None if symbol in by_symbol else position
+        
+        matched: Dict[int, ImportTranslation] = {}
+        for translation in explained:
+            symbol = normalize_symbol(translation.function_name)
+            position = by_name.get((normalize_library(translation.library_name), symbol))
+            if position is None:
+                position = by_symbol.get(symbol)
+            if position is None or position in matched:
+                increment_counter("llm_import_explanations_unmatched", 1)
+                continue
+            matched[position] = translation
+        return matched
+    
+    async def _interpret_strings(
+        self,
+        provider,
+        string_plan: StringPlan,
+        translation_context: Dict[str, Any],
+        concurrency: int,
+        budget: Optional[JobBudget] = None
+    ) -> List[Tuple[Dict[str, Any], StringTranslation]]:
+        """
+        Interpret cluster representatives in packed batches and fan the results out.
+        
+        Returns:
+            (string entry, StringTranslation) pairs for every member of each
+            interpreted cluster; a failed batch, or one the job budget has no
+            room left for, leaves its clusters out
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def interpret_batch(batch) -> List[Tuple[Dict[str, Any], StringTranslation]]:
+            async with semaphore:
+                representatives = [cluster.representative for cluster in batch]
+                texts = [item.get("content") or "" for item in representatives]
+                if not self._reserve(budget, provider, texts, TranslationOperationType.STRING_INTERPRETATION):
+                    return []
+                interpretations = None
+                try:
+                    interpretations = await provider.interpret_strings(representatives, translation_context)
+                except Exception as e:
+                    logger.error(f"Failed to interpret batch of {len(batch)} strings: {e}")
+                    increment_counter("llm_string_batch_failures", 1)
+                    return []
+                finally:
+                    if budget is not None:
+                        budget.finish(interpretations)
+            return fan_out(batch, interpretations)
+        
+        # Providers ignore strings past their per-request limit, so batches never exceed it
+        limit = getattr(provider, "max_strings_per_request", None)
+        batch_size = min(STRING_BATCH_SIZE, limit) if limit else STRING_BATCH_SIZE
+        results = await asyncio.gather(
+            *(interpret_batch(batch) for batch in string_plan.batches(batch_size=batch_size))
+        )
+        logger.info(f"Interpreted strings: {string_plan.stats()}")
+        return [pair for pairs in results for pair in pairs]
+    
+    async def _run_pass(
+        self,
+        name: str,
+        operation: Callable[[], Awaitable[Any]],
+        started: float,
+        pass_timings: Dict[str, float]
+    ) -> Any:
+        """Run one translation pass; a failed pass yields None without failing the job."""
+        try:
+            return await operation()
+        except Exception as e:
+            logger.error(f"Translation pass {name} failed: {e}")
+            increment_counter("llm_translation_pass_failures", 1, translation_pass=name)
+            return None
+        finally:
+            pass_timings[name] = round(time.monotonic() - started, 3)
+    
+    def _coverage_summary(self, progress: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize translation progress including coverage of the important set."""
+        important_total = progress["important_total"]
+        return {
+            **progress,
+            "important_coverage": round(progress["important_translated"] / important_total, 3) if important_total else 1.0
+        }
+    
+    async def _report_progress(
+        self,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+        progress: Dict[str, Any]
+    ) -> None:
+        """Send a progress update without letting callback failures break translation."""
+        if not progress_callback:
+            return
+        try:
+            await progress_callback(self._coverage_summary(progress))
+        except Exception as e:
+            logger.warning(f"Translation progress callback failed: {e}")
+    
+    def _build_reference_lookup(self, decompilation_result: DecompilationResult) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Index a job's functions, imports and strings by the keys function
+        reference lists use (callee name, import display name, string address).
+        """
+        imports = {}
+        for imp in getattr(decompilation_result, 'imports', None) or []:
+            data = self._build_import_data(imp)
+            imports.setdefault(f"{data['library']}!{data['function']}", data)
+            imports.setdefault(data["function"], data)
+        return {
+            "functions": {
+                func.name: {"name": func.name, "address": func.address}
+                for func in getattr(decompilation_result, 'functions', None) or []
+            },
+            "imports": imports,
+            "strings": {
+                string.address: self._build_string_data(string)
+                for string in getattr(decompilation_result, 'strings', None) or []
+            }
+        }
+    
+    def _build_function_data(
+        self,
+        func: Any,
+        references: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the provider function_data payload for a decompiled function.
+        
+        With a reference lookup, the callees, imports and strings the function
+        references are attached in relevance order for prompt context.
+        """
+        function_data = {
+            "name": func.name,
+            "address": func.address,
+            "size": func.size,
+            "assembly_code": func.assembly_code,
+            "pseudocode": getattr(func, 'pseudocode', None),
+            "decompiled_code": getattr(func, 'decompiled_code', None),
+            "calls_to": getattr(func, 'calls_to', []),
+            "calls_from": getattr(func, 'calls_from', []),
+            "variables": getattr(func, 'variables', []),
+            "imports_used": getattr(func, 'imports_used', []),
+            "strings_referenced": getattr(func, 'strings_referenced', [])
+        }
+        if references:
+            for field, kind, keys in (
+                ("related_functions", "functions", function_data["calls_to"]),
+                ("relevant_imports", "imports", function_data["imports_used"]),
+                ("relevant_strings", "strings", function_data["strings_referenced"])
+            ):
+                resolved = {
+                    id(references[kind][key]): references[kind][key]
+                    for key in keys or [] if key in references[kind]
+                }
+                if resolved:
+                    function_data[field] = list(resolved.values())
+        return function_data
+    
+    def _build_import_data(self, imp: Any) -> Dict[str, Any]:
+        """Build the provider import_list entry for an imported function."""
+        return {
+            "library": getattr(imp, 'library_name', None) or 'unknown',
+            "function": getattr(imp, 'function_name', None) or 'unknown',
+            "address": getattr(imp, 'address', None)
+        }
+    
+    def _build_string_data(self, string: Any) -> Dict[str, Any]:
+        """Build the provider string_list entry for an extracted string."""
+        return {
+            "content": string.value,
+            "address": string.address,
+            "size": string.size,
+            "encoding": getattr(string, 'encoding', 'ascii'),
+            "section": getattr(string, 'section', None)
+        }
+    
+    def _build_summary_data(
+        self,
+        decompilation_result: DecompilationResult,
+        translated_functions: List[FunctionTranslation]
+    ) -> Dict[str, Any]:
+        """Build the provider decompilation_data payload from the functions translated so far."""
+        metadata = getattr(decompilation_result, 'metadata', None)
+        return {
+            "file_info": {
+                "format": getattr(metadata, 'file_format', None) or 'unknown',
+                "size": getattr(metadata, 'file_size', None) or 0,
+                "architecture": getattr(metadata, 'architecture', None) or 'unknown'
+            },
+            "functions": [
+                {
+                    "name": t.function_name,
+                    "address": t.address,
+                    "summary": t.natural_language_description
+                }
+                for t in translated_functions
+            ],
+            "imports": [self._build_import_data(imp) for imp in decompilation_result.imports],
+            "strings": [self._build_string_data(string) for string in decompilation_result.strings]
+        }
     
     def _prepare_translation_context(
         self,
@@ -294,8 +1051,17 @@ class TranslationServiceOrchestrator:
             "translation_settings": {
                 "quality_level": llm_config.get("translation_detail", "standard"),
                 "analysis_depth": llm_config.get("analysis_depth", "standard")
-            }
+            },
+            # Shared by every function prompt, so providers can cache it with the system prompt
+            "imports": [
+                f"{getattr(imp, 'library_name', None) or 'unknown'}!{getattr(imp, 'function_name', None) or '?'}"
+                for imp in decompilation_result.imports[:MAX_CONTEXT_IMPORTS]
+            ]
         }
+        # Precomputed data characteristics steer prompt selection
+        profile = getattr(decompilation_result, 'profile', None)
+        if profile is not None:
+            translation_context["binary_traits"] = list(profile.traits)
         
         # Add additional context if provided
         if context:
@@ -312,7 +1078,8 @@ class TranslationServiceOrchestrator:
         return {
             "status": "healthy",
             "message": "Translation service ready - providers created on-demand from requests",
-            "supported_providers": ["openai", "anthropic", "gemini", "ollama"]
+            "supported_providers": ["openai", "anthropic", "gemini", "ollama"],
+            "rate_limits": get_rate_limit_stats()
         }
 
 
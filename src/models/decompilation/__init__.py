@@ -16,6 +16,7 @@ from .results import (
 from .basic_results import (
     BasicDecompilationResult, 
     DecompilationMetadata,
+    BinaryProfile,
     BasicFunctionInfo, 
     BasicStringInfo, 
     BasicImportInfo
@@ -29,6 +30,7 @@ __all__ = [
     'OverallSummary',
     'BasicDecompilationResult', 
     'DecompilationMetadata',
+    'BinaryProfile',
     'BasicFunctionInfo', 
     'BasicStringInfo', 
     'BasicImportInfo'
@@ -348,6 +348,98 @@ class DecompilationMetadata(BaseModel):
         return f"{algorithm}:{hash_value.lower()}"
 
 
+class BinaryProfile(BaseModel):
+    """
+    Data characteristics of a binary, computed once after decompilation.
+    
+    Prompt selection and provider scoring read the precomputed traits instead
+    of re-deriving heuristics from functions, imports and strings per prompt.
+    """
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "architecture": "x86",
+                    "compiler_hints": ["msvc"],
+                    "obfuscation_indicators": ["dynamic_api_resolution"],
+                    "crypto_constants": ["sha256"],
+                    "function_count": 142,
+                    "median_function_size": 96,
+                    "p90_function_size": 1184,
+                    "max_function_size": 9210,
+                    "traits": ["crypto_functions", "high_function_count", "suspicious_apis"]
+                }
+            ]
+        }
+    )
+    
+    architecture: Optional[str] = Field(
+        default=None,
+        description="Processor architecture (x86, x64, ARM, etc.)"
+    )
+    
+    compiler_hints: List[str] = Field(
+        default_factory=list,
+        description="Compilers or runtimes indicated by strings, imports and symbols"
+    )
+    
+    obfuscation_indicators: List[str] = Field(
+        default_factory=list,
+        description="Signs of packing or obfuscation"
+    )
+    
+    crypto_constants: List[str] = Field(
+        default_factory=list,
+        description="Algorithms whose constants appear in code or strings"
+    )
+    
+    function_count: int = Field(
+        default=0,
+        ge=0,
+        description="Number of functions"
+    )
+    
+    import_count: int = Field(
+        default=0,
+        ge=0,
+        description="Number of imports"
+    )
+    
+    string_count: int = Field(
+        default=0,
+        ge=0,
+        description="Number of strings"
+    )
+    
+    median_function_size: int = Field(
+        default=0,
+        ge=0,
+        description="Median function size in bytes"
+    )
+    
+    p90_function_size: int = Field(
+        default=0,
+        ge=0,
+        description="90th percentile function size in bytes"
+    )
+    
+    max_function_size: int = Field(
+        default=0,
+        ge=0,
+        description="Largest function size in bytes"
+    )
+    
+    traits: List[str] = Field(
+        default_factory=list,
+        description="Sorted characteristic flags used for prompt selection and provider scoring"
+    )
+    
+    def has_trait(self, trait: str) -> bool:
+        """Check whether the profile has a characteristic flag."""
+        return trait in self.traits
+
+
 class BasicDecompilationResult(TimestampedModel):
     """
     Basic decompilation result containing essential binary information.
@@ -426,6 +518,11 @@ class BasicDecompilationResult(TimestampedModel):
         description="Raw decompilation tool output (for debugging)"
     )
     
+    profile: Optional[BinaryProfile] = Field(
+        default=None,
+        description="Data characteristics computed once after decompilation"
+    )
+    
     @computed_field
     @property
     def basic_summary(self) -> Dict[str, Any]:
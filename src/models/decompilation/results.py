@@ -100,6 +100,18 @@ class LLMProviderMetadata(BaseModel):
         ge=0.0,
         description="Estimated cost in USD for this translation"
     )
+    
+    input_tokens: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Prompt tokens, when the provider reports them separately"
+    )
+    
+    output_tokens: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Completion tokens, when the provider reports them separately"
+    )
 
 
 class FunctionTranslation(BaseModel):
@@ -2,22 +2,28 @@
 Simple file-based storage system.
 
 Provides efficient data persistence with just the filesystem:
-- Job results stored as JSON files
+- Job results stored as files encoded by the cache payload codec (serialized, compressed)
+- Result expiry tracked in a time-bucketed index, so cleanup reads only expired results
 - Simple, portable, no external dependencies
 - Works in any environment with filesystem access
 """
 
 import os
-import json
 import asyncio
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 from datetime import datetime, timedelta
 
 from ..core.logging import get_logger
+from ..cache.codec import PayloadCodec
+from ..cache.expiry_index import ExpiryIndex, iso_to_epoch
 
 logger = get_logger(__name__)
 
+# Expired results removed per cleanup batch before yielding to the event loop
+CLEANUP_BATCH_SIZE = 500
+
 
 class FileStorage:
     """Simple file-based storage for job results and metadata."""
@@ -32,6 +38,20 @@ class FileStorage:
         self.results_dir.mkdir(parents=True, exist_ok=True)
         self.jobs_dir.mkdir(parents=True, exist_ok=True)
         
+        # Results hold full assembly text and compress well
+        self.codec = PayloadCodec()
+        
+        # Result expiries; loaded or rebuilt by the first cleanup. One process
+        # per base path owns the index, the others scan the results directory.
+        self.expiry_index = ExpiryIndex(self.base_path / "results_expiry_index.json", exclusive=True)
+        self.cleanup_progress: Dict[str, Any] = {
+            "batches": 0,
+            "processed": 0,
+            "removed": 0,
+            "total_removed": 0,
+            "last_cleanup": None
+        }
+        
         logger.info(f"FileStorage initialized at {self.base_path}")
     
     async def set_result(self, job_id: str, result_data: Dict[str, Any], ttl: int = 3600) -> bool:
@@ -46,9 +66,10 @@ class FileStorage:
                 "expires_at": (datetime.utcnow() + timedelta(seconds=ttl)).isoformat()
             }
             
-            # Write JSON file
-            with open(result_file, 'w') as f:
-                json.dump(result_with_meta, f, indent=2)
+            # Write encoded file
+            with open(result_file, 'wb') as f:
+                f.write(self.codec.encode(result_with_meta))
+            self.expiry_index.set(job_id, iso_to_epoch(result_with_meta["expires_at"]))
             
             logger.info(f"Stored result for job {job_id}")
             return True
@@ -65,15 +86,14 @@ class FileStorage:
             if not result_file.exists():
                 return None
             
-            # Read JSON file
-            with open(result_file, 'r') as f:
-                stored_data = json.load(f)
+            stored_data = self._read_stored(result_file)
             
             # Check expiration
             expires_at = datetime.fromisoformat(stored_data["expires_at"])
             if datetime.utcnow() > expires_at:
                 # File expired, delete it
                 result_file.unlink()
+                self.expiry_index.discard(job_id)
                 logger.info(f"Result for job {job_id} expired and removed")
                 return None
             
@@ -84,30 +104,112 @@ class FileStorage:
             return None
     
     async def cleanup_expired(self) -> int:
-        """Clean up expired result files."""
+        """
+        Clean up expired result files, in batches taken from the expiry index.
+        
+        A process that does not own the index scans the results directory.
+        """
         cleaned_count = 0
+        progress = self.cleanup_progress
+        progress.update(batches=0, processed=0, removed=0)
         try:
-            for result_file in self.results_dir.glob("*.json"):
-                try:
-                    with open(result_file, 'r') as f:
-                        stored_data = json.load(f)
-                    
-                    expires_at = datetime.fromisoformat(stored_data["expires_at"])
-                    if datetime.utcnow() > expires_at:
-                        result_file.unlink()
+            if self.expiry_index.owner:
+                cleaned_count = await self._cleanup_indexed(progress)
+            else:
+                # Another process owns the expiry index
+                for result_file in self.results_dir.glob("*.json"):
+                    if self._remove_if_expired(result_file.stem):
                         cleaned_count += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Error checking expiration for {result_file}: {e}")
-                    
+                progress.update(batches=1, removed=cleaned_count)
+            
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} expired result files")
                 
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
         
+        progress["total_removed"] += cleaned_count
+        progress["last_cleanup"] = datetime.utcnow().isoformat()
+        return cleaned_count
+    
+    async def _cleanup_indexed(self, progress: Dict[str, Any]) -> int:
+        """Remove due results in batches popped from the expiry index."""
+        cleaned_count = 0
+        if not self.expiry_index.complete:
+            self._load_expiry_index()
+        
+        while True:
+            due_ids = self.expiry_index.pop_due(time.time(), CLEANUP_BATCH_SIZE)
+            for job_id in due_ids:
+                if self._remove_if_expired(job_id):
+                    cleaned_count += 1
+            
+            progress["batches"] += 1
+            progress["processed"] += len(due_ids)
+            progress["removed"] = cleaned_count
+            if len(due_ids) < CLEANUP_BATCH_SIZE:
+                break
+            await asyncio.sleep(0)  # Let other requests run between batches
+        
+        self.expiry_index.save()
         return cleaned_count
     
+    def _remove_if_expired(self, job_id: str) -> bool:
+        """Delete a due result after confirming its stored expiry (it may have been rewritten)."""
+        result_file = self.results_dir / f"{job_id}.json"
+        try:
+            stored_data = self._read_stored(result_file)
+            
+            expires_at = iso_to_epoch(stored_data["expires_at"])
+            if time.time() <= expires_at:
+                self.expiry_index.set(job_id, expires_at)
+                return False
+            
+            result_file.unlink()
+            return True
+            
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Error checking expiration for {result_file}: {e}")
+            return False
+    
+    def _load_expiry_index(self) -> None:
+        """Complete the expiry index from its snapshot, or by reading every result once."""
+        entries = self.expiry_index.load_snapshot()
+        if entries is not None:
+            self.expiry_index.merge(entries, from_snapshot=True)
+            return
+        
+        entries = {}
+        for result_file in self.results_dir.glob("*.json"):
+            try:
+                entries[result_file.stem] = iso_to_epoch(self._read_stored(result_file)["expires_at"])
+            except Exception as e:
+                logger.warning(f"Error indexing expiration for {result_file}: {e}")
+        
+        self.expiry_index.merge(entries)
+        logger.info(f"Rebuilt result expiry index with {len(entries)} entries")
+    
+    def _read_stored(self, result_file: Path) -> Dict[str, Any]:
+        """Decode a result file (codec payload, or JSON text from earlier versions)."""
+        with open(result_file, 'rb') as f:
+            return self.codec.decode(f.read())
+    
+    def close(self) -> None:
+        """Persist the expiry index and release it for another process or instance."""
+        self.expiry_index.save()
+        self.expiry_index.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Expiry index, cleanup progress and codec metrics."""
+        return {
+            "expiry_index": self.expiry_index.get_stats(),
+            "due_count": self.expiry_index.due_count(time.time()),
+            "cleanup": dict(self.cleanup_progress),
+            "codec": self.codec.get_stats()
+        }
+    
     async def list_results(self) -> List[str]:
         """List all available result job IDs."""
         try:
@@ -0,0 +1,283 @@
+"""
+Local stand-in HTTP server for LLM provider tests.
+
+Serves canned OpenAI- and Anthropic-style responses on 127.0.0.1 and records
+every request so tests can assert on the exact request shape the SDKs send.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def openai_chat_response(
+    content: str = "This function initializes the parser.",
+    model: str = "gpt-4",
+    prompt_tokens: int = 1200,
+    completion_tokens: int = 40,
+    cached_tokens: int = 0
+) -> Dict[str, Any]:
+    """Build a chat.completions response body."""
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 1700000000,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+    }
+
+
+def anthropic_message_response(
+    content: str = "This function initializes the parser.",
+    model: str = "claude-3-haiku-20240307",
+    input_tokens: int = 50,
+    output_tokens: int = 40,
+    cache_read_input_tokens: int = 0,
+    cache_creation_input_tokens: int = 0
+) -> Dict[str, Any]:
+    """Build a messages.create response body."""
+    return {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": content}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_input_tokens": cache_read_input_tokens,
+            "cache_creation_input_tokens": cache_creation_input_tokens
+        }
+    }
+
+
+# Handler signature: (method, path, json_body) -> (status, body, headers)
+Handler = Callable[[str, str, Any], Tuple[int, Any, Dict[str, str]]]
+
+
+class StubLLMServer:
+    """
+    Threaded HTTP server standing in for an LLM vendor API.
+
+    Register responses per (method, path); unmatched requests get a 404.
+    Recorded requests are available as (method, path, headers, body) tuples.
+    """
+
+    def __init__(self):
+        self.requests: List[Tuple[str, str, Dict[str, str], Any]] = []
+        self._handlers: Dict[Tuple[str, str], Handler] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method: str, path: str, body: Any = None, status: int = 200,
+              headers: Optional[Dict[str, str]] = None, handler: Optional[Handler] = None) -> None:
+        """Register a canned response or a handler for a method and path."""
+        if handler is None:
+            def handler(_method, _path, _body, body=body, status=status, headers=headers or {}):
+                return status, body, headers
+        self._handlers[(method.upper(), path)] = handler
+
+    def requests_to(self, path: str) -> List[Any]:
+        """JSON bodies of recorded requests to a path."""
+        return [body for _, req_path, _, body in self.requests if req_path == path]
+
+    def start(self) -> "StubLLMServer":
+        stub = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = raw.decode("utf-8", "replace")
+                path = self.path.split("?", 1)[0]
+                stub.requests.append((self.command, path, dict(self.headers), body))
+
+                handler = stub._handlers.get((self.command, path))
+                if handler is None:
+                    status, payload, headers = 404, {"error": {"message": f"no route {path}"}}, {}
+                else:
+                    status, payload, headers = handler(self.command, path, body)
+
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _dispatch
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class FakeBatchAPI:
+    """
+    Fake OpenAI Batch and Anthropic Message Batches lifecycles on a StubLLMServer.
+
+    Batches report in-progress for `polls_before_done` status polls (forever
+    when None, until cancelled), then complete with one result per request.
+    `respond` maps a request body to the answer text; custom ids in `fail_ids`
+    get an error result instead. Custom ids in `unfinished_ids` have no result
+    once the batch is cancelled.
+    """
+
+    OPENAI_BATCH_ID = "batch_stub"
+    OPENAI_OUTPUT_FILE_ID = "file-output"
+    ANTHROPIC_BATCH_ID = "msgbatch_stub"
+
+    def __init__(self, server: StubLLMServer, respond: Callable[[Dict[str, Any]], str],
+                 polls_before_done: Optional[int] = 1, fail_ids: Tuple[str, ...] = (),
+                 unfinished_ids: Tuple[str, ...] = ()):
+        self.server = server
+        self.respond = respond
+        self.polls_before_done = polls_before_done
+        self.fail_ids = set(fail_ids)
+        self.unfinished_ids = set(unfinished_ids)
+        self.submitted: List[Dict[str, Any]] = []
+        self.polls = 0
+        self.cancelled = False
+
+    def _done(self) -> bool:
+        return self.cancelled or (self.polls_before_done is not None and self.polls > self.polls_before_done)
+
+    def _cancel(self, method, path, body):
+        self.cancelled = True
+        return 200, (self._openai_batch("cancelling") if "/messages/" not in path
+                     else self._anthropic_batch(ended=False)), {}
+
+    def _finished(self, custom_id: str) -> bool:
+        return not (self.cancelled and custom_id in self.unfinished_ids)
+
+    # OpenAI: upload JSONL file -> create batch -> poll -> download output file
+
+    def install_openai(self) -> "FakeBatchAPI":
+        self.server.route("POST", "/v1/files", handler=self._openai_upload)
+        self.server.route("POST", "/v1/batches", handler=self._openai_create)
+        self.server.route("GET", f"/v1/batches/{self.OPENAI_BATCH_ID}", handler=self._openai_retrieve)
+        self.server.route("POST", f"/v1/batches/{self.OPENAI_BATCH_ID}/cancel", handler=self._cancel)
+        self.server.route("GET", f"/v1/files/{self.OPENAI_OUTPUT_FILE_ID}/content", handler=self._openai_output)
+        return self
+
+    def _openai_upload(self, method, path, body):
+        # Multipart body: keep the JSONL request lines
+        for line in str(body).splitlines():
+            if line.startswith("{") and '"custom_id"' in line:
+                self.submitted.append(json.loads(line))
+        return 200, {
+            "id": "file-input", "object": "file", "bytes": len(str(body)), "created_at": 1700000000,
+            "filename": "functions.jsonl", "purpose": "batch", "status": "processed"
+        }, {}
+
+    def _openai_batch(self, status: str) -> Dict[str, Any]:
+        return {
+            "id": self.OPENAI_BATCH_ID, "object": "batch", "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-input", "completion_window": "24h", "status": status,
+            "created_at": 1700000000,
+            "output_file_id": self.OPENAI_OUTPUT_FILE_ID if status in ("completed", "cancelled") else None
+        }
+
+    def _openai_create(self, method, path, body):
+        return 200, self._openai_batch("validating"), {}
+
+    def _openai_retrieve(self, method, path, body):
+        self.polls += 1
+        if not self._done():
+            return 200, self._openai_batch("in_progress"), {}
+        return 200, self._openai_batch("cancelled" if self.cancelled else "completed"), {}
+
+    def _openai_output(self, method, path, body):
+        lines = []
+        for request in self.submitted:
+            custom_id = request["custom_id"]
+            if not self._finished(custom_id):
+                continue
+            if custom_id in self.fail_ids:
+                response = {"status_code": 500, "body": {"error": {"message": "server error"}}}
+            else:
+                response = {"status_code": 200, "body": openai_chat_response(self.respond(request["body"]))}
+            lines.append(json.dumps({"id": f"req-{custom_id}", "custom_id": custom_id, "response": response}))
+        return 200, "\n".join(lines).encode("utf-8"), {"Content-Type": "application/octet-stream"}
+
+    # Anthropic: create batch with inline requests -> poll -> stream JSONL results
+
+    def install_anthropic(self) -> "FakeBatchAPI":
+        batch_path = f"/v1/messages/batches/{self.ANTHROPIC_BATCH_ID}"
+        self.server.route("POST", "/v1/messages/batches", handler=self._anthropic_create)
+        self.server.route("GET", batch_path, handler=self._anthropic_retrieve)
+        self.server.route("POST", f"{batch_path}/cancel", handler=self._cancel)
+        self.server.route("GET", f"{batch_path}/results", handler=self._anthropic_results)
+        return self
+
+    def _anthropic_batch(self, ended: bool) -> Dict[str, Any]:
+        return {
+            "id": self.ANTHROPIC_BATCH_ID, "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(self.submitted),
+                "succeeded": len(self.submitted) - len(self.fail_ids) if ended else 0,
+                "errored": len(self.fail_ids) if ended else 0,
+                "canceled": 0, "expired": 0
+            },
+            "created_at": "2024-01-01T00:00:00Z", "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T01:00:00Z" if ended else None,
+            "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"{self.server.url}/v1/messages/batches/{self.ANTHROPIC_BATCH_ID}/results" if ended else None
+        }
+
+    def _anthropic_create(self, method, path, body):
+        self.submitted.extend(body["requests"])
+        return 200, self._anthropic_batch(ended=False), {}
+
+    def _anthropic_retrieve(self, method, path, body):
+        self.polls += 1
+        return 200, self._anthropic_batch(ended=self._done()), {}
+
+    def _anthropic_results(self, method, path, body):
+        lines = []
+        for request in self.submitted:
+            custom_id = request["custom_id"]
+            if not self._finished(custom_id):
+                result = {"type": "canceled"}
+            elif custom_id in self.fail_ids:
+                result = {"type": "errored", "error": {
+                    "type": "error", "error": {"type": "api_error", "message": "server error"}
+                }}
+            else:
+                result = {"type": "succeeded", "message": anthropic_message_response(self.respond(request["params"]))}
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+        return 200, "\n".join(lines).encode("utf-8"), {"Content-Type": "application/binary"}
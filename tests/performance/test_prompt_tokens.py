@@ -0,0 +1,144 @@
+"""
+Prompt token benchmark.
+
+Measures the input tokens each provider sends per translated function, using
+the calibrated estimate so the numbers do not depend on which tokenizers are
+installed. Baselines are the figures for the inline prompts the providers
+built before they shared the prompt pipeline. Anthropic and Gemini did not
+budget their prompts, so large functions dominate their baselines; OpenAI and
+Ollama use compact adaptations of the standard template, and Ollama fits the
+binary context into a small token allowance.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.gemini_provider import GeminiProvider
+from src.llm.providers.ollama_provider import OllamaProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.tokenization import CHARS_PER_TOKEN, EstimateTokenizer
+from tests.fixtures.assembly_samples import ALL_FUNCTIONS
+
+# Mean input tokens per function with the pre-pipeline inline prompts
+BASELINE_TOKENS_PER_FUNCTION = {
+    "openai": 1343,
+    "anthropic": 3942,
+    "gemini": 3352,
+    "ollama": 488,
+}
+
+CONTEXT = {
+    "binary_info": {"format": "pe", "architecture": "x86_64", "file_size": 184320},
+    "analysis_summary": {"function_count": 412, "import_count": 96, "string_count": 1830},
+    "translation_settings": {"quality_level": "standard", "analysis_depth": "standard"},
+    "imports": [f"kernel32.dll!Api{i}" for i in range(96)],
+    "job_id": "job-benchmark",
+}
+
+
+def large_function():
+    """r2-style listing with padding and an unrolled loop, as in optimized builds."""
+    lines = [f"│  0x{0x402000 + i * 4:08x}      4889e5         mov rbp, rsp" for i in range(40)]
+    for i in range(600):
+        lines.append(f"│  0x{0x403000 + i * 8:08x}      0f1f00         add rax, qword [rbx + 0x{i % 8 * 8:x}]")
+    lines += ["│  0x00404000      90             nop"] * 200
+    return SimpleNamespace(
+        name="sym.process_records", address="0x402000", size=9000,
+        disassembly="\n".join(lines), decompiled_code=None
+    )
+
+
+def function_data(sample):
+    return {
+        "name": sample.name,
+        "address": sample.address,
+        "size": sample.size,
+        "assembly_code": sample.disassembly,
+        "decompiled_code": sample.decompiled_code,
+        "calls_to": ["sym.imp.printf", "sym.helper"],
+        "variables": ["var_4h", "var_10h"],
+    }
+
+
+def chat_response(content="The function prints a greeting and returns 0."):
+    return {
+        "content": content, "model": "model", "tokens_used": 10, "input_tokens": 5,
+        "output_tokens": 5, "cached_input_tokens": 0, "processing_time_ms": 1, "structured": None,
+    }
+
+
+def ollama_response(content="The function prints a greeting and returns 0."):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def capture_openai(sent):
+    async def request(messages, **kwargs):
+        sent.append([m["content"] for m in messages])
+        return chat_response()
+    return request
+
+
+def capture_anthropic(sent):
+    async def request(messages, system_prompt, cacheable_context=None, **kwargs):
+        sent.append([system_prompt, cacheable_context or ""] + [m["content"] for m in messages])
+        return chat_response()
+    return request
+
+
+def capture_gemini(sent):
+    async def request(prompt, cacheable_prefix=None, **kwargs):
+        sent.append([cacheable_prefix or "", prompt])
+        return chat_response()
+    return request
+
+
+def capture_ollama(sent):
+    async def request(messages, **kwargs):
+        sent.append([m["content"] for m in messages])
+        return ollama_response()
+    return request
+
+
+PROVIDERS = {
+    "openai": (OpenAIProvider, "gpt-4", capture_openai),
+    "anthropic": (AnthropicProvider, "claude-3-haiku-20240307", capture_anthropic),
+    "gemini": (GeminiProvider, "gemini-1.5-flash", capture_gemini),
+    "ollama": (OllamaProvider, "llama3.1:8b", capture_ollama),
+}
+
+
+async def measure(provider_id):
+    """Token counts of each function prompt sent, and the provider's input budget."""
+    provider_class, model, capture = PROVIDERS[provider_id]
+    provider = provider_class(LLMConfig(provider_id=provider_id, api_key="test-key", default_model=model))
+    sent = []
+    samples = list(ALL_FUNCTIONS) + [large_function()]
+    with patch.object(provider, "_make_completion_request", AsyncMock(side_effect=capture(sent))):
+        for sample in samples:
+            await provider.translate_function(function_data(sample), dict(CONTEXT))
+    tokenizer = EstimateTokenizer(CHARS_PER_TOKEN[provider_id])
+    counts = [sum(tokenizer.count_many([part for part in parts if part])) for parts in sent]
+    return counts, provider.get_prompt_budget().max_input_tokens
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_id", sorted(PROVIDERS))
+async def test_prompts_fit_budget(provider_id):
+    counts, max_input_tokens = await measure(provider_id)
+    tokens = sum(counts) / len(counts)
+    baseline = BASELINE_TOKENS_PER_FUNCTION[provider_id]
+    print(f"{provider_id}: {tokens:.0f} tokens per function (before {baseline}, {tokens / baseline - 1:+.0%})")
+    assert max(counts) <= max_input_tokens
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_id", sorted(PROVIDERS))
+async def test_tokens_per_function_below_baseline(provider_id):
+    counts, _ = await measure(provider_id)
+    assert sum(counts) / len(counts) <= BASELINE_TOKENS_PER_FUNCTION[provider_id]
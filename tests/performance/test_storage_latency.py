@@ -0,0 +1,70 @@
+"""
+Storage latency benchmark.
+
+Measures p99 latency of API requests served while other requests write large
+results to the file cache. The baseline runs the same write bodies directly
+on the event loop, as FileStorageClient did before its I/O moved to the
+thread pool.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.cache.base import FileStorageClient
+
+WRITERS = 4
+WRITES_PER_WRITER = 6
+PAYLOAD = {"functions": [{"name": f"sym.f{i}", "description": "x" * 2000} for i in range(1000)]}
+
+
+def p99(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+async def measure(storage, write):
+    """p99 latency (ms) of small cache reads issued every millisecond during concurrent writes."""
+    await storage.set("session:small", {"status": "ok"})
+    latencies = []
+    writing = True
+
+    async def writer(index):
+        for i in range(WRITES_PER_WRITER):
+            await write(f"result:{index}:{i}", PAYLOAD)
+
+    async def api_requests():
+        while writing:
+            start = time.perf_counter()
+            assert await storage.get("session:small") == {"status": "ok"}
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.001)
+
+    probe = asyncio.create_task(api_requests())
+    await asyncio.sleep(0)
+    await asyncio.gather(*(writer(index) for index in range(WRITERS)))
+    writing = False
+    await probe
+    return p99(latencies)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_p99_latency_under_concurrent_writes(tmp_path):
+    settings = SimpleNamespace(storage=SimpleNamespace(base_path=tmp_path, cache_ttl_hours=24, max_file_size_mb=100))
+    storage = FileStorageClient(settings)
+    try:
+        async def blocking_write(key, value):
+            # Pre-thread-pool behaviour: the write body runs on the event loop
+            await asyncio.sleep(0)
+            storage._set_sync(key, value, None, False, False)
+
+        baseline = await measure(storage, blocking_write)
+        pooled = await measure(storage, storage.set)
+    finally:
+        await storage.disconnect()
+
+    print(f"p99 API latency under concurrent writes: {pooled:.1f}ms (blocking I/O {baseline:.1f}ms)")
+    assert pooled < baseline
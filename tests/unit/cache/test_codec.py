@@ -0,0 +1,149 @@
+"""
+Unit tests for the payload codec.
+
+Tests round trips for each available serializer, compression selection,
+reading entries written before the codec, decoding failures, and zstd
+dictionaries shared between codecs.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.cache import codec as codec_module
+from src.cache.base import FileStorageClient
+from src.cache.codec import (
+    COMPRESSOR_IDS,
+    HEADER,
+    MAGIC,
+    CodecError,
+    PayloadCodec,
+    available_serializers,
+)
+from src.storage.file_storage import FileStorage
+
+ASSEMBLY = "\n".join(
+    f"0x{0x1000 + i * 4:08x}      {op} rax, qword [rbp - 0x{i % 64:x}]"
+    for i, op in enumerate(["mov", "lea", "add", "xor", "cmp"] * 400)
+)
+
+VALUES = [
+    "text",
+    42,
+    3.5,
+    True,
+    None,
+    b"\x00\xffbinary",
+    [1, "two", None],
+    {"function": "main", "assembly": ASSEMBLY, "calls": ["parse", "exit"]},
+]
+
+
+@pytest.mark.parametrize("serializer", available_serializers())
+@pytest.mark.parametrize("compression", [True, False])
+def test_round_trip(serializer, compression):
+    codec = PayloadCodec(serializer=serializer, compression=compression)
+
+    for value in VALUES:
+        encoded = codec.encode(value)
+        assert encoded.startswith(MAGIC)
+        assert codec.decode(encoded) == value
+
+    # Tuples come back as lists, as with the original JSON text
+    assert codec.decode(codec.encode({"pair": (1, 2)})) == {"pair": [1, 2]}
+
+
+def test_compression_selection():
+    codec = PayloadCodec()
+    large = codec.encode({"assembly": ASSEMBLY})
+    small = codec.encode({"name": "main"})
+
+    assert HEADER.unpack_from(large)[3] != COMPRESSOR_IDS["none"]
+    assert len(large) < len(ASSEMBLY) / 3
+    assert HEADER.unpack_from(small)[3] == COMPRESSOR_IDS["none"]
+    assert codec.get_stats()["compression_ratio"] > 3
+
+    uncompressed = PayloadCodec(compression=False).encode({"assembly": ASSEMBLY})
+    assert HEADER.unpack_from(uncompressed)[3] == COMPRESSOR_IDS["none"]
+
+
+def test_legacy_json_entries():
+    codec = PayloadCodec()
+
+    assert codec.decode(json.dumps({"a": 1})) == {"a": 1}
+    assert codec.decode(json.dumps({"__bytes__": "AAE="}).encode()) == b"\x00\x01"
+    assert codec.decode(b"not json") == "not json"
+    assert codec.get_stats()["legacy_decoded"] == 3
+
+
+def test_undecodable_payloads(monkeypatch):
+    codec = PayloadCodec()
+    zstd_payload = HEADER.pack(MAGIC, 1, 1, COMPRESSOR_IDS["zstd"], 0) + b"\x28\xb5\x2f\xfd"
+    monkeypatch.setattr(codec_module, "zstandard", None)
+
+    with pytest.raises(CodecError):
+        codec.decode(zstd_payload)
+    with pytest.raises(CodecError):
+        codec.decode(HEADER.pack(MAGIC, 99, 1, 0, 0) + b"{}")
+
+
+@pytest.mark.asyncio
+async def test_storage_reads_legacy_and_encoded_entries(tmp_path):
+    settings = SimpleNamespace(storage=SimpleNamespace(
+        base_path=tmp_path, cache_ttl_hours=24, max_file_size_mb=100, enable_compression=True
+    ))
+    storage = FileStorageClient(settings)
+    try:
+        await storage.set("result:1", {"assembly": ASSEMBLY})
+        await storage.set("result:2", {"placeholder": True})
+        assert storage._get_file_path("result:1").stat().st_size < len(ASSEMBLY) / 3
+
+        # An entry written as plain JSON text before the codec existed
+        storage._get_file_path("result:2").write_text(json.dumps({"legacy": [1, 2]}))
+
+        assert await storage.get("result:1") == {"assembly": ASSEMBLY}
+        assert await storage.get("result:2") == {"legacy": [1, 2]}
+        assert storage.get_stats()["codec"]["legacy_decoded"] == 1
+    finally:
+        await storage.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_result_files_are_encoded(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    await storage.set_result("job-1", {"assembly": ASSEMBLY})
+
+    assert (tmp_path / "results" / "job-1.json").read_bytes().startswith(MAGIC)
+    assert await storage.get_result("job-1") == {"assembly": ASSEMBLY}
+
+    # Results stored as JSON text by earlier versions still read
+    (tmp_path / "results" / "job-2.json").write_text(json.dumps({
+        "data": {"old": True}, "stored_at": "2024-01-01T00:00:00",
+        "expires_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() + 3600))
+    }))
+    assert await storage.get_result("job-2") == {"old": True}
+
+
+def test_dictionaries_shared_between_codecs(tmp_path, monkeypatch):
+    pytest.importorskip("zstandard")
+    writer = PayloadCodec(dictionary_dir=tmp_path)
+    reader = PayloadCodec(dictionary_dir=tmp_path)  # Started before the dictionary existed
+    trainer = PayloadCodec(dictionary_dir=tmp_path)
+    lines = ASSEMBLY.splitlines()
+    samples = ["\n".join(lines[i:i + 200]).encode() for i in range(0, len(lines), 10)]
+
+    dictionary_id = writer.train_dictionary(samples)
+    encoded = writer.encode({"assembly": ASSEMBLY})
+    assert HEADER.unpack_from(encoded)[4] == dictionary_id
+
+    # Loaded from the directory on first use
+    assert reader.decode(encoded) == {"assembly": ASSEMBLY}
+    assert reader.get_stats()["active_dictionary_id"] == dictionary_id
+
+    # A codec that collected enough samples adopts the saved dictionary instead of training
+    monkeypatch.setattr(trainer, "train_dictionary", lambda samples: pytest.fail("trained a second dictionary"))
+    trainer._train_shared_dictionary(samples)
+    assert trainer.get_stats()["active_dictionary_id"] == dictionary_id
+    assert len(list(tmp_path.glob("*.zdict"))) == 1
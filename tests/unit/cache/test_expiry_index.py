@@ -0,0 +1,175 @@
+"""
+Unit tests for the expiry index.
+
+Tests bucketed due-key popping, snapshot persistence and rebuild merging,
+batched cleanup in FileStorageClient and the results FileStorage, and
+sharing one storage directory between several clients.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.cache.base import EXPIRY_INDEX_FILE, FileStorageClient
+from src.cache.expiry_index import ExpiryIndex
+from src.storage.file_storage import FileStorage
+
+
+def storage_settings(tmp_path, **overrides):
+    return SimpleNamespace(storage=SimpleNamespace(
+        base_path=tmp_path, cache_ttl_hours=24, max_file_size_mb=100, **overrides
+    ))
+
+
+def test_pop_due_by_bucket():
+    index = ExpiryIndex(bucket_seconds=10)
+    index.merge({})
+    for key, expires_at in (("a", 5.0), ("b", 15.0), ("c", None), ("d", 25.0), ("e", 17.0)):
+        index.set(key, expires_at)
+
+    assert index.due_count(16.0) == 2
+    assert index.pop_due(16.0, limit=1) == ["a"]
+    assert index.pop_due(16.0, limit=10) == ["b"]
+    assert index.pop_due(16.0, limit=10) == []
+    assert len(index) == 3
+
+    # Re-setting moves a key between buckets
+    index.set("d", 12.0)
+    index.discard("e")
+    assert index.pop_due(30.0, limit=10) == ["d"]
+    assert len(index) == 1
+    assert index.get_stats()["bucket_count"] == 0
+
+
+def test_snapshot_and_merge(tmp_path):
+    path = tmp_path / "index.json"
+    index = ExpiryIndex(path)
+    index.merge({"a": 100.0, "b": None})
+    assert index.save()
+    assert not index.save()  # Unchanged since the last save
+
+    loaded = ExpiryIndex(path)
+    assert loaded.load_snapshot() == {"a": 100.0, "b": None}
+
+    # The first change removes the snapshot so a crash cannot leave a stale one
+    index.set("c", 50.0)
+    assert not path.exists()
+    assert ExpiryIndex(path).load_snapshot() is None
+
+    # Changes made before the index is complete win over loaded entries
+    building = ExpiryIndex(path)
+    building.set("x", None)
+    building.discard("a")
+    building.merge({"a": 1.0, "x": 5.0, "y": 2.0})
+    assert building.complete
+    assert len(building) == 2
+    assert building.pop_due(10.0, limit=10) == ["y"]
+
+
+@pytest.mark.asyncio
+async def test_client_cleanup_in_batches(tmp_path):
+    storage = FileStorageClient(storage_settings(tmp_path, cleanup_batch_size=2))
+    try:
+        for i in range(5):
+            await storage.set(f"short:{i}", i, ttl=1)
+        await storage.set("long:0", 0, ttl=3600)
+        await storage.set("long:1", 1, ttl=1)
+        await storage.expire("long:1", 3600)
+        time.sleep(1.1)
+
+        await storage._cleanup_expired_files()
+
+        stats = storage.get_stats()["expiry_index"]
+        assert stats["cleanup"]["removed"] == 5
+        assert stats["cleanup"]["batches"] == 3
+        assert stats["due_count"] == 0
+        assert sorted(await storage.keys("*")) == ["long:0", "long:1"]
+        assert await storage.get("long:1") == 1
+    finally:
+        await storage.disconnect()
+
+    assert (tmp_path / EXPIRY_INDEX_FILE).exists()
+
+
+@pytest.mark.asyncio
+async def test_client_index_persisted_or_rebuilt(tmp_path):
+    storage = FileStorageClient(storage_settings(tmp_path))
+    await storage.set("kept", 1, ttl=3600)
+    await storage.set("doomed", 2, ttl=1)
+    await storage.disconnect()
+
+    restarted = FileStorageClient(storage_settings(tmp_path))
+    try:
+        await restarted._cleanup_expired_files()
+        assert restarted.get_stats()["expiry_index"]["cleanup"]["index_rebuilds"] == 0
+        assert sorted(await restarted.keys("*")) == ["doomed", "kept"]
+    finally:
+        await restarted.disconnect()
+
+    (tmp_path / EXPIRY_INDEX_FILE).unlink()
+    time.sleep(1.1)
+    rebuilt = FileStorageClient(storage_settings(tmp_path))
+    try:
+        await rebuilt._cleanup_expired_files()
+        stats = rebuilt.get_stats()["expiry_index"]
+        assert stats["cleanup"]["index_rebuilds"] == 1
+        assert stats["cleanup"]["removed"] == 1
+        assert await rebuilt.keys("*") == ["kept"]
+    finally:
+        await rebuilt.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_result_cleanup_uses_index(tmp_path):
+    storage = FileStorage(str(tmp_path))
+    for i in range(3):
+        await storage.set_result(f"job-{i}", {"i": i}, ttl=1)
+    await storage.set_result("job-kept", {"i": 3}, ttl=3600)
+    time.sleep(1.1)
+
+    assert await storage.cleanup_expired() == 3
+    assert await storage.list_results() == ["job-kept"]
+    assert storage.get_stats()["cleanup"]["processed"] == 3
+    storage.close()
+
+    # A fresh instance rebuilds the index from the results it finds
+    (tmp_path / "results_expiry_index.json").unlink(missing_ok=True)
+    restarted = FileStorage(str(tmp_path))
+    assert await restarted.cleanup_expired() == 0
+    assert restarted.get_stats()["expiry_index"]["entry_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_clients_sharing_storage(tmp_path):
+    owner = FileStorageClient(storage_settings(tmp_path))
+    other = FileStorageClient(storage_settings(tmp_path))
+    try:
+        assert owner.get_stats()["expiry_index"]["owner"]
+        assert not other.get_stats()["expiry_index"]["owner"]
+        await owner._cleanup_expired_files()  # Completes the owner's index
+
+        await owner.set("owner:short", 1, ttl=1)
+        await other.set("other:short", 2, ttl=1)
+        await other.set("other:long", 3, ttl=3600)
+        assert sorted(await owner.keys("*")) == ["other:long", "other:short", "owner:short"]
+        time.sleep(1.1)
+
+        # The owner's index never saw the other client's keys; walking finds them
+        await other._cleanup_expired_files()
+        assert other.get_stats()["expiry_index"]["cleanup"]["removed"] == 2
+        assert await owner.keys("*") == ["other:long"]
+    finally:
+        await other.disconnect()
+        await owner.disconnect()
+
+    # The owner did not persist an index that misses keys; the next owner rebuilds it
+    assert not (tmp_path / EXPIRY_INDEX_FILE).exists()
+    restarted = FileStorageClient(storage_settings(tmp_path))
+    try:
+        await restarted._cleanup_expired_files()
+        assert restarted.get_stats()["expiry_index"]["cleanup"]["index_rebuilds"] == 1
+        assert restarted.get_stats()["expiry_index"]["entry_count"] == 1
+    finally:
+        await restarted.disconnect()
+    assert (tmp_path / EXPIRY_INDEX_FILE).exists()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the analysis result cache.
+
+Tests that cache hits leave the cached payload untouched, that access
+counts and statistics are buffered and flushed in batches (and kept when
+a flush fails), and that deleting an entry drops its access record.
+"""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from src.cache.base import FileStorageClient
+from src.cache.result_cache import ResultCache, flush_result_caches
+from src.core.config import get_settings
+
+FILE_HASH = "ab" * 32
+CONFIG = {"depth": "standard", "llm_provider": "openai"}
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    settings = get_settings().model_copy(deep=True)
+    settings.storage.base_path = str(tmp_path)
+    client = FileStorageClient(settings)
+    yield client
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_hits_do_not_rewrite_payload(storage):
+    cache = ResultCache(storage)
+    await cache.set(FILE_HASH, CONFIG, {"functions": ["main"]})
+    await cache.flush_access_stats()
+    cache_key = cache._generate_cache_key(FILE_HASH, cache._generate_config_hash(CONFIG))
+
+    with patch.object(storage, "set", wraps=storage.set) as storage_set:
+        for _ in range(5):
+            assert await cache.get(FILE_HASH, CONFIG) == {"functions": ["main"]}
+    storage_set.assert_not_called()
+
+    info = await cache.get_cache_info(cache_key)
+    assert info["access_count"] == 5
+    assert info["last_accessed"] is not None
+    assert (await cache.get_cache_stats())["hits"] == 5
+
+    assert await cache.flush_access_stats() == 1
+    assert (await storage.get(cache_key))["access_count"] == 0
+    assert (await cache.get_cache_info(cache_key))["access_count"] == 5
+    assert (await storage.get(ResultCache.CACHE_STATS_KEY))["hits"] == 5
+
+
+@pytest.mark.asyncio
+async def test_flushes_in_batches(storage):
+    cache = ResultCache(storage)
+    cache.ACCESS_FLUSH_BATCH = 4
+    await cache.set(FILE_HASH, CONFIG, {"functions": []})
+
+    with patch.object(cache, "flush_access_stats", wraps=cache.flush_access_stats) as flush:
+        for _ in range(6):
+            await cache.get(FILE_HASH, CONFIG)
+    # 3 statistic events from the set + 2 per hit (access and statistic) = 15 events
+    assert flush.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_delete_drops_access_record(storage):
+    cache = ResultCache(storage)
+    await cache.set(FILE_HASH, CONFIG, {"functions": []})
+    await cache.get(FILE_HASH, CONFIG)
+    await cache.flush_access_stats()
+    cache_key = cache._generate_cache_key(FILE_HASH, cache._generate_config_hash(CONFIG))
+    meta_key = ResultCache.RESULT_METADATA_KEY.format(cache_key=cache_key)
+    assert await storage.get(meta_key) is not None
+
+    assert await cache.delete(FILE_HASH, CONFIG)
+    assert await storage.get(meta_key) is None
+    assert await cache.flush_access_stats() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_buffers(storage):
+    cache = ResultCache(storage)
+    await cache.set(FILE_HASH, CONFIG, {"functions": []})
+    await cache.flush_access_stats()
+    cache_key = cache._generate_cache_key(FILE_HASH, cache._generate_config_hash(CONFIG))
+    for _ in range(3):
+        await cache.get(FILE_HASH, CONFIG)
+
+    # The statistics write succeeds, the access record write fails
+    original_set = storage.set
+
+    async def failing_set(key, *args, **kwargs):
+        if key.startswith("result:meta:"):
+            raise OSError("disk full")
+        return await original_set(key, *args, **kwargs)
+
+    with patch.object(storage, "set", side_effect=failing_set):
+        assert await cache.flush_access_stats() == 0
+    assert cache._pending_access[cache_key][0] == 3
+    assert not cache._pending_stats
+
+    await cache.get(FILE_HASH, CONFIG)
+    assert await flush_result_caches() >= 1
+    assert (await cache.get_cache_info(cache_key))["access_count"] == 4
+    assert (await storage.get(ResultCache.CACHE_STATS_KEY))["hits"] == 4
@@ -0,0 +1,105 @@
+"""
+Unit tests for the storage backends.
+
+Runs the FileStorageClient contract against the file-per-key and SQLite
+backends, and tests that SQLite expiry cleanup uses the expiry index.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from src.cache.base import FileStorageClient, create_storage_client
+from src.cache.sqlite_storage import SQLiteStorageClient
+
+
+def storage_settings(tmp_path, backend):
+    return SimpleNamespace(storage=SimpleNamespace(
+        base_path=tmp_path, cache_ttl_hours=24, max_file_size_mb=100, backend=backend, sqlite_mmap_mb=16
+    ))
+
+
+@pytest_asyncio.fixture(params=["files", "sqlite"])
+async def storage(request, tmp_path):
+    client = create_storage_client(storage_settings(tmp_path, request.param))
+    yield client
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_backend_selection(tmp_path):
+    files = create_storage_client(storage_settings(tmp_path / "files", "files"))
+    sqlite = create_storage_client(storage_settings(tmp_path / "sqlite", "sqlite"))
+    try:
+        assert type(files) is FileStorageClient
+        assert type(sqlite) is SQLiteStorageClient
+    finally:
+        await files.disconnect()
+        await sqlite.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_round_trip_and_conditions(storage):
+    assert await storage.set("tag:results:depth:standard", ["result:a", "result:b"])
+    assert await storage.get("tag:results:depth:standard") == ["result:a", "result:b"]
+    assert await storage.set("blob", b"\x00\x01")
+    assert await storage.get("blob") == b"\x00\x01"
+
+    assert not await storage.set("blob", b"other", nx=True)
+    assert not await storage.set("missing", 1, xx=True)
+    assert await storage.set("blob", b"\x02", xx=True)
+    assert await storage.get("blob") == b"\x02"
+
+    assert await storage.exists("blob", "missing", "blob") == 2
+    assert sorted(await storage.keys("results")) == ["tag:results:depth:standard"]
+    assert len(await storage.keys()) == 2
+    assert await storage.delete("blob", "missing") == 1
+    assert await storage.get("blob") is None
+    assert await storage.flushdb()
+    assert await storage.keys() == []
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_expiry(storage):
+    await storage.set("session:1", {"user": 1}, ttl=60)
+    assert 55 <= await storage.ttl("session:1") <= 60
+    assert await storage.ttl("missing") == -2
+
+    # Both backends clear the expiry when an existing key is overwritten without ttl
+    await storage.set("session:1", {"user": 2}, xx=True)
+    assert await storage.ttl("session:1") == -1
+
+    assert await storage.expire("session:1", 1)
+    time.sleep(1.1)
+    assert await storage.get("session:1") is None
+    assert await storage.exists("session:1") == 0
+    assert await storage.ttl("session:1") == -2
+    assert not await storage.expire("session:1", 60)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cleanup_removes_only_expired(tmp_path):
+    storage = create_storage_client(storage_settings(tmp_path, "sqlite"))
+    try:
+        assert isinstance(storage, SQLiteStorageClient)
+        for i in range(20):
+            await storage.set(f"stats:{i}", i, ttl=1 if i < 5 else 3600)
+        time.sleep(1.1)
+
+        assert await storage._io.run(storage._cleanup_expired_batch_sync, 3) == (3, 3)
+        assert await storage._io.run(storage._cleanup_expired_batch_sync, 3) == (2, 2)
+        assert len(await storage.keys("stats:")) == 15
+
+        plan = storage._connection().execute(
+            "EXPLAIN QUERY PLAN SELECT key FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ? LIMIT ?",
+            (time.time(), 3)
+        ).fetchall()
+        assert any("entries_expires_at" in str(row) for row in plan)
+        assert storage.get_stats()["storage_stats"]["entry_count"] == 15
+    finally:
+        await storage.disconnect()
+
+    # A file per database, not per key
+    assert sorted(path.name for path in tmp_path.iterdir() if path.suffix == ".db") == ["storage.db"]
@@ -0,0 +1,96 @@
+"""
+Unit tests for binary profiling.
+
+Tests the characteristics computed once per binary and that prompt
+selection and provider scoring consume its traits.
+"""
+
+from src.decompilation.binary_profile import build_binary_profile
+from src.llm.base import TranslationOperationType
+from src.llm.prompts import AnalysisContext, ContextualPromptManager, TranslationQuality
+from src.models.decompilation.basic_results import (
+    BasicFunctionInfo,
+    BasicImportInfo,
+    BasicStringInfo,
+    DecompilationMetadata,
+)
+from src.models.shared.enums import FileFormat, Platform
+
+METADATA = DecompilationMetadata(
+    file_hash="sha256:" + "0" * 64, file_size=4096, file_format=FileFormat.PE,
+    platform=Platform.WINDOWS, architecture="x86", sections=[".text", "UPX1"]
+)
+
+
+def make_profile():
+    functions = [
+        BasicFunctionInfo(name="sym.hash_block", address="0x1000", size=400,
+                          assembly_code="0x00001000      mov dword [rdi], 0x6a09e667\n"
+                                        "0x00001006      pxor xmm0, xmm1"),
+        BasicFunctionInfo(name="main", address="0x1200", size=100),
+        BasicFunctionInfo(name="helper", address="0x1300", size=20),
+    ]
+    imports = [
+        BasicImportInfo(library_name="KERNEL32.dll", function_name="GetProcAddress"),
+        BasicImportInfo(library_name="VCRUNTIME140.dll", function_name="memset"),
+    ]
+    strings = [
+        BasicStringInfo(value="http://example.com/payload", address="0x3000", size=27),
+        BasicStringInfo(value="Q29ycnVwdGVkIGtleTogN2YzYjkxZGUwYTQ1ZTJjOA8xKp9Zq", address="0x3100", size=51),
+    ]
+    return build_binary_profile(functions, imports, strings, METADATA)
+
+
+def test_profile_characteristics():
+    profile = make_profile()
+
+    assert profile.architecture == "x86"
+    assert profile.compiler_hints == ["msvc"]
+    assert profile.crypto_constants == ["sha256"]
+    assert profile.obfuscation_indicators == ["dynamic_api_resolution", "high_entropy_strings", "packer_sections"]
+    assert (profile.median_function_size, profile.p90_function_size, profile.max_function_size) == (100, 400, 400)
+    for trait in ("suspicious_apis", "crypto_functions", "packed", "obfuscated_strings",
+                  "simd_instructions", "has_urls"):
+        assert profile.has_trait(trait)
+    assert not profile.has_trait("high_function_count")
+    assert profile.traits == sorted(profile.traits)
+
+
+def test_empty_binary_profile():
+    profile = build_binary_profile([], [], [])
+
+    assert profile.function_count == 0
+    assert profile.max_function_size == 0
+    assert profile.traits == []
+
+
+def test_selection_uses_traits():
+    manager = ContextualPromptManager()
+    traits = make_profile().traits
+
+    template = manager.select_prompt(
+        TranslationOperationType.FUNCTION_TRANSLATION, "anthropic",
+        AnalysisContext.PERFORMANCE_ANALYSIS, binary_traits=traits
+    )
+    assert template.template_id == "function_algorithm_analysis_v1"
+    assert manager.select_prompt(
+        TranslationOperationType.FUNCTION_TRANSLATION, "anthropic",
+        AnalysisContext.PERFORMANCE_ANALYSIS, binary_traits=traits
+    ) is template
+
+
+def test_complex_binaries_keep_requested_brief_quality():
+    manager = ContextualPromptManager()
+    traits = ["high_function_count", "complex_imports"]
+
+    assert manager.select_prompt(
+        TranslationOperationType.FUNCTION_TRANSLATION, "openai", None,
+        TranslationQuality.BRIEF, binary_traits=traits
+    ).quality_level == TranslationQuality.BRIEF
+
+    # A context's default brief quality is still upgraded
+    manager.context_preferences[AnalysisContext.SOFTWARE_AUDIT]["preferred_quality"] = TranslationQuality.BRIEF
+    assert manager.select_prompt(
+        TranslationOperationType.FUNCTION_TRANSLATION, "openai",
+        AnalysisContext.SOFTWARE_AUDIT, binary_traits=traits
+    ).quality_level == TranslationQuality.STANDARD
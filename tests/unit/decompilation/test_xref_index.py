@@ -0,0 +1,109 @@
+"""
+Unit tests for the cross-reference index.
+
+Tests address-range lookup, attribution of r2 xrefs to the functions they
+originate from, relevance ranking, the disassembly fallback, and that
+prompt context uses only the references ranked for a function.
+"""
+
+from src.decompilation.xref_index import AddressRangeIndex, XrefIndex
+from src.llm.prompts.base import ContextBuilder, TranslationQuality
+from src.models.decompilation.basic_results import (
+    BasicFunctionInfo,
+    BasicImportInfo,
+    BasicStringInfo,
+)
+
+
+def make_index():
+    functions = [
+        BasicFunctionInfo(name="main", address="0x1000", size=0x40),
+        BasicFunctionInfo(name="parse", address="0x1040", size=0x20),
+        BasicFunctionInfo(name="helper", address="0x1060", size=0x10),
+    ]
+    imports = [
+        BasicImportInfo(library_name="libc.so.6", function_name="printf", address="0x5000"),
+        BasicImportInfo(library_name="libc.so.6", function_name="memcpy", address="0x5008"),
+    ]
+    strings = [
+        BasicStringInfo(value="usage: %s", address="0x3000", size=10),
+        BasicStringInfo(value="bad header", address="0x3010", size=11),
+    ]
+    return XrefIndex(functions, imports, strings), functions, imports, strings
+
+
+def test_address_range_lookup():
+    index = AddressRangeIndex([(0x2000, 0x10, "b"), (0x1000, 0x20, "a")])
+
+    assert index.lookup(0x1000) == "a"
+    assert index.lookup(0x101f) == "a"
+    assert index.lookup(0x1020) is None
+    assert index.lookup(0x2008) == "b"
+    assert index.lookup(0x0fff) is None
+    assert len(index) == 2
+
+
+def test_xrefs_are_attributed_and_ranked():
+    index, (main, parse, helper), (printf, memcpy), (usage, bad_header) = make_index()
+    index.add_import_xrefs(printf, [{"from": 0x1010, "type": "CALL"}])
+    index.add_import_xrefs(memcpy, [{"from": 0x1004, "type": "CALL"}, {"from": 0x1048, "type": "CALL"},
+                                    {"from": 0x1020, "type": "CALL"}])
+    index.add_string_xrefs(bad_header, [{"from": 0x1050, "type": "DATA"}])
+    index.add_string_xrefs(usage, [{"from": 0x9999, "fcn_addr": 0x1000, "type": "DATA"}])
+    index.add_function_xrefs(parse, [{"from": 0x1030, "type": "CALL"}, {"from": 0x1068, "type": "CALL"}])
+    index.add_function_xrefs(helper, [{"from": 0x1044, "type": "DATA"}, {"from": 0x1064, "type": "CODE"}])
+    index.apply()
+
+    # memcpy is referenced twice from main, printf once
+    assert main.imports_used == ["libc.so.6!memcpy", "libc.so.6!printf"]
+    assert main.strings_referenced == ["0x3000"]
+    assert main.calls_to == ["parse"]
+    assert parse.imports_used == ["libc.so.6!memcpy"]
+    assert parse.strings_referenced == ["0x3010"]
+    # DATA xrefs are not calls; self-references are ignored
+    assert parse.calls_to == []
+    assert helper.calls_to == ["parse"]
+    assert sorted(parse.calls_from) == ["helper", "main"]
+
+
+def test_disassembly_fallback():
+    index, (main, parse, helper), _, _ = make_index()
+    main.assembly_code = "\n".join([
+        "0x00001000      lea rdi, [0x00003004]",
+        "0x00001007      call sym.imp.printf",
+        "0x0000100c      call 0x1040",
+        "0x00001011      mov rax, qword [0x00005008]",
+        "0x00001018      call sym.imp.printf",
+    ])
+    index.apply()
+
+    assert main.strings_referenced == ["0x3000"]
+    assert main.imports_used == ["libc.so.6!printf", "libc.so.6!memcpy"]
+    assert main.calls_to == ["parse"]
+    assert parse.calls_from == ["main"]
+
+
+def test_context_uses_ranked_references():
+    function_data = {
+        "name": "main",
+        "calls_to": ["parse"],
+        "imports_used": ["libc.so.6!memcpy", "printf"],
+        "strings_referenced": ["0x3010"],
+    }
+    context = ContextBuilder.build_function_context(
+        function_data,
+        related_functions=[{"name": "helper", "address": "0x1060"}, {"name": "parse", "address": "0x1040"}],
+        imports=[{"library": "libc.so.6", "function": name} for name in ("exit", "printf", "memcpy")],
+        strings=[{"content": "usage: %s", "address": "0x3000"}, {"content": "bad header", "address": "0x3010"}],
+        quality_level=TranslationQuality.BRIEF
+    )
+
+    assert context["related_functions"] == ["parse (0x1040)"]
+    assert context["relevant_imports"] == ["libc.so.6!memcpy", "libc.so.6!printf"]
+    assert context["relevant_strings"] == ['"bad header"']
+
+    # Without reference lists the candidates are used as given
+    unranked = ContextBuilder.build_function_context(
+        {"name": "main"}, imports=[{"library": "libc.so.6", "function": "exit"}]
+    )
+    assert unranked["relevant_imports"] == ["libc.so.6!exit"]
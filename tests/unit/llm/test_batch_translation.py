@@ -0,0 +1,275 @@
+"""
+Unit tests for offline batch translation.
+
+Runs the OpenAI and Anthropic batch paths against a local fake batch server
+and checks the translation service's batch selection and concurrent fallback.
+"""
+
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.llm.base import LLMConfig, LLMProviderException
+from src.llm.batch import (
+    BATCH_COST_DISCOUNT,
+    batch_custom_id,
+    parse_custom_id,
+    parse_jsonl,
+    to_jsonl,
+)
+from src.llm.function_ranking import DETAIL_FULL, RankedFunction
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.translation_service import TranslationServiceOrchestrator
+from tests.fixtures.llm_stub_server import (
+    FakeBatchAPI,
+    StubLLMServer,
+    anthropic_message_response,
+    openai_chat_response,
+)
+
+FUNCTIONS = [
+    {"name": "sym.parse_config", "address": "0x1000", "size": 64, "assembly_code": "push rbp\nret"},
+    {"name": "sym.read_file", "address": "0x2000", "size": 32, "assembly_code": "xor eax, eax\nret"},
+    {"name": "main", "address": "0x3000", "size": 128, "assembly_code": "call sym.parse_config\nret"},
+]
+
+_NAME_RE = re.compile(r"- Name: (\S+)")
+
+
+def answer_for(body):
+    """Answer text naming the function found in the request messages."""
+    text = " ".join(str(message["content"]) for message in body["messages"])
+    return f"Explains {_NAME_RE.search(text).group(1)}."
+
+
+@pytest.fixture
+def stub_server():
+    server = StubLLMServer().start()
+    yield server
+    server.stop()
+
+
+def test_custom_ids_and_jsonl_round_trip():
+    assert parse_custom_id(batch_custom_id(7)) == 7
+    assert parse_custom_id("other-7") is None
+    assert parse_jsonl(to_jsonl([{"a": 1}, {"b": 2}]).decode()) == [{"a": 1}, {"b": 2}]
+
+
+@pytest.mark.asyncio
+async def test_openai_batch_maps_results(stub_server):
+    stub_server.route("POST", "/v1/chat/completions", openai_chat_response())
+    fake = FakeBatchAPI(stub_server, answer_for, polls_before_done=2, fail_ids=(batch_custom_id(1),)).install_openai()
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4", endpoint_url=f"{stub_server.url}/v1"
+    ))
+    provider.endpoint_type = "openai"
+    await provider.initialize()
+
+    translations = await provider.translate_functions_batch(FUNCTIONS, poll_interval_seconds=0.01)
+
+    assert [request["custom_id"] for request in fake.submitted] == ["fn-0", "fn-1", "fn-2"]
+    assert fake.submitted[0]["url"] == "/v1/chat/completions"
+    assert fake.submitted[0]["body"]["model"] == "gpt-4"
+    assert fake.polls == 3
+    assert translations[0].natural_language_description == "Explains sym.parse_config."
+    assert translations[1] is None
+    assert translations[2].function_name == "main"
+    interactive_cost = provider._calculate_cost(1200, 40, "gpt-4")
+    assert translations[0].llm_provider.cost_estimate_usd == pytest.approx(interactive_cost * BATCH_COST_DISCOUNT)
+    await provider.cleanup()
+
+
+def test_openai_compatible_endpoint_has_no_batch():
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="llama3", endpoint_url="http://localhost:11434/v1"
+    ))
+    assert provider.supports_batch() is False
+
+    official = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4", endpoint_url="https://api.openai.com/v1"
+    ))
+    assert official.supports_batch() is True
+
+
+@pytest.mark.asyncio
+async def test_anthropic_batch_maps_results(stub_server):
+    stub_server.route("POST", "/v1/messages", anthropic_message_response())
+    fake = FakeBatchAPI(stub_server, answer_for, fail_ids=(batch_custom_id(2),)).install_anthropic()
+    provider = AnthropicProvider(LLMConfig(
+        provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+        endpoint_url=stub_server.url
+    ))
+    await provider.initialize()
+
+    translations = await provider.translate_functions_batch(
+        FUNCTIONS, {"imports": ["libc.so.6!fopen"]}, poll_interval_seconds=0.01
+    )
+
+    params = fake.submitted[0]["params"]
+    assert params["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "libc.so.6!fopen" in params["system"][-1]["text"]
+    assert translations[0].function_name == "sym.parse_config"
+    assert "Explains sym.read_file." in translations[1].natural_language_description
+    assert translations[2] is None
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_openai_timed_out_batch_is_cancelled_and_keeps_finished(stub_server):
+    fake = FakeBatchAPI(
+        stub_server, answer_for, polls_before_done=None, unfinished_ids=(batch_custom_id(1),)
+    ).install_openai()
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4", endpoint_url=f"{stub_server.url}/v1"
+    ))
+    provider.endpoint_type = "openai"
+    await provider.initialize()
+
+    translations = await provider.translate_functions_batch(
+        FUNCTIONS, poll_interval_seconds=0.01, timeout_seconds=0.05
+    )
+
+    assert fake.cancelled
+    assert translations[0].natural_language_description == "Explains sym.parse_config."
+    assert translations[1] is None
+    assert translations[2].function_name == "main"
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_openai_batch_is_cancelled_on_error(stub_server):
+    fake = FakeBatchAPI(stub_server, answer_for).install_openai()
+    stub_server.route("GET", f"/v1/batches/{fake.OPENAI_BATCH_ID}", {"error": {"message": "bad"}}, status=400)
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4", endpoint_url=f"{stub_server.url}/v1"
+    ))
+    provider.endpoint_type = "openai"
+    await provider.initialize()
+
+    with pytest.raises(LLMProviderException):
+        await provider.translate_functions_batch(FUNCTIONS, poll_interval_seconds=0.01)
+
+    assert fake.cancelled
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_timed_out_batch_is_cancelled_and_keeps_finished(stub_server):
+    fake = FakeBatchAPI(
+        stub_server, answer_for, polls_before_done=None, unfinished_ids=(batch_custom_id(0),)
+    ).install_anthropic()
+    provider = AnthropicProvider(LLMConfig(
+        provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+        endpoint_url=stub_server.url
+    ))
+    await provider.initialize()
+
+    translations = await provider.translate_functions_batch(
+        FUNCTIONS, poll_interval_seconds=0.01, timeout_seconds=0.05
+    )
+
+    assert fake.cancelled
+    assert translations[0] is None
+    assert translations[1].function_name == "sym.read_file"
+    assert translations[2].function_name == "main"
+    await provider.cleanup()
+
+
+class TestServiceBatchMode:
+    """Test batch selection in the translation service."""
+
+    def test_batch_mode_selection(self):
+        service = TranslationServiceOrchestrator()
+
+        assert service._use_batch_mode({"priority": "low"}) is True
+        assert service._use_batch_mode({"priority": "normal"}) is False
+        assert service._use_batch_mode({"priority": "low", "execution_mode": "interactive"}) is False
+        assert service._use_batch_mode({"execution_mode": "batch"}) is True
+
+    @pytest.mark.asyncio
+    async def test_unsupported_provider_falls_back(self):
+        service = TranslationServiceOrchestrator()
+        provider = Mock()
+        provider.supports_batch.return_value = False
+        provider.translate_functions_batch = AsyncMock()
+        selected = [RankedFunction(index=0, name="main", score=1.0, rank=0, detail_level=DETAIL_FULL)]
+
+        remaining = await service._translate_in_batch(
+            provider, [SimpleNamespace(**FUNCTIONS[2])], selected, {}, {}, {}, {}, None
+        )
+
+        assert remaining == selected
+        provider.translate_functions_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_low_priority_job_uses_batch_then_concurrent_for_failures(self, stub_server):
+        stub_server.route("POST", "/v1/messages", anthropic_message_response("Interactive answer."))
+        fake = FakeBatchAPI(stub_server, answer_for, fail_ids=(batch_custom_id(0),)).install_anthropic()
+        decompilation_result = SimpleNamespace(
+            decompilation_id="job-batch",
+            functions=[SimpleNamespace(**function) for function in FUNCTIONS],
+            imports=[],
+            strings=[],
+            metadata=None,
+        )
+
+        _, translation_data = await TranslationServiceOrchestrator().translate_decompilation_result(
+            decompilation_result,
+            {
+                "llm_provider": "anthropic",
+                "llm_api_key": "sk-ant-test",
+                "llm_endpoint_url": stub_server.url,
+                "llm_model": "claude-3-haiku-20240307",
+                "priority": "low",
+                "batch_poll_interval_seconds": 0.01,
+            },
+        )
+
+        assert len(fake.submitted) == 3
+        descriptions = {f["function_name"]: f["description"] for f in translation_data["functions"]}
+        assert len(descriptions) == 3
+        # The request that failed inside the batch was retried interactively
+        assert descriptions["sym.parse_config"] == "Interactive answer."
+        assert descriptions["main"] == "Explains main."
+        assert translation_data["coverage"]["translated"] == 3
+
+    @pytest.mark.asyncio
+    async def test_timed_out_batch_retranslates_only_unfinished(self, stub_server):
+        stub_server.route("POST", "/v1/messages", anthropic_message_response("Interactive answer."))
+        fake = FakeBatchAPI(
+            stub_server, answer_for, polls_before_done=None, unfinished_ids=(batch_custom_id(2),)
+        ).install_anthropic()
+        decompilation_result = SimpleNamespace(
+            decompilation_id="job-batch-timeout",
+            functions=[SimpleNamespace(**function) for function in FUNCTIONS],
+            imports=[],
+            strings=[],
+            metadata=None,
+        )
+
+        _, translation_data = await TranslationServiceOrchestrator().translate_decompilation_result(
+            decompilation_result,
+            {
+                "llm_provider": "anthropic",
+                "llm_api_key": "sk-ant-test",
+                "llm_endpoint_url": stub_server.url,
+                "llm_model": "claude-3-haiku-20240307",
+                "priority": "low",
+                "batch_poll_interval_seconds": 0.01,
+                "batch_timeout_seconds": 0.05,
+                "generate_summary": False,
+            },
+        )
+
+        assert fake.cancelled
+        # Only the function the cancelled batch never finished went out interactively
+        # (the 5-token request is initialize()'s health check)
+        interactive = [body for body in stub_server.requests_to("/v1/messages") if body["max_tokens"] > 5]
+        assert len(interactive) == 1
+        descriptions = {f["function_name"]: f["description"] for f in translation_data["functions"]}
+        assert descriptions["main"] == "Interactive answer."
+        assert descriptions["sym.parse_config"] == "Explains sym.parse_config."
+        assert translation_data["coverage"]["translated"] == 3
@@ -0,0 +1,124 @@
+"""
+Unit tests for call-graph ordered translation scheduling.
+
+Tests call graph construction, bottom-up ordering, cycle handling,
+and propagation of callee summaries into caller translations.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm.call_graph import CallGraph, CallGraphScheduler, summarize_translation
+
+
+def make_function(name, address, calls_to=None, assembly_code=""):
+    return SimpleNamespace(name=name, address=address, calls_to=calls_to or [], assembly_code=assembly_code)
+
+
+class TestCallGraph:
+    """Test call graph construction."""
+
+    def test_edges_from_calls_to(self):
+        graph = CallGraph([
+            make_function("main", "0x1000", calls_to=["helper"]),
+            make_function("helper", "0x2000"),
+        ])
+
+        assert graph.callees[0] == {1}
+        assert graph.callers[1] == {0}
+
+    def test_edges_from_assembly_call_instructions(self):
+        graph = CallGraph([
+            make_function("main", "0x00001000", assembly_code="call fcn.00002000\ncall sym.imp.printf\ncall 0x3000"),
+            make_function("fcn.00002000", "0x00002000"),
+            make_function("sym.parse", "0x00003000"),
+        ])
+
+        assert graph.callees[0] == {1, 2}
+
+    def test_components_are_reverse_topological(self):
+        graph = CallGraph([
+            make_function("main", "0x1000", calls_to=["a"]),
+            make_function("a", "0x2000", calls_to=["b"]),
+            make_function("b", "0x3000", calls_to=["a"]),
+        ])
+
+        components = graph.strongly_connected_components()
+
+        assert components == [[1, 2], [0]]
+
+
+class TestCallGraphScheduler:
+    """Test bottom-up scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_callees_translated_before_callers_with_summaries(self):
+        functions = [
+            make_function("main", "0x1000", calls_to=["init", "run"]),
+            make_function("init", "0x2000"),
+            make_function("run", "0x3000", calls_to=["init"]),
+        ]
+        scheduler = CallGraphScheduler(functions, max_concurrency=2)
+        order = []
+        seen_summaries = {}
+
+        async def translate(index, callee_summaries):
+            order.append(functions[index].name)
+            seen_summaries[functions[index].name] = callee_summaries
+            await asyncio.sleep(0)
+            return f"{functions[index].name} does work. More detail follows."
+
+        await scheduler.run(translate)
+
+        assert order == ["init", "run", "main"]
+        assert seen_summaries["run"] == {"init": "init does work."}
+        assert seen_summaries["main"] == {"init": "init does work.", "run": "run does work."}
+
+    @pytest.mark.asyncio
+    async def test_independent_subtrees_run_concurrently(self):
+        functions = [make_function(f"leaf{i}", f"0x{i + 1:x}000") for i in range(4)]
+        scheduler = CallGraphScheduler(functions, max_concurrency=4)
+        active = 0
+        peak = 0
+
+        async def translate(index, callee_summaries):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "ok."
+
+        await scheduler.run(translate)
+
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_callee_does_not_block_caller(self):
+        functions = [
+            make_function("main", "0x1000", calls_to=["broken"]),
+            make_function("broken", "0x2000"),
+        ]
+        scheduler = CallGraphScheduler(functions)
+        translated = []
+
+        async def translate(index, callee_summaries):
+            if functions[index].name == "broken":
+                raise RuntimeError("provider error")
+            translated.append((functions[index].name, callee_summaries))
+            return "done."
+
+        await scheduler.run(translate)
+
+        assert translated == [("main", {})]
+
+
+@pytest.mark.parametrize("description,expected", [
+    ("Parses the header. Then validates it.", "Parses the header."),
+    ("  Multi\nline   text without period", "Multi line text without period"),
+    (None, ""),
+])
+def test_summarize_translation(description, expected):
+    assert summarize_translation(description) == expected
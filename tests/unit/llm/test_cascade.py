@@ -0,0 +1,142 @@
+"""
+Unit tests for the local-first translation cascade.
+
+Tests escalation decisions, failure handling and the savings report, and runs
+cascade mode through the translation service with Ollama on a stub server.
+"""
+
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.cascade import CascadeTranslator
+from src.llm.translation_service import TranslationServiceOrchestrator
+from tests.fixtures.llm_stub_server import StubLLMServer, openai_chat_response
+
+
+class FakeProvider:
+    """Provider stand-in returning fixed-confidence translations."""
+
+    def __init__(self, provider_id, confidence=0.9, fail_names=(), cost=0.01):
+        self.provider_id = provider_id
+        self.confidence = confidence
+        self.fail_names = set(fail_names)
+        self.cost = cost
+        self.calls = []
+
+    def get_provider_id(self):
+        return self.provider_id
+
+    def get_default_model(self):
+        return f"{self.provider_id}-model"
+
+    def count_tokens(self, text):
+        return 100
+
+    def get_cost_estimate(self, token_count, operation_type):
+        return token_count * 0.0001
+
+    async def translate_function(self, function_data, context=None):
+        self.calls.append(function_data["name"])
+        if function_data["name"] in self.fail_names:
+            raise RuntimeError("provider failed")
+        confidence = self.confidence(function_data) if callable(self.confidence) else self.confidence
+        return SimpleNamespace(
+            function_name=function_data["name"],
+            address=function_data.get("address", "0x0"),
+            natural_language_description=f"{self.provider_id} explains {function_data['name']}",
+            confidence_score=confidence,
+            llm_provider=SimpleNamespace(tokens_used=50, cost_estimate_usd=self.cost),
+        )
+
+
+@pytest.mark.asyncio
+async def test_low_confidence_drafts_escalate():
+    local = FakeProvider("ollama", confidence=lambda f: 0.9 if f["name"] == "easy" else 0.5, cost=0.0)
+    remote = FakeProvider("openai")
+    cascade = CascadeTranslator(local, remote, confidence_threshold=0.7)
+
+    easy = await cascade.translate_function({"name": "easy"})
+    hard = await cascade.translate_function({"name": "hard"})
+
+    assert easy.natural_language_description == "ollama explains easy"
+    assert hard.natural_language_description == "openai explains hard"
+    assert remote.calls == ["hard"]
+    report = cascade.report()
+    assert (report["drafted"], report["accepted"], report["escalated"]) == (2, 1, 1)
+    assert report["remote_cost_usd"] == pytest.approx(0.01)
+    # The accepted draft avoided (100 prompt + 50 output tokens) of remote cost
+    assert report["estimated_cost_saved_usd"] == pytest.approx(0.015)
+    assert report["estimated_remote_only_cost_usd"] == pytest.approx(0.025)
+    assert report["estimated_remote_only_time_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_failures_fall_through():
+    local = FakeProvider("ollama", confidence=0.5, fail_names={"crash"})
+    remote = FakeProvider("openai", fail_names={"weak"})
+    cascade = CascadeTranslator(local, remote)
+
+    # Local failure escalates; remote failure keeps the weak local draft
+    assert (await cascade.translate_function({"name": "crash"})).natural_language_description == "openai explains crash"
+    assert (await cascade.translate_function({"name": "weak"})).natural_language_description == "ollama explains weak"
+
+    remote.fail_names.add("crash")
+    with pytest.raises(RuntimeError):
+        await cascade.translate_function({"name": "crash"})
+    report = cascade.report()
+    assert report["local_failures"] == 2
+    assert report["remote_failures"] == 2
+
+
+@pytest.mark.asyncio
+async def test_service_cascade_with_local_ollama():
+    server = StubLLMServer().start()
+    detailed = (
+        "The function parse_config reads each parameter from memory, stores it in a local variable "
+        "and uses the return register to signal success. " * 3
+    )
+
+    def handler(method, path, body):
+        prompt = body["messages"][-1]["content"]
+        name = re.search(r"- Name: (\S+)", prompt).group(1)
+        return 200, openai_chat_response(detailed.replace("parse_config", name) if name != "sym.obscure" else "Unsure."), {}
+
+    server.route("POST", "/v1/chat/completions", handler=handler)
+    remote = FakeProvider("openai")
+    decompilation_result = SimpleNamespace(
+        decompilation_id="job-cascade",
+        functions=[
+            SimpleNamespace(name="sym.parse_config", address="0x1000", size=64, assembly_code="push rbp\nret"),
+            SimpleNamespace(name="sym.obscure", address="0x2000", size=32, assembly_code="ud2"),
+        ],
+        imports=[],
+        strings=[],
+        metadata=None,
+    )
+    service = TranslationServiceOrchestrator()
+    service._create_provider_from_config = AsyncMock(return_value=SimpleNamespace(
+        initialize=AsyncMock(), translate_function=remote.translate_function, count_tokens=remote.count_tokens,
+        get_cost_estimate=remote.get_cost_estimate, get_provider_id=remote.get_provider_id,
+    ))
+    try:
+        _, translation_data = await service.translate_decompilation_result(decompilation_result, {
+            "llm_provider": "openai",
+            "cascade": True,
+            "local_llm_model": "llama3.1:8b",
+            "local_llm_endpoint_url": f"{server.url}/v1",
+            "generate_summary": False,
+        })
+    finally:
+        server.stop()
+
+    descriptions = {f["function_name"]: f["description"] for f in translation_data["functions"]}
+    assert descriptions["sym.parse_config"].startswith("The function sym.parse_config")
+    assert descriptions["sym.obscure"] == "openai explains sym.obscure"
+    assert remote.calls == ["sym.obscure"]
+    cascade = translation_data["cascade"]
+    assert cascade["local_model"] == "llama3.1:8b"
+    assert (cascade["accepted"], cascade["escalated"]) == (1, 1)
+    assert cascade["estimated_cost_saved_usd"] > 0
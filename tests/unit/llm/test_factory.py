@@ -27,6 +27,15 @@ from src.llm.base import (
     TranslationRequest,
     TranslationResponse
 )
+from src.llm.hedging import reset_live_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_live_stats():
+    """Factory stats are the process-wide live stats; start each test empty."""
+    reset_live_stats()
+    yield
+    reset_live_stats()
 
 
 class MockLLMProvider(LLMProvider):
@@ -589,4 +598,45 @@ class TestLLMProviderFactory:
         assert LLMProviderType.OPENAI in supported
         assert LLMProviderType.ANTHROPIC in supported
         assert LLMProviderType.GEMINI in supported
-        assert len(supported) == 3
\ No newline at end of file
+        assert len(supported) == 3
+
+class TestLiveLatencyRouting:
+    """Test provider selection from live request stats."""
+    
+    @pytest.fixture
+    def factory(self):
+        """Factory with two healthy mock providers."""
+        factory = LLMProviderFactory()
+        for provider_id in ("openai", "anthropic"):
+            config = LLMConfig(provider_id=provider_id, api_key="test-key", default_model="mock-model")
+            factory.add_provider(config)
+            provider = MockLLMProvider(config)
+            factory.providers[provider_id] = provider
+            factory._last_health_checks[provider_id] = provider.health_status
+        return factory
+    
+    def test_live_stats_drive_selection(self, factory):
+        """EWMA latency and error rate from requests override health-check latency."""
+        factory._last_health_checks["openai"].api_latency_ms = 100
+        factory._last_health_checks["anthropic"].api_latency_ms = 900
+        assert factory._select_fastest_provider(["openai", "anthropic"]) == "openai"
+        
+        for _ in range(5):
+            factory.record_request_success("openai", 100, 0.0, 2000)
+            factory.record_request_success("anthropic", 100, 0.0, 400)
+        assert factory._select_fastest_provider(["openai", "anthropic"]) == "anthropic"
+        
+        # Errors make a fast provider's expected time to a good answer worse
+        for _ in range(10):
+            factory.record_request_failure("anthropic", Exception("boom"))
+        assert factory.provider_stats["anthropic"].error_rate_ewma > 0.8
+        assert factory._select_fastest_provider(["openai", "anthropic"]) == "openai"
+    
+    def test_p95_tracks_recent_latencies(self, factory):
+        """The reported p95 comes from the rolling latency window."""
+        assert factory.provider_stats["openai"].p95_latency_ms is None
+        
+        for latency in range(100, 2100, 100):
+            factory.record_request_success("openai", 10, 0.0, latency)
+        
+        assert factory.provider_stats["openai"].p95_latency_ms == 1900
@@ -0,0 +1,99 @@
+"""
+Unit tests for priority-based function ranking.
+
+Tests importance scoring, detail-level assignment, max_functions limits,
+and scheduling priorities for ranked translation.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm.call_graph import CallGraph
+from src.llm.function_ranking import (
+    DETAIL_BRIEF,
+    DETAIL_FULL,
+    DETAIL_SKIP,
+    FunctionRanker,
+)
+
+
+def make_function(name, address, size=16, calls_to=None, imports_used=None, strings_referenced=None):
+    return SimpleNamespace(
+        name=name,
+        address=address,
+        size=size,
+        calls_to=calls_to or [],
+        calls_from=[],
+        imports_used=imports_used or [],
+        strings_referenced=strings_referenced or [],
+        assembly_code="",
+    )
+
+
+@pytest.fixture
+def functions():
+    return [
+        make_function("sym.pad", "0x1000", size=4),
+        make_function("main", "0x2000", size=200, calls_to=["sym.parse", "sym.log"]),
+        make_function("sym.parse", "0x3000", size=120, calls_to=["sym.log"],
+                      imports_used=["fopen", "fread"], strings_referenced=["config.ini"]),
+        make_function("sym.log", "0x4000", size=40, imports_used=["printf"]),
+        make_function("sym.unused", "0x5000", size=8),
+    ]
+
+
+class TestFunctionRanker:
+    """Test function ranking."""
+
+    def test_important_functions_rank_first(self, functions):
+        ranked = FunctionRanker(important_count=2).rank(functions)
+        order = [r.name for r in sorted(ranked, key=lambda r: r.rank)]
+
+        assert set(order[:2]) == {"main", "sym.parse"}
+        assert order[2] == "sym.log"
+        assert set(order[3:]) == {"sym.pad", "sym.unused"}
+
+    def test_detail_levels(self, functions):
+        ranked = {r.name: r for r in FunctionRanker(important_count=2).rank(functions)}
+
+        assert ranked["main"].detail_level == DETAIL_FULL
+        assert ranked["sym.parse"].detail_level == DETAIL_FULL
+        assert ranked["sym.log"].detail_level == DETAIL_BRIEF
+
+    def test_max_functions_and_skip_tail(self, functions):
+        ranked = FunctionRanker(important_count=1, max_functions=3, tail_mode=DETAIL_SKIP).rank(functions)
+        levels = [r.detail_level for r in sorted(ranked, key=lambda r: r.rank)]
+
+        assert levels == [DETAIL_FULL, DETAIL_SKIP, DETAIL_SKIP, DETAIL_SKIP, DETAIL_SKIP]
+
+        ranked = FunctionRanker(important_count=1, max_functions=3).rank(functions)
+        levels = [r.detail_level for r in sorted(ranked, key=lambda r: r.rank)]
+
+        assert levels == [DETAIL_FULL, DETAIL_BRIEF, DETAIL_BRIEF, DETAIL_SKIP, DETAIL_SKIP]
+
+    def test_entry_point_from_metadata_address(self, functions):
+        functions[1].name = "fcn.00002000"
+        ranked = {r.name: r for r in FunctionRanker().rank(functions, entry_point="0x00002000")}
+
+        assert ranked["fcn.00002000"].entry_distance == 0
+        assert ranked["sym.parse"].entry_distance == 1
+        assert ranked["sym.unused"].entry_distance is None
+
+    def test_callees_inherit_caller_priority(self, functions):
+        graph = CallGraph(functions)
+        ranker = FunctionRanker(important_count=1)
+        ranked = ranker.rank(functions, graph)
+
+        priorities = ranker.schedule_priorities(ranked, graph)
+
+        # sym.log is needed by both top-ranked functions, so it runs at their priority
+        assert priorities[3] == 0
+        assert priorities[3] < ranked[3].rank
+
+    def test_invalid_tail_mode(self):
+        with pytest.raises(ValueError):
+            FunctionRanker(tail_mode="verbose")
+
+    def test_empty(self):
+        assert FunctionRanker().rank([]) == []
@@ -0,0 +1,157 @@
+"""
+Unit tests for live provider stats and hedged translation.
+
+Tests that function requests feed the shared live stats, that a request slower
+than the primary's rolling p95 is hedged to the second provider, and that a
+translation job hedges through its hedge_provider.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.hedging import MIN_HEDGE_SAMPLES, HedgedTranslator, get_live_stats, reset_live_stats
+from src.llm.translation_service import TranslationServiceOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def clean_live_stats():
+    reset_live_stats()
+    yield
+    reset_live_stats()
+
+
+class TimedProvider:
+    """Provider stand-in that answers after a fixed delay, or fails."""
+
+    def __init__(self, provider_id, delay=0.0, fail=False):
+        self.provider_id = provider_id
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def initialize(self):
+        pass
+
+    def get_provider_id(self):
+        return self.provider_id
+
+    def supports_batch(self):
+        return False
+
+    async def translate_function(self, function_data, context=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.provider_id} failed")
+        return SimpleNamespace(
+            function_name=function_data["name"],
+            natural_language_description=f"{self.provider_id} explains {function_data['name']}.",
+            confidence_score=0.9,
+            llm_provider=SimpleNamespace(tokens_used=100, cost_estimate_usd=0.001),
+        )
+
+
+FUNCTION_DATA = {"name": "sym.main", "address": "0x1000", "assembly_code": "ret"}
+
+
+@pytest.mark.asyncio
+async def test_requests_feed_live_stats():
+    primary = TimedProvider("openai")
+    translator = HedgedTranslator(primary)
+
+    await translator.translate_function(FUNCTION_DATA)
+    primary.fail = True
+    with pytest.raises(RuntimeError):
+        await translator.translate_function(FUNCTION_DATA)
+
+    stats = get_live_stats("openai")
+    assert stats.successful_requests == 1
+    assert stats.failed_requests == 1
+    assert stats.total_tokens == 100
+    assert len(stats.recent_latencies_ms) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_after_rolling_p95():
+    primary = TimedProvider("openai", delay=5)
+    hedge = TimedProvider("anthropic")
+    translator = HedgedTranslator(primary, hedge)
+    assert translator.hedge_delay_ms() is None
+
+    for _ in range(MIN_HEDGE_SAMPLES):
+        get_live_stats("openai").record_success(10, 0.0, 20)
+    assert translator.hedge_delay_ms() == 20
+
+    translation = await translator.translate_function(FUNCTION_DATA)
+    await asyncio.sleep(0)
+
+    assert translation.natural_language_description == "anthropic explains sym.main."
+    assert primary.cancelled == 1
+    # The cancelled request is not counted as a failure
+    assert get_live_stats("openai").failed_requests == 0
+    assert get_live_stats("anthropic").successful_requests == 1
+    assert translator.report()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    primary = TimedProvider("openai")
+    hedge = TimedProvider("anthropic")
+    translator = HedgedTranslator(primary, hedge, hedge_after_ms=1000)
+
+    await translator.translate_function(FUNCTION_DATA)
+
+    assert hedge.calls == 0
+    assert translator.report()["hedged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_falls_over_to_hedge():
+    primary = TimedProvider("openai", fail=True)
+    hedge = TimedProvider("anthropic")
+    translator = HedgedTranslator(primary, hedge)
+
+    translation = await translator.translate_function(FUNCTION_DATA)
+
+    assert translation.natural_language_description == "anthropic explains sym.main."
+    assert translator.report()["fallbacks"] == 1
+    assert get_live_stats("openai").failed_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_job_hedges_through_hedge_provider():
+    primary = TimedProvider("openai", delay=5)
+    hedge = TimedProvider("anthropic")
+    for _ in range(MIN_HEDGE_SAMPLES):
+        get_live_stats("openai").record_success(10, 0.0, 20)
+    service = TranslationServiceOrchestrator()
+    service._create_provider_from_config = AsyncMock(
+        side_effect=lambda config: hedge if config["llm_provider"] == "hedge-provider-id" else primary
+    )
+    result = SimpleNamespace(
+        decompilation_id="job-hedged",
+        functions=[SimpleNamespace(name="sym.main", address="0x1000", size=16, assembly_code="ret")],
+        imports=[],
+        strings=[],
+        metadata=None,
+    )
+
+    _, translation_data = await service.translate_decompilation_result(result, {
+        "llm_provider": "openai",
+        "hedge_provider": "hedge-provider-id",
+        "generate_summary": False,
+    })
+
+    assert translation_data["functions"][0]["description"] == "anthropic explains sym.main."
+    assert translation_data["hedging"] == {
+        "hedge_provider": "anthropic", "hedged": 1, "hedge_wins": 1, "fallbacks": 0
+    }
+    assert get_live_stats("anthropic").successful_requests == 1
@@ -0,0 +1,207 @@
+"""
+Unit tests for the import explanation knowledge base.
+
+Tests key normalization, seeding, quality-tier lookups, export/import round
+trips and the translation service only sending unknown imports to the provider.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from src.cache.base import FileStorageClient
+from src.llm.base import IMPORT_SUMMARY_UNAVAILABLE, LLMConfig
+from src.llm.import_knowledge import (
+    QUALITY_CLOUD,
+    QUALITY_LOCAL,
+    WELL_KNOWN_IMPORTS,
+    ImportKnowledgeBase,
+    entry_key,
+    normalize_library,
+    normalize_symbol,
+    provider_quality,
+)
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.translation_service import TranslationServiceOrchestrator
+from src.models.decompilation.results import ImportTranslation, LLMProviderMetadata
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    settings = SimpleNamespace(storage=SimpleNamespace(base_path=tmp_path, cache_ttl_hours=24, max_file_size_mb=100))
+    client = FileStorageClient(settings)
+    yield client
+    await client.disconnect()
+
+
+def explanation(library, function, summary="Does something.", provider="openai"):
+    return ImportTranslation(
+        library_name=library,
+        function_name=function,
+        api_documentation_summary=summary,
+        usage_context="Used at startup",
+        confidence_score=0.8,
+        llm_provider=LLMProviderMetadata(provider=provider, model="gpt-4", tokens_used=100, processing_time_ms=500),
+    )
+
+
+def test_normalization():
+    assert normalize_library("KERNEL32.dll") == "kernel32"
+    assert normalize_library("libc.so.6") == "libc"
+    assert normalize_library(None) == "unknown"
+    assert normalize_symbol("sym.imp.memcpy@GLIBC_2.14") == "memcpy"
+    assert entry_key("libc.so.6", "memcpy", QUALITY_CLOUD) == entry_key("libc", "imp.memcpy", QUALITY_CLOUD)
+    assert provider_quality("ollama") == QUALITY_LOCAL
+    assert provider_quality("anthropic") == QUALITY_CLOUD
+
+
+@pytest.mark.asyncio
+async def test_seeded_on_first_lookup(storage):
+    knowledge_base = ImportKnowledgeBase(storage)
+
+    found, missing = await knowledge_base.lookup_many([
+        {"library": "KERNEL32.dll", "function": "CreateFileW"},
+        {"library": "libc.so.6", "function": "memcpy"},
+        {"library": "acme.dll", "function": "AcmeInit"},
+    ])
+
+    assert missing == [2]
+    assert found[0].function_name == "CreateFileW"
+    assert found[0].library_name == "KERNEL32.dll"
+    assert found[1].llm_provider.tokens_used == 0
+    assert len(await knowledge_base.export_entries()) == len(WELL_KNOWN_IMPORTS)
+
+
+@pytest.mark.asyncio
+async def test_quality_tiers(storage):
+    knowledge_base = ImportKnowledgeBase(storage)
+    await knowledge_base.store_many([explanation("acme.dll", "AcmeInit", provider="ollama")], QUALITY_LOCAL)
+    item = [{"library": "acme.dll", "function": "AcmeInit"}]
+
+    # A hosted-model job does not reuse a local-model explanation
+    assert (await knowledge_base.lookup_many(item, QUALITY_CLOUD))[1] == [0]
+    assert (await knowledge_base.lookup_many(item, QUALITY_LOCAL))[1] == []
+
+    await knowledge_base.store_many([explanation("acme.dll", "AcmeInit", "Initializes Acme.")], QUALITY_CLOUD)
+    found, _ = await knowledge_base.lookup_many(item, QUALITY_LOCAL)
+    assert found[0].api_documentation_summary == "Initializes Acme."
+
+
+@pytest.mark.asyncio
+async def test_export_import_round_trip(storage, tmp_path):
+    source = ImportKnowledgeBase(storage)
+    await source.store_many([explanation("acme.dll", "AcmeInit")], QUALITY_CLOUD)
+    entries = await source.export_entries()
+
+    target_settings = SimpleNamespace(
+        storage=SimpleNamespace(base_path=tmp_path / "air-gapped", cache_ttl_hours=24, max_file_size_mb=100)
+    )
+    target_storage = FileStorageClient(target_settings)
+    try:
+        target = ImportKnowledgeBase(target_storage)
+        assert await target.import_entries(entries) == len(entries)
+        # Existing entries are kept unless overwriting
+        assert await target.import_entries(entries) == 0
+        assert await target.import_entries([{"library": "x", "function": "y"}], overwrite=True) == 0
+        found, missing = await target.lookup_many([{"library": "acme.dll", "function": "AcmeInit"}])
+        assert missing == []
+    finally:
+        await target_storage.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_service_sends_only_unknown_imports(storage):
+    knowledge_base = ImportKnowledgeBase(storage)
+    provider = SimpleNamespace(
+        get_provider_id=lambda: "anthropic",
+        explain_imports=AsyncMock(side_effect=lambda imports, context: [
+            explanation(item["library"], item["function"], "Acme API.") for item in imports
+        ]),
+    )
+    import_list = [
+        {"library": "kernel32.dll", "function": "VirtualAlloc", "address": None},
+        {"library": "acme.dll", "function": "AcmeInit", "address": None},
+    ]
+    service = TranslationServiceOrchestrator(import_knowledge=knowledge_base)
+
+    first = await service._explain_imports(provider, import_list, {})
+    second = await service._explain_imports(provider, import_list, {})
+
+    assert [t.function_name for t in first] == ["VirtualAlloc", "AcmeInit"]
+    assert provider.explain_imports.await_count == 1
+    assert provider.explain_imports.await_args.args[0] == [import_list[1]]
+    assert second[1].api_documentation_summary == "Acme API."
+
+
+@pytest.mark.asyncio
+async def test_explanations_matched_by_name(storage):
+    knowledge_base = ImportKnowledgeBase(storage)
+    # Reordered, one skipped, one extra and one under another library name
+    provider = SimpleNamespace(
+        get_provider_id=lambda: "anthropic",
+        explain_imports=AsyncMock(return_value=[
+            explanation("widget.so", "WidgetDraw", "Draws a widget."),
+            explanation("unrelated.dll", "Unrequested"),
+            explanation("ACME.DLL", "sym.imp.AcmeInit", "Starts Acme."),
+        ]),
+    )
+    import_list = [
+        {"library": "acme.dll", "function": "AcmeInit", "address": None},
+        {"library": "acme.dll", "function": "AcmeShutdown", "address": None},
+        {"library": "libwidget.so.1", "function": "WidgetDraw", "address": None},
+    ]
+    service = TranslationServiceOrchestrator(import_knowledge=knowledge_base)
+
+    translations = await service._explain_imports(provider, import_list, {})
+
+    assert [(t.function_name, t.api_documentation_summary) for t in translations] == [
+        ("sym.imp.AcmeInit", "Starts Acme."),
+        ("WidgetDraw", "Draws a widget."),
+    ]
+    stored = {normalize_symbol(entry["function"]) for entry in await knowledge_base.export_entries()}
+    assert {"AcmeInit", "WidgetDraw"} <= stored
+    assert "Unrequested" not in stored
+
+
+@pytest.mark.asyncio
+async def test_unavailable_explanations_not_stored(storage):
+    knowledge_base = ImportKnowledgeBase(storage)
+
+    written = await knowledge_base.store_many([
+        explanation("acme.dll", "AcmeInit", IMPORT_SUMMARY_UNAVAILABLE),
+        explanation("acme.dll", "AcmeShutdown", "Stops Acme."),
+    ], QUALITY_CLOUD)
+
+    assert written == 1
+    _, missing = await knowledge_base.lookup_many([{"library": "acme.dll", "function": "AcmeInit"}])
+    assert missing == [0]
+
+
+def test_provider_reply_split_per_import():
+    provider = OpenAIProvider(LLMConfig(provider_id="openai", api_key="sk-test", default_model="gpt-4"))
+    import_list = [
+        {"library": "acme.dll", "function": "AcmeInit"},
+        {"library": "acme.dll", "function": "AcmeShutdown"},
+        {"library": "acme.dll", "function": "AcmeReset"},
+    ]
+    content = (
+        "Here is an overview of AcmeInit and AcmeShutdown.\n\n"
+        "### AcmeInit\n"
+        "1. Purpose and functionality: Starts the Acme runtime.\n"
+        "2. Common usage patterns: Called once at startup.\n"
+        "3. Security considerations: Loads plugins from disk.\n\n"
+        "### AcmeShutdown\n"
+        "Stops the runtime and frees its buffers.\n"
+    )
+
+    init = provider._extract_import_explanation(content, import_list, 0)
+    shutdown = provider._extract_import_explanation(content, import_list, 1)
+    reset = provider._extract_import_explanation(content, import_list, 2)
+
+    assert init["summary"] == "Starts the Acme runtime."
+    assert init["usage"] == "Called once at startup."
+    assert init["security"] == "Loads plugins from disk."
+    assert shutdown["summary"] == "Stops the runtime and frees its buffers."
+    assert reset["summary"] is None
@@ -0,0 +1,239 @@
+"""
+Unit tests for per-job token and cost budgets.
+
+Tests live accounting from result metadata, brief-mode degradation near the
+limit, leaving functions untranslated once the budget is spent, and the
+cheaper fallback model.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.job_budget import JobBudget
+from src.llm.string_filtering import prepare_strings
+from src.llm.translation_service import TranslationServiceOrchestrator
+from src.models.decompilation.results import LLMProviderMetadata
+
+
+def metadata(tokens, cost=None, model="gpt-4"):
+    return LLMProviderMetadata(
+        provider="openai", model=model, tokens_used=tokens, processing_time_ms=10, cost_estimate_usd=cost
+    )
+
+
+class MeteredProvider:
+    """Provider stand-in whose translations each use a fixed number of tokens."""
+
+    def __init__(self, tokens_per_call=100, model="gpt-4"):
+        self.tokens_per_call = tokens_per_call
+        self.model = model
+        self.detail_levels = []
+        self.cleaned_up = False
+
+    async def initialize(self):
+        pass
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+    def get_provider_id(self):
+        return "openai"
+
+    def supports_batch(self):
+        return True
+
+    async def translate_function(self, function_data, context=None):
+        self.detail_levels.append(function_data["detail_level"])
+        return SimpleNamespace(
+            function_name=function_data["name"],
+            address=function_data["address"],
+            natural_language_description=f"Explains {function_data['name']}.",
+            confidence_score=0.9,
+            llm_provider=metadata(self.tokens_per_call, model=self.model)
+        )
+
+
+class EstimatingProvider(MeteredProvider):
+    """Metered provider that can estimate its requests and answers after a delay."""
+
+    def __init__(self, tokens_per_call=100, estimated_tokens=100):
+        super().__init__(tokens_per_call)
+        self.estimated_tokens = estimated_tokens
+        self.config = SimpleNamespace(max_tokens=estimated_tokens)
+
+    def _estimate_request_tokens(self, texts, max_tokens, model=None):
+        return max_tokens
+
+    def get_cost_estimate(self, token_count, operation_type):
+        return 0.0
+
+    async def translate_function(self, function_data, context=None):
+        await asyncio.sleep(0.01)
+        return await super().translate_function(function_data, context)
+
+
+def make_result(function_count=10):
+    return SimpleNamespace(
+        decompilation_id="job-budget",
+        functions=[
+            SimpleNamespace(name=f"sym.f{i}", address=hex(0x1000 + i * 0x10), size=16, assembly_code="ret")
+            for i in range(function_count)
+        ],
+        imports=[],
+        strings=[],
+        metadata=None,
+    )
+
+
+def test_accounting_and_states():
+    budget = JobBudget(max_tokens=1000, max_cost_usd=0.10)
+    shared = metadata(200, cost=0.02)
+    # A batched request's results share one metadata object and count once
+    budget.record([SimpleNamespace(llm_provider=shared), SimpleNamespace(llm_provider=shared)])
+    assert (budget.tokens_used, budget.requests) == (200, 1)
+    assert budget.fraction_used() == pytest.approx(0.2)
+
+    budget.record(SimpleNamespace(llm_provider=metadata(100, cost=0.07)))
+    # Cost is the tighter limit: $0.09 of $0.10
+    assert budget.degraded and not budget.exhausted
+
+    budget.record(SimpleNamespace(llm_provider=metadata(100, cost=0.03)))
+    assert budget.exhausted
+    assert not budget.try_start("sym.late")
+    assert budget.get_stats()["skipped_functions"] == 1
+
+
+def test_in_flight_requests_are_projected():
+    budget = JobBudget(max_tokens=800)
+    budget.record(SimpleNamespace(llm_provider=metadata(300)))
+    assert budget.try_start("sym.a")
+    assert budget.try_start("sym.b") is False  # 300 spent + 2 x 300 expected > 800
+    budget.finish(SimpleNamespace(llm_provider=metadata(100)))
+    assert budget.try_start("sym.c")  # 400 spent + 200 expected
+    assert budget.skipped == ["sym.b"]
+
+    # Before any result, each request is projected at the caller's estimate
+    fresh = JobBudget(max_tokens=1000)
+    assert fresh.try_start("sym.a", estimated_tokens=400)
+    assert fresh.try_start("sym.b", estimated_tokens=400)
+    assert fresh.try_start("sym.c", estimated_tokens=400) is False
+
+    unlimited = JobBudget()
+    unlimited.record(SimpleNamespace(llm_provider=metadata(10 ** 9)))
+    assert not unlimited.enabled and unlimited.try_start("sym.a")
+
+    with pytest.raises(ValueError):
+        JobBudget(max_cost_usd=0)
+
+
+async def translate(provider, **llm_config):
+    service = TranslationServiceOrchestrator()
+    service._create_provider_from_config = AsyncMock(return_value=provider)
+    progress_updates = []
+
+    async def on_progress(progress):
+        progress_updates.append(progress)
+
+    _, translation_data = await service.translate_decompilation_result(
+        make_result(),
+        {"llm_provider": "openai", "translation_concurrency": 1, "generate_summary": False,
+         "important_functions": 10, **llm_config},
+        progress_callback=on_progress
+    )
+    return service, translation_data, progress_updates
+
+
+@pytest.mark.asyncio
+async def test_budget_degrades_then_stops():
+    provider = MeteredProvider(tokens_per_call=100)
+
+    _, translation_data, progress_updates = await translate(provider, max_job_tokens=550, priority="low")
+
+    # Budgeted jobs skip the batch API; 5 x 100 tokens fit, the sixth would not
+    assert len(translation_data["functions"]) == 5
+    assert provider.detail_levels == ["full"] * 5
+    assert len(translation_data["untranslated_functions"]) == 5
+    budget = translation_data["budget"]
+    assert budget["tokens_used"] == 500
+    assert budget["skipped_functions"] == 5
+    assert budget["degraded"] and not budget["exhausted"]
+    assert progress_updates[-1]["budget"]["fraction_used"] == pytest.approx(0.909)
+    assert progress_updates[-1]["completed"] == 10
+
+
+@pytest.mark.asyncio
+async def test_degraded_functions_use_brief_mode_and_fallback_model():
+    provider = MeteredProvider(tokens_per_call=100)
+    cheap = MeteredProvider(tokens_per_call=20, model="gpt-4o-mini")
+    service = TranslationServiceOrchestrator()
+    service._create_provider_from_config = AsyncMock(side_effect=[provider, cheap])
+
+    _, translation_data = await service.translate_decompilation_result(
+        make_result(),
+        {"llm_provider": "openai", "llm_model": "gpt-4", "translation_concurrency": 1, "generate_summary": False,
+         "important_functions": 10, "max_job_tokens": 1000, "budget_degrade_at": 0.5,
+         "budget_fallback_model": "gpt-4o-mini"}
+    )
+
+    assert provider.detail_levels == ["full"] * 5
+    assert cheap.detail_levels == ["brief"] * 5
+    assert service._create_provider_from_config.await_args.args[0]["llm_model"] == "gpt-4o-mini"
+    assert translation_data["budget"]["tokens_used"] == 600
+    assert translation_data["untranslated_functions"] == []
+    assert cheap.cleaned_up and provider.cleaned_up
+
+
+@pytest.mark.asyncio
+async def test_first_concurrent_requests_reserve_an_estimate():
+    provider = EstimatingProvider(tokens_per_call=400, estimated_tokens=400)
+
+    _, translation_data, _ = await translate(provider, max_job_tokens=1000, translation_concurrency=3)
+
+    # Without a reservation all three first requests would start and spend 1200
+    assert translation_data["budget"]["tokens_used"] == 800
+    assert len(translation_data["untranslated_functions"]) == 8
+
+
+@pytest.mark.asyncio
+async def test_summary_skipped_once_budget_exhausted():
+    provider = MeteredProvider(tokens_per_call=100)
+    provider.generate_overall_summary = AsyncMock()
+
+    _, translation_data, _ = await translate(provider, max_job_tokens=100, generate_summary=True)
+
+    assert translation_data["budget"]["exhausted"]
+    assert translation_data["summary"] is None
+    provider.generate_overall_summary.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_import_and_string_requests_reserve_an_estimate():
+    provider = EstimatingProvider(estimated_tokens=400)
+    provider.max_strings_per_request = 1
+    provider.interpret_strings = AsyncMock(side_effect=lambda strings, context: [
+        SimpleNamespace(interpretation="A path.", llm_provider=metadata(400)) for _ in strings
+    ])
+    provider.explain_imports = AsyncMock()
+    service = TranslationServiceOrchestrator(import_knowledge=SimpleNamespace(
+        lookup_many=AsyncMock(return_value=({}, [0])), store_many=AsyncMock(return_value=0)
+    ))
+    budget = JobBudget(max_tokens=500)
+    string_plan = prepare_strings([
+        {"content": content, "address": hex(0x4000 + i * 0x20), "size": len(content), "encoding": "ascii"}
+        for i, content in enumerate(["/etc/app.conf", "https://updates.example.com/check", "Failed to open %s"])
+    ])
+
+    interpreted = await service._interpret_strings(provider, string_plan, {}, concurrency=3, budget=budget)
+
+    # All three batches start together; only the first fits the 400-token estimate
+    assert provider.interpret_strings.await_count == 1
+    assert len(interpreted) == 1
+    assert budget.tokens_used == 400 and budget.in_flight == 0
+
+    explained = await service._explain_imports(provider, [{"library": "libc.so.6", "function": "fopen"}], {}, budget)
+
+    assert explained == []
+    provider.explain_imports.assert_not_called()
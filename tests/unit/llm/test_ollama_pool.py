@@ -0,0 +1,193 @@
+"""
+Unit tests for Ollama endpoint scheduling.
+
+Tests parallelism discovery against a stub server that runs a fixed number of
+requests at once, least-outstanding dispatch with a local wait queue, keep_alive
+pings, the provider spreading work across several endpoints, and providers
+on the same endpoints sharing one pool.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.llm.base import LLMConfig, LLMProviderType
+from src.llm.providers import ollama_pool
+from src.llm.providers.ollama_pool import OllamaEndpoint, OllamaEndpointPool, native_api_url
+from src.llm.providers.ollama_provider import OllamaProvider
+from tests.fixtures.llm_stub_server import StubLLMServer, openai_chat_response
+
+
+@pytest.fixture
+def server():
+    server = StubLLMServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def clear_discovery_cache():
+    ollama_pool._discovered_parallelism.clear()
+    yield
+    ollama_pool._discovered_parallelism.clear()
+
+
+def limited_generate(slots: int, seconds: float = 0.05):
+    """/api/generate handler that runs at most slots requests at once, like OLLAMA_NUM_PARALLEL."""
+    semaphore = threading.Semaphore(slots)
+
+    def handler(method, path, body):
+        with semaphore:
+            time.sleep(seconds)
+        return 200, {"model": body["model"], "response": "OK", "done": True}, {}
+
+    return handler
+
+
+def test_native_api_url():
+    assert native_api_url("http://localhost:11434/v1") == "http://localhost:11434"
+    assert native_api_url("http://localhost:11434/v1/") == "http://localhost:11434"
+    assert native_api_url("http://gpu-box:11434") == "http://gpu-box:11434"
+
+
+@pytest.mark.asyncio
+async def test_discovers_server_parallelism(server):
+    server.route("POST", "/api/generate", handler=limited_generate(slots=2))
+    endpoint = OllamaEndpoint(f"{server.url}/v1", "ollama-no-auth", 5)
+    try:
+        assert await endpoint.discover_parallelism("llama3.1:8b") == 2
+        probes = len(server.requests_to("/api/generate"))
+
+        # Discovery is cached per server and model
+        again = OllamaEndpoint(f"{server.url}/v1", "ollama-no-auth", 5)
+        assert await again.discover_parallelism("llama3.1:8b") == 2
+        assert len(server.requests_to("/api/generate")) == probes
+        await again.close()
+    finally:
+        await endpoint.close()
+
+
+@pytest.mark.asyncio
+async def test_configured_parallelism_skips_probe(server):
+    endpoint = OllamaEndpoint(f"{server.url}/v1", "ollama-no-auth", 5, parallelism=4)
+    pool = OllamaEndpointPool([endpoint], keep_alive="1h")
+    server.route("POST", "/api/generate", body={"done": True})
+    try:
+        await pool.start("phi4")
+        # Only the warm-up keep_alive request, no probes
+        assert server.requests_to("/api/generate") == [{"model": "phi4", "keep_alive": "1h"}]
+        assert pool.capacity == 4
+    finally:
+        await pool.close()
+    assert pool._keep_alive_task is None
+
+
+@pytest.mark.asyncio
+async def test_dispatch_balances_and_queues(server):
+    first = OllamaEndpoint(f"{server.url}/a/v1", "ollama-no-auth", 5, parallelism=2)
+    second = OllamaEndpoint(f"{server.url}/b/v1", "ollama-no-auth", 5, parallelism=1)
+    pool = OllamaEndpointPool([first, second])
+    release = asyncio.Event()
+    used = []
+
+    async def job():
+        async with pool.acquire() as endpoint:
+            used.append(endpoint)
+            await release.wait()
+
+    try:
+        tasks = [asyncio.create_task(job()) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        # Three slots in total: two on the first endpoint, one on the second, two waiting
+        assert (first.outstanding, second.outstanding) == (2, 1)
+        assert pool.queued == 2
+        release.set()
+        await asyncio.gather(*tasks)
+        stats = pool.get_stats()
+        assert stats["max_queued"] == 2
+        assert stats["queued"] == 0
+        assert sum(e["completed"] for e in stats["endpoints"]) == 5
+        assert used[:3].count(first) == 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_endpoint_is_skipped(server):
+    first = OllamaEndpoint(f"{server.url}/a/v1", "ollama-no-auth", 5, parallelism=2)
+    second = OllamaEndpoint(f"{server.url}/b/v1", "ollama-no-auth", 5, parallelism=2)
+    pool = OllamaEndpointPool([first, second])
+    try:
+        pool.mark_failed(first)
+        for _ in range(2):
+            async with pool.acquire() as endpoint:
+                assert endpoint is second
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_provider_spreads_requests_across_endpoints():
+    servers = [StubLLMServer().start(), StubLLMServer().start()]
+    for stub in servers:
+        stub.route("POST", "/api/generate", body={"done": True})
+        stub.route("POST", "/v1/chat/completions", handler=lambda method, path, body: (
+            time.sleep(0.05) or (200, openai_chat_response("The function returns its first argument."), {})
+        ))
+    provider = OllamaProvider(LLMConfig(
+        provider_id=LLMProviderType.OLLAMA,
+        api_key="ollama-no-auth",
+        default_model="llama3.1:8b",
+        endpoint_url=f"{servers[0].url}/v1",
+        provider_specific={"endpoints": [f"{servers[1].url}/v1"], "num_parallel": 2},
+    ))
+    try:
+        await provider.initialize()
+        await asyncio.gather(*(
+            provider.translate_function({"name": f"sub_{i}", "address": "0x1000", "size": 8, "assembly_code": "mov eax, edi\nret"})
+            for i in range(8)
+        ))
+        stats = provider.get_pool_stats()
+        assert stats["capacity"] == 4
+        assert [len(stub.requests_to("/v1/chat/completions")) for stub in servers] == [4, 4]
+    finally:
+        await provider.cleanup()
+        await ollama_pool.close_endpoint_pools()
+        for stub in servers:
+            stub.stop()
+
+
+@pytest.mark.asyncio
+async def test_providers_share_pool_per_endpoint_set(server):
+    server.route("POST", "/api/generate", body={"done": True})
+
+    def make_provider(endpoints):
+        return OllamaProvider(LLMConfig(
+            provider_id=LLMProviderType.OLLAMA,
+            api_key="ollama-no-auth",
+            default_model="llama3.1:8b",
+            endpoint_url=f"{server.url}/v1",
+            provider_specific={"endpoints": endpoints, "num_parallel": 2},
+        ))
+
+    first, second = make_provider([]), make_provider([])
+    other = make_provider([f"{server.url}/b/v1"])
+    try:
+        await first.initialize()
+        await second.initialize()
+        await other.initialize()
+        assert first.pool is second.pool
+        assert other.pool is not first.pool
+        pool = first.pool
+
+        # A finished job leaves the pool open and its model warm for the next one
+        await first.cleanup()
+        warm_pings = len(server.requests_to("/api/generate"))
+        third = make_provider([])
+        await third.initialize()
+        assert third.pool is pool
+        assert len(server.requests_to("/api/generate")) == warm_pings
+    finally:
+        await ollama_pool.close_endpoint_pools()
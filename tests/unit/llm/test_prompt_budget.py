@@ -0,0 +1,127 @@
+"""
+Unit tests for prompt budget management.
+
+Tests token counting, r2 assembly compression, and fitting prompt
+sections to an input token budget.
+"""
+
+import json
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.prompt_budget import (
+    DEFAULT_INPUT_BUDGETS,
+    PromptBudget,
+    TokenCounter,
+    compress_assembly,
+)
+
+R2_LISTING = """            ; CALL XREF from entry0 @ 0x1040
+┌ 37: int main (int argc, char **argv);
+│           ; var int64_t var_4h @ rbp-0x4
+│           0x00001139      55             push rbp
+│           0x0000113a      4889e5         mov rbp, rsp
+│           0x0000113d      90             nop
+│           0x0000113e      90             nop
+│           0x0000113f      0f1f00         nop dword [rax]
+│           0x00001142      90             nop
+│       │   ; CODE XREF from main @ 0x1160
+│           0x00001143      4883c001       add rax, 1
+│           0x00001147      4883c001       add rax, 1
+│           0x0000114b      4883c001       add rax, 1
+│           0x0000114f      4883c001       add rax, 1
+│           0x00001153      4883c001       add rax, 1
+│           0x00001157      5d             pop rbp
+└           0x00001158      c3             ret"""
+
+
+@pytest.fixture
+def estimate_counter():
+    """Token counter that always uses the calibrated estimate."""
+    return TokenCounter("anthropic", use_tokenizer=False)
+
+
+class TestCompressAssembly:
+    """Test r2 assembly compression."""
+
+    def test_drops_comment_lines_but_keeps_vars(self):
+        compressed = compress_assembly(R2_LISTING)
+
+        assert "XREF" not in compressed
+        assert "; var int64_t var_4h" in compressed
+
+    def test_collapses_nop_runs(self):
+        compressed = compress_assembly(R2_LISTING)
+
+        assert compressed.count("nop") == 2  # first nop + marker
+        assert "; ... 3 more nop instructions" in compressed
+
+    def test_elides_repeated_blocks(self):
+        compressed = compress_assembly(R2_LISTING)
+
+        assert compressed.count("add rax, 1") == 1
+        assert "repeated 4 more times" in compressed
+        assert compressed.rstrip().endswith("ret")
+
+    def test_multi_line_blocks(self):
+        block = "mov eax, [rbx]\nadd rbx, 4\nxor ecx, eax\n"
+        compressed = compress_assembly("push rbp\n" + block * 4 + "ret")
+
+        assert compressed.count("add rbx, 4") == 1
+        assert "previous 3 instruction(s) repeated 3 more times" in compressed
+
+    def test_empty_input(self):
+        assert compress_assembly("") == ""
+
+
+class TestPromptBudget:
+    """Test fitting prompt sections to a budget."""
+
+    def test_small_assembly_untouched_except_compression(self, estimate_counter):
+        budget = PromptBudget(estimate_counter, 4000)
+        code = "push rbp\nmov rbp, rsp\nret"
+
+        assert budget.fit_assembly(code, 1000) == code
+
+    def test_large_assembly_fits_budget(self, estimate_counter):
+        budget = PromptBudget(estimate_counter, 4000)
+        code = "\n".join(f"0x{0x1000 + i * 4:08x}  89c{i % 8}  mov eax, {i}" for i in range(2000))
+
+        fitted = budget.fit_assembly(code, 300)
+
+        assert budget.count(fitted) <= 300
+        assert "lines omitted" in fitted
+        assert fitted.splitlines()[0].endswith("mov eax, 0")
+        assert fitted.splitlines()[-1].endswith("mov eax, 1999")
+
+    def test_fit_context_drops_largest_entries(self, estimate_counter):
+        budget = PromptBudget(estimate_counter, 4000)
+        context = {"job_id": "abc", "empty": None, "blob": "x" * 5000}
+
+        fitted = budget.fit_context(context, 50)
+
+        assert json.loads(fitted) == {"job_id": "abc"}
+
+    def test_remaining_and_split(self, estimate_counter):
+        budget = PromptBudget(estimate_counter, 1000)
+
+        available = budget.remaining("a" * 330)
+        shares = budget.split(available, {"assembly": 0.75, "context": 0.25})
+
+        assert available == 900
+        assert shares == {"assembly": 675, "context": 225}
+
+    def test_for_config_uses_provider_default(self):
+        config = LLMConfig(provider_id="ollama", api_key="x", default_model="llama3.1:8b")
+
+        budget = PromptBudget.for_config(config)
+
+        assert budget.max_input_tokens == DEFAULT_INPUT_BUDGETS["ollama"]
+
+    def test_for_config_honors_max_input_tokens(self):
+        config = LLMConfig(
+            provider_id="anthropic", api_key="x", default_model="claude-3-haiku", max_input_tokens=2048
+        )
+
+        assert PromptBudget.for_config(config).max_input_tokens == 2048
@@ -0,0 +1,233 @@
+"""
+Unit tests for provider-side prompt caching.
+
+Runs the OpenAI and Anthropic providers against a local stand-in server and
+checks that the static prompt prefix is marked cacheable in each vendor's
+request format. Gemini context caching and the Ollama no-op are also covered.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.gemini_provider import GeminiProvider
+from src.llm.providers.ollama_provider import OllamaProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+from tests.fixtures.llm_stub_server import (
+    StubLLMServer,
+    anthropic_message_response,
+    openai_chat_response,
+)
+
+FUNCTION_DATA = {
+    "name": "sym.parse_config",
+    "address": "0x00401000",
+    "size": 64,
+    "assembly_code": "push rbp\nmov rbp, rsp\ncall sym.imp.fopen\npop rbp\nret",
+    "calls_to": ["sym.imp.fopen"],
+}
+
+CONTEXT = {
+    "binary_info": {"format": "elf", "architecture": "x86_64", "file_size": 40960},
+    "analysis_summary": {"function_count": 12, "import_count": 3, "string_count": 40},
+    "translation_settings": {"quality_level": "standard", "analysis_depth": "standard"},
+    "imports": ["libc.so.6!fopen", "libc.so.6!fread", "libc.so.6!printf"],
+    "job_id": "job-123",
+}
+
+
+@pytest.fixture
+def stub_server():
+    server = StubLLMServer().start()
+    yield server
+    server.stop()
+
+
+class TestOpenAIPromptCaching:
+    """OpenAI keeps the static prefix first and routes it with a cache key."""
+
+    @pytest.mark.asyncio
+    async def test_static_prefix_in_system_message(self, stub_server):
+        stub_server.route("POST", "/v1/chat/completions", openai_chat_response(cached_tokens=1024))
+        provider = OpenAIProvider(LLMConfig(
+            provider_id="openai", api_key="sk-test", default_model="gpt-4",
+            endpoint_url=f"{stub_server.url}/v1"
+        ))
+        provider.endpoint_type = "openai"
+        await provider.initialize()
+
+        await provider.translate_function(FUNCTION_DATA, CONTEXT)
+        await provider.translate_function({**FUNCTION_DATA, "name": "sym.other"}, CONTEXT)
+
+        first, second = stub_server.requests_to("/v1/chat/completions")[-2:]
+        system_first = first["messages"][0]
+        assert system_first["role"] == "system"
+        assert '"imports":["libc.so.6!fopen"' in system_first["content"]
+        assert "job-123" not in system_first["content"]
+        assert "job-123" in first["messages"][1]["content"]
+
+        # Identical prefix and cache key across functions
+        assert second["messages"][0] == system_first
+        assert first["prompt_cache_key"] == second["prompt_cache_key"]
+        await provider.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_compatible_endpoints_do_not_get_cache_key(self, stub_server):
+        stub_server.route("POST", "/v1/chat/completions", openai_chat_response())
+        provider = OpenAIProvider(LLMConfig(
+            provider_id="openai", api_key="sk-test", default_model="gpt-4",
+            endpoint_url=f"{stub_server.url}/v1"
+        ))
+        await provider.initialize()
+
+        await provider.translate_function(FUNCTION_DATA, CONTEXT)
+
+        body = stub_server.requests_to("/v1/chat/completions")[-1]
+        assert "prompt_cache_key" not in body
+        await provider.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cached_tokens_reported(self, stub_server):
+        stub_server.route("POST", "/v1/chat/completions", openai_chat_response(cached_tokens=1024))
+        provider = OpenAIProvider(LLMConfig(
+            provider_id="openai", api_key="sk-test", default_model="gpt-4",
+            endpoint_url=f"{stub_server.url}/v1"
+        ))
+        await provider.initialize()
+
+        response = await provider._make_completion_request([{"role": "user", "content": "hi"}])
+
+        assert response["cached_input_tokens"] == 1024
+        await provider.cleanup()
+
+
+class TestAnthropicPromptCaching:
+    """Anthropic marks the static system blocks with cache_control."""
+
+    @pytest.mark.asyncio
+    async def test_cache_control_on_static_context(self, stub_server):
+        stub_server.route("POST", "/v1/messages", anthropic_message_response(
+            input_tokens=50, cache_read_input_tokens=2000
+        ))
+        provider = AnthropicProvider(LLMConfig(
+            provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+            endpoint_url=stub_server.url
+        ))
+        await provider.initialize()
+
+        translation = await provider.translate_function(FUNCTION_DATA, CONTEXT)
+
+        body = stub_server.requests_to("/v1/messages")[-1]
+        system_blocks = body["system"]
+        assert isinstance(system_blocks, list) and len(system_blocks) == 2
+        assert "cache_control" not in system_blocks[0]
+        assert system_blocks[1]["cache_control"] == {"type": "ephemeral"}
+        assert "libc.so.6!fread" in system_blocks[1]["text"]
+        # Per-request context stays out of the cached prefix
+        assert "job-123" not in system_blocks[1]["text"]
+        assert "job-123" in body["messages"][0]["content"]
+        # Cached input tokens count toward usage
+        assert translation.llm_provider.tokens_used == 50 + 2000 + 40
+        await provider.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_cacheable_without_context(self, stub_server):
+        stub_server.route("POST", "/v1/messages", anthropic_message_response())
+        provider = AnthropicProvider(LLMConfig(
+            provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+            endpoint_url=stub_server.url
+        ))
+        await provider.initialize()
+
+        await provider._make_completion_request([{"role": "user", "content": "hi"}], "system text")
+
+        body = stub_server.requests_to("/v1/messages")[-1]
+        assert body["system"] == [
+            {"type": "text", "text": "system text", "cache_control": {"type": "ephemeral"}}
+        ]
+        await provider.cleanup()
+
+
+class TestGeminiContextCaching:
+    """Gemini stores large static prefixes as cached content."""
+
+    def _provider(self, min_tokens):
+        provider = GeminiProvider(LLMConfig(
+            provider_id="gemini", api_key="test-key", default_model="gemini-flash",
+            provider_specific={"context_cache_min_tokens": min_tokens}
+        ))
+        provider.genai_model = Mock()
+        provider.genai_model.generate_content.return_value = Mock(text="Plain response", usage_metadata=None)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_large_prefix_uses_cached_content(self):
+        provider = self._provider(min_tokens=1)
+        cached_model = Mock()
+        cached_model.generate_content.return_value = Mock(
+            text="Cached response", usage_metadata=Mock(cached_content_token_count=300)
+        )
+
+        with patch("google.generativeai.caching.CachedContent.create", return_value=Mock()) as create, \
+                patch("google.generativeai.GenerativeModel.from_cached_content", return_value=cached_model):
+            first = await provider._make_completion_request("function prompt", cacheable_prefix="static prefix")
+            await provider._make_completion_request("other prompt", cacheable_prefix="static prefix")
+
+        assert create.call_count == 1
+        assert create.call_args.kwargs["contents"] == ["static prefix"]
+        cached_model.generate_content.assert_called_with("other prompt")
+        assert first["cached_input_tokens"] == 300
+        provider.genai_model.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_small_prefix_sent_inline_first(self):
+        provider = self._provider(min_tokens=100000)
+
+        with patch("google.generativeai.caching.CachedContent.create") as create:
+            await provider._make_completion_request("function prompt", cacheable_prefix="static prefix")
+
+        create.assert_not_called()
+        provider.genai_model.generate_content.assert_called_once_with("static prefix\n\nfunction prompt")
+
+    @pytest.mark.asyncio
+    async def test_cache_failure_falls_back(self):
+        provider = self._provider(min_tokens=1)
+
+        with patch("google.generativeai.caching.CachedContent.create", side_effect=RuntimeError("unsupported")) as create:
+            await provider._make_completion_request("p1", cacheable_prefix="static prefix")
+            await provider._make_completion_request("p2", cacheable_prefix="static prefix")
+
+        assert create.call_count == 1
+        provider.genai_model.generate_content.assert_called_with("static prefix\n\np2")
+
+    @pytest.mark.asyncio
+    async def test_other_model_gets_prefix_inline(self):
+        provider = self._provider(min_tokens=1)
+        override_model = Mock()
+        override_model.generate_content.return_value = Mock(text="Override response", usage_metadata=None)
+
+        with patch("google.generativeai.caching.CachedContent.create") as create, \
+                patch("google.generativeai.GenerativeModel", return_value=override_model) as model_class:
+            result = await provider._make_completion_request(
+                "function prompt", model="gemini-pro", max_tokens=512, cacheable_prefix="static prefix"
+            )
+
+        # Cached content belongs to the default model, so the prefix travels with the prompt
+        create.assert_not_called()
+        assert model_class.call_args.kwargs["model_name"] == "gemini-pro"
+        assert "safety_settings" in model_class.call_args.kwargs
+        prompt = override_model.generate_content.call_args.args[0]
+        assert prompt == "static prefix\n\nfunction prompt"
+        assert override_model.generate_content.call_args.kwargs["generation_config"].max_output_tokens == 512
+        assert result["model"] == "gemini-pro"
+
+
+def test_ollama_prompt_caching_is_noop():
+    provider = OllamaProvider(LLMConfig(provider_id="ollama", api_key="x", default_model="llama3.1:8b"))
+
+    assert provider.supports_prompt_caching is False
+    assert OpenAIProvider.supports_prompt_caching is True
+    assert AnthropicProvider.supports_prompt_caching is True
+    assert GeminiProvider.supports_prompt_caching is True
@@ -0,0 +1,155 @@
+"""
+Unit tests for prompt template experiments.
+
+Tests stable traffic assignment, per-template telemetry and the comparison
+report, validation of experiment definitions, and assignment and recording
+during a translation job.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.llm.prompt_budget import PromptBudget, TokenCounter
+from src.llm.prompt_pipeline import PromptPipeline
+from src.llm.prompts import PromptExperiment, PromptExperimentManager, get_template_by_id
+from src.llm.translation_service import TranslationServiceOrchestrator
+from src.models.decompilation.results import LLMProviderMetadata
+
+CONTROL = "function_translation_standard_v1"
+TERSE = "function_translation_standard_v2"
+
+
+def translation(input_tokens, output_tokens, latency_ms, confidence):
+    return SimpleNamespace(
+        confidence_score=confidence,
+        llm_provider=LLMProviderMetadata(
+            provider="openai", model="gpt-4", tokens_used=input_tokens + output_tokens,
+            processing_time_ms=latency_ms, input_tokens=input_tokens, output_tokens=output_tokens
+        )
+    )
+
+
+def test_assignment_is_stable_and_follows_shares():
+    experiment = PromptExperiment("terse-prompt", CONTROL, {TERSE: 25})
+    assignments = [experiment.assign(f"job-1:0x{i:x}") for i in range(4000)]
+
+    assert assignments == [experiment.assign(f"job-1:0x{i:x}") for i in range(4000)]
+    assert 0.22 < assignments.count(TERSE) / len(assignments) < 0.28
+    assert set(assignments) == {CONTROL, TERSE}
+
+
+def test_report_compares_variants_with_control():
+    experiment = PromptExperiment("terse-prompt", CONTROL, {TERSE: 50}, description="Fewer instruction tokens")
+    experiment.record(CONTROL, translation(1000, 400, 2000, 0.8))
+    experiment.record(CONTROL, translation(1200, 400, 2400, 0.9))
+    experiment.record(TERSE, translation(800, 300, 1500, 0.85))
+    experiment.record(TERSE, None)
+
+    report = experiment.report()
+    control, terse = report["control"], report["variants"][0]
+    assert control["avg_input_tokens"] == 1100
+    assert control["traffic_percent"] == 50
+    assert terse["success_rate"] == 0.5
+    assert terse["change_vs_control"]["avg_input_tokens"] == pytest.approx(800 / 1100 - 1, abs=1e-4)
+    assert terse["change_vs_control"]["avg_latency_ms"] == pytest.approx(1500 / 2200 - 1, abs=1e-4)
+    assert terse["change_vs_control"]["avg_cost_usd"] is None
+    assert get_template_by_id(TERSE).usage_count >= 2
+
+
+def test_experiment_validation():
+    with pytest.raises(KeyError):
+        PromptExperiment("missing", CONTROL, {"function_translation_missing_v9": 10})
+    with pytest.raises(ValueError):
+        PromptExperiment("mixed", CONTROL, {"import_explanation_standard_v1": 10})
+    with pytest.raises(ValueError):
+        PromptExperiment("too-much", CONTROL, {TERSE: 120})
+
+    manager = PromptExperimentManager()
+    manager.start(PromptExperiment("first", CONTROL, {TERSE: 10}))
+    with pytest.raises(ValueError):
+        manager.start(PromptExperiment("second", CONTROL, {TERSE: 10}))
+    manager.stop("first")
+    assert manager.active() is None
+    manager.start(PromptExperiment("second", CONTROL, {TERSE: 10}))
+    assert [report["experiment_id"] for report in manager.report()] == ["second", "first"]
+
+
+def test_pipeline_uses_assigned_template():
+    prompt = PromptPipeline("openai").function_prompt(
+        {"name": "sym.main", "address": "0x1000", "assembly_code": "ret", "prompt_template_id": TERSE},
+        {}, PromptBudget(TokenCounter("openai", "gpt-4"), 8000),
+        function_calls="", static_context="", dynamic_context={}
+    )
+    assert prompt.template_id == TERSE
+    assert prompt.user_prompt.startswith("Explain this function.")
+
+
+class RecordingProvider:
+    def __init__(self):
+        self.template_ids = []
+
+    async def initialize(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    def get_provider_id(self):
+        return "openai"
+
+    async def translate_function(self, function_data, context=None):
+        self.template_ids.append(function_data.get("prompt_template_id"))
+        result = translation(500, 100, 900, 0.8)
+        result.function_name = function_data["name"]
+        result.natural_language_description = "Does things."
+        return result
+
+
+async def run_job(manager, provider, llm_config=None, context=None):
+    service = TranslationServiceOrchestrator()
+    service._create_provider_from_config = AsyncMock(return_value=provider)
+    result = SimpleNamespace(
+        decompilation_id="job-exp",
+        functions=[SimpleNamespace(name=f"sym.f{i}", address=hex(0x1000 + i * 16), size=16, assembly_code="ret")
+                   for i in range(20)],
+        imports=[], strings=[], metadata=None
+    )
+
+    with patch("src.llm.translation_service.prompt_experiment_manager", manager):
+        await service.translate_decompilation_result(
+            result, {"llm_provider": "openai", "generate_summary": False, "important_functions": 10, **(llm_config or {})},
+            context
+        )
+
+
+@pytest.mark.asyncio
+async def test_job_assigns_and_records_templates():
+    manager = PromptExperimentManager()
+    experiment = manager.start(PromptExperiment("terse-prompt", CONTROL, {TERSE: 50}))
+    provider = RecordingProvider()
+
+    await run_job(manager, provider)
+
+    # Only the full-detail functions take part
+    assigned = [template_id for template_id in provider.template_ids if template_id]
+    assert len(assigned) == 10 and set(assigned) <= {CONTROL, TERSE}
+    report = experiment.report()
+    assert report["control"]["requests"] + report["variants"][0]["requests"] == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("llm_config, context", [
+    ({"translation_detail": "comprehensive"}, None),
+    (None, {"analysis_context": "malware_analysis"}),
+])
+async def test_job_keeps_templates_other_than_the_control(llm_config, context):
+    manager = PromptExperimentManager()
+    experiment = manager.start(PromptExperiment("terse-prompt", CONTROL, {TERSE: 50}))
+    provider = RecordingProvider()
+
+    await run_job(manager, provider, llm_config, context)
+
+    assert not any(provider.template_ids)
+    assert experiment.report()["control"]["requests"] == 0
@@ -0,0 +1,146 @@
+"""
+Unit tests for the shared prompt pipeline.
+
+Tests template selection from the job's translation detail and analysis
+context, budgeted rendering of code and context, and that every provider
+builds its function prompt through the pipeline.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.llm.base import BRIEF_DETAIL_INSTRUCTION, LLMConfig
+from src.llm.prompt_budget import PromptBudget, TokenCounter
+from src.llm.prompt_pipeline import PromptPipeline
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.gemini_provider import GeminiProvider
+from src.llm.providers.ollama_provider import OllamaProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+
+FUNCTION = {
+    "name": "sym.parse_header",
+    "address": "0x401000",
+    "size": 96,
+    "assembly_code": "push rbp\nmov rbp, rsp\ncall sym.imp.memcpy\npop rbp\nret",
+    "decompiled_code": "int parse_header(char *buf) { memcpy(hdr, buf, 16); return 0; }",
+    "calls_to": ["sym.imp.memcpy"],
+    "variables": ["buf"],
+    "is_entry_point": True,
+}
+
+CONTEXT = {
+    "binary_info": {"format": "elf", "architecture": "x86_64", "file_size": 4096},
+    "translation_settings": {"quality_level": "standard", "analysis_depth": "standard"},
+    "job_id": "job-42",
+}
+
+
+def build(function_data=FUNCTION, context=CONTEXT, max_input_tokens=8000, **kwargs):
+    budget = PromptBudget(TokenCounter("openai", "gpt-4"), max_input_tokens)
+    return PromptPipeline("openai").function_prompt(
+        function_data, context, budget,
+        function_calls="sym.imp.memcpy (copies bytes)",
+        static_context="**Binary Context:**\n{}",
+        dynamic_context={"job_id": "job-42"},
+        **kwargs
+    )
+
+
+def test_renders_selected_template():
+    prompt = build(output_instructions="Reply with JSON.")
+
+    assert prompt.template_id == "function_translation_standard_v1"
+    assert prompt.system_prompt.endswith("Reply with JSON.")
+    assert prompt.static_context == "**Binary Context:**\n{}"
+    assert "- Name: sym.parse_header" in prompt.user_prompt
+    assert "- Entry Point: Yes" in prompt.user_prompt
+    assert "- Calls to: sym.imp.memcpy (copies bytes)" in prompt.user_prompt
+    assert "(elf, unknown, x86_64)" in prompt.user_prompt
+    assert "memcpy(hdr, buf, 16)" in prompt.user_prompt
+    assert prompt.user_prompt.endswith('**Context Information:**\n{"job_id":"job-42"}')
+
+
+@pytest.mark.parametrize("detail, analysis_context, template_id", [
+    ("basic", None, "function_translation_brief_v1"),
+    ("detailed", None, "function_translation_comprehensive_v1"),
+    ("standard", "malware_analysis", "function_security_analysis_v1"),
+    ("standard", "no_such_context", "function_translation_standard_v1"),
+])
+def test_selection_follows_job_settings(detail, analysis_context, template_id):
+    context = {**CONTEXT, "translation_settings": {"quality_level": detail}}
+    if analysis_context:
+        context["analysis_context"] = analysis_context
+    assert build(context=context).template_id == template_id
+
+
+def test_brief_functions_and_budget():
+    assembly = "\n".join(f"mov eax, {i}" for i in range(3000))
+    prompt = build(
+        {**FUNCTION, "assembly_code": assembly, "decompiled_code": None, "detail_level": "brief"},
+        max_input_tokens=1500
+    )
+
+    assert prompt.template_id == "function_translation_brief_v1"
+    assert prompt.user_prompt.endswith(BRIEF_DETAIL_INSTRUCTION)
+    assert "lines omitted" in prompt.user_prompt
+    assert "Not available" in prompt.user_prompt
+    budget = PromptBudget(TokenCounter("openai", "gpt-4"), 1500)
+    assert budget.remaining(prompt.system_prompt, prompt.static_context, prompt.user_prompt) > 0
+
+
+def chat_response():
+    return {
+        "content": "Parses the header.", "model": "model", "tokens_used": 10, "input_tokens": 5,
+        "output_tokens": 5, "cached_input_tokens": 0, "processing_time_ms": 1, "structured": None,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_class, provider_id, model, response", [
+    (OpenAIProvider, "openai", "gpt-4", chat_response()),
+    (AnthropicProvider, "anthropic", "claude-3-haiku-20240307", chat_response()),
+    (GeminiProvider, "gemini", "gemini-1.5-flash", chat_response()),
+    (OllamaProvider, "ollama", "llama3.1:8b", SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="Parses the header."))]
+    )),
+])
+async def test_providers_use_pipeline(provider_class, provider_id, model, response):
+    provider = provider_class(LLMConfig(provider_id=provider_id, api_key="test-key", default_model=model))
+    request = AsyncMock(return_value=response)
+
+    with patch.object(provider, "_make_completion_request", request), \
+            patch.object(PromptPipeline, "function_prompt", wraps=provider.get_prompt_pipeline().function_prompt) as build_prompt:
+        await provider.translate_function(dict(FUNCTION), dict(CONTEXT))
+
+    build_prompt.assert_called_once()
+    sent = str(request.await_args)
+    assert "- Name: sym.parse_header" in sent
+    assert '"job_id":"job-42"' in sent
+    assert provider.get_prompt_pipeline() is provider.get_prompt_pipeline()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_parses_template_sections():
+    provider = AnthropicProvider(LLMConfig(provider_id="anthropic", api_key="test-key", default_model="claude-3-haiku-20240307"))
+    content = (
+        "1. **Function Purpose**: Copies a 16-byte header out of the input buffer.\n\n"
+        "2. **Parameters**: buf points to the raw input.\n"
+        "3. **Logic Flow**: Sets up a frame, calls memcpy and returns.\n"
+        "4. **Return Value**: Always 0.\n"
+        "5. **Security Considerations**: buf is not length-checked.\n\n"
+        "**Confidence Assessment**: About 85%, the assembly is short and unambiguous."
+    )
+    request = AsyncMock(return_value={**chat_response(), "content": content})
+
+    with patch.object(provider, "_make_completion_request", request):
+        result = await provider.translate_function(dict(FUNCTION), dict(CONTEXT))
+
+    assert "Confidence Assessment" in str(request.await_args)
+    assert result.natural_language_description == "Copies a 16-byte header out of the input buffer."
+    assert result.parameters_explanation == "buf points to the raw input."
+    assert result.assembly_summary == "Sets up a frame, calls memcpy and returns."
+    assert result.return_value_explanation == "Always 0."
+    assert result.security_analysis == "buf is not length-checked."
+    assert result.confidence_score == 0.85
@@ -0,0 +1,109 @@
+"""
+Unit tests for compiled prompt rendering.
+
+Tests that compiled templates render exactly like str.format for every
+registered template, buffer rendering, memoized provider adaptation and the
+prompt selection cache.
+"""
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+from src.llm.base import TranslationOperationType
+from src.llm.prompts import (
+    FUNCTION_TRANSLATION_PROMPTS,
+    IMPORT_EXPLANATION_PROMPTS,
+    OVERALL_SUMMARY_PROMPTS,
+    STRING_INTERPRETATION_PROMPTS,
+    AnalysisContext,
+    ContextualPromptManager,
+    PromptVersion,
+    TranslationQuality,
+    compile_prompt,
+    manager,
+)
+
+ALL_TEMPLATES = [
+    template
+    for prompts in (FUNCTION_TRANSLATION_PROMPTS, IMPORT_EXPLANATION_PROMPTS,
+                    STRING_INTERPRETATION_PROMPTS, OVERALL_SUMMARY_PROMPTS)
+    for versions in prompts.values()
+    for template in versions.values()
+]
+
+
+@pytest.mark.parametrize("template", ALL_TEMPLATES, ids=lambda t: t.template_id)
+def test_compiled_render_matches_format(template):
+    compiled = compile_prompt(template.user_prompt_template)
+    context = {name: f"<{name}>" for name in compiled.fields}
+    context["assembly_code"] = "push rbp\nmov rbp, rsp\n" * 500
+    context["function_size"] = 64
+    context["imports"] = [{"library": "libc.so.6", "function": "fopen"}]
+
+    assert compiled.render(context) == template.user_prompt_template.format(**context)
+    assert template.render_user_prompt(context) == template.user_prompt_template.format(**context)
+    for provider_id in ("openai", "anthropic", "gemini"):
+        adapted = template.get_adapted_prompt(provider_id)[1]
+        assert template.render_user_prompt(context, provider_id) == adapted.format(**context)
+
+
+def test_segments_conversions_and_errors():
+    compiled = compile_prompt("{{literal}} {name!r} {size:>6} {name}")
+    assert compiled.fields == ("name", "size")
+    assert compiled.render({"name": "main", "size": 42}) == "{literal} 'main'     42 main"
+    assert compile_prompt("{name!r} {size:>6}") is compile_prompt("{name!r} {size:>6}")
+    # Attribute lookups fall back to str.format
+    assert compile_prompt("{info[name]}").render({"info": {"name": "main"}}) == "main"
+
+    with pytest.raises(KeyError, match="Missing required template variable: size"):
+        compiled.render({"name": "main"})
+
+
+def test_render_into_reused_buffer():
+    compiled = compile_prompt("Function {name}:\n{assembly_code}\n")
+    buffer = io.StringIO()
+    for name in ("sym.a", "sym.b"):
+        buffer.seek(0)
+        buffer.truncate()
+        compiled.render_into(buffer, {"name": name, "assembly_code": "ret"})
+    assert buffer.getvalue() == "Function sym.b:\nret\n"
+
+
+def test_adaptation_is_memoized():
+    template = FUNCTION_TRANSLATION_PROMPTS[TranslationQuality.STANDARD][PromptVersion.V1]
+    first = template.get_adapted_prompt("anthropic")
+    assert template.get_adapted_prompt("anthropic") is first
+    assert first == template._adapt("anthropic")
+    assert template.get_adapted_prompt("ollama")[0] == template.provider_adaptations["ollama"]["system_prompt_replace"]
+    assert template.get_adapted_prompt("vllm") == (template.system_prompt, template.user_prompt_template)
+
+    edited = template.model_copy(update={"user_prompt_template": "Explain {function_name} briefly please."})
+    assert edited.get_adapted_prompt("vllm")[1] == "Explain {function_name} briefly please."
+
+
+def test_selection_is_cached():
+    prompt_manager = ContextualPromptManager()
+    with patch.object(manager, "get_function_prompt", wraps=manager.get_function_prompt) as get_prompt:
+        first = prompt_manager.select_prompt(TranslationOperationType.FUNCTION_TRANSLATION, "openai")
+        again = prompt_manager.select_prompt(TranslationOperationType.FUNCTION_TRANSLATION, "openai")
+        brief = prompt_manager.select_prompt(
+            TranslationOperationType.FUNCTION_TRANSLATION, "openai",
+            AnalysisContext.MALWARE_ANALYSIS, TranslationQuality.BRIEF
+        )
+        assert get_prompt.call_count == 2
+
+        # Data characteristics are part of the cache key
+        for _ in range(2):
+            prompt_manager.select_prompt(
+                TranslationOperationType.FUNCTION_TRANSLATION, "openai",
+                data_characteristics={"security_indicators": {"suspicious_apis": True}}
+            )
+        assert get_prompt.call_count == 3
+
+        prompt_manager.clear_selection_cache()
+        prompt_manager.select_prompt(TranslationOperationType.FUNCTION_TRANSLATION, "openai")
+        assert get_prompt.call_count == 4
+    assert again is first
+    assert brief is not first
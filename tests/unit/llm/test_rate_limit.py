@@ -0,0 +1,254 @@
+"""
+Unit tests for adaptive client-side rate limiting.
+
+Tests token bucket admission, round-robin fairness across jobs, learning limits
+from vendor headers, 429 backoff and the shared per-credential registry.
+"""
+
+import asyncio
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.rate_limit import (
+    MIN_RATE_FACTOR,
+    AdaptiveRateLimiter,
+    get_rate_limiter,
+    parse_retry_after,
+    rate_limit_owner,
+    reset_rate_limiters,
+)
+from tests.fixtures.llm_stub_server import StubLLMServer, openai_chat_response
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+class TestAdaptiveRateLimiter:
+    """Test bucket admission and queuing."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_capacity_is_immediate(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=6000)
+
+        await asyncio.wait_for(limiter.acquire(500), timeout=0.1)
+
+        snapshot = limiter.snapshot()
+        assert snapshot.available_requests == pytest.approx(9, abs=0.1)
+        assert snapshot.available_tokens == pytest.approx(500, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_on_full_bucket(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=6000)
+
+        await asyncio.wait_for(limiter.acquire(5000), timeout=0.1)
+
+        assert limiter.snapshot().available_tokens < 0
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_owners(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=6000, tokens_per_minute=500000)
+        limiter._request_level = 0.0
+        granted = []
+
+        async def request(owner, n):
+            await limiter.acquire(10, owner=owner)
+            granted.append((owner, n))
+
+        # Job A queues all of its work before job B arrives
+        tasks = [asyncio.create_task(request("job-a", n)) for n in range(3)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(request("job-b", n)) for n in range(3)]
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+
+        owners = [owner for owner, _ in granted]
+        assert owners == ["job-a", "job-b", "job-a", "job-b", "job-a", "job-b"]
+        assert [n for owner, n in granted if owner == "job-a"] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_owner_defaults_to_context(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=6000, tokens_per_minute=500000)
+        limiter._request_level = 0.0
+
+        token = rate_limit_owner.set("job-ctx")
+        try:
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            assert list(limiter._waiters) == ["job-ctx"]
+            await asyncio.wait_for(waiter, timeout=1)
+        finally:
+            rate_limit_owner.reset(token)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=6000, tokens_per_minute=500000)
+        limiter._request_level = 0.0
+
+        cancelled = asyncio.create_task(limiter.acquire(owner="job-a"))
+        waiting = asyncio.create_task(limiter.acquire(owner="job-a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(waiting, timeout=1)
+        assert limiter.waiting == 0
+
+    def test_release_returns_reservation(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=6000)
+        limiter._token_level = 0.0
+
+        limiter.release(800)
+
+        assert limiter._token_level == pytest.approx(800, abs=5)
+
+    def test_reconcile_returns_unused_tokens(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=6000)
+        limiter._token_level = 0.0
+
+        limiter.reconcile(estimated_tokens=800, actual_tokens=300)
+
+        assert limiter._token_level == pytest.approx(500)
+
+
+class TestAdaptation:
+    """Test learning from headers and 429s."""
+
+    def test_openai_headers(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=40000)
+
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "3",
+            "x-ratelimit-limit-tokens": "200000",
+            "x-ratelimit-remaining-tokens": "1500",
+        })
+
+        assert limiter.requests_per_minute == 500
+        assert limiter.tokens_per_minute == 200000
+        assert limiter._request_level == 3
+        assert limiter._token_level == 1500
+
+    def test_anthropic_headers(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=40000)
+
+        limiter.update_from_headers({
+            "anthropic-ratelimit-requests-limit": "50",
+            "anthropic-ratelimit-requests-remaining": "49",
+            "anthropic-ratelimit-tokens-limit": "80000",
+        })
+
+        assert limiter.requests_per_minute == 50
+        assert limiter.tokens_per_minute == 80000
+
+    def test_rate_limited_backs_off_and_recovers(self):
+        limiter = AdaptiveRateLimiter("test", requests_per_minute=60, tokens_per_minute=40000)
+
+        limiter.record_rate_limited(retry_after=5)
+
+        snapshot = limiter.snapshot()
+        assert snapshot.rate_factor == 0.5
+        assert snapshot.paused_for_seconds == pytest.approx(5, abs=0.1)
+        assert snapshot.rate_limited_count == 1
+
+        for _ in range(20):
+            limiter.record_rate_limited(retry_after=0)
+        assert limiter.rate_factor == MIN_RATE_FACTOR
+
+        limiter.record_success()
+        assert limiter.rate_factor == pytest.approx(MIN_RATE_FACTOR + 0.05)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+        assert parse_retry_after({"retry-after": "7"}) == 7.0
+        assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+        assert parse_retry_after({"retry-after": "soon"}) is None
+        assert parse_retry_after(None) is None
+
+
+def test_registry_shared_per_credential():
+    first = get_rate_limiter("openai", "sk-one")
+    assert get_rate_limiter("openai", "sk-one") is first
+    assert get_rate_limiter("openai", "sk-two") is not first
+    assert get_rate_limiter("openai", "sk-one", "http://localhost:8000/v1") is not first
+    assert "sk-one" not in first.key
+
+
+@pytest.mark.asyncio
+async def test_provider_waits_out_429_in_shared_limiter():
+    server = StubLLMServer().start()
+    calls = []
+    throttle = []
+
+    def handler(method, path, body):
+        calls.append(body)
+        if throttle:
+            throttle.pop()
+            return 429, {"error": {"message": "Rate limit reached", "type": "requests"}}, {"retry-after-ms": "20"}
+        return 200, openai_chat_response(), {
+            "x-ratelimit-limit-requests": "5000",
+            "x-ratelimit-remaining-requests": "4999",
+        }
+
+    server.route("POST", "/v1/chat/completions", handler=handler)
+    config = LLMConfig(
+        provider_id="openai", api_key="sk-limited", default_model="gpt-4",
+        endpoint_url=f"{server.url}/v1", requests_per_minute=6000, tokens_per_minute=500000, max_tokens=256
+    )
+    provider = OpenAIProvider(config)
+    other_job_provider = OpenAIProvider(config)
+    try:
+        await provider.initialize()
+        calls.clear()
+        throttle.append(True)
+
+        response = await provider._make_completion_request([{"role": "user", "content": "hi"}])
+
+        assert response["content"] == "This function initializes the parser."
+        # One 429 and one retry: the SDK did not retry on its own schedule
+        assert len(calls) == 2
+        limiter = provider.rate_limiter
+        assert other_job_provider.rate_limiter is limiter
+        assert limiter.rate_limited_count == 1
+        assert limiter.rate_factor == 0.5 + 0.05
+        assert limiter.requests_per_minute == 5000
+        await provider.cleanup()
+    finally:
+        server.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_not_retried_and_returns_tokens():
+    server = StubLLMServer().start()
+    calls = []
+
+    def handler(method, path, body):
+        calls.append(body)
+        return 400, {"error": {"message": "Bad request", "type": "invalid_request_error"}}, {}
+
+    server.route("POST", "/v1/chat/completions", handler=handler)
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-failing", default_model="gpt-4",
+        endpoint_url=f"{server.url}/v1", requests_per_minute=6000, tokens_per_minute=6000, max_tokens=256
+    ))
+    try:
+        try:
+            await provider.initialize()
+        except Exception:
+            pass  # Health check fails against this server
+        calls.clear()
+        limiter = provider.rate_limiter
+        limiter._token_level = 1000.0
+
+        with pytest.raises(Exception):
+            await provider._make_completion_request([{"role": "user", "content": "hi"}])
+
+        # One attempt only, and the reservation went back to the shared bucket
+        assert len(calls) == 1
+        assert limiter._token_level == pytest.approx(1000, abs=20)
+        await provider.cleanup()
+    finally:
+        server.stop()
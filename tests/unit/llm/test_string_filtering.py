@@ -0,0 +1,138 @@
+"""
+Unit tests for string preprocessing before interpretation.
+
+Tests deduplication, low-information filtering, template clustering, batch
+packing and fan-out of interpretations to cluster members.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.gemini_provider import GeminiProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.string_filtering import (
+    MAX_PROMPT_STRING_CHARS,
+    cluster_key,
+    fan_out,
+    is_low_information,
+    prepare_strings,
+    shannon_entropy,
+)
+from src.llm.translation_service import TranslationServiceOrchestrator
+
+
+def entry(value, address="0x4000"):
+    return {"content": value, "address": address, "size": len(value), "encoding": "ascii"}
+
+
+class TestFiltering:
+    """Test the low-information heuristics."""
+
+    def test_entropy(self):
+        assert shannon_entropy("") == 0.0
+        assert shannon_entropy("aaaa") == 0.0
+        assert shannon_entropy("abcd") == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("value", [
+        "abc", "AAAAAAAA", "----====----", "%s: %d\n", "%08x %08x", "GLIBC_2.2.5", ".eh_frame", "bcdfghjk",
+    ])
+    def test_low_information(self, value):
+        assert is_low_information(value) is True
+
+    @pytest.mark.parametrize("value", [
+        "Failed to open configuration file",
+        "http://10.0.0.1/gate.php",
+        "/etc/passwd",
+        "SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Run",
+        "Usage: %s [options] <file>",
+        "dGhpcyBpcyBhIHNlY3JldCBrZXk=",
+    ])
+    def test_informative(self, value):
+        assert is_low_information(value) is False
+
+
+def test_cluster_key_normalizes_numbers_and_formats():
+    assert cluster_key("Error 404 at 0x1f00") == cluster_key("error 500 at 0xdead")
+    assert cluster_key("Retry %d of %d") == cluster_key("Retry %u of %lu")
+    assert cluster_key("Retry %d of %d") != cluster_key("Connection refused")
+
+
+def test_prepare_strings_dedupes_filters_and_clusters():
+    strings = [
+        entry("Connection to server failed", "0x4000"),
+        entry("Connection to server failed", "0x4100"),
+        entry("%s: %d"),
+        entry("%s: %d"),
+        entry("Worker 1 started"),
+        entry("Worker 2 started"),
+        entry("Loading plugin " + "abcdefghij" * 30),
+    ]
+
+    plan = prepare_strings(strings)
+
+    assert plan.stats() == {"total": 7, "unique": 5, "filtered": 1, "clusters": 3, "batches": 1}
+    assert [len(cluster.members) for cluster in plan.clusters] == [2, 2, 1]
+    assert len(plan.clusters[2].representative["content"]) == MAX_PROMPT_STRING_CHARS
+
+
+def test_batches_bounded_by_count_and_chars():
+    plan = prepare_strings([entry(f"Message number {chr(65 + i)} sent") for i in range(26)])
+
+    assert [len(batch) for batch in plan.batches(batch_size=10)] == [10, 10, 6]
+    assert all(len(batch) <= 2 for batch in plan.batches(max_chars=50))
+
+
+def test_fan_out_pairs_members_with_representative():
+    plan = prepare_strings([entry("Worker 1 started", "0x1"), entry("Worker 2 started", "0x2"), entry("Disk full")])
+
+    pairs = fan_out(plan.clusters, ["worker startup", None])
+
+    assert [(member["address"], meaning) for member, meaning in pairs] == [("0x1", "worker startup"), ("0x2", "worker startup")]
+
+
+@pytest.mark.asyncio
+async def test_service_interprets_representatives_only():
+    strings = [entry(f"Worker {i} started", hex(0x4000 + i)) for i in range(120)] + [
+        entry(f"Unique message {chr(65 + i)}{chr(97 + i)}") for i in range(60)
+    ] + [entry("%d%%")] * 500
+    plan = prepare_strings(strings)
+    provider = SimpleNamespace(interpret_strings=AsyncMock(side_effect=lambda batch, context: [
+        SimpleNamespace(interpretation=f"means {item['content']}", usage_context="log", security_analysis=None)
+        for item in batch
+    ]))
+
+    pairs = await TranslationServiceOrchestrator()._interpret_strings(provider, plan, {}, concurrency=2)
+
+    sent = [item for call in provider.interpret_strings.await_args_list for item in call.args[0]]
+    assert len(sent) == 61
+    assert provider.interpret_strings.await_count == 2
+    assert len(pairs) == 180
+    assert {meaning.interpretation for member, meaning in pairs[:120]} == {"means Worker 0 started"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_class,provider_id,model", [
+    (OpenAIProvider, "openai", "gpt-4"),
+    (AnthropicProvider, "anthropic", "claude-3-haiku-20240307"),
+    (GeminiProvider, "gemini", "gemini-flash"),
+])
+async def test_every_cluster_interpreted_through_each_provider(provider_class, provider_id, model):
+    strings = [entry(f"Unique message {chr(65 + i // 26)}{chr(97 + i % 26)}", hex(0x4000 + i)) for i in range(50)]
+    plan = prepare_strings(strings)
+    provider = provider_class(LLMConfig(provider_id=provider_id, api_key="test-key", default_model=model))
+    provider.genai_model = Mock()
+    provider._make_completion_request = AsyncMock(return_value={
+        "content": "Status message shown to the user.", "model": model, "tokens_used": 120,
+        "input_tokens": 100, "output_tokens": 20, "processing_time_ms": 5
+    })
+
+    pairs = await TranslationServiceOrchestrator()._interpret_strings(provider, plan, {}, concurrency=2)
+
+    # Batches respect the provider's limit, so no cluster is cut off by its slice
+    assert len(plan.clusters) == 50
+    assert sorted(member["address"] for member, _ in pairs) == sorted(item["address"] for item in strings)
+    assert all(meaning.string_value == member["content"] for member, meaning in pairs)
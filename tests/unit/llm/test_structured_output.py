@@ -0,0 +1,193 @@
+"""
+Unit tests for structured JSON output.
+
+Tests schema derivation from the result models, decoding and validation, the
+one-shot repair re-ask, and the OpenAI and Anthropic providers requesting and
+parsing structured replies against a local stand-in server.
+"""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.base import LLMConfig
+from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.providers.openai_provider import OpenAIProvider
+from src.llm.structured_output import (
+    FUNCTION_TRANSLATION_SCHEMA,
+    OVERALL_SUMMARY_SCHEMA,
+    StructuredOutputError,
+    decode_json,
+    parse_output,
+    parse_with_repair,
+)
+from tests.fixtures.llm_stub_server import (
+    StubLLMServer,
+    anthropic_message_response,
+    openai_chat_response,
+)
+
+FUNCTION_DATA = {
+    "name": "sym.parse_config",
+    "address": "0x00401000",
+    "size": 64,
+    "assembly_code": "push rbp\nmov rbp, rsp\ncall sym.imp.fopen\npop rbp\nret",
+}
+
+FIELDS = {
+    "natural_language_description": "Opens the configuration file and parses it.",
+    "parameters_explanation": "Takes the path of the file.",
+    "return_value_explanation": "Returns 0 on success.",
+    "assembly_summary": None,
+    "security_analysis": None,
+    "confidence_score": 0.85,
+}
+
+
+@pytest.fixture
+def stub_server():
+    server = StubLLMServer().start()
+    yield server
+    server.stop()
+
+
+def test_schemas_follow_models():
+    schema = FUNCTION_TRANSLATION_SCHEMA.json_schema
+    assert schema["required"] == list(schema["properties"])
+    assert schema["additionalProperties"] is False
+    assert "parameters_explanation" in FUNCTION_TRANSLATION_SCHEMA.nullable
+    assert "natural_language_description" not in FUNCTION_TRANSLATION_SCHEMA.nullable
+    assert OVERALL_SUMMARY_SCHEMA.json_schema["properties"]["key_insights"]["type"] == "array"
+
+
+def test_decode_and_validate():
+    assert decode_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_output(json.dumps({**FIELDS, "confidence_score": 3}), FUNCTION_TRANSLATION_SCHEMA)["confidence_score"] == 1.0
+
+    with pytest.raises(StructuredOutputError):
+        decode_json("The function opens a file.")
+    with pytest.raises(StructuredOutputError):
+        parse_output({**FIELDS, "natural_language_description": None}, FUNCTION_TRANSLATION_SCHEMA)
+    with pytest.raises(StructuredOutputError):
+        parse_output({**FIELDS, "confidence_score": "high"}, FUNCTION_TRANSLATION_SCHEMA)
+
+
+@pytest.mark.asyncio
+async def test_repair_reasks_once():
+    reask = AsyncMock(return_value=json.dumps(FIELDS))
+    fields = await parse_with_repair('{"natural_language_description": "Opens', FUNCTION_TRANSLATION_SCHEMA, reask)
+    assert fields == FIELDS
+    system_prompt, user_prompt = reask.await_args.args
+    assert "confidence_score" in system_prompt
+    assert user_prompt.endswith('{"natural_language_description": "Opens')
+
+    reask = AsyncMock(return_value="still not json")
+    with pytest.raises(StructuredOutputError):
+        await parse_with_repair("nope", FUNCTION_TRANSLATION_SCHEMA, reask)
+    assert reask.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_openai_schema_request_and_repair(stub_server):
+    replies = [json.dumps(FIELDS)[:-20], json.dumps(FIELDS)]
+    stub_server.route("POST", "/v1/chat/completions", handler=lambda method, path, body: (
+        200, openai_chat_response(replies.pop(0) if "response_format" in body else "OK",
+                                  prompt_tokens=100, completion_tokens=50), {}
+    ))
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4",
+        endpoint_url=f"{stub_server.url}/v1", structured_output=True
+    ))
+    provider.endpoint_type = "openai"
+    await provider.initialize()
+
+    translation = await provider.translate_function(FUNCTION_DATA)
+
+    first, repair = stub_server.requests_to("/v1/chat/completions")[-2:]
+    assert first["response_format"]["type"] == "json_schema"
+    assert first["response_format"]["json_schema"]["strict"] is True
+    # The repair request carries the broken reply but not the function again
+    assert "push rbp" not in json.dumps(repair["messages"])
+    assert translation.natural_language_description == FIELDS["natural_language_description"]
+    assert translation.parameters_explanation == "Takes the path of the file."
+    assert translation.confidence_score == 0.85
+    assert translation.llm_provider.tokens_used == 300
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_openai_compatible_endpoint_uses_json_mode_and_falls_back(stub_server):
+    stub_server.route("POST", "/v1/chat/completions", openai_chat_response("Parameters: path. Returns: 0."))
+    provider = OpenAIProvider(LLMConfig(
+        provider_id="openai", api_key="sk-test", default_model="gpt-4",
+        endpoint_url=f"{stub_server.url}/v1", structured_output=True
+    ))
+    await provider.initialize()
+
+    translation = await provider.translate_function(FUNCTION_DATA)
+
+    first, repair = stub_server.requests_to("/v1/chat/completions")[-2:]
+    assert first["response_format"] == {"type": "json_object"}
+    assert "confidence_score" in first["messages"][0]["content"]
+    # Unrepairable replies keep the free-text result instead of retranslating
+    assert translation.natural_language_description == "Parameters: path. Returns: 0."
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_tool_use(stub_server):
+    response = anthropic_message_response()
+    response["content"] = [{"type": "tool_use", "id": "toolu_1", "name": "record_function_translation", "input": FIELDS}]
+    response["stop_reason"] = "tool_use"
+    stub_server.route("POST", "/v1/messages", response)
+    provider = AnthropicProvider(LLMConfig(
+        provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+        endpoint_url=stub_server.url, structured_output=True
+    ))
+    await provider.initialize()
+    sent = len(stub_server.requests_to("/v1/messages"))
+
+    translation = await provider.translate_function(FUNCTION_DATA)
+
+    body = stub_server.requests_to("/v1/messages")[-1]
+    assert body["tool_choice"] == {"type": "tool", "name": "record_function_translation"}
+    assert body["tools"][0]["input_schema"] == FUNCTION_TRANSLATION_SCHEMA.json_schema
+    assert len(stub_server.requests_to("/v1/messages")) == sent + 1
+    assert translation.return_value_explanation == "Returns 0 on success."
+    assert translation.confidence_score == 0.85
+    await provider.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_summary_tool_use(stub_server):
+    summary_fields = {
+        "program_purpose": "Configuration loader.",
+        "main_functionality": "Reads and validates configuration files.",
+        "architecture_overview": "Single-threaded command line tool.",
+        "data_flow_description": "File contents flow into a settings table.",
+        "security_analysis": "No network access.",
+        "technology_stack": ["C", "libc"],
+        "key_insights": ["Parses INI files"],
+        "potential_use_cases": ["Service configuration"],
+        "risk_assessment": None,
+        "behavioral_indicators": [],
+        "confidence_score": 0.7,
+    }
+    response = anthropic_message_response()
+    response["content"] = [{"type": "tool_use", "id": "toolu_1", "name": "record_overall_summary", "input": summary_fields}]
+    response["stop_reason"] = "tool_use"
+    stub_server.route("POST", "/v1/messages", response)
+    provider = AnthropicProvider(LLMConfig(
+        provider_id="anthropic", api_key="sk-ant-test", default_model="claude-3-haiku-20240307",
+        endpoint_url=stub_server.url, structured_output=True
+    ))
+    await provider.initialize()
+
+    summary = await provider.generate_overall_summary({"functions": [], "imports": [], "strings": []})
+
+    body = stub_server.requests_to("/v1/messages")[-1]
+    assert body["tool_choice"] == {"type": "tool", "name": "record_overall_summary"}
+    assert summary.program_purpose == "Configuration loader."
+    assert summary.technology_stack == ["C", "libc"]
+    await provider.cleanup()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the tokenizer registry.
+
+Tests the shared LRU token count cache, batched counting of cache misses,
+tokenizer selection and fallback, and providers counting through the registry.
+"""
+
+import pytest
+
+from src.llm import tokenization
+from src.llm.base import LLMConfig, LLMProviderType
+from src.llm.prompt_budget import PromptBudget
+from src.llm.providers.ollama_provider import OllamaProvider
+from src.llm.tokenization import (
+    EstimateTokenizer,
+    TokenCountCache,
+    Tokenizer,
+    count_tokens,
+    count_tokens_many,
+    get_token_count_cache,
+    get_tokenizer,
+    register_tokenizer,
+)
+
+
+class WordTokenizer(Tokenizer):
+    """Exact tokenizer stand-in: one token per whitespace-separated word."""
+
+    is_exact = True
+
+    def __init__(self, name="words"):
+        self.name = name
+        self.batches = []
+
+    def _encode_lengths(self, texts):
+        self.batches.append(list(texts))
+        return [len(text.split()) for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(tokenization, "_factories", {k: list(v) for k, v in tokenization._factories.items()})
+    monkeypatch.setattr(tokenization, "_tokenizers", {})
+    monkeypatch.setattr(tokenization, "_token_count_cache", TokenCountCache())
+
+
+def test_lru_eviction():
+    cache = TokenCountCache(max_entries=2)
+    tokenizer = WordTokenizer()
+    a, b, c = (cache.key(tokenizer, text) for text in ("a", "b", "c"))
+    cache.put(a, 1)
+    cache.put(b, 2)
+    assert cache.get(a) == 1  # a is now most recently used
+    cache.put(c, 3)
+
+    assert cache.get(b) is None
+    assert cache.get(a) == 1 and cache.get(c) == 3
+    assert cache.get_stats()["entries"] == 2
+    assert cache.get_stats()["hits"] == 3
+
+
+def test_count_many_tokenizes_only_misses_once():
+    tokenizer = WordTokenizer()
+    assert count_tokens("mov eax, ebx", tokenizer) == 3
+
+    counts = count_tokens_many(["mov eax, ebx", "push rbp", "", "push rbp", "ret"], tokenizer)
+
+    assert counts == [3, 2, 0, 2, 1]
+    # Cached and duplicate texts are not re-tokenized, and misses go in one batch
+    assert tokenizer.batches == [["mov eax, ebx"], ["push rbp", "ret"]]
+    assert get_token_count_cache().get_stats()["entries"] == 3
+
+
+def test_cache_is_per_tokenizer():
+    first, second = WordTokenizer("first"), WordTokenizer("second")
+    count_tokens("xor eax, eax", first)
+    count_tokens("xor eax, eax", second)
+    assert len(second.batches) == 1
+
+
+def test_estimates_bypass_cache():
+    tokenizer = EstimateTokenizer(3.3)
+    assert count_tokens_many(["a" * 330, ""], tokenizer) == [100, 0]
+    assert get_token_count_cache().get_stats()["entries"] == 0
+
+
+def test_registry_falls_back_to_calibrated_estimate():
+    tokenizer = get_tokenizer("anthropic", "claude-3-haiku")
+    assert not tokenizer.is_exact
+    assert tokenizer.chars_per_token == tokenization.CHARS_PER_TOKEN["anthropic"]
+    assert get_tokenizer("anthropic", "claude-3-haiku") is tokenizer
+    # A missing tokenizer file is ignored
+    assert not get_tokenizer("ollama", "llama3.1:8b", {"tokenizer_file": "/nonexistent/tokenizer.json"}).is_exact
+
+
+def test_registered_factory_takes_precedence():
+    words = WordTokenizer()
+    register_tokenizer(LLMProviderType.OLLAMA, lambda model, options: words if model == "llama3.1:8b" else None)
+
+    assert get_tokenizer("ollama", "llama3.1:8b") is words
+    assert not get_tokenizer("ollama", "phi4").is_exact
+
+
+def test_provider_and_budget_count_through_registry():
+    words = WordTokenizer()
+    register_tokenizer("ollama", lambda model, options: words)
+    provider = OllamaProvider(LLMConfig(
+        provider_id=LLMProviderType.OLLAMA, api_key="ollama-no-auth", default_model="llama3.1:8b"
+    ))
+
+    assert provider.count_tokens("lea rdi, [rip + 0x10]") == 5
+    assert provider.count_tokens_many(["nop", "call sym.imp.puts"]) == [1, 2]
+    budget = PromptBudget.for_config(provider.config)
+    assert budget.remaining("nop", "push rbp") == budget.max_input_tokens - 3
+    assert words.batches[-1] == ["push rbp"]
@@ -0,0 +1,185 @@
+"""
+Unit tests for the concurrent translation passes.
+
+Uses a fake provider with fixed delays to check that imports and strings run
+alongside function translation and that the summary waits for N functions.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.rate_limit import rate_limit_owner
+from src.llm.translation_service import TranslationServiceOrchestrator
+
+PASS_DELAY = 0.3
+FUNCTION_DELAY = 0.05
+
+
+class SlowProvider:
+    """Provider stand-in that sleeps for a fixed time per call."""
+
+    def __init__(self, fail_strings=False, fail_functions=False):
+        self.fail_strings = fail_strings
+        self.fail_functions = fail_functions
+        self.translated_before_summary = None
+        self.summary_functions = None
+        self.owners = set()
+        self.translated = 0
+
+    async def initialize(self):
+        pass
+
+    def get_provider_id(self):
+        return "openai"
+
+    def supports_batch(self):
+        return False
+
+    async def translate_function(self, function_data, context=None):
+        self.owners.add(rate_limit_owner.get())
+        await asyncio.sleep(FUNCTION_DELAY)
+        if self.fail_functions:
+            raise RuntimeError("function translation failed")
+        self.translated += 1
+        return SimpleNamespace(
+            function_name=function_data["name"],
+            address=function_data["address"],
+            natural_language_description=f"Explains {function_data['name']}.",
+            confidence_score=0.9
+        )
+
+    async def explain_imports(self, import_list, context=None):
+        self.owners.add(rate_limit_owner.get())
+        await asyncio.sleep(PASS_DELAY)
+        return [
+            SimpleNamespace(
+                library_name=item["library"], function_name=item["function"],
+                api_documentation_summary="Opens a file.", security_implications=None
+            )
+            for item in import_list
+        ]
+
+    async def interpret_strings(self, string_list, context=None):
+        await asyncio.sleep(PASS_DELAY)
+        if self.fail_strings:
+            raise RuntimeError("string pass failed")
+        return [
+            SimpleNamespace(
+                string_value=item["content"], address=item["address"], interpretation="A path.",
+                usage_context="File access", security_analysis=None
+            )
+            for item in string_list
+        ]
+
+    async def generate_overall_summary(self, decompilation_data, context=None):
+        self.translated_before_summary = self.translated
+        self.summary_functions = [f["name"] for f in decompilation_data["functions"]]
+        await asyncio.sleep(PASS_DELAY)
+        return SimpleNamespace(
+            program_purpose="Reads configuration.", main_functionality="Parses files.",
+            security_analysis="Low risk.", risk_assessment=None, key_insights=[]
+        )
+
+
+def make_result(function_count=8):
+    return SimpleNamespace(
+        decompilation_id="job-passes",
+        functions=[
+            SimpleNamespace(name=f"sym.f{i}", address=hex(0x1000 + i * 0x10), size=16, assembly_code="ret")
+            for i in range(function_count)
+        ],
+        imports=[SimpleNamespace(library_name="libc.so.6", function_name="fopen", address=None)],
+        strings=[SimpleNamespace(value="/etc/app.conf", address="0x4000", size=14, encoding="ascii")],
+        metadata=None,
+    )
+
+
+async def translate(provider, **llm_config):
+    knowledge_base = SimpleNamespace(
+        lookup_many=AsyncMock(return_value=({}, [0])), store_many=AsyncMock(return_value=1)
+    )
+    service = TranslationServiceOrchestrator(import_knowledge=knowledge_base)
+    service._create_provider_from_config = AsyncMock(return_value=provider)
+    return await service.translate_decompilation_result(
+        make_result(), {"llm_provider": "openai", "translation_concurrency": 2, **llm_config}
+    )
+
+
+@pytest.mark.asyncio
+async def test_passes_overlap_function_translation():
+    provider = SlowProvider()
+
+    start = time.monotonic()
+    _, translation_data = await translate(provider, summary_after_functions=2)
+    elapsed = time.monotonic() - start
+
+    # Sequential passes would take ~1.1s; concurrent ones take the longest chain
+    assert elapsed < 0.75
+    assert len(translation_data["functions"]) == 8
+    assert translation_data["imports"][0]["function"] == "fopen"
+    assert translation_data["strings"][0]["value"] == "/etc/app.conf"
+    assert translation_data["summary"]["program_purpose"] == "Reads configuration."
+    assert set(translation_data["pass_timings"]) == {"functions", "imports", "strings", "summary"}
+    assert provider.owners == {"job-passes"}
+
+
+@pytest.mark.asyncio
+async def test_summary_starts_after_first_results():
+    provider = SlowProvider()
+
+    _, translation_data = await translate(provider, summary_after_functions=4)
+
+    assert provider.translated_before_summary == 4
+    assert len(provider.summary_functions) == 4
+    assert translation_data["summary"] is not None
+
+
+@pytest.mark.asyncio
+async def test_zero_threshold_starts_summary_immediately():
+    provider = SlowProvider()
+
+    _, translation_data = await translate(provider, summary_after_functions=0)
+
+    assert provider.translated_before_summary == 0
+    assert provider.summary_functions == []
+    assert translation_data["summary"]["program_purpose"] == "Reads configuration."
+    assert len(translation_data["functions"]) == 8
+
+
+@pytest.mark.asyncio
+async def test_summary_only_result_is_kept():
+    provider = SlowProvider(fail_functions=True)
+
+    _, translation_data = await translate(provider, translate_imports=False, translate_strings=False)
+
+    assert translation_data is not None
+    assert translation_data["functions"] == []
+    assert translation_data["summary"]["program_purpose"] == "Reads configuration."
+
+
+@pytest.mark.asyncio
+async def test_failed_pass_does_not_fail_job():
+    provider = SlowProvider(fail_strings=True)
+
+    _, translation_data = await translate(provider, translate_imports=False)
+
+    assert translation_data["strings"] == []
+    assert translation_data["imports"] == []
+    assert len(translation_data["functions"]) == 8
+    # Fewer results than the default threshold: the summary covers all of them
+    assert len(provider.summary_functions) == 8
+
+
+@pytest.mark.asyncio
+async def test_zero_important_functions_translates_all_brief():
+    provider = SlowProvider()
+
+    _, translation_data = await translate(provider, important_functions=0, generate_summary=False)
+
+    assert len(translation_data["functions"]) == 8
+    assert {f["detail_level"] for f in translation_data["functions"]} == {"brief"}
+    assert translation_data["coverage"]["important_total"] == 0